@@ -0,0 +1,140 @@
+"""Background batching of lead_activities inserts.
+
+Used by the lead mutation routes when the transactional RPCs aren't
+deployed: instead of a blocking insert per request, activity rows are
+queued and written in bulk by a daemon thread.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from app.db import get_supabase
+
+logger = logging.getLogger("dynasty_property_os.activity_log")
+
+_STOP = object()  # queued by close(): write the batch in hand, then exit
+
+
+class ActivityLogBatcher:
+    """Queue activity rows and flush them in one insert per batch.
+
+    A flush happens when ``batch_size`` rows are waiting or ``interval``
+    seconds pass, whichever comes first. A failed insert is retried
+    ``retries`` times with exponential backoff before its rows are counted
+    in ``failed``. At interpreter exit, close() lets the worker write the
+    batch it is holding and then flushes whatever is still queued.
+    """
+
+    def __init__(self, table: str = "lead_activities", batch_size: int = 200,
+                 interval: float = 0.5, client_factory: Callable[[], Any] = get_supabase,
+                 retries: int = 2, retry_backoff: float = 0.5) -> None:
+        self.table = table
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._client_factory = client_factory
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self.written = 0
+        self.failed = 0
+        self.retried = 0
+
+    def enqueue(self, row: dict[str, Any]) -> None:
+        if self._closed:
+            self._write([row])
+            return
+        self._ensure_worker()
+        self._queue.put(row)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None and not self._closed:
+                self._worker = threading.Thread(target=self._run, name="activity-log-batcher", daemon=True)
+                self._worker.start()
+                atexit.register(self.close)
+
+    def _drain(self) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        while len(batch) < self.batch_size:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                batch.append(row)
+        return batch
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        for attempt in range(self.retries + 1):
+            try:
+                self._client_factory().table(self.table).insert(batch).execute()
+                self.written += len(batch)
+                return
+            except Exception:  # noqa: BLE001 - activity logging must never take the API down
+                if attempt == self.retries:
+                    self.failed += len(batch)
+                    logger.exception("activity batch insert failed rows=%d attempts=%d", len(batch), attempt + 1)
+                    return
+                self.retried += 1
+                logger.warning("activity batch insert failed rows=%d; retrying", len(batch))
+                time.sleep(self.retry_backoff * 2 ** attempt)
+
+    def _run(self) -> None:
+        while True:
+            row = self._queue.get()
+            if row is _STOP:
+                return
+            batch = [row]
+            stop = False
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stop = True
+                    break
+                batch.append(row)
+            self._write(batch)
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Write everything queued so far on the calling thread."""
+        while not self._queue.empty():
+            self._write(self._drain())
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the worker once its in-flight batch is written, then flush the queue.
+
+        Rows enqueued after close() are written immediately on the caller's
+        thread.
+        """
+        with self._start_lock:
+            self._closed = True
+            worker = self._worker
+        if worker is not None and worker.is_alive():
+            self._queue.put(_STOP)
+            worker.join(timeout)
+        self.flush()
+
+
+lead_activity_log = ActivityLogBatcher()
+
+__all__ = ["ActivityLogBatcher", "lead_activity_log"]
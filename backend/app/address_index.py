@@ -0,0 +1,280 @@
+"""Street-address normalization plus exact and fuzzy in-memory indexes.
+
+Leads, properties and the property-intelligence tables are all keyed by
+free-text addresses, so "123 North Main Street Apt 2" and "123 n main st #2"
+must land on the same key, while the same street line in another city must
+not. normalize_address() canonicalizes directionals, street suffixes,
+ordinals and unit designators to USPS-style abbreviations and appends the
+ZIP (or city and state); address_hash() is the stable digest stored in
+``address_hash`` columns.
+
+AddressIndex keeps a hash map for O(1) exact lookups and a trigram inverted
+index for ranked fuzzy search. Trigrams are built the way pg_trgm builds
+them, so in-process scores agree with ``similarity()`` in Postgres.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+
+STREET_SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "AV": "AVE", "AVEN": "AVE", "AVN": "AVE",
+    "BOULEVARD": "BLVD", "BOUL": "BLVD", "BRANCH": "BR", "BYPASS": "BYP",
+    "CIRCLE": "CIR", "CIRC": "CIR", "COURT": "CT", "CRT": "CT", "COVE": "CV",
+    "CREEK": "CRK", "CROSSING": "XING", "DRIVE": "DR", "DRV": "DR",
+    "EXPRESSWAY": "EXPY", "EXTENSION": "EXT", "GARDENS": "GDNS", "HEIGHTS": "HTS",
+    "HIGHWAY": "HWY", "HIWAY": "HWY", "HOLLOW": "HOLW", "LANE": "LN",
+    "LOOP": "LOOP", "MANOR": "MNR", "PARKWAY": "PKWY", "PKY": "PKWY",
+    "PLACE": "PL", "PLAZA": "PLZ", "POINT": "PT", "RIDGE": "RDG", "ROAD": "RD",
+    "ROUTE": "RTE", "SQUARE": "SQ", "STREET": "ST", "STR": "ST", "TERRACE": "TER",
+    "TRAIL": "TRL", "TRAILER": "TRLR", "TURNPIKE": "TPKE", "VIEW": "VW",
+    "VILLAGE": "VLG", "WAY": "WAY",
+}
+_CANONICAL_SUFFIXES = set(STREET_SUFFIXES.values())
+_CANONICAL_DIRECTIONALS = set(DIRECTIONALS.values())
+
+ORDINALS = {
+    "FIRST": "1ST", "SECOND": "2ND", "THIRD": "3RD", "FOURTH": "4TH", "FIFTH": "5TH",
+    "SIXTH": "6TH", "SEVENTH": "7TH", "EIGHTH": "8TH", "NINTH": "9TH", "TENTH": "10TH",
+}
+
+# Apartment, suite and lot designators all collapse to UNIT: "Apt 2",
+# "Unit 2" and "#2" are the same door for deduplication purposes.
+UNIT_DESIGNATORS = {
+    "#", "APARTMENT", "APT", "UNIT", "SUITE", "STE", "LOT", "SPACE", "SPC",
+    "ROOM", "RM", "BUILDING", "BLDG", "FLOOR", "FL", "TRLR",
+}
+
+US_STATES = frozenset({
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN",
+    "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH",
+    "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT",
+    "VT", "VA", "WA", "WV", "WI", "WY", "PR", "VI", "GU",
+})
+
+_ZIP4_RE = re.compile(r"\b(\d{5})-\d{4}\b")
+_PUNCTUATION_RE = re.compile(r"[^A-Z0-9# ]+")
+
+
+@dataclass(frozen=True)
+class NormalizedAddress:
+    street: str                 # "123 N MAIN ST"
+    unit: Optional[str] = None  # "2"
+    zip: Optional[str] = None   # five-digit ZIP when one was present
+    city: Optional[str] = None  # "PARK HILLS"
+    state: Optional[str] = None # "MO"
+
+    @property
+    def locality(self) -> Optional[str]:
+        """ZIP when known, else whatever of city and state was given."""
+        return self.zip or " ".join(p for p in (self.city, self.state) if p) or None
+
+    @property
+    def key(self) -> str:
+        """Street line, unit and locality — the string that is hashed and indexed."""
+        parts = [self.street]
+        if self.unit:
+            parts += ["UNIT", self.unit]
+        if self.locality:
+            parts.append(self.locality)
+        return " ".join(parts)
+
+    @property
+    def house_number(self) -> Optional[str]:
+        head = self.street.split(" ", 1)[0]
+        return head if head[:1].isdigit() else None
+
+
+def _tokens(text: str) -> list[str]:
+    return _PUNCTUATION_RE.sub(" ", text.replace("#", " # ")).split()
+
+
+def _is_suffix(token: str) -> bool:
+    return token in STREET_SUFFIXES or token in _CANONICAL_SUFFIXES
+
+
+def _street_end(words: list[str], limit: int) -> Optional[int]:
+    """Index just past the street line (suffix, post-directional, unit) within ``words[:limit]``."""
+    start = 1 if words and words[0][:1].isdigit() else 0
+    suffixes = [i for i in range(start + 1, limit) if _is_suffix(words[i])]
+    if not suffixes:
+        return None
+    end = suffixes[-1] + 1
+    if end < limit and (words[end] in DIRECTIONALS or words[end] in _CANONICAL_DIRECTIONALS):
+        end += 1
+    if end < limit and words[end] in UNIT_DESIGNATORS:
+        end = min(end + 2, limit)
+    return end
+
+
+def parse_address(address: Optional[str]) -> Optional[NormalizedAddress]:
+    """Canonicalize one free-text address, or None when nothing is left.
+
+    A trailing ZIP and state are peeled off, and whatever follows the
+    street suffix (or the first comma) is the city, so "123 Main St,
+    Orlando, FL 32801" and "123 Main St Orlando FL 32801" parse alike. The
+    key ends in the ZIP, or in the city and state when there is no ZIP, so
+    the same street in two cities never shares a key.
+    """
+    text = _ZIP4_RE.sub(r"\1", " ".join(str(address or "").upper().split()))
+    if not text:
+        return None
+    street_part, comma, locality = text.partition(",")
+    words = _tokens(street_part)
+    boundary = len(words)
+    words += _tokens(locality)
+
+    zip_code = state = None
+    if len(words) > 1 and re.fullmatch(r"\d{5}", words[-1]):
+        zip_code = words.pop()
+    if len(words) > 2 and words[-1] in US_STATES:
+        state = words.pop()
+    limit = min(boundary, len(words)) if comma else len(words)
+    end = _street_end(words, limit)
+    if end is None or (comma and end < limit and words[end] in UNIT_DESIGNATORS):
+        end = limit
+    tokens, city = words[:end], " ".join(words[end:]) or None
+
+    unit = None
+    for i, token in enumerate(tokens):
+        if token in UNIT_DESIGNATORS and i >= 2:
+            unit = " ".join(tokens[i + 1:]).replace("#", "").strip() or None
+            tokens = tokens[:i]
+            break
+
+    tokens = [ORDINALS.get(t, t) for t in tokens]
+    # Pre-directional only when a street name still follows ("123 North St"
+    # keeps NORTH as the name); suffix and post-directional at the end.
+    start = 1 if tokens and tokens[0][:1].isdigit() else 0
+    if len(tokens) - start >= 3 and tokens[start] in DIRECTIONALS:
+        tokens[start] = DIRECTIONALS[tokens[start]]
+    post = tokens[-1] if tokens else ""
+    if len(tokens) - start >= 3 and (post in DIRECTIONALS or post in _CANONICAL_DIRECTIONALS) and (
+        tokens[-2] in STREET_SUFFIXES or tokens[-2] in _CANONICAL_SUFFIXES
+    ):
+        tokens[-1] = DIRECTIONALS.get(post, post)
+        tokens[-2] = STREET_SUFFIXES.get(tokens[-2], tokens[-2])
+    elif len(tokens) - start >= 2 and tokens[-1] in STREET_SUFFIXES:
+        tokens[-1] = STREET_SUFFIXES[tokens[-1]]
+
+    street = " ".join(tokens)
+    if not street:
+        return None
+    return NormalizedAddress(street=street, unit=unit, zip=zip_code, city=city, state=state)
+
+
+def normalize_address(address: Optional[str]) -> Optional[str]:
+    """Canonical key for ``address`` (see parse_address), or None if blank."""
+    parsed = parse_address(address)
+    return parsed.key if parsed else None
+
+
+def address_hash(address: Optional[str]) -> Optional[str]:
+    """Stable digest of the normalized key, stored in ``address_hash`` columns."""
+    key = normalize_address(address)
+    return hashlib.sha1(key.encode()).hexdigest() if key else None
+
+
+def trigrams(text: str) -> set[str]:
+    """pg_trgm-compatible trigram set: each word padded "  word "."""
+    grams: set[str] = set()
+    for word in re.findall(r"[A-Za-z0-9]+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a: str, b: str) -> float:
+    """Trigram Jaccard similarity, matching pg_trgm's ``similarity()``."""
+    ga, gb = trigrams(a), trigrams(b)
+    if not ga or not gb:
+        return 0.0
+    return len(ga & gb) / len(ga | gb)
+
+
+class AddressIndex:
+    """Exact (hash) and fuzzy (trigram) lookup over normalized addresses.
+
+    ``add`` is O(length of the address); ``get`` is a single dict lookup;
+    ``search`` only scores records sharing at least one trigram with the
+    query. Candidates whose house number differs from the query's are
+    ranked below those that agree, since a different number is a different
+    parcel no matter how similar the street.
+    """
+
+    def __init__(self, records: Iterable[tuple[Any, Optional[str]]] = ()) -> None:
+        self._exact: dict[str, list[Any]] = {}
+        self._ids: list[Any] = []
+        self._parsed: list[NormalizedAddress] = []
+        self._gram_counts: list[int] = []
+        self._postings: dict[str, list[int]] = {}
+        for record_id, address in records:
+            self.add(record_id, address)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, record_id: Any, address: Optional[str]) -> Optional[str]:
+        """Index one record; returns its normalized key (None if unusable)."""
+        parsed = parse_address(address)
+        if parsed is None:
+            return None
+        position = len(self._ids)
+        self._ids.append(record_id)
+        self._parsed.append(parsed)
+        self._exact.setdefault(parsed.key, []).append(record_id)
+        grams = trigrams(parsed.key)
+        self._gram_counts.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(position)
+        return parsed.key
+
+    def get(self, address: Optional[str]) -> list[Any]:
+        """Record ids whose normalized key equals ``address``'s."""
+        key = normalize_address(address)
+        return list(self._exact.get(key, ())) if key else []
+
+    def search(self, address: Optional[str], limit: int = 10,
+               min_score: float = 0.3) -> list[dict[str, Any]]:
+        """Ranked fuzzy matches: ``[{"id", "address", "score"}, ...]``."""
+        parsed = parse_address(address)
+        if parsed is None:
+            return []
+        query_grams = trigrams(parsed.key)
+        shared: Counter[int] = Counter()
+        for gram in query_grams:
+            shared.update(self._postings.get(gram, ()))
+
+        number = parsed.house_number
+        ranked = []
+        for position, overlap in shared.items():
+            score = overlap / (len(query_grams) + self._gram_counts[position] - overlap)
+            if score < min_score:
+                continue
+            candidate = self._parsed[position]
+            number_ok = number is None or candidate.house_number in (None, number)
+            ranked.append((number_ok, score, position))
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [
+            {"id": self._ids[position], "address": self._parsed[position].key, "score": round(score, 4)}
+            for _, score, position in ranked[:limit]
+        ]
+
+
+__all__ = [
+    "AddressIndex",
+    "NormalizedAddress",
+    "address_hash",
+    "normalize_address",
+    "parse_address",
+    "similarity",
+    "trigrams",
+]
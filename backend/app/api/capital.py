@@ -1,16 +1,36 @@
-"""Capital Engine API — Investor CRUD, available/deployed capital, distributions, returns."""
+"""Capital Engine API — Investor CRUD, available/deployed capital, distributions, returns, ledger."""
 from __future__ import annotations
 
+import sys
+from datetime import date, datetime
+from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from app.cache import ttl_cache
 from app.db import get_supabase
+from app.summary import (
+    SUMMARY_TTL_SECONDS,
+    bucket_rows,
+    bucket_totals,
+    check_period,
+    closing_buckets,
+    optional_rpc,
+    rpc_deployed,
+)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
 
 router = APIRouter(prefix="/api/capital", tags=["Capital Engine"])
 
+# Order matters: the waterfall pays capital back first, then pref, then profit.
+DISTRIBUTION_TYPES = ("Return of Capital", "Preferred Return", "Profit Share")
+
 
 # ─── Models ──────────────────────────────────────────────────────────────────
 
@@ -53,6 +73,31 @@ class DistributionCreate(BaseModel):
     status: str = "Pending"
 
 
+class WaterfallTierInput(BaseModel):
+    lp_split: float = Field(gt=0, le=1)
+    hurdle: Optional[float] = None      # annual LP profit rate ending the tier; omit on the last tier
+
+
+class WaterfallRun(BaseModel):
+    close_from: date
+    close_to: date
+    deal_ids: list[UUID] = []           # restrict the run to these deals
+    preferred_return: float = 0.08      # used where an investor has no preferred_return
+    catch_up: float = 0.0
+    tiers: list[WaterfallTierInput] = [WaterfallTierInput(lp_split=0.70)]
+    distribution_date: Optional[date] = None
+    dry_run: bool = False
+
+
+class LedgerEntryCreate(BaseModel):
+    entry_type: str         # deposit | commit | release | fund | return | distribute | withdraw
+    investor_id: UUID
+    amount: float = Field(gt=0)
+    deal_id: Optional[UUID] = None
+    effective_at: Optional[datetime] = None
+    memo: Optional[str] = None
+
+
 # ─── Capital Summary Helpers ──────────────────────────────────────────────────
 
 def _sum_field(rows: list[dict], field: str) -> float:
@@ -78,26 +123,38 @@ def available_capital():
 
 
 @router.get("/deployed")
-def deployed_capital():
-    """Capital currently deployed across open deals."""
+@ttl_cache(seconds=SUMMARY_TTL_SECONDS)
+def deployed_capital(period: Optional[str] = None):
+    """Capital currently deployed across open deals.
+
+    Totals come from the ``capital_deployed_summary`` RPC; ``period``
+    (month | quarter | year) adds per-bucket amounts. Row-level detail lives
+    on /commitments and the allocations table, not here.
+    """
+    check_period(period)
     db = get_supabase()
-    allocs = db.table("allocations").select(
-        "allocation_id, deal_id, investor_id, amount, roi, allocated_at"
-    ).execute().data or []
-
-    commits = db.table("commitments").select(
-        "commitment_id, investor_id, deal_id, amount, status"
-    ).eq("status", "Funded").execute().data or []
-
-    total_alloc  = _sum_field(allocs, "amount")
-    total_commit = _sum_field(commits, "amount")
-
-    return {
-        "total_deployed_allocations": round(total_alloc, 2),
-        "total_committed_funded": round(total_commit, 2),
-        "allocations": allocs,
-        "commitments": commits,
+    summary = optional_rpc(db, "capital_deployed_summary", {"p_period": period})
+    if summary:
+        return summary
+
+    allocs = db.table("allocations").select("amount, allocated_at").execute().data or []
+    commits = db.table("commitments").select("amount, created_at").eq("status", "Funded").execute().data or []
+    result = {
+        "total_deployed_allocations": round(_sum_field(allocs, "amount"), 2),
+        "allocation_count": len(allocs),
+        "total_committed_funded": round(_sum_field(commits, "amount"), 2),
+        "funded_commitment_count": len(commits),
+        "by_period": [],
     }
+    if period:
+        buckets = bucket_totals(allocs, "allocated_at", period, {"amount": "deployed_allocations"})
+        for bucket, totals in bucket_totals(commits, "created_at", period, {"amount": "committed_funded"}).items():
+            buckets.setdefault(bucket, {}).update(totals)
+        for totals in buckets.values():
+            totals.setdefault("deployed_allocations", 0.0)
+            totals.setdefault("committed_funded", 0.0)
+        result["by_period"] = bucket_rows(buckets)
+    return result
 
 
 @router.get("/distributions")
@@ -129,19 +186,157 @@ def list_distributions(
 @router.post("/distributions", status_code=201)
 def create_distribution(payload: DistributionCreate):
     db = get_supabase()
-    valid_types = {"Preferred Return", "Profit Share", "Return of Capital"}
-    if payload.type not in valid_types:
-        raise HTTPException(400, f"type must be one of: {valid_types}")
+    if payload.type not in DISTRIBUTION_TYPES:
+        raise HTTPException(400, f"type must be one of: {', '.join(DISTRIBUTION_TYPES)}")
     result = db.table("distributions").insert(payload.model_dump()).execute()
     if not result.data:
         raise HTTPException(500, "Failed to create distribution")
     return result.data[0]
 
 
+@router.post("/distributions/waterfall", status_code=201)
+def run_distribution_waterfall(payload: WaterfallRun):
+    """Compute every investor's distribution for deals closed in a window.
+
+    Each closed deal's capital recovered plus net profit runs through the
+    waterfall (return of capital, preferred return, optional GP catch-up,
+    hurdle tiers) for all funded commitments at once, and the resulting
+    Pending distributions are inserted in a single write. A deal with any
+    existing distribution is skipped so a run can't pay twice; that includes
+    a mid-hold payment such as a preferred-return distribution, since the
+    waterfall can't net it out. ``skipped_deals`` lists those deals and
+    ``skipped_for`` the distribution types found on each. An investor's own
+    ``preferred_return`` (0 included) overrides the run's default.
+    """
+    import numpy as np
+
+    from dynasty_os.engines.waterfall_kernel import WaterfallTerms, WaterfallTier, run_waterfall
+
+    terms = WaterfallTerms(
+        preferred_return=payload.preferred_return,
+        catch_up=payload.catch_up,
+        tiers=tuple(WaterfallTier(lp_split=t.lp_split, hurdle=t.hurdle) for t in payload.tiers),
+    )
+    try:
+        terms.validate()
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+
+    db = get_supabase()
+    closings = db.table("closings").select(
+        "property_id, sale_price, net_profit, capital_recovered, close_date"
+    ).gte("close_date", payload.close_from.isoformat()).lte(
+        "close_date", payload.close_to.isoformat()
+    ).execute().data or []
+    property_ids = sorted({c["property_id"] for c in closings if c.get("property_id")})
+    if not property_ids:
+        return {"deals": 0, "positions": 0, "skipped_deals": [], "skipped_for": {}, "inserted": 0, "distributions": []}
+
+    q = db.table("deals").select("deal_id, property_id, created_at").in_("property_id", property_ids)
+    if payload.deal_ids:
+        q = q.in_("deal_id", [str(d) for d in payload.deal_ids])
+    deal_for_property: dict[str, str] = {}
+    for deal in sorted(q.execute().data or [], key=lambda d: d.get("created_at") or ""):
+        deal_for_property[deal["property_id"]] = deal["deal_id"]   # latest deal on the property wins
+
+    skipped_for: dict[str, list[str]] = {}
+    for r in db.table("distributions").select("deal_id, type").in_(
+        "deal_id", list(deal_for_property.values()) or [""]
+    ).execute().data or []:
+        types = skipped_for.setdefault(r["deal_id"], [])
+        if r.get("type") not in types:
+            types.append(r.get("type"))
+    already_paid = set(skipped_for)
+    deal_ids = sorted(set(deal_for_property.values()) - already_paid)
+    positions = db.table("commitments").select(
+        "investor_id, deal_id, amount, created_at, investors(preferred_return)"
+    ).in_("deal_id", deal_ids or [""]).eq("status", "Funded").execute().data or []
+    positions = [p for p in positions if float(p.get("amount") or 0) > 0]
+    deal_ids = sorted({p["deal_id"] for p in positions})
+    if not deal_ids:
+        return {"deals": 0, "positions": 0, "skipped_deals": sorted(already_paid), "skipped_for": skipped_for,
+                "inserted": 0, "distributions": []}
+
+    slot = {deal_id: i for i, deal_id in enumerate(deal_ids)}
+    deal_index = np.array([slot[p["deal_id"]] for p in positions])
+    capital = np.array([float(p["amount"]) for p in positions])
+    investor_pref = [(p.get("investors") or {}).get("preferred_return") for p in positions]
+    pref = np.array([float(payload.preferred_return if r is None else r) for r in investor_pref])
+
+    recovered = np.zeros(len(deal_ids))
+    profit = np.zeros(len(deal_ids))
+    has_recovered = np.zeros(len(deal_ids), dtype=bool)
+    close_date: dict[int, date] = {}
+    for c in closings:
+        i = slot.get(deal_for_property.get(c.get("property_id")))
+        if i is None:
+            continue
+        if c.get("capital_recovered") is not None:
+            recovered[i] += float(c["capital_recovered"])
+            has_recovered[i] = True
+        profit[i] += float(c.get("net_profit") or 0)
+        closed = date.fromisoformat(str(c["close_date"])[:10])
+        close_date[i] = max(close_date.get(i, closed), closed)
+    deal_capital = np.bincount(deal_index, weights=capital, minlength=len(deal_ids))
+    distributable = np.where(has_recovered, recovered, deal_capital) + profit
+
+    funded = [date.fromisoformat(str(p.get("created_at") or close_date[slot[p["deal_id"]]])[:10]) for p in positions]
+    years = np.array([
+        max((close_date[slot[p["deal_id"]]] - start).days, 0) / 365.25 for p, start in zip(positions, funded)
+    ])
+
+    result = run_waterfall(distributable, deal_index, capital, terms, preferred_return=pref, years=years)
+
+    paid_on = (payload.distribution_date or date.today()).isoformat()
+    rows = [
+        {
+            "investor_id": p["investor_id"],
+            "deal_id": p["deal_id"],
+            "amount": round(float(amount), 2),
+            "distribution_date": paid_on,
+            "type": kind,
+            "status": "Pending",
+        }
+        for kind, column in zip(DISTRIBUTION_TYPES, (result.return_of_capital, result.preferred_return, result.profit_share))
+        for p, amount in zip(positions, column)
+        if amount >= 0.005
+    ]
+    inserted = 0
+    if rows and not payload.dry_run:
+        inserted = len(db.table("distributions").insert(rows).execute().data or [])
+
+    return {
+        "deals": len(deal_ids),
+        "positions": len(positions),
+        "skipped_deals": sorted(already_paid),
+        "skipped_for": skipped_for,
+        "totals": {
+            "return_of_capital": round(float(result.return_of_capital.sum()), 2),
+            "preferred_return": round(float(result.preferred_return.sum()), 2),
+            "profit_share": round(float(result.profit_share.sum()), 2),
+            "gp_catch_up": round(float(result.gp_catch_up.sum()), 2),
+            "gp_carry": round(float(result.gp_carry.sum()), 2),
+        },
+        "dry_run": payload.dry_run,
+        "inserted": inserted,
+        "distributions": rows,
+    }
+
+
 @router.get("/returns")
-def capital_returns():
-    """Portfolio-level return metrics across all closings."""
+@ttl_cache(seconds=SUMMARY_TTL_SECONDS)
+def capital_returns(period: Optional[str] = None):
+    """Portfolio-level return metrics across all closings.
+
+    Served by the ``capital_returns_summary`` RPC; ``period`` adds closing
+    totals per month, quarter or year.
+    """
+    check_period(period)
     db = get_supabase()
+    summary = optional_rpc(db, "capital_returns_summary", {"p_period": period})
+    if summary:
+        return summary
+
     closings = db.table("closings").select("net_profit, capital_recovered, sale_price, close_date").execute().data or []
     allocs   = db.table("allocations").select("amount, roi").execute().data or []
 
@@ -162,7 +357,91 @@ def capital_returns():
         "total_deployed": round(total_deployed, 2),
         "avg_roi": round(avg_roi, 4),
         "closed_deals": len(closings),
+        "by_period": closing_buckets(closings, period),
+    }
+
+
+# ── Capital Ledger ────────────────────────────────────────────────────────────
+
+def _ledger_balances(raw: Optional[dict]) -> dict[str, float]:
+    from dynasty_os.engines.capital_ledger import ACCOUNTS
+
+    raw = raw or {}
+    return {account: round(float(raw.get(account) or 0), 2) for account in ACCOUNTS}
+
+
+def _ledger_rpc(db, function: str, params: dict) -> Optional[dict]:
+    data = optional_rpc(db, function, params, fallback="ledger routes return 503")
+    if not rpc_deployed(function):
+        raise HTTPException(503, "Capital ledger not deployed (migration 016)")
+    return data
+
+
+@router.get("/ledger/balances")
+def ledger_balances(
+    investor_id: Optional[UUID] = None,
+    deal_id: Optional[UUID] = None,
+    as_of: Optional[datetime] = None,
+):
+    """Ledger balance per account for an investor, a deal, both, or everyone.
+
+    Current balances are read from the trigger-maintained running totals;
+    ``as_of`` sums postings up to that instant instead.
+    """
+    params = {
+        "p_investor_id": str(investor_id) if investor_id else None,
+        "p_deal_id": str(deal_id) if deal_id else None,
     }
+    db = get_supabase()
+    if as_of:
+        raw = _ledger_rpc(db, "capital_balance_as_of", {"p_as_of": as_of.isoformat(), **params})
+    else:
+        raw = _ledger_rpc(db, "capital_balance", params)
+    return {
+        "investor_id": params["p_investor_id"],
+        "deal_id": params["p_deal_id"],
+        "as_of": as_of.isoformat() if as_of else None,
+        "balances": _ledger_balances(raw),
+    }
+
+
+@router.get("/ledger/entries")
+def list_ledger_entries(
+    investor_id: Optional[UUID] = None,
+    deal_id: Optional[UUID] = None,
+    limit: int = Query(default=50, le=200),
+    offset: int = 0,
+):
+    db = get_supabase()
+    q = db.table("capital_journal").select("*")
+    if investor_id:
+        q = q.eq("investor_id", str(investor_id))
+    if deal_id:
+        q = q.eq("deal_id", str(deal_id))
+    result = q.order("effective_at", desc=True).order("entry_id", desc=True).range(offset, offset + limit - 1).execute()
+    return {"entries": result.data or [], "offset": offset}
+
+
+@router.post("/ledger/entries", status_code=201)
+def create_ledger_entry(payload: LedgerEntryCreate):
+    """Append a manual journal entry (deposits, withdrawals, corrections).
+
+    Commitment and distribution writes post their own entries; the journal
+    is append-only, so a mistake is undone with an opposite entry.
+    """
+    from dynasty_os.engines.capital_ledger import validate_entry
+
+    try:
+        validate_entry(payload.entry_type, payload.amount, payload.deal_id)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+
+    row = payload.model_dump(mode="json", exclude_none=True)
+    db = get_supabase()
+    result = db.table("capital_journal").insert(row).execute()
+    if not result.data:
+        raise HTTPException(500, "Failed to record ledger entry")
+    return result.data[0]
 
 
 # ── Investor CRUD ─────────────────────────────────────────────────────────────
@@ -210,6 +489,7 @@ def create_commitment(payload: CommitmentCreate):
     result = db.table("commitments").insert(payload.model_dump()).execute()
     if not result.data:
         raise HTTPException(500, "Failed to create commitment")
+    deployed_capital.cache_clear()
     return result.data[0]
 
 
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -18,6 +20,19 @@ if str(_PROJECT_ROOT) not in sys.path:
 
 router = APIRouter(prefix="/api/deal", tags=["Deal Engine"])
 
+# Investors eligible for new deals, same set as /api/capital/available.
+MATCHABLE_INVESTOR_STATUSES = ["Warm", "Meeting", "Committed", "Funded", "Repeat", "Strategic Partner"]
+OPEN_DEAL_STATUSES = ["PENDING", "GO", "GO_WITH_CONDITIONS", "RENEGOTIATE"]
+INVESTOR_INDEX_RELOAD_SECONDS = 60
+_DEAL_MATCH_SELECT = (
+    "deal_id, asking_price, repairs, status, properties(city, county, state, zip), "
+    "risk_scores(risk_level, created_at), exit_models(flip_profit)"
+)
+
+_index_lock = threading.Lock()
+_index_loaded_at = 0.0
+_index = None
+
 
 # ─── Models ──────────────────────────────────────────────────────────────────
 
@@ -470,6 +485,52 @@ def _sync_to_disposition(db, deal: dict[str, Any]) -> tuple[Optional[dict], Opti
         return None, f"Disposition sync failed: {exc}"
 
 
+def _investor_index(db, force: bool = False):
+    """Shared InvestorMatchIndex over matchable investors, rebuilt every minute."""
+    global _index, _index_loaded_at
+    from dynasty_os.engines.investor_matching import InvestorMatchIndex, InvestorProfile
+
+    with _index_lock:
+        if force or _index is None or time.monotonic() - _index_loaded_at >= INVESTOR_INDEX_RELOAD_SECONDS:
+            rows = db.table("investors").select(
+                "investor_id, investor_name, available_capital, markets, risk_profile, "
+                "investment_type, preferred_return, status"
+            ).in_("status", MATCHABLE_INVESTOR_STATUSES).execute().data or []
+            _index = InvestorMatchIndex(InvestorProfile.from_row(r) for r in rows)
+            _index_loaded_at = time.monotonic()
+    return _index
+
+
+def _first(embedded: Any) -> dict:
+    """PostgREST embeds one-to-many relations as lists; take the first row."""
+    if isinstance(embedded, list):
+        return embedded[0] if embedded else {}
+    return embedded or {}
+
+
+def _latest(embedded: Any) -> dict:
+    """The most recently created row of an embedded relation."""
+    if isinstance(embedded, list):
+        return max(embedded, key=lambda r: r.get("created_at") or "", default={})
+    return embedded or {}
+
+
+def _deal_profile(row: dict):
+    """DealProfile for matching from a deals row selected with _DEAL_MATCH_SELECT."""
+    from dynasty_os.engines.investor_matching import DealProfile, location_keys
+
+    prop = _first(row.get("properties"))
+    capital = float(row.get("asking_price") or 0) + float(row.get("repairs") or 0)
+    profit = _first(row.get("exit_models")).get("flip_profit")
+    return DealProfile.from_row({
+        "deal_id": row["deal_id"],
+        "capital_needed": capital,
+        "markets": location_keys(prop.get("city"), prop.get("county"), prop.get("state"), prop.get("zip")),
+        "risk_level": _latest(row.get("risk_scores")).get("risk_level"),
+        "projected_return": float(profit) / capital if profit is not None and capital > 0 else None,
+    })
+
+
 # ─── Routes ──────────────────────────────────────────────────────────────────
 
 @router.get("")
@@ -497,6 +558,28 @@ def create_deal(payload: DealCreate):
     return result.data[0]
 
 
+@router.get("/investor-matches")
+def match_open_deals(
+    limit: int = Query(default=10, ge=1, le=100),
+    deal_limit: int = Query(default=200, ge=1, le=1000),
+    refresh: bool = False,
+):
+    """Ranked investor matches for every open deal in one pass over the index."""
+    db = get_supabase()
+    index = _investor_index(db, force=refresh)
+    deals = db.table("deals").select(_DEAL_MATCH_SELECT).in_(
+        "status", OPEN_DEAL_STATUSES
+    ).order("created_at", desc=True).limit(deal_limit).execute().data or []
+    matches = index.match_all((_deal_profile(d) for d in deals), limit=limit)
+    return {
+        "deals": [
+            {"deal_id": deal_id, "matches": [m.to_dict() for m in ranked]}
+            for deal_id, ranked in matches.items()
+        ],
+        "index": index.get_metrics(),
+    }
+
+
 @router.get("/{deal_id}")
 def get_deal(deal_id: UUID):
     db = get_supabase()
@@ -591,35 +674,27 @@ def get_deal_intelligence(deal_id: UUID):
 
 
 @router.get("/{deal_id}/investor-matches")
-def get_investor_matches(deal_id: UUID):
-    """Candidate investors for the Approve-flow picker, using the same
-    matching rule as InvestorEngine (available_capital >= 20% of asking price)."""
+def get_investor_matches(deal_id: UUID, refresh: bool = False):
+    """Candidate investors for the Approve-flow picker, best fit first.
+
+    Matches come from the InvestorMatchIndex: enough capacity to cover 20%
+    of the capital need, a compatible market and risk profile, ranked by
+    fit score (see dynasty_os.engines.investor_matching).
+    """
     db = get_supabase()
-    deal_row = db.table("deals").select("*").eq("deal_id", str(deal_id)).single().execute()
-    if not deal_row.data:
+    deal_row = db.table("deals").select(_DEAL_MATCH_SELECT).eq("deal_id", str(deal_id)).maybe_single().execute()
+    if not deal_row or not deal_row.data:
         raise HTTPException(404, "Deal not found")
 
-    investors_rows = db.table("investors").select("*").execute()
-    investors = investors_rows.data or []
-
-    from dynasty_os.engines.deal_engine import DealData, InvestorEngine
-
-    deal = DealData(
-        deal_id=str(deal_id),
-        property_id=deal_row.data.get("property_id", ""),
-        seller=deal_row.data.get("seller", ""),
-        asking_price=float(deal_row.data.get("asking_price") or 0),
-        arv=float(deal_row.data.get("arv") or 0),
-        repairs=float(deal_row.data.get("repairs") or 0),
-    )
-    exit_row = db.table("exit_models").select("flip_profit").eq("deal_id", str(deal_id)).maybe_single().execute()
-    profit = (exit_row.data or {}).get("flip_profit") or 0
-
-    match = InvestorEngine().process(deal, profit, investors)
-    matched_ids = set(match["investors"])
+    investors = db.table("investors").select("*").execute().data or []
+    ranked = _investor_index(db, force=refresh).match(_deal_profile(deal_row.data), limit=len(investors) or 1)
+    by_id = {inv.get("investor_id"): inv for inv in investors}
     return {
         "deal_id": str(deal_id),
-        "matched_investors": [inv for inv in investors if inv.get("investor_id") in matched_ids],
+        "matched_investors": [
+            {**by_id[m.investor_id], "fit_score": m.fit_score} for m in ranked if m.investor_id in by_id
+        ],
+        "matches": [m.to_dict() for m in ranked],
         "all_investors": investors,
     }
 
@@ -1,7 +1,16 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+import sys
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import Optional
 
+import numpy as np
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
 router = APIRouter(prefix="/api/engines", tags=["engines"])
 
 
@@ -155,15 +164,50 @@ class LeadScoringResult(BaseModel):
     priority: str
     reasoning: list[str]
 
+
+class LeadScoringBatchInput(BaseModel):
+    leads: list[LeadScoringInput]
+    lead_ids: Optional[list[str]] = None
+
+
+class LeadScoringBatchResult(BaseModel):
+    count: int
+    lead_ids: Optional[list[str]] = None
+    score: list[int]
+    grade: list[str]
+    priority: list[str]
+
+
+HIGH_MOTIVATION = frozenset({"divorce", "probate", "foreclosure", "bankruptcy", "death", "eviction", "behind"})
+
+# Threshold ladders: (bounds, points per bin). Equity bins are ">= bound",
+# timeline and asking-vs-ARV bins are "<= bound"; a missing value scores 0.
+EQUITY_LADDER = ((0.20, 0.40), (-10, 10, 20))
+TIMELINE_LADDER = ((30, 90), (15, 5, 0))
+ASKING_VS_ARV_LADDER = ((0.65, 0.75), (15, 5, -15))
+
+GRADE_BOUNDS = (40, 60, 80)
+GRADES = ("D", "C", "B", "A")
+PRIORITIES = ("Archive", "Nurture", "Follow-Up", "Priority")
+
+
+def _ladder_points(values: np.ndarray, ladder: tuple, side: str) -> np.ndarray:
+    bounds, points = ladder
+    bins = np.searchsorted(np.asarray(bounds), values, side=side)
+    return np.where(np.isnan(values), 0, np.asarray(points)[np.minimum(bins, len(points) - 1)])
+
+
+def _has_high_motivation(text: Optional[str]) -> bool:
+    return not HIGH_MOTIVATION.isdisjoint(text.lower().split())
+
+
 @router.post("/lead-score", response_model=LeadScoringResult)
 def score_lead(payload: LeadScoringInput) -> LeadScoringResult:
     score = 50
     reasoning = []
 
-    HIGH_MOTIVATION = {"divorce", "probate", "foreclosure", "bankruptcy", "death", "eviction", "behind"}
     if payload.motivation:
-        words = payload.motivation.lower().split()
-        if any(w in HIGH_MOTIVATION for w in words):
+        if _has_high_motivation(payload.motivation):
             score += 20
             reasoning.append("High-motivation keyword detected")
         else:
@@ -194,6 +238,44 @@ def score_lead(payload: LeadScoringInput) -> LeadScoringResult:
     return LeadScoringResult(score=score, grade=grade, priority=priority, reasoning=reasoning)
 
 
+@router.post("/lead-score/batch", response_model=LeadScoringBatchResult)
+def score_leads_batch(payload: LeadScoringBatchInput) -> LeadScoringBatchResult:
+    """Score many leads at once; same rules as /lead-score, returned as columns.
+
+    Each threshold ladder is one searchsorted over the whole column, so
+    re-grading the full lead table is a single request. Reasoning strings
+    are omitted — call /lead-score for one lead's explanation.
+    """
+    leads = payload.leads
+    if payload.lead_ids is not None and len(payload.lead_ids) != len(leads):
+        raise HTTPException(400, "lead_ids must have one entry per lead")
+
+    def column(name: str) -> np.ndarray:
+        return np.array([getattr(l, name) for l in leads], dtype=float)
+
+    motivated = np.array([bool(l.motivation) and _has_high_motivation(l.motivation) for l in leads], dtype=bool)
+    flags = np.array([(l.vacant, l.tax_delinquent, l.absentee_owner) for l in leads], dtype=bool).reshape(-1, 3)
+
+    score = (
+        50
+        + 20 * motivated
+        + _ladder_points(column("equity_pct"), EQUITY_LADDER, side="right")
+        + _ladder_points(column("timeline_days"), TIMELINE_LADDER, side="left")
+        + _ladder_points(column("asking_vs_arv"), ASKING_VS_ARV_LADDER, side="left")
+        + flags @ np.array([10, 10, 5])
+    )
+    score = np.clip(score, 0, 100).astype(int)
+    tier = np.searchsorted(np.asarray(GRADE_BOUNDS), score, side="right")
+
+    return LeadScoringBatchResult(
+        count=len(leads),
+        lead_ids=payload.lead_ids,
+        score=score.tolist(),
+        grade=np.asarray(GRADES)[tier].tolist(),
+        priority=np.asarray(PRIORITIES)[tier].tolist(),
+    )
+
+
 # ─── CAPITAL ALLOCATION ENGINE ────────────────────────────────────────────────
 
 class DealForAllocation(BaseModel):
@@ -210,26 +292,103 @@ class AllocationResult(BaseModel):
     recommended: bool
     reasoning: str
 
+class CapitalPool(BaseModel):
+    pool_id: str
+    capital: float = Field(ge=0)
+    deal_ids: list[str] = []            # empty = may fund any deal
+
+
+class PoolAllocationInput(BaseModel):
+    deals: list[DealForAllocation]
+    pools: list[CapitalPool]
+    time_budget_ms: int = Field(default=750, ge=10, le=10_000)
+
+
+def _funding_priority(d: DealForAllocation) -> float:
+    risk_penalty = d.risk_score / 100
+    time_penalty = 1 / max(d.timeline_months, 1)
+    return d.roi * d.strategic_value * time_penalty * (1 - risk_penalty * 0.5)
+
+
+def _allocation_reasoning(d: DealForAllocation, funded: bool, source: str = "") -> str:
+    outcome = f"Funded{' from ' + source if source else ''}" if funded else "Not in funded set"
+    return f"ROI={d.roi:.1%}, Risk={d.risk_score}/100, Timeline={d.timeline_months}mo — {outcome}"
+
+
 @router.post("/capital-allocation", response_model=list[AllocationResult])
-def capital_allocation(deals: list[DealForAllocation], available_capital: float = 0) -> list[AllocationResult]:
-    def priority(d: DealForAllocation) -> float:
-        risk_penalty = d.risk_score / 100
-        time_penalty = 1 / max(d.timeline_months, 1)
-        return d.roi * d.strategic_value * time_penalty * (1 - risk_penalty * 0.5)
-
-    scored = sorted(deals, key=priority, reverse=True)
-    results = []
-    remaining = available_capital
-
-    for d in scored:
-        score = priority(d)
-        can_fund = remaining >= d.capital_required
-        if can_fund: remaining -= d.capital_required
-        results.append(AllocationResult(
+def capital_allocation(
+    deals: list[DealForAllocation],
+    available_capital: float = Query(default=0, ge=0),
+    time_budget_ms: int = Query(default=750, ge=10, le=10_000),
+) -> list[AllocationResult]:
+    """Fund the set of deals that maximizes total priority-weighted capital.
+
+    Each deal is worth priority score x capital required; the funded set is
+    the 0/1 knapsack optimum (see dynasty_os.engines.allocation_solver), so
+    capital isn't left idle the way a greedy fill in priority order can.
+    """
+    from dynasty_os.engines.allocation_solver import solve_knapsack
+
+    scores = [_funding_priority(d) for d in deals]
+    result = solve_knapsack(
+        [d.capital_required for d in deals],
+        [score * d.capital_required for score, d in zip(scores, deals)],
+        available_capital,
+        time_budget=time_budget_ms / 1000,
+    )
+    funded = set(result.selected)
+    results = [
+        AllocationResult(
             deal_id=d.deal_id,
             funding_priority_score=round(score, 4),
-            recommended=can_fund,
-            reasoning=f"ROI={d.roi:.1%}, Risk={d.risk_score}/100, Timeline={d.timeline_months}mo — {'Funded' if can_fund else 'Insufficient capital'}",
-        ))
-
+            recommended=i in funded,
+            reasoning=_allocation_reasoning(d, i in funded),
+        )
+        for i, (d, score) in enumerate(zip(deals, scores))
+    ]
     return sorted(results, key=lambda r: r.funding_priority_score, reverse=True)
+
+
+@router.post("/capital-allocation/pools")
+def capital_allocation_pools(payload: PoolAllocationInput) -> dict:
+    """Allocate deals across several investor pools (each deal from at most one).
+
+    Returns per-deal results, per-pool deployment and the solver's value,
+    upper bound and gap (0 when the plan is proven optimal).
+    """
+    from dynasty_os.engines.allocation_solver import solve_multi_pool
+
+    deals, pools = payload.deals, payload.pools
+    scores = [_funding_priority(d) for d in deals]
+    eligible = [[not p.deal_ids or d.deal_id in p.deal_ids for p in pools] for d in deals]
+    result = solve_multi_pool(
+        [d.capital_required for d in deals],
+        [score * d.capital_required for score, d in zip(scores, deals)],
+        [p.capital for p in pools],
+        eligible if deals and pools else None,
+        time_budget=payload.time_budget_ms / 1000,
+    )
+
+    deployed = [0.0] * len(pools)
+    allocations = []
+    for i, (d, score) in enumerate(zip(deals, scores)):
+        pool = result.assignments.get(i)
+        if pool is not None:
+            deployed[pool] += d.capital_required
+        allocations.append({
+            "deal_id": d.deal_id,
+            "funding_priority_score": round(score, 4),
+            "recommended": pool is not None,
+            "pool_id": pools[pool].pool_id if pool is not None else None,
+            "reasoning": _allocation_reasoning(d, pool is not None, pools[pool].pool_id if pool is not None else ""),
+        })
+    allocations.sort(key=lambda a: a["funding_priority_score"], reverse=True)
+    return {
+        "allocations": allocations,
+        "pools": [
+            {"pool_id": p.pool_id, "capital": p.capital, "deployed": round(used, 2),
+             "remaining": round(p.capital - used, 2)}
+            for p, used in zip(pools, deployed)
+        ],
+        "solver": {k: v for k, v in result.to_dict().items() if k != "selected"},
+    }
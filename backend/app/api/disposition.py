@@ -1,16 +1,57 @@
-"""Disposition Engine API — Buyers, Offers, Contracts, Closings, Profit."""
+"""Disposition Engine API — Buyers, Offers, Contracts, Closings, Profit, Performance."""
 from __future__ import annotations
 
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from app.api.capital import capital_returns
+from app.cache import ttl_cache
 from app.db import get_supabase
+from app.summary import SUMMARY_TTL_SECONDS, check_period, closing_buckets, optional_rpc
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
 
 router = APIRouter(prefix="/api/disposition", tags=["Disposition Engine"])
 
+BUYER_INDEX_RELOAD_SECONDS = 60
+_BUYER_MATCH_SELECT = "buyer_id, funding_capacity, buyer_score, buyer_criteria(min_price, max_price)"
+ACTIVE_LEASE_STATUSES = ["active", "Active"]
+_HELD_RENTAL_SELECT = (
+    "property_id, monthly_rent, properties(city, state, estimated_arv, acquisition_price, estimated_rent, "
+    "lender_packets(requested_amount, status, created_at))"
+)
+LOAD_PAGE_SIZE = 1000
+
+_buyer_index_lock = threading.Lock()
+_buyer_index_loaded_at = 0.0
+_buyer_index = None
+
+# Days-on-market / price-reduction sketches over disposition_performance
+# (migration 019). Each worker catches up on rows recorded by the others at
+# most every PERFORMANCE_SYNC_SECONDS. Ids are not committed in order, so
+# each catch-up re-reads the last PERFORMANCE_OVERLAP_SECONDS of
+# recorded_at (longer than any insert transaction) and skips ids already
+# counted.
+PERFORMANCE_SYNC_SECONDS = float(os.getenv("PERFORMANCE_SYNC_SECONDS", "5"))
+PERFORMANCE_OVERLAP_SECONDS = float(os.getenv("PERFORMANCE_OVERLAP_SECONDS", "300"))
+PERFORMANCE_COLUMNS = "id, list_price, sale_price, days_on_market, exit_strategy, market, recorded_at"
+_performance_lock = threading.Lock()
+_performance_synced_at = 0.0
+_performance_high_water: Optional[datetime] = None
+_performance_recent: dict[int, datetime] = {}    # ids counted inside the overlap window
+_performance = None
+
 
 # ─── Models ──────────────────────────────────────────────────────────────────
 
@@ -37,6 +78,48 @@ class OfferUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class PropertyPrice(BaseModel):
+    property_id: str
+    price: float
+
+
+class BuyerMatchRun(BaseModel):
+    deal_ids: Optional[list[str]] = None             # incremental: new / edited deals
+    buyer_profile_ids: Optional[list[str]] = None    # incremental: new / edited buyer profiles
+    dry_run: bool = False
+
+
+class PerformanceEvent(BaseModel):
+    property_id: str
+    list_price: float
+    sale_price: float
+    days_on_market: int
+    exit_strategy: str
+    market: Optional[str] = None    # e.g. "Austin, TX"
+
+
+class HeldRental(BaseModel):
+    property_id: str
+    market_value: float
+    monthly_rent: float
+    loan_balance: float = 0
+    annual_taxes: float = 0
+    annual_insurance: float = 0
+    market: Optional[str] = None
+    appreciation: Optional[float] = None
+
+
+class HoldSellRun(BaseModel):
+    assets: list[HeldRental] = []                   # empty: every property with an active lease
+    target_liquidity: float = 0                     # cash the sales must raise
+    hold_years: int = 5
+    reinvestment_rate: float = 0.08                 # return on redeployed sale proceeds
+    appreciation: float = 0.03
+    appreciation_by_market: dict[str, float] = {}   # e.g. {"Park Hills, MO": 0.02}
+    interest_rate: float = 0.07
+    selling_costs_pct: float = 0.06
+
+
 class ClosingCreate(BaseModel):
     contract_id: Optional[str] = None
     property_id: str
@@ -79,6 +162,10 @@ def create_buyer(payload: BuyerCreate):
     result = db.table("buyers").insert(payload.model_dump()).execute()
     if not result.data:
         raise HTTPException(500, "Failed to create buyer")
+    from dynasty_os.engines.buyer_matching import BuyerBands
+    with _buyer_index_lock:
+        if _buyer_index is not None:
+            _buyer_index.add(BuyerBands.from_row(result.data[0]))
     return result.data[0]
 
 
@@ -91,6 +178,176 @@ def get_buyer(buyer_id: UUID):
     return result.data
 
 
+def _buyers_index(db, force: bool = False):
+    """Shared BuyerIntervalIndex over every buyer's criteria bands, rebuilt every minute.
+
+    The index is mutated by create_buyer and by lookups (match_all may
+    rebuild), so callers must hold _buyer_index_lock while using it.
+    """
+    global _buyer_index, _buyer_index_loaded_at
+    from dynasty_os.engines.buyer_matching import BuyerBands, BuyerIntervalIndex
+
+    with _buyer_index_lock:
+        if force or _buyer_index is None or time.monotonic() - _buyer_index_loaded_at >= BUYER_INDEX_RELOAD_SECONDS:
+            rows = db.table("buyers").select(_BUYER_MATCH_SELECT).execute().data or []
+            _buyer_index = BuyerIntervalIndex(BuyerBands.from_row(r) for r in rows)
+            _buyer_index_loaded_at = time.monotonic()
+    return _buyer_index
+
+
+def _with_buyers(db, matches: dict[str, list[str]], limit: int) -> dict[str, list[dict]]:
+    """Replace ranked buyer ids with buyer rows, one query for every property."""
+    wanted = {b for ids in matches.values() for b in ids[:limit]}
+    rows = {}
+    if wanted:
+        found = db.table("buyers").select(
+            "buyer_id, buyer_name, buyer_type, funding_capacity, close_speed_days, buyer_score"
+        ).in_("buyer_id", list(wanted)).execute().data or []
+        rows = {r["buyer_id"]: r for r in found}
+    return {pid: [rows[b] for b in ids[:limit] if b in rows] for pid, ids in matches.items()}
+
+
+@router.get("/properties/{property_id}/buyer-matches")
+def property_buyer_matches(
+    property_id: UUID,
+    price: Optional[float] = Query(default=None, ge=0),
+    limit: int = Query(default=25, ge=1, le=200),
+):
+    """Buyers whose price band and funding capacity cover the property's price (default: estimated ARV)."""
+    db = get_supabase()
+    if price is None:
+        prop = db.table("properties").select("estimated_arv").eq("id", str(property_id)).limit(1).execute().data
+        if not prop:
+            raise HTTPException(404, "Property not found")
+        if prop[0].get("estimated_arv") is None:
+            raise HTTPException(422, "Property has no estimated_arv; pass price")
+        price = float(prop[0]["estimated_arv"])
+    index = _buyers_index(db)
+    with _buyer_index_lock:
+        buyer_ids = index.match(price)
+    buyers = _with_buyers(db, {str(property_id): buyer_ids}, limit)[str(property_id)]
+    return {"property_id": str(property_id), "price": price, "match_count": len(buyer_ids), "buyers": buyers}
+
+
+@router.post("/buyer-matches")
+def bulk_buyer_matches(
+    properties: list[PropertyPrice] = [],
+    limit: int = Query(default=25, ge=1, le=200),
+):
+    """Match many properties in one sweep.
+
+    With an empty body every property in an Active marketing campaign is
+    matched at its estimated ARV.
+    """
+    db = get_supabase()
+    if properties:
+        priced = [(p.property_id, p.price) for p in properties]
+    else:
+        rows = db.table("property_marketing").select(
+            "property_id, properties(estimated_arv)"
+        ).eq("status", "Active").execute().data or []
+        priced = []
+        for r in rows:
+            prop = r.get("properties") or {}
+            if isinstance(prop, list):
+                prop = prop[0] if prop else {}
+            if r.get("property_id") and prop.get("estimated_arv") is not None:
+                priced.append((r["property_id"], float(prop["estimated_arv"])))
+    index = _buyers_index(db)
+    with _buyer_index_lock:
+        matches = index.match_all(dict(priced).items())
+    return {
+        "properties": len(priced),
+        "matched_properties": len(matches),
+        "match_counts": {pid: len(ids) for pid, ids in matches.items()},
+        "matches": _with_buyers(db, matches, limit),
+    }
+
+
+@router.post("/buyer-matches/generate")
+def generate_buyer_matches(payload: BuyerMatchRun):
+    """Score open deals against active buyer profiles into dynasty.buyer_matches.
+
+    Without ids every open deal is scored against every active profile;
+    with ``deal_ids`` or ``buyer_profile_ids`` only that slice is re-scored.
+    Only new or changed matches are written.
+    """
+    from app.buyer_match_job import BuyerMatchJob
+
+    job = BuyerMatchJob(get_supabase(), dry_run=payload.dry_run)
+    return job.run(deal_ids=payload.deal_ids, buyer_profile_ids=payload.buyer_profile_ids)
+
+
+# ── Hold vs. Sell ────────────────────────────────────────────────────────────
+
+def _held_rentals(db) -> list[dict]:
+    """One asset per leased property: lease rent, ARV as value, latest submitted packet's loan amount as debt."""
+    rows: list[dict] = []
+    offset = 0
+    while True:
+        page = db.table("leases").select(_HELD_RENTAL_SELECT).in_(
+            "status", ACTIVE_LEASE_STATUSES
+        ).order("id").range(offset, offset + LOAD_PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < LOAD_PAGE_SIZE:
+            break
+        offset += LOAD_PAGE_SIZE
+
+    assets: dict[str, dict] = {}
+    for r in rows:
+        prop = r.get("properties") or {}
+        if isinstance(prop, list):
+            prop = prop[0] if prop else {}
+        value = prop.get("estimated_arv") or prop.get("acquisition_price")
+        if not r.get("property_id") or value is None:
+            continue
+        packets = [p for p in prop.get("lender_packets") or [] if (p.get("status") or "draft") != "draft"]
+        latest = max(packets, key=lambda p: p.get("created_at") or "") if packets else {}
+        asset = assets.setdefault(r["property_id"], {
+            "property_id": r["property_id"],
+            "market_value": float(value),
+            "monthly_rent": 0.0,
+            "loan_balance": float(latest.get("requested_amount") or 0),
+            "market": ", ".join(v for v in (prop.get("city"), prop.get("state")) if v) or None,
+            "estimated_rent": float(prop.get("estimated_rent") or 0),
+        })
+        # Multi-unit properties carry one active lease per unit.
+        asset["monthly_rent"] += float(r.get("monthly_rent") or 0)
+    for asset in assets.values():
+        estimated = asset.pop("estimated_rent")
+        asset["monthly_rent"] = asset["monthly_rent"] or estimated
+    return list(assets.values())
+
+
+@router.post("/hold-sell")
+def optimize_hold_sell_portfolio(
+    payload: HoldSellRun,
+    limit: int = Query(default=500, ge=1, le=10000),
+):
+    """Hold / sell verdict for every held rental, with sales ranked by marginal return.
+
+    Assets whose net sale proceeds earn more redeployed at
+    ``reinvestment_rate`` than held are SELL. If those sales raise less than
+    ``target_liquidity``, the next-best candidates become SELL_FOR_LIQUIDITY.
+    """
+    from dynasty_os.engines.hold_sell_optimizer import HeldAsset, optimize_hold_sell
+
+    if payload.hold_years < 1 or payload.hold_years > 30:
+        raise HTTPException(400, "hold_years must be between 1 and 30")
+    rows = [a.model_dump() for a in payload.assets] or _held_rentals(get_supabase())
+    plan = optimize_hold_sell(
+        (HeldAsset.from_row(r) for r in rows),
+        hold_years=payload.hold_years,
+        reinvestment_rate=payload.reinvestment_rate,
+        target_liquidity=payload.target_liquidity,
+        appreciation=payload.appreciation,
+        appreciation_by_market=payload.appreciation_by_market,
+        interest_rate=payload.interest_rate,
+        selling_costs_pct=payload.selling_costs_pct,
+    )
+    return {"portfolio": plan.portfolio, "assets": plan.rows(limit)}
+
+
 # ── Offers ────────────────────────────────────────────────────────────────────
 
 @router.get("/offers")
@@ -131,6 +388,7 @@ def update_offer_status(offer_id: UUID, payload: OfferUpdate):
     result = db.table("offers").update(updates).eq("offer_id", str(offer_id)).execute()
     if not result.data:
         raise HTTPException(404, "Offer not found")
+    profit_analysis.cache_clear()
     return result.data[0]
 
 
@@ -160,17 +418,30 @@ def create_closing(payload: ClosingCreate):
     # Update property status to 'sold'
     db.table("properties").update({"status": "sold"}).eq("id", payload.property_id).execute()
 
+    profit_analysis.cache_clear()
+    capital_returns.cache_clear()
     return closing
 
 
 # ── Profit Analysis ───────────────────────────────────────────────────────────
 
 @router.get("/profit")
+@ttl_cache(seconds=SUMMARY_TTL_SECONDS)
 def profit_analysis(
     year: Optional[int] = None,
+    period: Optional[str] = None,
 ):
-    """Portfolio-level profit and capital recovery summary."""
+    """Portfolio-level profit and capital recovery summary.
+
+    Served by the ``disposition_profit_summary`` RPC; ``period`` (month |
+    quarter | year) adds closing totals per bucket within ``year``.
+    """
+    check_period(period)
     db = get_supabase()
+    summary = optional_rpc(db, "disposition_profit_summary", {"p_year": year, "p_period": period})
+    if summary:
+        return {**summary, "year_filter": year}
+
     q = db.table("closings").select("net_profit, capital_recovered, sale_price, close_date")
     if year:
         q = q.gte("close_date", f"{year}-01-01").lte("close_date", f"{year}-12-31")
@@ -181,10 +452,12 @@ def profit_analysis(
     total_revenue   = sum(float(r.get("sale_price") or 0) for r in closings)
     avg_profit      = total_profit / len(closings) if closings else 0
 
-    # Offer conversion rates
-    all_offers = db.table("offers").select("status").execute().data or []
-    accepted = sum(1 for o in all_offers if o.get("status") == "Accepted")
-    conversion = round(accepted / len(all_offers), 4) if all_offers else 0
+    # Offer conversion rates: two head-only counts rather than every offer row
+    total_offers = db.table("offers").select("offer_id", count="exact").limit(0).execute().count or 0
+    accepted = (
+        db.table("offers").select("offer_id", count="exact").eq("status", "Accepted").limit(0).execute().count or 0
+    )
+    conversion = round(accepted / total_offers, 4) if total_offers else 0
 
     return {
         "closed_deals": len(closings),
@@ -193,5 +466,110 @@ def profit_analysis(
         "total_revenue": round(total_revenue, 2),
         "avg_profit_per_deal": round(avg_profit, 2),
         "offer_conversion_rate": conversion,
+        "by_period": closing_buckets(closings, period),
         "year_filter": year,
     }
+
+
+# ── Performance KPIs ──────────────────────────────────────────────────────────
+
+def _recorded_at(row: dict) -> datetime:
+    return datetime.fromisoformat(str(row["recorded_at"]).replace("Z", "+00:00"))
+
+
+def _performance_sketches(db, force: bool = False):
+    """Shared KeyedSketches over disposition_performance, caught up to the latest row.
+
+    The first call loads every row; later ones read only rows recorded
+    within PERFORMANCE_OVERLAP_SECONDS of the newest one seen, skipping ids
+    already counted, so a row whose transaction committed after a
+    higher id was read is still counted exactly once per worker.
+    """
+    global _performance, _performance_synced_at, _performance_high_water, _performance_recent
+    from dynasty_os.engines.quantile_sketch import KeyedSketches, rollup_keys
+
+    with _performance_lock:
+        if _performance is None:
+            _performance, _performance_high_water, _performance_recent, force = KeyedSketches(), None, {}, True
+        if force or time.monotonic() - _performance_synced_at >= PERFORMANCE_SYNC_SECONDS:
+            overlap = timedelta(seconds=PERFORMANCE_OVERLAP_SECONDS)
+            since = _performance_high_water - overlap if _performance_high_water else None
+            last_id = 0
+            while True:
+                q = db.table("disposition_performance").select(PERFORMANCE_COLUMNS)
+                if since is not None:
+                    q = q.gte("recorded_at", since.isoformat())
+                page = q.gt("id", last_id).order("id").limit(LOAD_PAGE_SIZE).execute().data or []
+                for row in page:
+                    last_id = row["id"]
+                    if row["id"] in _performance_recent:
+                        continue
+                    recorded_at = _recorded_at(row)
+                    _performance_recent[row["id"]] = recorded_at
+                    if _performance_high_water is None or recorded_at > _performance_high_water:
+                        _performance_high_water = recorded_at
+                    list_price = float(row["list_price"])
+                    values = {
+                        "days_on_market": float(row["days_on_market"]),
+                        "price_reduction_pct": (list_price - float(row["sale_price"])) / list_price if list_price else 0,
+                    }
+                    for metric, value in values.items():
+                        for key in rollup_keys(metric, row["exit_strategy"], row.get("market")):
+                            _performance.add(key, value)
+                if len(page) < LOAD_PAGE_SIZE:
+                    break
+            if _performance_high_water is not None:
+                cutoff = _performance_high_water - overlap
+                _performance_recent = {i: at for i, at in _performance_recent.items() if at >= cutoff}
+            _performance_synced_at = time.monotonic()
+        return _performance
+
+
+@router.post("/performance", status_code=201)
+def record_performance(events: list[PerformanceEvent]):
+    """Store sold listings and add them to the days-on-market and price-reduction sketches.
+
+    Each value lands under its exit strategy and market and their ``*``
+    rollups. Events are kept in disposition_performance, so the sketches
+    survive restarts and every worker sees them.
+    """
+    db = get_supabase()
+    if events:
+        db.table("disposition_performance").insert([e.model_dump() for e in events]).execute()
+    _performance_sketches(db, force=True)
+    return {"recorded": len(events)}
+
+
+@router.get("/performance")
+def performance_distributions(
+    exit_strategy: Optional[str] = None,
+    market: Optional[str] = None,
+):
+    """Count, mean, min, max, p50 and p90 of days on market and price reduction (a fraction of list price).
+
+    ``overall`` is the selected exit strategy / market (default: everything);
+    ``by_exit_strategy`` and ``by_market`` break down whichever is not fixed.
+    """
+    from dynasty_os.engines.quantile_sketch import ALL, split_key
+
+    sketches = _performance_sketches(get_supabase())
+    cells: dict[tuple[str, str], dict] = {}
+    with _performance_lock:
+        for key in sketches.keys():
+            parts = split_key(key)
+            if len(parts) == 3:
+                metric, exit_key, market_key = parts
+                cells.setdefault((exit_key, market_key), {})[metric] = sketches.summary(key)
+    exit_key, market_key = exit_strategy or ALL, market or ALL
+    return {
+        "events": cells.get((ALL, ALL), {}).get("days_on_market", {}).get("count", 0),
+        "exit_strategy": exit_strategy,
+        "market": market,
+        "overall": cells.get((exit_key, market_key), {}),
+        "by_exit_strategy": {} if exit_strategy else {
+            e: v for (e, m), v in sorted(cells.items()) if e != ALL and m == market_key
+        },
+        "by_market": {} if market else {
+            m: v for (e, m), v in sorted(cells.items()) if m != ALL and e == exit_key
+        },
+    }
@@ -6,7 +6,9 @@ scenario modeling, and due diligence management.
 
 from __future__ import annotations
 import logging
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
 from uuid import uuid4
@@ -15,14 +17,57 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from app.db import get_supabase
+from app.metrics import DEFAULT_METRICS_DIR, MetricsRegistry, nest_counters, summarize_histogram
 
 _PROJECT_ROOT = Path(__file__).resolve().parents[3]
 if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
-router = APIRouter(prefix="/api/land-build", tags=["Land + Build UW/DD"])
+# Shared by every route in this module and merged across workers by /metrics.
+land_build_metrics = MetricsRegistry(
+    "land_build",
+    snapshot_dir=os.getenv("LAND_BUILD_METRICS_DIR") or DEFAULT_METRICS_DIR,
+    flush_at_exit=os.getenv("METRICS_FLUSH_AT_EXIT", "1") != "0",
+)
+
+router = APIRouter(
+    prefix="/api/land-build",
+    tags=["Land + Build UW/DD"],
+    route_class=land_build_metrics.route_class,
+)
 logger = logging.getLogger("dynasty_property_os.api.land_build_uw_dd")
 
+_DEFAULT_DD_DB_PATH = Path(__file__).resolve().parents[2] / "storage" / "land_build" / "dd_checklist.sqlite3"
+
+
+@lru_cache(maxsize=1)
+def _dd_checklist_store():
+    """Process-wide handle on the durable SQLite DD checklist store."""
+    from dynasty_os.engines.land_build_uw_dd_engine import DDChecklistStore
+
+    path = os.getenv("LAND_BUILD_DD_DB_PATH") or str(_DEFAULT_DD_DB_PATH)
+    return DDChecklistStore(path)
+
+
+@lru_cache(maxsize=1)
+def _dd_checklist_engine():
+    """Process-wide DD checklist engine backed by the durable SQLite store.
+
+    Every /dd-checklist* route shares this instance, so an update lands in
+    the same store the summary route reads from.
+    """
+    from dynasty_os.engines.land_build_uw_dd_engine import DDChecklistEngine
+
+    return DDChecklistEngine(_dd_checklist_store())
+
+
+@lru_cache(maxsize=1)
+def _offer_ladder_engine():
+    """Process-wide offer engine so MAO tables stay memoized across requests."""
+    from dynasty_os.engines.land_build_uw_dd_engine import OfferCalculationEngine
+
+    return OfferCalculationEngine()
+
 
 # ─── Models ──────────────────────────────────────────────────────────────────
 
@@ -47,17 +92,30 @@ class PropertyInputRequest(BaseModel):
 
 
 class SaleScenarioRequest(BaseModel):
-    """Sale scenario modeling request."""
+    """Sale scenario modeling request.
+
+    Supplying any ladder (``*_values``) or a best/worst-case ARV also returns
+    the full ARV x holding months x carrying cost grid.
+    """
     property_id: str
     arv_sale: float
+    purchase_price: float = 0.0
     holding_months: int = 12
     carrying_cost_monthly: float = 0.0
     best_case_arv: Optional[float] = None
     worst_case_arv: Optional[float] = None
+    arv_values: Optional[List[float]] = None
+    holding_months_values: Optional[List[int]] = None
+    carrying_cost_values: Optional[List[float]] = None
 
 
 class RentalBackstopRequest(BaseModel):
-    """Rental backstop scenario request."""
+    """Rental backstop scenario request.
+
+    Supplying any ladder (``*_values`` / ``vacancy_rates``) also returns the
+    rent x vacancy x holding years cash-flow grid. With a purchase price the
+    response adds a monthly DCF (IRR, NPV, equity multiple, DSCR).
+    """
     property_id: str
     est_monthly_rent: float
     annual_taxes: float = 0.0
@@ -65,6 +123,15 @@ class RentalBackstopRequest(BaseModel):
     holding_years: int = 5
     exit_sale_year: int = 5
     exit_arv: Optional[float] = None
+    purchase_price: float = 0.0
+    rent_values: Optional[List[float]] = None
+    vacancy_rates: Optional[List[float]] = None
+    holding_years_values: Optional[List[int]] = None
+    loan_amount: float = 0.0
+    interest_rate: float = 0.07
+    rent_growth: float = 0.03
+    vacancy_rate: float = 0.05
+    discount_rate: float = 0.10
 
 
 class ExitStrategyRequest(BaseModel):
@@ -103,6 +170,28 @@ class BuyBoxRequest(BaseModel):
     excluded_counties: Optional[List[str]] = None
 
 
+class BulkBuyBox(BuyBoxRequest):
+    """Buy box in a bulk evaluation; ids are generated when omitted."""
+    buybox_id: Optional[str] = None
+
+
+class BuyBoxParcel(BaseModel):
+    """Fields the buy box checks read from a property."""
+    property_id: str
+    lot_size_acres: float = 0.0
+    arv_land: float = 0.0
+    purchase_price: float = 0.0
+    zoning: Optional[str] = None
+    county: Optional[str] = None
+
+
+class BulkBuyBoxEvaluateRequest(BaseModel):
+    """Many properties x many buy boxes; only pairs scoring >= min_score are returned."""
+    properties: List[BuyBoxParcel]
+    buyboxes: List[BulkBuyBox]
+    min_score: float = 80.0
+
+
 class CampaignRequest(BaseModel):
     """Campaign creation request."""
     campaign_id: Optional[str] = None
@@ -123,6 +212,22 @@ class OfferCalculationRequest(BaseModel):
     holding_months: int = 12
 
 
+class OfferLadderProperty(BaseModel):
+    """One property row in a bulk offer ladder."""
+    property_id: str
+    arv: float
+    repair_cost: float = 0.0
+    holding_cost_monthly: float = 0.0
+    holding_months: int = 12
+
+
+class OfferLadderRequest(BaseModel):
+    """MAO for many properties across exit strategies and a target ROI ladder."""
+    properties: List[OfferLadderProperty]
+    target_rois: List[float] = [0.10, 0.15, 0.20, 0.25, 0.30]
+    exit_strategies: Optional[List[str]] = None
+
+
 class ComprehensiveAnalysisRequest(BaseModel):
     """Comprehensive Land + Build deal analysis request."""
     property_input: PropertyInputRequest
@@ -130,6 +235,19 @@ class ComprehensiveAnalysisRequest(BaseModel):
     include_dd_checklist: bool = True
 
 
+# ─── Helpers ─────────────────────────────────────────────────────────────────
+
+MAX_GRID_CELLS = 250_000
+
+
+def _check_grid_size(*axis_lengths: int) -> None:
+    cells = 1
+    for length in axis_lengths:
+        cells *= length
+    if cells > MAX_GRID_CELLS:
+        raise HTTPException(400, f"Scenario grid too large ({cells} cells, max {MAX_GRID_CELLS})")
+
+
 # ─── Routes ──────────────────────────────────────────────────────────────────
 
 @router.post("/analyze", status_code=200)
@@ -144,7 +262,7 @@ def analyze_land_build_deal(payload: ComprehensiveAnalysisRequest):
         BuyBoxCriteria,
     )
     
-    engine = LandBuild_UW_DDEngine()
+    engine = LandBuild_UW_DDEngine(dd_store=_dd_checklist_store())
     
     buybox = None
     if payload.buybox_criteria:
@@ -161,7 +279,12 @@ def analyze_land_build_deal(payload: ComprehensiveAnalysisRequest):
     
     if not result.get("success"):
         raise HTTPException(400, result.get("reason", "Analysis failed"))
-    
+
+    # DD counters live in the shared store; everything else is per-request.
+    engine_metrics = engine.get_metrics()
+    engine_metrics.pop("dd_checklist", None)
+    for section, metrics in engine_metrics.items():
+        land_build_metrics.record_engine(section, metrics)
     return result
 
 
@@ -174,12 +297,29 @@ def calculate_sale_scenario(payload: SaleScenarioRequest):
     result = engine.process(
         property_id=payload.property_id,
         arv_sale=payload.arv_sale,
-        purchase_price=0.0,
+        purchase_price=payload.purchase_price,
         holding_months=payload.holding_months,
         carrying_cost_monthly=payload.carrying_cost_monthly,
     )
-    
-    return {"scenario": result, "metrics": engine.get_metrics()}
+
+    response = {"scenario": result}
+    ladder_arvs = [v for v in (payload.worst_case_arv, payload.arv_sale, payload.best_case_arv) if v is not None]
+    if payload.arv_values or payload.holding_months_values or payload.carrying_cost_values or len(ladder_arvs) > 1:
+        arv_values = payload.arv_values or sorted(set(ladder_arvs))
+        holding_months = payload.holding_months_values or [payload.holding_months]
+        carrying_costs = payload.carrying_cost_values or [payload.carrying_cost_monthly]
+        _check_grid_size(len(arv_values), len(holding_months), len(carrying_costs))
+        response["grid"] = engine.process_grid(
+            property_id=payload.property_id,
+            purchase_price=payload.purchase_price,
+            arv_values=arv_values,
+            holding_months=holding_months,
+            carrying_costs_monthly=carrying_costs,
+        )
+
+    response["metrics"] = engine.get_metrics()
+    land_build_metrics.record_engine("sale_scenario", response["metrics"])
+    return response
 
 
 @router.post("/rental-backstop", status_code=200)
@@ -195,9 +335,44 @@ def calculate_rental_backstop(payload: RentalBackstopRequest):
         annual_insurance=payload.annual_insurance,
         holding_years=payload.holding_years,
         exit_arv=payload.exit_arv or 0.0,
+        purchase_price=payload.purchase_price,
     )
-    
-    return {"backstop": result, "metrics": engine.get_metrics()}
+
+    response = {"backstop": result}
+    if payload.rent_values or payload.vacancy_rates or payload.holding_years_values:
+        rents = payload.rent_values or [payload.est_monthly_rent]
+        vacancy_rates = payload.vacancy_rates or [0.0]
+        holding_years = payload.holding_years_values or [payload.holding_years]
+        _check_grid_size(len(rents), len(vacancy_rates), len(holding_years))
+        response["grid"] = engine.process_grid(
+            property_id=payload.property_id,
+            monthly_rents=rents,
+            vacancy_rates=vacancy_rates,
+            holding_years=holding_years,
+            annual_taxes=payload.annual_taxes,
+            annual_insurance=payload.annual_insurance,
+            exit_arv=payload.exit_arv or 0.0,
+            purchase_price=payload.purchase_price,
+        )
+    if payload.purchase_price > 0:
+        response["dcf"] = engine.process_dcf(
+            property_id=payload.property_id,
+            monthly_rent=payload.est_monthly_rent,
+            annual_taxes=payload.annual_taxes,
+            annual_insurance=payload.annual_insurance,
+            purchase_price=payload.purchase_price,
+            holding_years=payload.holding_years,
+            exit_arv=payload.exit_arv or 0.0,
+            loan_amount=payload.loan_amount,
+            interest_rate=payload.interest_rate,
+            rent_growth=payload.rent_growth,
+            vacancy_rate=payload.vacancy_rate,
+            discount_rate=payload.discount_rate,
+        )
+
+    response["metrics"] = engine.get_metrics()
+    land_build_metrics.record_engine("rental_backstop", response["metrics"])
+    return response
 
 
 @router.post("/exit-strategies", status_code=200)
@@ -214,15 +389,15 @@ def rank_exit_strategies(payload: ExitStrategyRequest):
         monthly_rent=payload.monthly_rent,
     )
     
-    return {"exit_analysis": result, "metrics": engine.get_metrics()}
+    metrics = engine.get_metrics()
+    land_build_metrics.record_engine("exit_strategy", metrics)
+    return {"exit_analysis": result, "metrics": metrics}
 
 
 @router.post("/dd-checklist", status_code=201)
 def create_dd_checklist(payload: DDChecklistRequest):
     """Create a due diligence checklist for a property."""
-    from dynasty_os.engines.land_build_uw_dd_engine import DDChecklistEngine
-    
-    engine = DDChecklistEngine()
+    engine = _dd_checklist_engine()
     result = engine.create_checklist(
         property_id=payload.property_id,
         include_categories=payload.include_categories,
@@ -234,21 +409,18 @@ def create_dd_checklist(payload: DDChecklistRequest):
 @router.get("/dd-checklist/{property_id}", status_code=200)
 def get_dd_checklist_summary(property_id: str):
     """Get summary of due diligence checklist for a property."""
-    from dynasty_os.engines.land_build_uw_dd_engine import DDChecklistEngine
-    
-    engine = DDChecklistEngine()
-    summary = engine.get_checklist_summary(property_id)
-    
-    return summary
+    return _dd_checklist_engine().get_checklist_summary(property_id)
 
 
 @router.post("/dd-checklist-update", status_code=200)
 def update_dd_checklist_item(payload: DDChecklistUpdateRequest):
     """Update a due diligence checklist item."""
-    from dynasty_os.engines.land_build_uw_dd_engine import DDChecklistEngine
-    
-    engine = DDChecklistEngine()
-    result = engine.update_item_status(
+    from dynasty_os.engines.land_build_uw_dd_engine import DD_STATUSES
+
+    if payload.status not in DD_STATUSES:
+        raise HTTPException(400, f"status must be one of: {DD_STATUSES}")
+
+    result = _dd_checklist_engine().update_item_status(
         item_id=payload.item_id,
         status=payload.status,
         result=payload.result or "",
@@ -280,8 +452,33 @@ def evaluate_against_buybox(
         property_input=property_data.model_dump(exclude_none=True),
         buybox=buybox,
     )
-    
-    return {"evaluation": result, "metrics": engine.get_metrics()}
+
+    metrics = engine.get_metrics()
+    land_build_metrics.record_engine("buy_box", metrics)
+    return {"evaluation": result, "metrics": metrics}
+
+
+@router.post("/buy-box-evaluate/bulk", status_code=200)
+def evaluate_buyboxes_bulk(payload: BulkBuyBoxEvaluateRequest):
+    """Match many properties against many buy boxes in one vectorized pass."""
+    from dynasty_os.engines.land_build_uw_dd_engine import BuyBoxEngine, BuyBoxCriteria
+
+    if not payload.buyboxes:
+        raise HTTPException(400, "At least one buy box is required")
+
+    buyboxes = [
+        BuyBoxCriteria(**{**b.model_dump(exclude_none=True), "buybox_id": b.buybox_id or f"BB-{uuid4()}"})
+        for b in payload.buyboxes
+    ]
+    engine = BuyBoxEngine()
+    result = engine.evaluate_bulk(
+        properties=[p.model_dump(exclude_none=True) for p in payload.properties],
+        buyboxes=buyboxes,
+        min_score=payload.min_score,
+    )
+    metrics = engine.get_metrics()
+    land_build_metrics.record_engine("buy_box", metrics)
+    return {"evaluation": result, "metrics": metrics}
 
 
 @router.post("/offer-calculation", status_code=200)
@@ -300,7 +497,9 @@ def calculate_optimal_offer(payload: OfferCalculationRequest):
             holding_cost_monthly=payload.holding_cost_monthly,
             holding_months=payload.holding_months,
         )
-        return {"offer": result, "metrics": engine.get_metrics(), "fallback": False}
+        metrics = engine.get_metrics()
+        land_build_metrics.record_engine("offer_calc", metrics)
+        return {"offer": result, "metrics": metrics, "fallback": False}
     except ModuleNotFoundError:
         holding_cost = payload.holding_cost_monthly * payload.holding_months
         target_profit = payload.arv * payload.target_roi
@@ -329,19 +528,64 @@ def calculate_optimal_offer(payload: OfferCalculationRequest):
         }
 
 
+@router.post("/offer-calculation/ladder", status_code=200)
+def calculate_offer_ladder(payload: OfferLadderRequest):
+    """Bulk MAO ladder (exit strategy x target ROI) in columnar, mail-merge-ready form."""
+    from dynasty_os.engines.land_build_uw_dd_engine import ExitType, roi_label
+
+    valid = {e.value for e in ExitType}
+    strategies = payload.exit_strategies or [e.value for e in ExitType]
+    invalid = [s for s in strategies if s not in valid]
+    if invalid:
+        raise HTTPException(400, f"exit_strategies must be drawn from: {sorted(valid)}")
+    if not payload.target_rois:
+        raise HTTPException(400, "target_rois must not be empty")
+    labels = [roi_label(r) for r in payload.target_rois]
+    if len(set(labels)) != len(labels):
+        raise HTTPException(400, "target_rois must be distinct")
+    _check_grid_size(len(payload.properties), len(strategies), len(payload.target_rois))
+
+    result = _offer_ladder_engine().offer_ladder(
+        properties=[p.model_dump() for p in payload.properties],
+        target_rois=payload.target_rois,
+        exit_strategies=strategies,
+    )
+    land_build_metrics.incr("offer_calc.ladder_offers_calculated", result["offer_count"])
+    land_build_metrics.incr("offer_calc.ladder_cache_hits", result["cache_hits"])
+    return {"ladder": result}
+
+
 @router.get("/metrics", status_code=200)
 def get_all_metrics():
-    """Get aggregated metrics from all Land + Build sub-engines."""
+    """Get cumulative metrics from all Land + Build sub-engines across workers.
+
+    Engine counters and per-route request/error/latency stats come from the
+    process-wide registry merged with every worker's snapshot; DD checklist
+    counts come straight from the shared store.
+    """
     try:
         from dynasty_os.engines.land_build_uw_dd_engine import LandBuild_UW_DDEngine
 
-        engine = LandBuild_UW_DDEngine()
-        metrics = engine.get_metrics()
+        aggregate = land_build_metrics.aggregate()
+        counters = aggregate["counters"]
+        engine_counters = {k: v for k, v in counters.items() if not k.startswith(("requests:", "errors:"))}
+        metrics = nest_counters(engine_counters, into=LandBuild_UW_DDEngine(dd_store=_dd_checklist_store()).get_metrics())
+
+        routes = {
+            name.removeprefix("latency:"): {
+                "requests": counters.get(f"requests:{name.removeprefix('latency:')}", 0),
+                "errors": counters.get(f"errors:{name.removeprefix('latency:')}", 0),
+                "latency": summarize_histogram(histogram),
+            }
+            for name, histogram in sorted(aggregate["histograms"].items())
+        }
 
         return {
             "status": "operational",
             "engine": "land_build_uw_dd",
             "metrics": metrics or {},
+            "routes": routes,
+            "workers": aggregate["workers"],
             "warnings": [],
             "verified": True,
         }
@@ -1,15 +1,84 @@
 """Lead Engine API — CRUD + scoring + routing for all lead types."""
 from __future__ import annotations
 
+import base64
+import io
+import json
+import logging
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from postgrest.exceptions import APIError
+from pydantic import BaseModel, Field
 
+from app.activity_log import lead_activity_log
+from app.cache import ttl_cache
 from app.db import get_supabase
+from app.summary import optional_rpc
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
 
 router = APIRouter(prefix="/api/leads", tags=["Lead Engine"])
+logger = logging.getLogger("dynasty_property_os.api.leads")
+
+# Dashboard refreshes within this window share one stats lookup.
+LEAD_STATS_TTL_SECONDS = 15
+
+# The auto-router re-reads the roster and open-lead counts this often, which
+# also corrects loads for leads closed or reassigned outside this process.
+LEAD_ROUTER_RELOAD_SECONDS = 60
+_router_lock = threading.Lock()
+_router_loaded_at = 0.0
+
+
+def _lead_tx(db, function: str, params: dict) -> Optional[dict]:
+    """Run a transactional lead mutation RPC.
+
+    Returns None when the function isn't deployed (remembered for the
+    process lifetime) so the caller can take the multi-request path.
+    """
+    try:
+        return optional_rpc(db, function, params, fallback="using per-table writes")
+    except APIError as exc:
+        if exc.code == "P0002":
+            raise HTTPException(404, "Lead not found") from exc
+        raise
+
+
+@lru_cache(maxsize=1)
+def _routing_engine():
+    from dynasty_os.engines.lead_engine import RoutingEngine
+
+    return RoutingEngine()
+
+
+def _lead_router(db, force: bool = False):
+    """The shared RoutingEngine, seeded from lead_assignees + lead_assignee_load."""
+    global _router_loaded_at
+    engine = _routing_engine()
+    with _router_lock:
+        if force or not _router_loaded_at or time.monotonic() - _router_loaded_at >= LEAD_ROUTER_RELOAD_SECONDS:
+            roster = db.table("lead_assignees").select("*").eq("active", True).execute().data or []
+            loads = db.table("lead_assignee_load").select("assignee, open_leads").execute().data or []
+            open_counts = {row["assignee"]: row["open_leads"] for row in loads}
+            engine.reset_assignees()
+            for row in roster:
+                engine.register_assignee(
+                    row["assignee"], row["capacity"], row.get("grades") or (), row.get("lead_types") or (),
+                    open_leads=open_counts.get(row["assignee"], 0),
+                )
+            _router_loaded_at = time.monotonic()
+    return engine
 
 
 # ─── Models ──────────────────────────────────────────────────────────────────
@@ -64,6 +133,12 @@ class LeadRouteRequest(BaseModel):
     reason: Optional[str] = None
 
 
+class LeadAutoRouteRequest(BaseModel):
+    lead_ids: Optional[list[UUID]] = None
+    unassigned: bool = False            # route the oldest leads with no owner
+    limit: int = Field(default=500, ge=1, le=5000)
+
+
 class LeadScoreBreakdown(BaseModel):
     motivation_score: int = 0
     equity_score: int = 0
@@ -76,6 +151,33 @@ class LeadScoreBreakdown(BaseModel):
 
 # ─── Routes ──────────────────────────────────────────────────────────────────
 
+LEAD_GRADES = ("A", "B", "C", "D")
+
+
+def _encode_cursor(row: dict) -> str:
+    raw = json.dumps([row.get("date_created"), row["lead_id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[Optional[str], str]:
+    try:
+        date_created, lead_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (None if date_created is None else str(date_created)), str(UUID(str(lead_id)))
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(400, "Invalid cursor") from exc
+
+
+def _after_cursor(cursor: str) -> str:
+    """PostgREST ``or`` filter for rows after ``cursor`` in (date_created DESC NULLS FIRST, lead_id DESC).
+
+    Leads without a date_created sort first, ordered by lead_id alone.
+    """
+    date_created, lead_id = _decode_cursor(cursor)
+    if date_created is None:
+        return f"date_created.not.is.null,and(date_created.is.null,lead_id.lt.{lead_id})"
+    return f'date_created.lt."{date_created}",and(date_created.eq."{date_created}",lead_id.lt.{lead_id})'
+
+
 @router.get("")
 def list_leads(
     lead_type: Optional[str] = None,
@@ -83,8 +185,18 @@ def list_leads(
     grade: Optional[str] = None,
     limit: int = Query(default=50, le=200),
     offset: int = 0,
+    cursor: Optional[str] = None,
 ):
-    """Return paginated leads with optional filters."""
+    """Return paginated leads with optional filters.
+
+    Pass the previous response's ``next_cursor`` to page by keyset on
+    (date_created, lead_id), leads without a date_created first; ``offset``
+    still works when no cursor is given.
+    Grade filters on the lead's denormalized current grade.
+    """
+    if grade and grade not in LEAD_GRADES:
+        raise HTTPException(400, f"grade must be one of: {LEAD_GRADES}")
+
     db = get_supabase()
     q = db.table("leads").select(
         "*, lead_scoring(grade, total_score), lead_routing(routed_to)"
@@ -93,21 +205,17 @@ def list_leads(
         q = q.eq("lead_type", lead_type)
     if status:
         q = q.eq("status", status)
-    q = q.order("date_created", desc=True).range(offset, offset + limit - 1)
-    result = q.execute()
-
-    rows = result.data or []
-
-    # Filter by grade post-join if provided
     if grade:
-        rows = [
-            r for r in rows
-            if r.get("lead_scoring") and any(
-                s.get("grade") == grade for s in (r["lead_scoring"] if isinstance(r["lead_scoring"], list) else [r["lead_scoring"]])
-            )
-        ]
+        q = q.eq("grade", grade)
+    q = q.order("date_created", desc=True, nullsfirst=True).order("lead_id", desc=True)
+    if cursor:
+        q = q.or_(_after_cursor(cursor)).limit(limit)
+    else:
+        q = q.range(offset, offset + limit - 1)
+    rows = q.execute().data or []
 
-    return {"leads": rows, "count": len(rows), "offset": offset}
+    next_cursor = _encode_cursor(rows[-1]) if len(rows) == limit else None
+    return {"leads": rows, "count": len(rows), "offset": offset, "next_cursor": next_cursor}
 
 
 @router.post("", status_code=201)
@@ -133,10 +241,160 @@ def create_lead(payload: LeadCreate):
     return lead
 
 
+@router.post("/import")
+async def import_leads(
+    request: Request,
+    format: Optional[str] = Query(default=None, description="csv or ndjson; inferred from Content-Type"),
+    lead_type: Optional[str] = Query(default=None, description="Lead type for rows that omit one"),
+    source: Optional[str] = Query(default=None, description="Source for rows that omit one"),
+    batch_size: int = Query(default=2000, ge=1, le=5000),
+):
+    """Bulk-import leads from a raw CSV or NDJSON request body.
+
+    The body is spooled to disk as it arrives, then validated and inserted
+    in batches; per-row errors come back in the report instead of failing
+    the request.
+    """
+    from app.lead_import import IMPORT_FORMATS, LeadImporter
+
+    content_type = request.headers.get("content-type", "")
+    fmt = format or ("ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv")
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(400, f"format must be one of: {IMPORT_FORMATS}")
+
+    with SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+
+        def run() -> dict:
+            lines = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+            importer = LeadImporter(get_supabase(), batch_size=batch_size,
+                                    default_lead_type=lead_type, default_source=source)
+            try:
+                return importer.run(lines, fmt)
+            finally:
+                lines.detach()
+
+        report = await run_in_threadpool(run)
+
+    lead_stats.cache_clear()
+    return {"format": fmt, **report}
+
+
+def _group_by_assignee(results: list[dict]) -> dict[str, list[str]]:
+    by_assignee: dict[str, list[str]] = {}
+    for r in results:
+        by_assignee.setdefault(r["routed_to"], []).append(r["lead_id"])
+    return by_assignee
+
+
+@router.post("/auto-route")
+def auto_route_leads(payload: LeadAutoRouteRequest):
+    """Route a batch of leads to the least-loaded eligible reps in one call.
+
+    Pass ``lead_ids`` (e.g. a fresh import) or ``unassigned=true`` for the
+    oldest ownerless leads. Reps come from lead_assignees; when every
+    eligible rep is at capacity the lead overflows to its grade's team queue.
+    The batch is written in one transaction (auto_route_leads_tx), which
+    reports each lead's previous owner so their load moves with the lead.
+    """
+    from dynasty_os.engines.lead_engine import Lead
+
+    if not payload.lead_ids and not payload.unassigned:
+        raise HTTPException(400, "Provide lead_ids or set unassigned=true")
+
+    db = get_supabase()
+    q = db.table("leads").select("lead_id, lead_type, source, grade, owner")
+    if payload.lead_ids:
+        q = q.in_("lead_id", [str(i) for i in payload.lead_ids[: payload.limit]])
+    else:
+        q = q.is_("owner", "null").order("date_created").limit(payload.limit)
+    leads = q.execute().data or []
+    if not leads:
+        return {"routed": 0, "overflowed": 0, "by_assignee": {}, "assignments": []}
+
+    engine = _lead_router(db)
+    results = engine.process_bulk(
+        (Lead(lead_id=row["lead_id"], lead_type=row["lead_type"], source=row.get("source") or ""),
+         row.get("grade") or "D")
+        for row in leads
+    )
+    for r in results:
+        r["description"] = f"Auto-routed to {r['routed_to']} — {r['reason']}"
+
+    routed = _lead_tx(db, "auto_route_leads_tx", {"p_assignments": [
+        {"lead_id": r["lead_id"], "routed_to": r["routed_to"],
+         "reason": f"Auto-routed ({r['reason']})", "description": r["description"]}
+        for r in results
+    ]})
+    if routed is not None:
+        previous_owners = {row["lead_id"]: row.get("previous_owner") for row in routed}
+        # Leads deleted since the read were skipped; give their load back.
+        for r in results:
+            if r["lead_id"] not in previous_owners:
+                engine.adjust_load(r["routed_to"], -1)
+        results = [r for r in results if r["lead_id"] in previous_owners]
+    else:
+        previous_owners = {row["lead_id"]: row.get("owner") for row in leads}
+        db.table("lead_routing").insert([
+            {"lead_id": r["lead_id"], "routed_to": r["routed_to"], "reason": f"Auto-routed ({r['reason']})"}
+            for r in results
+        ]).execute()
+        for assignee, lead_ids in _group_by_assignee(results).items():
+            db.table("leads").update({"owner": assignee}).in_("lead_id", lead_ids).execute()
+        for r in results:
+            lead_activity_log.enqueue({
+                "lead_id": r["lead_id"],
+                "activity_type": "Routed",
+                "description": r["description"],
+            })
+
+    # The engine already counted each lead against its new owner.
+    for r in results:
+        if previous_owners.get(r["lead_id"]):
+            engine.adjust_load(previous_owners[r["lead_id"]], -1)
+
+    by_assignee = _group_by_assignee(results)
+    return {
+        "routed": len(results),
+        "overflowed": sum(1 for r in results if r["reason"] == "overflow"),
+        "by_assignee": {a: len(ids) for a, ids in by_assignee.items()},
+        "assignments": [
+            {"lead_id": r["lead_id"], "grade": r["grade"], "routed_to": r["routed_to"], "reason": r["reason"]}
+            for r in results
+        ],
+    }
+
+
+@router.get("/routing/load")
+def routing_load(refresh: bool = False):
+    """Current open-lead load and capacity per rep, least loaded first."""
+    engine = _lead_router(get_supabase(), force=refresh)
+    return {"assignees": engine.load_snapshot(), **engine.get_metrics()}
+
+
 @router.get("/stats")
+@ttl_cache(seconds=LEAD_STATS_TTL_SECONDS)
 def lead_stats():
-    """Summary counts by status and grade."""
+    """Summary counts by status and grade.
+
+    Served from the trigger-maintained counters behind the ``lead_stats``
+    RPC; falls back to counting rows when that migration isn't applied.
+    """
     db = get_supabase()
+    try:
+        stats = db.rpc("lead_stats").execute().data
+    except APIError:
+        logger.warning("lead_stats RPC unavailable; counting rows instead", exc_info=True)
+    else:
+        if stats:
+            return stats
+    return _count_lead_stats(db)
+
+
+def _count_lead_stats(db) -> dict:
+    """Legacy path: page both tables through PostgREST and count in Python."""
 
     def fetch_all(table: str, columns: str) -> list[dict]:
         rows: list[dict] = []
@@ -154,12 +412,12 @@ def lead_stats():
 
     by_status: dict[str, int] = {}
     for row in leads:
-        s = row.get("status", "Unknown")
+        s = row.get("status") or "Unknown"
         by_status[s] = by_status.get(s, 0) + 1
 
     by_grade: dict[str, int] = {}
     for row in scores:
-        g = row.get("grade", "D")
+        g = row.get("grade") or "D"
         by_grade[g] = by_grade.get(g, 0) + 1
 
     return {
@@ -190,15 +448,24 @@ def update_lead(lead_id: UUID, payload: LeadUpdate):
     if not updates:
         raise HTTPException(400, "No fields to update")
 
+    description = f"Fields updated: {', '.join(updates.keys())}"
+    lead = _lead_tx(db, "update_lead_tx", {
+        "p_lead_id": str(lead_id),
+        "p_updates": updates,
+        "p_activity_description": description,
+    })
+    if lead is not None:
+        return lead
+
     result = db.table("leads").update(updates).eq("lead_id", str(lead_id)).execute()
     if not result.data:
         raise HTTPException(404, "Lead not found")
 
-    db.table("lead_activities").insert({
+    lead_activity_log.enqueue({
         "lead_id": str(lead_id),
         "activity_type": "Updated",
-        "description": f"Fields updated: {', '.join(updates.keys())}",
-    }).execute()
+        "description": description,
+    })
 
     return result.data[0]
 
@@ -239,6 +506,21 @@ def score_lead(lead_id: UUID, payload: LeadScoreBreakdown):
     grade = "A" if total >= 80 else "B" if total >= 60 else "C" if total >= 40 else "D"
 
     db = get_supabase()
+    description = f"Lead scored {total}/100 — Grade {grade}"
+
+    scored = _lead_tx(db, "score_lead_tx", {
+        "p_lead_id": str(lead_id),
+        "p_motivation_score": payload.motivation_score,
+        "p_equity_score": payload.equity_score,
+        "p_condition_score": payload.condition_score,
+        "p_timeline_score": payload.timeline_score,
+        "p_price_expectation_score": payload.price_expectation_score,
+        "p_total_score": total,
+        "p_grade": grade,
+        "p_activity_description": description,
+    })
+    if scored is not None:
+        return scored
 
     scoring_payload = {
         "lead_id": str(lead_id),
@@ -257,22 +539,48 @@ def score_lead(lead_id: UUID, payload: LeadScoreBreakdown):
     else:
         db.table("lead_scoring").insert(scoring_payload).execute()
 
-    # Update aggregate score on the lead
-    db.table("leads").update({"score": total}).eq("lead_id", str(lead_id)).execute()
+    # Update aggregate score and denormalized grade (list filter) on the lead
+    db.table("leads").update({"score": total, "grade": grade}).eq("lead_id", str(lead_id)).execute()
 
-    db.table("lead_activities").insert({
+    lead_activity_log.enqueue({
         "lead_id": str(lead_id),
         "activity_type": "Scored",
-        "description": f"Lead scored {total}/100 — Grade {grade}",
-    }).execute()
+        "description": description,
+    })
 
     return {"lead_id": str(lead_id), "total_score": total, "grade": grade}
 
 
+def _move_load(previous_owner: Optional[str], owner: str) -> None:
+    """Move one open lead from ``previous_owner``'s load to ``owner``'s."""
+    if previous_owner == owner:
+        return
+    engine = _routing_engine()
+    if previous_owner:
+        engine.adjust_load(previous_owner, -1)
+    engine.adjust_load(owner, 1)
+
+
 @router.post("/{lead_id}/route", status_code=201)
 def route_lead(lead_id: UUID, payload: LeadRouteRequest):
     """Route a lead to a team member or workflow queue."""
     db = get_supabase()
+    description = f"Routed to {payload.routed_to} — {payload.reason or 'no reason given'}"
+    routing = _lead_tx(db, "route_lead_tx", {
+        "p_lead_id": str(lead_id),
+        "p_routed_to": payload.routed_to,
+        "p_reason": payload.reason or "Manual routing",
+        "p_activity_description": description,
+    })
+    if routing is not None:
+        _move_load(routing.pop("previous_owner", None), payload.routed_to)
+        return routing
+
+    current = db.table("leads").select("owner").eq("lead_id", str(lead_id)).limit(1).execute().data
+    if not current:
+        raise HTTPException(404, "Lead not found")
+    previous_owner = current[0].get("owner")
+
     result = db.table("lead_routing").insert({
         "lead_id": str(lead_id),
         "routed_to": payload.routed_to,
@@ -283,11 +591,12 @@ def route_lead(lead_id: UUID, payload: LeadRouteRequest):
         raise HTTPException(500, "Failed to route lead")
 
     db.table("leads").update({"owner": payload.routed_to}).eq("lead_id", str(lead_id)).execute()
+    _move_load(previous_owner, payload.routed_to)
 
-    db.table("lead_activities").insert({
+    lead_activity_log.enqueue({
         "lead_id": str(lead_id),
         "activity_type": "Routed",
-        "description": f"Routed to {payload.routed_to} — {payload.reason or 'no reason given'}",
-    }).execute()
+        "description": description,
+    })
 
     return result.data[0]
@@ -0,0 +1,212 @@
+"""Capital Engine Liquidity API — daily cash forecast and reserve-breach alerts.
+
+Confirmed commitments (funding inflows), future-dated allocations, open
+project budgets and pending sale contracts are loaded once into a shared
+LiquidityForecaster as dated cash events. Row changes posted to /events
+(Supabase database-webhook payloads) replace just that row's events, and
+the whole forecast is rebuilt each day or every LIQUIDITY_RELOAD_SECONDS.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from app.db import get_supabase
+from app.summary import optional_rpc
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+logger = logging.getLogger("dynasty_property_os.liquidity")
+
+router = APIRouter(prefix="/api/capital/liquidity", tags=["Capital Engine"])
+
+LIQUIDITY_RELOAD_SECONDS = float(os.getenv("LIQUIDITY_RELOAD_SECONDS", "600"))
+LIQUIDITY_RESERVE_RATIO = float(os.getenv("LIQUIDITY_RESERVE_RATIO", "0.15"))
+COMMITMENT_FUNDING_DAYS = 30     # confirmed commitment -> cash in hand
+DEFAULT_PROJECT_DAYS = 90        # burn window for projects without a target_completion
+LOAD_PAGE_SIZE = 1000
+
+ACTIVE_INVESTOR_STATUSES = ["Warm", "Meeting", "Committed", "Funded", "Repeat", "Strategic Partner"]
+
+# table -> (primary key, columns, status filter)
+LIQUIDITY_SOURCES: dict[str, tuple[str, str, list[str]]] = {
+    "commitments": ("commitment_id", "commitment_id, amount, status, created_at", ["Confirmed"]),
+    "allocations": ("allocation_id", "allocation_id, amount, allocated_at", []),
+    "projects": ("project_id", "project_id, status, start_date, target_completion, budget, actual_cost",
+                 ["Planning", "Active"]),
+    "contracts": ("contract_id", "contract_id, status, sale_price, closing_date", ["Pending", "Under Contract"]),
+}
+
+_reload_lock = threading.Lock()
+_last_reload = 0.0
+_forecaster = None
+
+
+def _day(value: Any) -> Optional[date]:
+    return date.fromisoformat(str(value)[:10]) if value else None
+
+
+def _row_events(table: str, row: dict, today: date) -> list:
+    """Cash events for one source row (empty when it moves no cash)."""
+    from dynasty_os.engines.liquidity_forecast import CashEvent
+
+    pk, _, statuses = LIQUIDITY_SOURCES[table]
+    key = f"{table}:{row.get(pk)}"
+    if statuses and row.get("status") not in statuses:
+        return []
+    if table == "commitments":
+        created = _day(row.get("created_at")) or today
+        amount = float(row.get("amount") or 0)
+        return [CashEvent(key, amount, created + timedelta(days=COMMITMENT_FUNDING_DAYS))] if amount > 0 else []
+    if table == "allocations":
+        on = _day(row.get("allocated_at"))
+        amount = float(row.get("amount") or 0)
+        # Past allocations are already out of the starting cash.
+        return [CashEvent(key, -amount, on)] if on and on > today and amount > 0 else []
+    if table == "projects":
+        remaining = float(row.get("budget") or 0) - float(row.get("actual_cost") or 0)
+        if remaining <= 0:
+            return []
+        start = max(_day(row.get("start_date")) or today, today)
+        until = _day(row.get("target_completion")) or start + timedelta(days=DEFAULT_PROJECT_DAYS)
+        return [CashEvent(key, -remaining, start, max(until, start))]
+    on = _day(row.get("closing_date"))
+    price = float(row.get("sale_price") or 0)
+    return [CashEvent(key, price, on)] if on and price > 0 else []
+
+
+def _fetch(db, table: str) -> list[dict]:
+    pk, columns, statuses = LIQUIDITY_SOURCES[table]
+    rows: list[dict] = []
+    offset = 0
+    while True:
+        q = db.table(table).select(columns)
+        if statuses:
+            q = q.in_("status", statuses)
+        page = q.order(pk).range(offset, offset + LOAD_PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < LOAD_PAGE_SIZE:
+            return rows
+        offset += LOAD_PAGE_SIZE
+
+
+def _starting_position(db) -> tuple[float, float]:
+    """(cash available today, capital currently deployed)."""
+    investors = db.table("investors").select("available_capital").in_(
+        "status", ACTIVE_INVESTOR_STATUSES
+    ).execute().data or []
+    cash = sum(float(r.get("available_capital") or 0) for r in investors)
+    summary = optional_rpc(db, "capital_deployed_summary", {"p_period": None})
+    if summary:
+        deployed = float(summary.get("total_deployed_allocations") or 0)
+    else:
+        allocs = db.table("allocations").select("amount").execute().data or []
+        deployed = sum(float(r.get("amount") or 0) for r in allocs)
+    return cash, deployed
+
+
+def _ensure_loaded(force: bool = False):
+    """Return the shared forecaster, rebuilding it when stale, forced, or a new day."""
+    global _forecaster, _last_reload
+    from dynasty_os.engines.liquidity_forecast import LiquidityForecaster
+
+    today = date.today()
+    with _reload_lock:
+        stale = (
+            force or _forecaster is None or _forecaster.start != today
+            or time.monotonic() - _last_reload >= LIQUIDITY_RELOAD_SECONDS
+        )
+        if stale:
+            db = get_supabase()
+            cash, deployed = _starting_position(db)
+            forecaster = LiquidityForecaster(today, cash, (cash + deployed) * LIQUIDITY_RESERVE_RATIO)
+            events = [e for table in LIQUIDITY_SOURCES for row in _fetch(db, table)
+                      for e in _row_events(table, row, today)]
+            sources = forecaster.load(events)
+            _forecaster, _last_reload = forecaster, time.monotonic()
+            logger.info("liquidity forecast loaded sources=%d events=%d", sources, len(events))
+        return _forecaster
+
+
+# ─── Models ──────────────────────────────────────────────────────────────────
+
+class LiquidityEvent(BaseModel):
+    """Supabase database-webhook payload (one row change)."""
+    type: str                       # INSERT / UPDATE / DELETE
+    table: str
+    record: Optional[dict[str, Any]] = None
+    old_record: Optional[dict[str, Any]] = None
+
+
+# ─── Routes ──────────────────────────────────────────────────────────────────
+
+@router.get("/forecast")
+def liquidity_forecast(
+    horizon_days: int = Query(default=180, ge=1, le=180),
+    min_reserve: Optional[float] = Query(default=None, ge=0),
+    daily: bool = True,
+    refresh: bool = False,
+):
+    """Projected daily cash position and every reserve breach ahead.
+
+    The reserve defaults to LIQUIDITY_RESERVE_RATIO of total capital
+    (available + deployed); ``min_reserve`` overrides it for this call.
+    """
+    forecaster = _ensure_loaded(force=refresh)
+    with _reload_lock:
+        return forecaster.forecast(include_daily=daily, reserve=min_reserve, horizon_days=horizon_days)
+
+
+@router.get("/metrics")
+def liquidity_metrics():
+    forecaster = _ensure_loaded()
+    with _reload_lock:
+        return forecaster.get_metrics()
+
+
+@router.post("/events")
+def apply_liquidity_events(events: list[LiquidityEvent]):
+    """Apply row changes from commitments / allocations / projects / contracts webhooks.
+
+    Every event is validated before any is applied, and the batch is applied
+    under ``_reload_lock`` so readers and reloads never see half of it.
+    """
+    changes: list[tuple[str, Optional[dict]]] = []
+    for event in events:
+        if event.table not in LIQUIDITY_SOURCES:
+            raise HTTPException(400, f"table must be one of: {', '.join(LIQUIDITY_SOURCES)}")
+        pk = LIQUIDITY_SOURCES[event.table][0]
+        kind = event.type.upper()
+        if kind == "DELETE":
+            row = event.old_record or event.record or {}
+            if pk not in row:
+                raise HTTPException(400, f"DELETE events need old_record.{pk}")
+            changes.append((f"{event.table}:{row[pk]}", None))
+        elif kind in ("INSERT", "UPDATE"):
+            if not event.record or pk not in event.record:
+                raise HTTPException(400, f"{kind} events need record.{pk}")
+            changes.append((f"{event.table}:{event.record[pk]}", event.record))
+        else:
+            raise HTTPException(400, "type must be one of: INSERT, UPDATE, DELETE")
+
+    _ensure_loaded()
+    with _reload_lock:
+        forecaster = _forecaster
+        for key, record in changes:
+            if record is None:
+                forecaster.remove(key)
+            else:
+                forecaster.upsert(key, _row_events(key.split(":", 1)[0], record, forecaster.start))
+        first_breach = (forecaster.breaches() or [{}])[0].get("start")
+    return {"applied": len(changes), "first_breach": first_breach}
@@ -0,0 +1,238 @@
+"""Capital Engine Portfolio Risk API — exposure, concentration and drawdowns.
+
+Every allocation (capital placed in a deal) and every open project's spend
+to date is a position in a shared PortfolioRiskBook, grouped by asset type
+(properties.property_type; "Development" for project spend), market
+(city, state), investor and lender (loan type of the property's latest
+non-draft lender packet). Rows changed
+through /events (Supabase database-webhook payloads) are re-read and
+upserted one at a time, so /report stays a read of in-memory group totals.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from app.db import get_supabase
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+logger = logging.getLogger("dynasty_property_os.portfolio_risk")
+
+router = APIRouter(prefix="/api/capital/risk", tags=["Capital Engine"])
+
+PORTFOLIO_RISK_RELOAD_SECONDS = float(os.getenv("PORTFOLIO_RISK_RELOAD_SECONDS", "900"))
+LOAD_PAGE_SIZE = 1000
+
+LIQUID_INVESTOR_STATUSES = ["Warm", "Meeting", "Committed", "Funded", "Repeat", "Strategic Partner"]
+OPEN_PROJECT_STATUSES = ["Planning", "Active", "On Hold"]
+
+_PROPERTY_SELECT = "properties(city, state, property_type, lender_packets(loan_type, status, created_at))"
+
+# table -> (primary key, select)
+RISK_SOURCES: dict[str, tuple[str, str]] = {
+    "allocations": (
+        "allocation_id",
+        f"allocation_id, amount, investors(investor_name), deals(property_id, {_PROPERTY_SELECT})",
+    ),
+    "projects": ("project_id", f"project_id, status, actual_cost, {_PROPERTY_SELECT}"),
+}
+
+_book_lock = threading.Lock()
+_book_loaded_at = 0.0
+_book = None
+
+
+def _first(embedded: Any) -> dict:
+    """PostgREST embeds one-to-many relations as lists; take the first row."""
+    if isinstance(embedded, list):
+        return embedded[0] if embedded else {}
+    return embedded or {}
+
+
+def _lender(prop: dict) -> Optional[str]:
+    packets = [p for p in prop.get("lender_packets") or [] if (p.get("status") or "draft") != "draft"]
+    if not packets:
+        return None
+    return max(packets, key=lambda p: p.get("created_at") or "").get("loan_type")
+
+
+def _position(table: str, row: dict):
+    """Position for one source row, or None when it carries no exposure."""
+    from dynasty_os.engines.portfolio_risk import Position
+
+    pk = RISK_SOURCES[table][0]
+    if table == "allocations":
+        prop = _first(_first(row.get("deals")).get("properties"))
+        exposure = float(row.get("amount") or 0)
+        asset_type = prop.get("property_type")
+        investor = _first(row.get("investors")).get("investor_name")
+    else:
+        if row.get("status") not in OPEN_PROJECT_STATUSES:
+            return None
+        prop = _first(row.get("properties"))
+        exposure = float(row.get("actual_cost") or 0)
+        asset_type = "Development"
+        investor = None
+    if exposure <= 0:
+        return None
+    market = ", ".join(v for v in (prop.get("city"), prop.get("state")) if v) or None
+    return Position(
+        position_id=f"{table}:{row.get(pk)}",
+        exposure=exposure,
+        asset_type=asset_type,
+        market=market,
+        investor=investor,
+        lender=_lender(prop),
+    )
+
+
+def _fetch(db, table: str) -> list[dict]:
+    pk, columns = RISK_SOURCES[table]
+    rows: list[dict] = []
+    offset = 0
+    while True:
+        q = db.table(table).select(columns).order(pk)
+        page = q.range(offset, offset + LOAD_PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < LOAD_PAGE_SIZE:
+            return rows
+        offset += LOAD_PAGE_SIZE
+
+
+def _liquid_capital(db) -> float:
+    investors = db.table("investors").select("available_capital").in_(
+        "status", LIQUID_INVESTOR_STATUSES
+    ).execute().data or []
+    return sum(float(r.get("available_capital") or 0) for r in investors)
+
+
+def _ensure_loaded(force: bool = False):
+    """Shared PortfolioRiskBook, rebuilt when forced or every PORTFOLIO_RISK_RELOAD_SECONDS."""
+    global _book, _book_loaded_at
+    from dynasty_os.engines.portfolio_risk import PortfolioRiskBook
+
+    with _book_lock:
+        if force or _book is None or time.monotonic() - _book_loaded_at >= PORTFOLIO_RISK_RELOAD_SECONDS:
+            db = get_supabase()
+            positions = [p for table in RISK_SOURCES for row in _fetch(db, table)
+                         if (p := _position(table, row)) is not None]
+            _book = PortfolioRiskBook(positions, _liquid_capital(db))
+            _book_loaded_at = time.monotonic()
+            logger.info("portfolio risk book loaded positions=%d", len(_book))
+        return _book
+
+
+# ─── Models ──────────────────────────────────────────────────────────────────
+
+class RiskEvent(BaseModel):
+    """Supabase database-webhook payload (one row change)."""
+    type: str                       # INSERT / UPDATE / DELETE
+    table: str
+    record: Optional[dict[str, Any]] = None
+    old_record: Optional[dict[str, Any]] = None
+
+
+class ScenarioInput(BaseModel):
+    default: float = 0.0
+    by: dict[str, dict[str, float]] = {}
+
+
+# ─── Routes ──────────────────────────────────────────────────────────────────
+
+@router.get("/report")
+def portfolio_risk_report(
+    max_concentration: float = Query(default=0.25, gt=0, le=1),
+    refresh: bool = False,
+):
+    """Exposures, HHI and top share per dimension, liquidity ratio and default scenario drawdowns."""
+    book = _ensure_loaded(force=refresh)
+    with _book_lock:
+        return book.report(max_concentration)
+
+
+@router.get("/exposures/{dimension}")
+def portfolio_exposures(dimension: str):
+    from dynasty_os.engines.portfolio_risk import DIMENSIONS
+
+    if dimension not in DIMENSIONS:
+        raise HTTPException(400, f"dimension must be one of: {', '.join(DIMENSIONS)}")
+    book = _ensure_loaded()
+    with _book_lock:
+        return {"dimension": dimension, "hhi": round(book.hhi(dimension), 4), "exposures": book.exposures(dimension)}
+
+
+@router.post("/scenarios")
+def run_scenarios(scenarios: dict[str, ScenarioInput]):
+    """Drawdowns under caller-defined shocks, e.g. {"tx_crash": {"by": {"market": {"Austin, TX": -0.3}}}}."""
+    from dynasty_os.engines.portfolio_risk import DIMENSIONS
+
+    for scenario in scenarios.values():
+        unknown = set(scenario.by) - set(DIMENSIONS)
+        if unknown:
+            raise HTTPException(400, f"scenario dimensions must be one of: {', '.join(DIMENSIONS)}")
+    book = _ensure_loaded()
+    with _book_lock:
+        total = book.total_exposure
+        changes = {name: book.scenario_loss(scenario.model_dump()) for name, scenario in scenarios.items()}
+    results = {}
+    for name, change in changes.items():
+        results[name] = {
+            "value_change": round(change, 2),
+            "drawdown_pct": round(-change / total, 4) + 0.0 if total > 0 else 0.0,
+        }
+    return {"total_exposure": round(total, 2), "scenarios": results}
+
+
+@router.get("/metrics")
+def portfolio_risk_metrics():
+    book = _ensure_loaded()
+    with _book_lock:
+        return book.get_metrics()
+
+
+@router.post("/events")
+def apply_risk_events(events: list[RiskEvent]):
+    """Apply allocation / project row changes; the changed row is re-read with its joins.
+
+    Rows are re-read first, then every change is applied under ``_book_lock``
+    so reports and reloads never see half of a batch.
+    """
+    db = get_supabase()
+    changes: list[tuple[str, Any]] = []
+    for event in events:
+        if event.table not in RISK_SOURCES:
+            raise HTTPException(400, f"table must be one of: {', '.join(RISK_SOURCES)}")
+        pk, columns = RISK_SOURCES[event.table]
+        kind = event.type.upper()
+        if kind not in ("INSERT", "UPDATE", "DELETE"):
+            raise HTTPException(400, "type must be one of: INSERT, UPDATE, DELETE")
+        row = (event.old_record if kind == "DELETE" else event.record) or event.record or {}
+        if pk not in row:
+            raise HTTPException(400, f"{kind} events need {pk}")
+        key = f"{event.table}:{row[pk]}"
+        fresh = None
+        if kind != "DELETE":
+            fresh = _first(db.table(event.table).select(columns).eq(pk, row[pk]).limit(1).execute().data)
+        changes.append((key, _position(event.table, fresh) if fresh else None))
+
+    _ensure_loaded()
+    with _book_lock:
+        book = _book
+        for key, position in changes:
+            if position is None:
+                book.remove(key)
+            else:
+                book.upsert(position)
+        positions = len(book)
+    return {"applied": len(changes), "positions": positions}
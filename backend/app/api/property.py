@@ -1,16 +1,55 @@
 """Property Intelligence API — Vacancy, Tax, Ownership, Comps, Rent."""
 from __future__ import annotations
 
+import logging
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from app.address_index import AddressIndex, address_hash, normalize_address, parse_address
 from app.db import get_supabase
+from app.summary import optional_rpc
+
+logger = logging.getLogger("dynasty_property_os.property")
 
 router = APIRouter(prefix="/api/property", tags=["Property Intelligence"])
 
+# Address-keyed tables and their primary key columns.
+ADDRESS_SOURCES = {
+    "properties": "id",
+    "property_vacancy": "vacancy_id",
+    "property_tax": "tax_id",
+    "property_ownership": "ownership_id",
+}
+# Rows pulled for in-process ranking when match_address() isn't deployed.
+ADDRESS_FALLBACK_ROWS = 500
+
+
+def _with_address_keys(row: dict) -> dict:
+    """Add the address_normalized / address_hash columns used for lookups."""
+    key = normalize_address(row.get("address"))
+    if key:
+        row["address_normalized"] = key
+        row["address_hash"] = address_hash(key)
+    return row
+
+
+def _fuzzy_address_rows(db, source: str, query: str, house_number: Optional[str],
+                        limit: int, min_score: float) -> list[dict]:
+    """Candidate rows from the match_address() RPC, or a trigram-indexed LIKE."""
+    id_col = ADDRESS_SOURCES[source]
+    rows = optional_rpc(db, "match_address", {
+        "p_source": source, "p_query": query, "p_limit": limit * 4, "p_min_score": min_score,
+    }, fallback="ranking LIKE candidates in-process")
+    if rows is not None:
+        return [{id_col: r["record_id"], "address": r["address"], "address_normalized": r["address_normalized"]}
+                for r in rows]
+    pattern = f"{house_number} %" if house_number else f"%{query.split(' ', 1)[0]}%"
+    return db.table(source).select(f"{id_col}, address, address_normalized") \
+        .like("address_normalized", pattern).limit(ADDRESS_FALLBACK_ROWS).execute().data or []
+
 
 # ─── Models ──────────────────────────────────────────────────────────────────
 
@@ -99,6 +138,12 @@ class RentCreate(BaseModel):
     source: Optional[str] = None
 
 
+def _contains(value: str) -> str:
+    """Quoted ``%value%`` pattern for a PostgREST or_() filter (commas and parens stay literal)."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"%{escaped}%"'
+
+
 # ─── Routes ──────────────────────────────────────────────────────────────────
 
 @router.get("")
@@ -119,7 +164,11 @@ def list_properties(
     if property_type:
         q = q.eq("property_type", property_type)
     if address:
-        q = q.ilike("address", f"%{address}%")
+        # address_normalized (trigram index, migration 013) holds only the
+        # street key; the raw address (trigram index, migration 017) still
+        # matches city / ZIP searches and rows without a key yet.
+        key = normalize_address(address) or address
+        q = q.or_(f"address_normalized.ilike.{_contains(key)},address.ilike.{_contains(address)}")
     result = q.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
     return {"properties": result.data or [], "offset": offset}
 
@@ -127,12 +176,52 @@ def list_properties(
 @router.post("", status_code=201)
 def create_property(payload: PropertyCreate):
     db = get_supabase()
-    result = db.table("properties").insert(payload.model_dump()).execute()
+    result = db.table("properties").insert(_with_address_keys(payload.model_dump())).execute()
     if not result.data:
         raise HTTPException(500, "Failed to create property")
     return result.data[0]
 
 
+@router.get("/address-match")
+def match_address(
+    address: str,
+    source: str = "properties",
+    limit: int = Query(default=10, ge=1, le=50),
+    min_score: float = Query(default=0.3, ge=0, le=1),
+):
+    """Ranked candidates for a free-text address — dedupe check before inserting.
+
+    Exact normalized-key hits (hash index) come first with score 1.0, then
+    trigram matches ranked by similarity, preferring the same house number.
+    """
+    if source not in ADDRESS_SOURCES:
+        raise HTTPException(400, f"source must be one of: {', '.join(ADDRESS_SOURCES)}")
+    parsed = parse_address(address)
+    if parsed is None:
+        raise HTTPException(400, "address must not be blank")
+
+    db = get_supabase()
+    id_col = ADDRESS_SOURCES[source]
+    exact = db.table(source).select(f"{id_col}, address, address_normalized") \
+        .eq("address_hash", address_hash(parsed.key)).limit(limit).execute().data or []
+    candidates = [
+        {"id": r[id_col], "address": r["address"], "address_normalized": r["address_normalized"],
+         "score": 1.0, "exact": True}
+        for r in exact
+    ]
+
+    seen = {c["id"] for c in candidates}
+    rows = [r for r in _fuzzy_address_rows(db, source, parsed.key, parsed.house_number, limit, min_score)
+            if r[id_col] not in seen]
+    by_id = {r[id_col]: r for r in rows}
+    index = AddressIndex((r[id_col], r.get("address_normalized") or r["address"]) for r in rows)
+    for match in index.search(parsed.key, limit=limit - len(candidates), min_score=min_score):
+        row = by_id[match["id"]]
+        candidates.append({"id": match["id"], "address": row["address"], "address_normalized": match["address"],
+                           "score": match["score"], "exact": False})
+    return {"query": parsed.key, "zip": parsed.zip, "source": source, "candidates": candidates}
+
+
 # ── Vacancy ─────────────────────────────────────────────────────────────────
 
 @router.get("/vacancy")
@@ -159,7 +248,7 @@ def list_vacant(
 @router.post("/vacancy", status_code=201)
 def add_vacancy(payload: VacancyCreate):
     db = get_supabase()
-    result = db.table("property_vacancy").insert(payload.model_dump(exclude_none=True)).execute()
+    result = db.table("property_vacancy").insert(_with_address_keys(payload.model_dump(exclude_none=True))).execute()
     if not result.data:
         raise HTTPException(500, "Failed to add vacancy record")
     return result.data[0]
@@ -186,7 +275,7 @@ def list_tax_delinquent(
 @router.post("/tax", status_code=201)
 def add_tax_record(payload: TaxCreate):
     db = get_supabase()
-    result = db.table("property_tax").insert(payload.model_dump(exclude_none=True)).execute()
+    result = db.table("property_tax").insert(_with_address_keys(payload.model_dump(exclude_none=True))).execute()
     if not result.data:
         raise HTTPException(500, "Failed to create tax record")
     return result.data[0]
@@ -204,7 +293,7 @@ def get_ownership(property_id: UUID):
 @router.post("/ownership", status_code=201)
 def add_ownership(payload: OwnershipCreate):
     db = get_supabase()
-    result = db.table("property_ownership").insert(payload.model_dump(exclude_none=True)).execute()
+    result = db.table("property_ownership").insert(_with_address_keys(payload.model_dump(exclude_none=True))).execute()
     if not result.data:
         raise HTTPException(500, "Failed to create ownership record")
     return result.data[0]
@@ -0,0 +1,153 @@
+"""Acquisitions Work Queue API — next actions per rep from lead_action_queue + seller_followups.
+
+The open rows of both tables are loaded once into the Lead Engine's
+WorkQueueScheduler and kept current by write deltas posted to /events
+(Supabase database-webhook payloads), with a periodic full reload as a
+safety net, so queue screens never sort the whole table per refresh.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from app.db import get_supabase
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+logger = logging.getLogger("dynasty_property_os.work_queue")
+
+router = APIRouter(prefix="/api/work-queue", tags=["Work Queue"])
+
+# Schema holding lead_action_queue / seller_followups (Prisma's "dynasty").
+WORK_QUEUE_SCHEMA = os.getenv("WORK_QUEUE_SCHEMA", "dynasty")
+WORK_QUEUE_RELOAD_SECONDS = float(os.getenv("WORK_QUEUE_RELOAD_SECONDS", "300"))
+LOAD_PAGE_SIZE = 1000
+
+_reload_lock = threading.Lock()
+_last_reload = 0.0
+
+
+@lru_cache(maxsize=1)
+def _scheduler():
+    from dynasty_os.engines.lead_engine import WorkQueueScheduler
+
+    return WorkQueueScheduler()
+
+
+def _load_open_items() -> list:
+    from dynasty_os.engines.lead_engine import OPEN_STATUS, WORK_SOURCES, WorkItem
+
+    db = get_supabase().schema(WORK_QUEUE_SCHEMA)
+    items = []
+    for source in WORK_SOURCES:
+        offset = 0
+        while True:
+            rows = (
+                db.table(source).select("*").eq("status", OPEN_STATUS)
+                .order("id").range(offset, offset + LOAD_PAGE_SIZE - 1).execute().data or []
+            )
+            items.extend(WorkItem.from_row(source, row) for row in rows)
+            if len(rows) < LOAD_PAGE_SIZE:
+                break
+            offset += LOAD_PAGE_SIZE
+    return items
+
+
+def _ensure_loaded(force: bool = False):
+    """Return the scheduler, (re)loading it when stale or forced."""
+    global _last_reload
+    scheduler = _scheduler()
+    if not force and time.monotonic() - _last_reload < WORK_QUEUE_RELOAD_SECONDS and _last_reload:
+        return scheduler
+    with _reload_lock:
+        if force or not _last_reload or time.monotonic() - _last_reload >= WORK_QUEUE_RELOAD_SECONDS:
+            loaded = scheduler.load(_load_open_items())
+            _last_reload = time.monotonic()
+            logger.info("work queue loaded open_items=%d", loaded)
+    return scheduler
+
+
+# ─── Models ──────────────────────────────────────────────────────────────────
+
+class WorkQueueEvent(BaseModel):
+    """Supabase database-webhook payload (one row change)."""
+    type: str                       # INSERT / UPDATE / DELETE
+    table: str
+    record: Optional[dict[str, Any]] = None
+    old_record: Optional[dict[str, Any]] = None
+
+
+# ─── Routes ──────────────────────────────────────────────────────────────────
+
+@router.get("/metrics")
+def work_queue_metrics():
+    return _ensure_loaded().get_metrics()
+
+
+@router.post("/reload")
+def reload_work_queue():
+    scheduler = _ensure_loaded(force=True)
+    return {"status": "reloaded", **scheduler.get_metrics()}
+
+
+@router.post("/events")
+def apply_work_queue_events(events: list[WorkQueueEvent]):
+    """Apply row changes from lead_action_queue / seller_followups webhooks.
+
+    Every event is validated before any is applied, and the batch is applied
+    under ``_reload_lock``, so a reload in progress finishes first instead
+    of overwriting deltas that arrived while it was fetching.
+    """
+    from dynasty_os.engines.lead_engine import WORK_SOURCES, WorkItem
+
+    changes: list[tuple[str, Any]] = []
+    for event in events:
+        if event.table not in WORK_SOURCES:
+            raise HTTPException(400, f"table must be one of: {', '.join(WORK_SOURCES)}")
+        kind = event.type.upper()
+        if kind == "DELETE":
+            row = event.old_record or event.record or {}
+            if "id" not in row:
+                raise HTTPException(400, "DELETE events need old_record.id")
+            changes.append((event.table, row["id"]))
+        elif kind in ("INSERT", "UPDATE"):
+            if not event.record:
+                raise HTTPException(400, f"{kind} events need a record")
+            try:
+                changes.append((event.table, WorkItem.from_row(event.table, event.record)))
+            except (KeyError, TypeError, ValueError) as exc:
+                raise HTTPException(400, f"invalid {event.table} record: {exc!r}") from exc
+        else:
+            raise HTTPException(400, "type must be one of: INSERT, UPDATE, DELETE")
+
+    scheduler = _ensure_loaded()
+    with _reload_lock:
+        for table, change in changes:
+            if isinstance(change, WorkItem):
+                scheduler.upsert(change)
+            else:
+                scheduler.remove(table, change)
+    return {"applied": len(changes)}
+
+
+@router.get("/{assignee}")
+def next_work(assignee: str, limit: int = Query(default=20, ge=1, le=250)):
+    """Next ``limit`` open actions for a rep, highest priority / soonest first."""
+    scheduler = _ensure_loaded()
+    items = scheduler.next_for(assignee, limit)
+    return {
+        "assignee": assignee,
+        "open_items": scheduler.depth(assignee),
+        "items": [item.to_dict() for item in items],
+    }
@@ -0,0 +1,185 @@
+"""Batch buyer-match generation for dynasty.buyer_matches (migrations 020-022).
+
+Shared by POST /api/disposition/buyer-matches/generate and
+scripts/generate_buyer_matches.py. Open deals, their properties, active
+buyer profiles and every buyer_criteria row are read once, scored together
+by dynasty_os.engines.buyer_match_scoring (the frontend's scoreMatch rules,
+vectorized), and compared with the stored matches. Only new or changed
+(deal_id, buyer_profile_id) rows are written, in bulk upserts on that key.
+
+Passing ``deal_ids`` (a new or edited deal) or ``buyer_profile_ids`` (a new
+or edited buyer) limits both the scoring and the diff to that slice, so the
+job can run on every insert instead of re-scoring the whole book. Matches
+that fall below the threshold are left in place, as the frontend generator
+does, so their pipeline status is never lost.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from uuid import uuid4
+
+from postgrest.types import ReturnMethod
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+# Schema holding the Prisma tables ("Deal", "Property", buyer_*).
+BUYER_MATCH_SCHEMA = os.getenv("BUYER_MATCH_SCHEMA", "dynasty")
+CLOSED_DEAL_STATUSES = ["dead", "closed"]
+ACTIVE_BUYER_STATUS = "ACTIVE"
+LOAD_PAGE_SIZE = 1000
+IN_FILTER_CHUNK = 200            # ids per in_() filter, keeps request URLs short
+
+
+def _chunks(values: list[str], size: int = IN_FILTER_CHUNK) -> Iterable[list[str]]:
+    for start in range(0, len(values), size):
+        yield values[start: start + size]
+
+
+class BuyerMatchJob:
+    """One generation run: load, score, diff, bulk upsert."""
+
+    def __init__(self, db, batch_size: int = 500, dry_run: bool = False) -> None:
+        self.db = db.schema(BUYER_MATCH_SCHEMA)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+    # ─── Loading ────────────────────────────────────────────────────────────
+
+    def _paged(self, query_factory) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            page = query_factory().order("id").range(offset, offset + LOAD_PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < LOAD_PAGE_SIZE:
+                return rows
+            offset += LOAD_PAGE_SIZE
+
+    def _by_ids(self, table: str, columns: str, column: str, ids: list[str], **eq) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        for chunk in _chunks(sorted(set(ids))):
+            def query(chunk=chunk):
+                q = self.db.table(table).select(columns).in_(column, chunk)
+                for key, value in eq.items():
+                    q = q.eq(key, value)
+                return q
+            rows.extend(self._paged(query))
+        return rows
+
+    def _load_deals(self, deal_ids: Optional[list[str]], user_ids: Optional[list[str]]) -> list[dict[str, Any]]:
+        columns = "id, userId, propertyId, exitStrategy, purchasePrice, arv, capitalRequired"
+
+        def open_deals(q):
+            return (q.not_.is_("propertyId", "null").neq("decision", "KILL")
+                    .not_.in_("status", CLOSED_DEAL_STATUSES))
+
+        if deal_ids is not None:
+            return [r for chunk in _chunks(sorted(set(deal_ids)))
+                    for r in self._paged(lambda chunk=chunk: open_deals(
+                        self.db.table("Deal").select(columns).in_("id", chunk)))]
+        if user_ids is not None:
+            return [r for chunk in _chunks(sorted(set(user_ids)))
+                    for r in self._paged(lambda chunk=chunk: open_deals(
+                        self.db.table("Deal").select(columns).in_("userId", chunk)))]
+        return self._paged(lambda: open_deals(self.db.table("Deal").select(columns)))
+
+    def _load_profiles(self, profile_ids: Optional[list[str]], user_ids: Optional[list[str]]) -> list[dict[str, Any]]:
+        columns = "id, user_id"
+        if profile_ids is not None:
+            return self._by_ids("buyer_profiles", columns, "id", profile_ids, status=ACTIVE_BUYER_STATUS)
+        if user_ids is not None:
+            return self._by_ids("buyer_profiles", columns, "user_id", user_ids, status=ACTIVE_BUYER_STATUS)
+        return self._paged(lambda: self.db.table("buyer_profiles").select(columns).eq("status", ACTIVE_BUYER_STATUS))
+
+    # ─── Run ────────────────────────────────────────────────────────────────
+
+    def run(self, deal_ids: Optional[list[str]] = None,
+            buyer_profile_ids: Optional[list[str]] = None) -> dict[str, Any]:
+        from dynasty_os.engines.buyer_match_scoring import CriteriaInput, DealInput, best_matches
+
+        started = time.perf_counter()
+        # An incremental run only needs the other side for the same users.
+        if deal_ids is not None:
+            deals = self._load_deals(deal_ids, None)
+            profiles = self._load_profiles(buyer_profile_ids, [d["userId"] for d in deals])
+        elif buyer_profile_ids is not None:
+            profiles = self._load_profiles(buyer_profile_ids, None)
+            deals = self._load_deals(None, [p["user_id"] for p in profiles])
+        else:
+            deals = self._load_deals(None, None)
+            profiles = self._load_profiles(None, None)
+
+        properties = {
+            p["id"]: p for p in self._by_ids(
+                "Property", "id, propertyType, city, state", "id", [d["propertyId"] for d in deals]
+            )
+        }
+        deal_inputs = [DealInput.from_rows(d, properties[d["propertyId"]])
+                       for d in deals if d["propertyId"] in properties]
+        active = {p["id"] for p in profiles}
+        criteria = [
+            CriteriaInput.from_row(r)
+            for r in self._by_ids("buyer_criteria", "*", "buyer_profile_id", list(active))
+            if r["buyer_profile_id"] in active
+        ]
+        matches = best_matches(deal_inputs, criteria)
+        criteria_per_user = Counter(c.user_id for c in criteria)
+        pairs_scored = sum(n * criteria_per_user[u] for u, n in Counter(d.user_id for d in deal_inputs).items())
+
+        existing = {
+            (r["deal_id"], r["buyer_profile_id"]): r
+            for r in self._by_ids("buyer_matches", "id, deal_id, buyer_profile_id, match_score, match_reasons",
+                                  "deal_id", [d.deal_id for d in deal_inputs])
+            if r["buyer_profile_id"] in active
+        }
+        now = datetime.utcnow().isoformat(timespec="milliseconds")
+        rows, inserted, updated = [], 0, 0
+        for m in matches:
+            reasons = list(m.match_reasons)
+            current = existing.get((m.deal_id, m.buyer_profile_id))
+            if current is not None and current["match_score"] == m.match_score \
+                    and list(current.get("match_reasons") or []) == reasons:
+                continue
+            if current is None:
+                inserted += 1
+            else:
+                updated += 1
+            rows.append({
+                "id": current["id"] if current else uuid4().hex,
+                "deal_id": m.deal_id,
+                "property_id": m.property_id,
+                "buyer_profile_id": m.buyer_profile_id,
+                "user_id": m.user_id,
+                "match_score": m.match_score,
+                "match_reasons": reasons,
+                "updated_at": now,
+            })
+
+        if not self.dry_run:
+            for start in range(0, len(rows), self.batch_size):
+                self.db.table("buyer_matches").upsert(
+                    rows[start: start + self.batch_size],
+                    on_conflict="deal_id,buyer_profile_id", returning=ReturnMethod.minimal,
+                ).execute()
+
+        return {
+            "deals": len(deal_inputs),
+            "buyer_profiles": len(active),
+            "criteria": len(criteria),
+            "pairs_scored": pairs_scored,
+            "matches": len(matches),
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": len(matches) - inserted - updated,
+            "written": 0 if self.dry_run else len(rows),
+            "dry_run": self.dry_run,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
@@ -0,0 +1,49 @@
+"""Short-lived in-process caching for read-heavy dashboard endpoints."""
+from __future__ import annotations
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def ttl_cache(seconds: float) -> Callable[[F], F]:
+    """Cache a function's result per argument tuple for ``seconds``.
+
+    Meant for aggregate endpoints where slightly stale numbers are fine.
+    Concurrent misses for the same key compute once, while misses for
+    different keys don't wait on each other; the wrapped function gains
+    ``cache_clear()`` for tests and for writes that must show up immediately.
+    """
+
+    def decorator(func: F) -> F:
+        entries: dict[tuple, tuple[float, Any]] = {}
+        key_locks: dict[tuple, threading.Lock] = {}
+        locks_guard = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = entries.get(key)
+            if hit and hit[0] > now:
+                return hit[1]
+            with locks_guard:
+                lock = key_locks.setdefault(key, threading.Lock())
+            with lock:
+                hit = entries.get(key)
+                if hit and hit[0] > time.monotonic():
+                    return hit[1]
+                value = func(*args, **kwargs)
+                entries[key] = (time.monotonic() + seconds, value)
+                return value
+
+        wrapper.cache_clear = entries.clear  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+__all__ = ["ttl_cache"]
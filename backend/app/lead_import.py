@@ -0,0 +1,240 @@
+"""Streaming bulk lead import shared by POST /api/leads/import and scripts/import_leads.py.
+
+Rows are read one at a time from CSV or NDJSON, validated against the Lead
+Engine vocabularies, and written in batches: one leads upsert plus one
+lead_activities insert per batch. Bad rows are reported by line number and
+never stop the stream. Rows carrying an address, phone or email get an
+``import_key`` so re-imports (and repeats within a file) are skipped; the
+address part is canonicalized first, so "123 N Main St" and "123 North Main
+Street" are the same lead.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Iterable, Iterator, Optional
+
+from app.address_index import normalize_address
+
+DEDUPE_FIELDS = ("address", "phone", "email")
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Spellings seen in list-vendor and driving-for-dollars exports.
+SOURCE_ALIASES = {
+    "driving for dollars": "Drive-By",
+    "d4d": "Drive-By",
+    "drive by": "Drive-By",
+    "public record": "Public Records",
+    "mail": "Direct Mail",
+}
+
+MAX_REPORTED_ERRORS = 1000
+
+
+def _vocabulary() -> tuple[dict[str, str], dict[str, str], dict[str, str]]:
+    from app.api.leads import LEAD_SOURCES, LEAD_STATUSES, LEAD_TYPES
+
+    def fold(values: Iterable[str]) -> dict[str, str]:
+        return {v.lower(): v for v in values}
+
+    return fold(LEAD_TYPES), {**fold(LEAD_SOURCES), **SOURCE_ALIASES}, fold(LEAD_STATUSES)
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[tuple[int, Optional[dict[str, Any]], Optional[str]]]:
+    """Yield (line_number, record, parse_error) for each non-blank input row."""
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            if not any((v or "").strip() for v in record.values() if isinstance(v, str)):
+                continue
+            if None in record:
+                yield reader.line_num, None, "more values than header columns"
+                continue
+            yield reader.line_num, record, None
+    elif fmt == "ndjson":
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield number, None, f"invalid JSON: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield number, None, "each line must be a JSON object"
+                continue
+            yield number, record, None
+    else:
+        raise ValueError(f"format must be one of: {IMPORT_FORMATS}")
+
+
+def import_key(lead_type: str, record: dict[str, Any]) -> Optional[str]:
+    """Stable dedupe key from lead type plus normalized address/phone/email."""
+    parts = []
+    for name in DEDUPE_FIELDS:
+        value = str(record.get(name) or "").strip().lower()
+        if name == "phone":
+            value = re.sub(r"\D", "", value)[-10:]
+        elif name == "address":
+            value = normalize_address(value) or ""
+        else:
+            value = " ".join(value.split())
+        parts.append(value)
+    if not any(parts):
+        return None
+    return hashlib.sha1("|".join([lead_type, *parts]).encode()).hexdigest()
+
+
+@dataclass
+class ImportReport:
+    received: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    def error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "batches": self.batches,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "warnings": self.warnings,
+        }
+
+
+class LeadImporter:
+    """Validate and batch-insert lead records into Supabase.
+
+    ``default_lead_type`` / ``default_source`` fill rows that omit them,
+    e.g. a whole Direct Mail list of Seller leads.
+    """
+
+    def __init__(self, db, batch_size: int = 2000, default_lead_type: Optional[str] = None,
+                 default_source: Optional[str] = None) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.default_lead_type = default_lead_type
+        self.default_source = default_source
+        self.report = ImportReport()
+        self._types, self._sources, self._statuses = _vocabulary()
+        self._seen_keys: set[str] = set()
+        self._pending: list[tuple[int, dict[str, Any]]] = []
+
+    def validate(self, record: dict[str, Any]) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+        """Map a raw record to a leads row, or return an error message."""
+        raw = {str(k).strip().lower(): (v.strip() if isinstance(v, str) else v) for k, v in record.items()}
+        metadata = raw.pop("metadata", None) or {}
+        if not isinstance(metadata, dict):
+            return None, "metadata must be an object"
+
+        lead_type_raw = raw.pop("lead_type", None) or self.default_lead_type
+        lead_type = self._types.get(str(lead_type_raw or "").lower())
+        if not lead_type:
+            return None, f"invalid lead_type {lead_type_raw!r}"
+
+        row: dict[str, Any] = {"lead_type": lead_type, "status": "New"}
+        source_raw = raw.pop("source", None) or self.default_source
+        if source_raw:
+            source = self._sources.get(str(source_raw).lower())
+            if not source:
+                return None, f"invalid source {source_raw!r}"
+            row["source"] = source
+        status_raw = raw.pop("status", None)
+        if status_raw:
+            status = self._statuses.get(str(status_raw).lower())
+            if not status:
+                return None, f"invalid status {status_raw!r}"
+            row["status"] = status
+        next_action = raw.pop("next_action_date", None)
+        if next_action:
+            try:
+                row["next_action_date"] = date.fromisoformat(str(next_action)).isoformat()
+            except ValueError:
+                return None, f"invalid next_action_date {next_action!r}"
+        for name in ("owner", "pipeline_stage", "notes"):
+            value = raw.pop(name, None)
+            if value:
+                row[name] = value
+
+        metadata = {**metadata, **{k: v for k, v in raw.items() if v not in (None, "")}}
+        row["metadata"] = metadata
+        row["import_key"] = import_key(lead_type, metadata)
+        return row, None
+
+    def add(self, line: int, record: Optional[dict[str, Any]], parse_error: Optional[str] = None) -> None:
+        self.report.received += 1
+        if parse_error:
+            self.report.error(line, parse_error)
+            return
+        row, error = self.validate(record or {})
+        if error:
+            self.report.error(line, error)
+            return
+        key = row["import_key"]
+        if key is not None:
+            if key in self._seen_keys:
+                self.report.duplicates += 1
+                return
+            self._seen_keys.add(key)
+        self._pending.append((line, row))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending batch: leads upsert, then their Created activities."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.report.batches += 1
+        rows = [row for _, row in batch]
+        try:
+            inserted = self.db.table("leads").upsert(
+                rows, on_conflict="import_key", ignore_duplicates=True
+            ).execute().data or []
+        except Exception as exc:  # noqa: BLE001 - report the batch, keep streaming
+            for line, _ in batch:
+                self.report.error(line, f"insert failed: {exc}")
+            return
+
+        self.report.inserted += len(inserted)
+        self.report.duplicates += len(rows) - len(inserted)
+        if not inserted:
+            return
+        activities = [
+            {
+                "lead_id": lead["lead_id"],
+                "activity_type": "Created",
+                "description": f"Lead created via import — source: {lead.get('source') or 'unknown'}",
+            }
+            for lead in inserted
+        ]
+        try:
+            self.db.table("lead_activities").insert(activities).execute()
+        except Exception as exc:  # noqa: BLE001 - the leads themselves are already in
+            self.report.warnings.append(
+                f"batch {self.report.batches}: Created activities not logged for {len(activities)} leads: {exc}"
+            )
+
+    def run(self, lines: Iterable[str], fmt: str) -> dict[str, Any]:
+        for line, record, parse_error in iter_records(lines, fmt):
+            self.add(line, record, parse_error)
+        self.flush()
+        return self.report.as_dict()
+
+
+__all__ = ["IMPORT_FORMATS", "ImportReport", "LeadImporter", "import_key", "iter_records"]
@@ -13,9 +13,12 @@ from pydantic import BaseModel
 from dotenv import load_dotenv
 from app.api.deals import router as engines_router
 from app.api.leads import router as leads_router
+from app.api.work_queue import router as work_queue_router
 from app.api.deal_engine import router as deal_router
 from app.api.property import router as property_router
 from app.api.capital import router as capital_router
+from app.api.liquidity import router as liquidity_router
+from app.api.portfolio_risk import router as portfolio_risk_router
 from app.api.disposition import router as disposition_router
 from app.api.land_build_uw_dd import router as land_build_router
 from app.api.sync import router as sync_router
@@ -36,6 +39,7 @@ app.include_router(engines_router)
 
 # ── Lead Engine ───────────────────────────────────────────────────────────────
 app.include_router(leads_router)
+app.include_router(work_queue_router)
 
 # ── Deal Engine ───────────────────────────────────────────────────────────────
 app.include_router(deal_router)
@@ -45,6 +49,8 @@ app.include_router(property_router)
 
 # ── Capital Engine ────────────────────────────────────────────────────────────
 app.include_router(capital_router)
+app.include_router(liquidity_router)
+app.include_router(portfolio_risk_router)
 
 # ── Disposition Engine ────────────────────────────────────────────────────────
 app.include_router(disposition_router)
@@ -0,0 +1,421 @@
+"""Process-wide metrics registry with per-worker snapshots.
+
+Each registry keeps lock-guarded counters, fixed-bucket latency
+histograms and KLL quantile sketches (for business values such as days on
+market, whose range no fixed bucket set fits) in memory. Workers
+periodically write their snapshot to a shared directory (one JSON file per
+process), and aggregate() merges every file into a cluster-wide view, so a
+request served by any worker sees the same totals.
+
+Snapshots of workers that have exited are folded into one
+``<namespace>-retired.json`` file by whichever worker aggregates next, so the
+directory holds one file per live worker and dead workers' totals are kept
+without being read one file at a time forever.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable
+from uuid import uuid4
+
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+from dynasty_os.engines.quantile_sketch import KLLSketch
+
+logger = logging.getLogger("dynasty_property_os.metrics")
+
+# Upper bounds in milliseconds; the final bucket catches everything slower.
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+DEFAULT_METRICS_DIR = Path(__file__).resolve().parents[1] / "storage" / "metrics"
+
+# A snapshot from another host not rewritten for this long is treated as a
+# dead worker's. Workers on this host are checked by pid instead.
+STALE_SNAPSHOT_SECONDS = 24 * 3600
+# A fold lock older than this was left by a crashed worker.
+FOLD_LOCK_SECONDS = 60
+
+RETIRED_WORKER_ID = "retired"
+
+
+def _empty_histogram() -> dict[str, Any]:
+    return {"buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1), "count": 0, "sum_ms": 0.0}
+
+
+def _merge_histogram(into: dict[str, Any], other: dict[str, Any]) -> None:
+    into["buckets"] = [a + b for a, b in zip(into["buckets"], other["buckets"])]
+    into["count"] += other["count"]
+    into["sum_ms"] += other["sum_ms"]
+
+
+def _subtract_histogram(into: dict[str, Any], other: dict[str, Any]) -> None:
+    into["buckets"] = [a - b for a, b in zip(into["buckets"], other["buckets"])]
+    into["count"] -= other["count"]
+    into["sum_ms"] -= other["sum_ms"]
+
+
+def _merge_snapshots(
+    snapshots: Iterable[dict[str, Any]],
+) -> tuple[dict[str, int], dict[str, dict[str, Any]], dict[str, KLLSketch]]:
+    counters: dict[str, int] = {}
+    histograms: dict[str, dict[str, Any]] = {}
+    sketches: dict[str, KLLSketch] = {}
+    for data in snapshots:
+        for name, value in data.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+        for name, histogram in data.get("histograms", {}).items():
+            _merge_histogram(histograms.setdefault(name, _empty_histogram()), histogram)
+        for name, sketch in data.get("sketches", {}).items():
+            sketches.setdefault(name, KLLSketch()).merge(KLLSketch.from_dict(sketch))
+    return counters, histograms, sketches
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists but owned by someone else
+    return True
+
+
+def _percentile(histogram: dict[str, Any], q: float) -> float | None:
+    """Bucket upper bound at quantile ``q`` (None for an empty or overflow bucket)."""
+    if not histogram["count"]:
+        return None
+    rank = q * histogram["count"]
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS, histogram["buckets"]):
+        seen += count
+        if seen >= rank:
+            return float(bound)
+    return None
+
+
+def summarize_histogram(histogram: dict[str, Any]) -> dict[str, Any]:
+    count = histogram["count"]
+    return {
+        "count": count,
+        "mean_ms": round(histogram["sum_ms"] / count, 2) if count else None,
+        "p50_ms": _percentile(histogram, 0.50),
+        "p95_ms": _percentile(histogram, 0.95),
+        "p99_ms": _percentile(histogram, 0.99),
+    }
+
+
+def nest_counters(counters: dict[str, int], into: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Expand dotted counter names (``section.key.sub``) into nested dicts."""
+    nested = into if into is not None else {}
+    for name, value in counters.items():
+        *path, leaf = name.split(".")
+        node = nested
+        for part in path:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        node[leaf] = value
+    return nested
+
+
+class MetricsRegistry:
+    """Counters, latency histograms and value sketches for one API area.
+
+    ``snapshot_dir`` is shared by all workers of a deployment; set it to
+    None to keep metrics in-process only. ``flush_at_exit`` writes a final
+    snapshot when the process exits (tests turn it off).
+    """
+
+    def __init__(self, namespace: str, snapshot_dir: str | Path | None = None,
+                 flush_interval: float = 5.0, stale_after: float = STALE_SNAPSHOT_SECONDS,
+                 flush_at_exit: bool = True) -> None:
+        self.namespace = namespace
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.flush_interval = flush_interval
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._histograms: dict[str, dict[str, Any]] = {}
+        self._sketches: dict[str, KLLSketch] = {}
+        # What the last flush wrote, and the sketch values recorded since:
+        # enough to drop the written part if another worker folds our file.
+        self._flushed: dict[str, Any] | None = None
+        self._unflushed_values: dict[str, list[float]] = {}
+        self._started_at = time.time()
+        self._host, self._pid = socket.gethostname(), os.getpid()
+        self._worker_id = f"{self._host}-{self._pid}-{uuid4().hex[:8]}"
+        self._last_flush = 0.0
+        if self.snapshot_dir and flush_at_exit:
+            atexit.register(self.flush)
+
+    # ── Recording ──────────────────────────────────────────────────────────
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name: str, duration_ms: float) -> None:
+        bucket = bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _empty_histogram()
+            histogram["buckets"][bucket] += 1
+            histogram["count"] += 1
+            histogram["sum_ms"] += duration_ms
+        self._maybe_flush()
+
+    def record_value(self, name: str, value: float) -> None:
+        """Add ``value`` to the quantile sketch ``name`` (merged across workers by aggregate())."""
+        with self._lock:
+            sketch = self._sketches.get(name)
+            if sketch is None:
+                sketch = self._sketches[name] = KLLSketch()
+            sketch.add(value)
+            if self.snapshot_dir:
+                self._unflushed_values.setdefault(name, []).append(value)
+        self._maybe_flush()
+
+    def record_engine(self, section: str, metrics: dict[str, Any]) -> None:
+        """Add the integer counters from an engine's get_metrics() under ``section``.
+
+        Nested dicts (e.g. per-exit-type counts) are flattened with dots;
+        averages and other floats are not additive and are skipped.
+        """
+        flat: dict[str, int] = {}
+
+        def walk(prefix: str, value: Any) -> None:
+            if isinstance(value, dict):
+                for key, inner in value.items():
+                    walk(f"{prefix}.{key}", inner)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                flat[prefix] = value
+
+        walk(section, metrics)
+        with self._lock:
+            for name, value in flat.items():
+                self._counters[name] = self._counters.get(name, 0) + value
+        self._maybe_flush()
+
+    # ── Snapshots ──────────────────────────────────────────────────────────
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return self._snapshot_locked()
+
+    def _snapshot_locked(self) -> dict[str, Any]:
+        return {
+            "worker_id": self._worker_id,
+            "host": self._host,
+            "pid": self._pid,
+            "started_at": self._started_at,
+            "counters": dict(self._counters),
+            "histograms": {
+                name: {**h, "buckets": list(h["buckets"])} for name, h in self._histograms.items()
+            },
+            "sketches": {name: sketch.to_dict() for name, sketch in self._sketches.items()},
+        }
+
+    def _snapshot_path(self) -> Path:
+        return self.snapshot_dir / f"{self.namespace}-{self._worker_id}.json"
+
+    def _retired_path(self) -> Path:
+        return self.snapshot_dir / f"{self.namespace}-{RETIRED_WORKER_ID}.json"
+
+    def _maybe_flush(self) -> None:
+        if self.snapshot_dir and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _drop_flushed_locked(self) -> None:
+        """Forget what the last flush wrote; it now lives in the retired file."""
+        for name, value in self._flushed["counters"].items():
+            remaining = self._counters.get(name, 0) - value
+            if remaining:
+                self._counters[name] = remaining
+            else:
+                self._counters.pop(name, None)
+        for name, written in self._flushed["histograms"].items():
+            histogram = self._histograms.get(name)
+            if histogram is not None:
+                _subtract_histogram(histogram, written)
+                if not histogram["count"]:
+                    del self._histograms[name]
+        self._sketches = {}
+        for name, values in self._unflushed_values.items():
+            sketch = self._sketches[name] = KLLSketch()
+            sketch.extend(values)
+
+    def flush(self) -> None:
+        """Atomically write this worker's snapshot to the shared directory."""
+        if not self.snapshot_dir:
+            return
+        self._last_flush = time.monotonic()
+        path = self._snapshot_path()
+        tmp = path.with_suffix(".tmp")
+        with self._lock:
+            if self._flushed is not None and not path.exists():
+                # Our file was folded into the retired totals (we sat idle past
+                # stale_after); rewriting it whole would count it twice.
+                self._drop_flushed_locked()
+            data = self._snapshot_locked()
+            pending, self._unflushed_values = self._unflushed_values, {}
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, path)
+        except OSError:
+            logger.warning("metrics snapshot write failed path=%s", path, exc_info=True)
+            with self._lock:
+                for name, values in pending.items():
+                    self._unflushed_values.setdefault(name, [])[:0] = values
+            return
+        self._flushed = data
+
+    def _is_dead(self, data: dict[str, Any], path: Path, now: float) -> bool:
+        if data.get("host") == self._host and isinstance(data.get("pid"), int):
+            if not _process_alive(data["pid"]):
+                return True
+        try:
+            return now - path.stat().st_mtime > self.stale_after
+        except OSError:
+            return False
+
+    def _fold(self, stale: list[Path]) -> None:
+        """Merge dead workers' snapshots into the retired file and delete them.
+
+        One worker folds at a time (an O_EXCL lock file); the others skip
+        and keep reading the stale files until it is done.
+        """
+        lock = self.snapshot_dir / f"{self.namespace}.fold.lock"
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime > FOLD_LOCK_SECONDS:
+                    lock.unlink()
+            except OSError:
+                pass
+            return
+        except OSError:
+            logger.warning("metrics fold lock failed path=%s", lock, exc_info=True)
+            return
+        try:
+            retired_path = self._retired_path()
+            try:
+                retired = [json.loads(retired_path.read_text())]
+            except FileNotFoundError:
+                retired = []
+            claimed, folded = [], []
+            for path in stale:
+                # Renaming claims the file: a worker that rewrites it after
+                # this point starts a fresh one (see flush()).
+                target = path.with_suffix(".folding")
+                try:
+                    os.rename(path, target)
+                    folded.append(json.loads(target.read_text()))
+                except FileNotFoundError:
+                    continue
+                claimed.append(target)
+            if not claimed:
+                return
+            counters, histograms, sketches = _merge_snapshots(retired + folded)
+            tmp = retired_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({
+                "worker_id": RETIRED_WORKER_ID,
+                "folded_at": time.time(),
+                "counters": counters,
+                "histograms": histograms,
+                "sketches": {name: sketch.to_dict() for name, sketch in sketches.items()},
+            }))
+            os.replace(tmp, retired_path)
+            for target in claimed:
+                target.unlink()
+        except (OSError, ValueError):
+            logger.warning("metrics fold failed dir=%s", self.snapshot_dir, exc_info=True)
+        finally:
+            try:
+                lock.unlink()
+            except OSError:
+                pass
+
+    def aggregate(self) -> dict[str, Any]:
+        """Merge every worker's latest snapshot (this worker's live state wins).
+
+        ``sketches`` holds merged KLLSketch objects; read them with
+        ``summary()`` or ``quantile()``. Dead workers' files found along the
+        way are folded into the retired file for later calls.
+        """
+        snapshots = {self._worker_id: self.snapshot()}
+        stale: list[Path] = []
+        if self.snapshot_dir and self.snapshot_dir.is_dir():
+            now = time.time()
+            for path in self.snapshot_dir.glob(f"{self.namespace}-*.json"):
+                try:
+                    data = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                worker_id = data.get("worker_id", path.stem)
+                if worker_id not in (self._worker_id, RETIRED_WORKER_ID) and self._is_dead(data, path, now):
+                    stale.append(path)
+                snapshots.setdefault(worker_id, data)
+
+        counters, histograms, sketches = _merge_snapshots(snapshots.values())
+        if stale:
+            self._fold(stale)
+        workers = len(snapshots) - (RETIRED_WORKER_ID in snapshots) - len(stale)
+        return {"workers": workers, "counters": counters, "histograms": histograms, "sketches": sketches}
+
+    # ── FastAPI integration ────────────────────────────────────────────────
+
+    @property
+    def route_class(self) -> type[APIRoute]:
+        """APIRoute subclass that counts requests/errors and times every handler."""
+        registry = self
+
+        class MeteredRoute(APIRoute):
+            def get_route_handler(self) -> Callable:
+                handler = super().get_route_handler()
+                label = f"{sorted(self.methods)[0]} {self.path_format}"
+
+                async def metered_handler(request: Request) -> Response:
+                    start = perf_counter()
+                    status = 500
+                    try:
+                        response = await handler(request)
+                        status = response.status_code
+                        return response
+                    except Exception as exc:
+                        status = 422 if isinstance(exc, RequestValidationError) else getattr(exc, "status_code", 500)
+                        raise
+                    finally:
+                        registry.observe(f"latency:{label}", (perf_counter() - start) * 1000)
+                        registry.incr(f"requests:{label}")
+                        if status >= 400:
+                            registry.incr(f"errors:{label}")
+
+                return metered_handler
+
+        return MeteredRoute
+
+
+__all__ = [
+    "DEFAULT_METRICS_DIR",
+    "LATENCY_BUCKETS_MS",
+    "MetricsRegistry",
+    "STALE_SNAPSHOT_SECONDS",
+    "nest_counters",
+    "summarize_histogram",
+]
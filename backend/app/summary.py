@@ -0,0 +1,133 @@
+"""Shared plumbing for the aggregate (SQL-side) summary endpoints.
+
+/api/capital/deployed, /api/capital/returns and /api/disposition/profit are
+served by the JSONB functions in migration 015, which return only totals
+plus optional per-period buckets. When that migration isn't applied the
+endpoints fall back to summing rows in Python; period_start() buckets those
+rows the same way ``date_trunc()`` does so both paths answer identically.
+
+optional_rpc() is the one place that detects a missing RPC; the lead,
+property and ledger routes use it for their own functions too.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+logger = logging.getLogger("dynasty_property_os.summary")
+
+SUMMARY_PERIODS = ("month", "quarter", "year")
+SUMMARY_TTL_SECONDS = 15
+
+# PostgREST error code for "function not found in the schema cache".
+RPC_NOT_FOUND = "PGRST202"
+_missing_rpcs: set[str] = set()
+
+
+def rpc_deployed(function: str) -> bool:
+    """False once ``function`` has been found missing in this process."""
+    return function not in _missing_rpcs
+
+
+def optional_rpc(db, function: str, params: dict, fallback: str = "summing rows instead") -> Optional[Any]:
+    """Call an RPC, or None when it isn't deployed (remembered for the process lifetime).
+
+    ``fallback`` names what the caller does instead, for the warning logged
+    the first time the function is missing. Other API errors propagate.
+    """
+    if function in _missing_rpcs:
+        return None
+    try:
+        return db.rpc(function, params).execute().data
+    except APIError as exc:
+        if exc.code != RPC_NOT_FOUND:
+            raise
+        logger.warning("%s RPC not deployed; %s", function, fallback)
+        _missing_rpcs.add(function)
+        return None
+
+
+def check_period(period: Optional[str]) -> None:
+    """Reject a ``period`` outside SUMMARY_PERIODS with a 400."""
+    if period is not None and period not in SUMMARY_PERIODS:
+        raise HTTPException(400, f"period must be one of: {', '.join(SUMMARY_PERIODS)}")
+
+
+def period_start(value: Any, period: str) -> Optional[str]:
+    """First day of ``value``'s month/quarter/year as an ISO date.
+
+    Timestamps with an offset are moved to UTC first, as ``date_trunc()`` on
+    a TIMESTAMPTZ does under Supabase's UTC session time zone.
+    """
+    if not value:
+        return None
+    text = str(value)
+    day = date.fromisoformat(text[:10])
+    if len(text) > 10:
+        stamp = datetime.fromisoformat(text)
+        if stamp.tzinfo is not None:
+            day = stamp.astimezone(timezone.utc).date()
+    if period == "year":
+        return date(day.year, 1, 1).isoformat()
+    if period == "quarter":
+        return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1).isoformat()
+    return date(day.year, day.month, 1).isoformat()
+
+
+def bucket_totals(
+    rows: Iterable[dict],
+    date_field: str,
+    period: str,
+    fields: dict[str, str],
+    count_as: Optional[str] = None,
+) -> dict[str, dict[str, float]]:
+    """Sum ``fields`` (row column -> output key) per period bucket."""
+    buckets: dict[str, dict[str, float]] = {}
+    for row in rows:
+        bucket = period_start(row.get(date_field), period)
+        if bucket is None:
+            continue
+        totals = buckets.setdefault(bucket, {})
+        if count_as:
+            totals[count_as] = totals.get(count_as, 0) + 1
+        for column, key in fields.items():
+            totals[key] = totals.get(key, 0.0) + float(row.get(column) or 0)
+    return buckets
+
+
+def bucket_rows(buckets: dict[str, dict[str, float]]) -> list[dict[str, Any]]:
+    """Buckets as ``[{"period": ..., **totals}]``, oldest first, amounts rounded."""
+    return [
+        {"period": bucket, **{k: round(v, 2) if isinstance(v, float) else v for k, v in totals.items()}}
+        for bucket, totals in sorted(buckets.items())
+    ]
+
+
+def closing_buckets(closings: list[dict], period: Optional[str]) -> list[dict[str, Any]]:
+    """Python twin of the ``closings_by_period`` SQL function."""
+    if not period:
+        return []
+    return bucket_rows(bucket_totals(
+        closings, "close_date", period,
+        {"net_profit": "total_net_profit", "capital_recovered": "total_capital_recovered",
+         "sale_price": "total_revenue"},
+        count_as="closed_deals",
+    ))
+
+
+__all__ = [
+    "RPC_NOT_FOUND",
+    "SUMMARY_PERIODS",
+    "SUMMARY_TTL_SECONDS",
+    "bucket_rows",
+    "bucket_totals",
+    "check_period",
+    "closing_buckets",
+    "optional_rpc",
+    "period_start",
+    "rpc_deployed",
+]
@@ -0,0 +1,276 @@
+"""Exact 0/1 capital allocation: knapsack and multi-pool solvers.
+
+Replaces "sort by priority and fund what fits" in the Capital Engine's
+AllocationEngine and /api/engines/capital-allocation. The single-pool solver
+runs a NumPy dynamic program over capital discretized into at most
+``max_units`` buckets (weights rounded *up*, so every answer is feasible in
+real dollars), then a depth-first branch-and-bound on exact amounts, seeded
+with that answer, to prove optimality or improve on it within the time
+budget. Results carry the LP-relaxation upper bound and the relative gap, so
+callers can tell an optimal plan (gap 0) from a best-found one.
+
+The multi-pool variant assigns each deal to at most one pool (optionally
+restricted by eligibility), solving pools largest-first and then trying
+single-deal moves and swaps between pools; its gap is measured against the
+relaxation that pools all eligible capital together.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Sequence
+
+import numpy as np
+
+DEFAULT_TIME_BUDGET = 0.75    # seconds
+DEFAULT_MAX_UNITS = 20_000    # capital buckets in the DP grid
+MAX_DP_CELLS = 50_000_000     # deals x buckets; coarser buckets beyond this
+
+
+@dataclass
+class KnapsackResult:
+    selected: list[int]                 # indices into the input arrays
+    value: float
+    capital_used: float
+    upper_bound: float
+    optimal: bool
+    method: str
+    elapsed_ms: float
+    assignments: dict[int, int] = field(default_factory=dict)   # deal index -> pool index (multi-pool)
+
+    @property
+    def gap(self) -> float:
+        """Relative distance to the upper bound (0.0 when proven optimal)."""
+        if self.optimal or self.upper_bound <= 0:
+            return 0.0
+        return max(self.upper_bound - self.value, 0.0) / self.upper_bound
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "selected": self.selected,
+            "value": round(self.value, 4),
+            "capital_used": round(self.capital_used, 2),
+            "upper_bound": round(self.upper_bound, 4),
+            "gap": round(self.gap, 6),
+            "optimal": self.optimal,
+            "method": self.method,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+
+def lp_bound(weights: np.ndarray, values: np.ndarray, capacity: float) -> float:
+    """Fractional-knapsack (LP relaxation) bound; items with value <= 0 are ignored."""
+    useful = values > 0
+    free = useful & (weights <= 0)
+    w, v = weights[useful & ~free], values[useful & ~free]
+    order = np.argsort(-v / w, kind="stable")
+    w, v = w[order], v[order]
+    filled = np.cumsum(w)
+    whole = filled <= capacity
+    bound = float(values[free].sum() + v[whole].sum())
+    k = int(whole.sum())
+    if k < len(w):
+        room = capacity - (filled[k - 1] if k else 0.0)
+        bound += float(v[k] * room / w[k])
+    return bound
+
+
+def _dp_select(weights: np.ndarray, values: np.ndarray, capacity: float,
+               max_units: int, deadline: float) -> tuple[list[int], bool]:
+    """DP over discretized capital; returns (selection, finished_before_deadline)."""
+    n = len(weights)
+    max_units = max(min(max_units, MAX_DP_CELLS // max(n, 1)), 1)
+    unit = max(capacity / max_units, 1e-9)
+    cap_units = int(np.floor(capacity / unit + 1e-9))
+    units = np.ceil(weights / unit - 1e-9).astype(np.int64)
+
+    best = np.zeros(cap_units + 1)
+    take = np.zeros((n, cap_units + 1), dtype=bool)
+    for i in range(n):
+        w, v = units[i], values[i]
+        if v <= 0 or w > cap_units:
+            continue
+        if w == 0:
+            best += v
+            take[i, :] = True
+            continue
+        candidate = best[:-w] + v
+        better = candidate > best[w:]
+        take[i, w:] = better
+        best[w:] = np.where(better, candidate, best[w:])
+        if perf_counter() > deadline:
+            return [], False
+
+    selected: list[int] = []
+    c = cap_units
+    for i in range(n - 1, -1, -1):
+        if take[i, c]:
+            selected.append(i)
+            c -= units[i]
+    return sorted(selected), True
+
+
+def _branch_and_bound(weights: np.ndarray, values: np.ndarray, capacity: float,
+                      incumbent: list[int], deadline: float) -> tuple[list[int], bool, float]:
+    """Depth-first B&B on exact weights. Returns (selection, proven_optimal, open_bound)."""
+    free = [i for i in range(len(weights)) if weights[i] <= 0 and values[i] > 0]
+    cand = [i for i in range(len(weights)) if weights[i] > 0 and values[i] > 0 and weights[i] <= capacity]
+    cand.sort(key=lambda i: -values[i] / weights[i])
+    w = [float(weights[i]) for i in cand]
+    v = [float(values[i]) for i in cand]
+    n = len(cand)
+    base = float(sum(values[i] for i in free))
+
+    best_value = float(sum(values[i] for i in incumbent))
+    position = {i: j for j, i in enumerate(cand)}
+    best_set = {position[i] for i in incumbent if i in position}
+
+    def bound(k: int, room: float, value: float) -> float:
+        while k < n and w[k] <= room:
+            room -= w[k]
+            value += v[k]
+            k += 1
+        return value + (v[k] * room / w[k] if k < n else 0.0)
+
+    # Stack entries: (next item, room left, value so far, chosen items)
+    stack: list[tuple[int, float, float, tuple[int, ...]]] = [(0, capacity, base, ())]
+    nodes = 0
+    while stack:
+        k, room, value, chosen = stack.pop()
+        if bound(k, room, value) <= best_value + 1e-9:
+            continue
+        if k == n:
+            best_value, best_set = value, set(chosen)
+            continue
+        nodes += 1
+        if nodes % 512 == 0 and perf_counter() > deadline:
+            stack.append((k, room, value, chosen))
+            open_bound = max(bound(*node[:3]) for node in stack)
+            return sorted(cand[j] for j in best_set) + free, False, max(open_bound, best_value)
+        stack.append((k + 1, room, value, chosen))                      # skip item k
+        if w[k] <= room:
+            stack.append((k + 1, room - w[k], value + v[k], chosen + (k,)))  # take item k (explored first)
+    return sorted(cand[j] for j in best_set) + free, True, best_value
+
+
+def solve_knapsack(
+    weights: Sequence[float],
+    values: Sequence[float],
+    capacity: float,
+    *,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    max_units: int = DEFAULT_MAX_UNITS,
+) -> KnapsackResult:
+    """Choose deals maximizing total value with total weight <= capacity (negative capacity funds nothing)."""
+    start = perf_counter()
+    deadline = start + time_budget
+    w = np.asarray(weights, dtype=float)
+    v = np.asarray(values, dtype=float)
+    capacity = max(float(capacity), 0.0)
+    root_bound = lp_bound(w, v, capacity) if len(w) else 0.0
+
+    dp_selected, dp_done = _dp_select(w, v, capacity, max_units, start + time_budget * 0.5)
+    if not dp_done:
+        # Out of time in the DP: fall back to density-greedy as the incumbent.
+        dp_selected, room = [], capacity
+        for i in np.argsort(-np.where(w > 0, v / np.maximum(w, 1e-12), np.inf), kind="stable"):
+            if v[i] > 0 and w[i] <= room:
+                dp_selected.append(int(i))
+                room -= max(w[i], 0.0)
+        dp_selected.sort()
+
+    selected, optimal, open_bound = _branch_and_bound(w, v, capacity, dp_selected, deadline)
+    value = float(v[selected].sum()) if selected else 0.0
+    return KnapsackResult(
+        selected=[int(i) for i in selected],
+        value=value,
+        capital_used=float(np.maximum(w[selected], 0).sum()) if selected else 0.0,
+        upper_bound=value if optimal else float(min(root_bound, open_bound)),
+        optimal=optimal,
+        method="dp+branch_and_bound" if dp_done else "greedy+branch_and_bound",
+        elapsed_ms=(perf_counter() - start) * 1000,
+    )
+
+
+def solve_multi_pool(
+    weights: Sequence[float],
+    values: Sequence[float],
+    capacities: Sequence[float],
+    eligible: np.ndarray | None = None,
+    *,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    max_units: int = DEFAULT_MAX_UNITS,
+) -> KnapsackResult:
+    """Assign each deal to at most one capital pool, maximizing total value.
+
+    ``eligible`` is an optional (deals, pools) boolean matrix; by default
+    every pool can fund every deal. Never returns an infeasible plan.
+    """
+    start = perf_counter()
+    deadline = start + time_budget
+    w = np.asarray(weights, dtype=float)
+    v = np.asarray(values, dtype=float)
+    caps = np.maximum(np.asarray(capacities, dtype=float), 0.0)
+    n, m = len(w), len(caps)
+    ok = np.ones((n, m), dtype=bool) if eligible is None else np.asarray(eligible, dtype=bool)
+
+    assignment = np.full(n, -1)
+    room = caps.copy()
+    per_pool_budget = time_budget * 0.6 / max(m, 1)
+    all_optimal = True
+    for p in np.argsort(-caps, kind="stable"):
+        open_idx = np.flatnonzero((assignment < 0) & ok[:, p])
+        if not len(open_idx):
+            continue
+        result = solve_knapsack(w[open_idx], v[open_idx], caps[p],
+                                time_budget=per_pool_budget, max_units=max_units)
+        all_optimal &= result.optimal
+        chosen = open_idx[result.selected]
+        assignment[chosen] = p
+        room[p] -= np.maximum(w[chosen], 0).sum()
+
+    # Local search: move an unfunded deal into any pool with room, or swap
+    # it for a funded deal of lower value in the same pool.
+    improved = True
+    while improved and perf_counter() < deadline:
+        improved = False
+        for i in np.argsort(-v, kind="stable"):
+            if assignment[i] >= 0 or v[i] <= 0:
+                continue
+            for p in np.flatnonzero(ok[i]):
+                if w[i] <= room[p] + 1e-9:
+                    assignment[i] = p
+                    room[p] -= max(w[i], 0)
+                    improved = True
+                    break
+                members = np.flatnonzero((assignment == p) & (v < v[i]) & (w + room[p] >= w[i] - 1e-9))
+                if len(members):
+                    j = members[np.argmin(v[members])]
+                    assignment[j], assignment[i] = -1, p
+                    room[p] += max(w[j], 0) - max(w[i], 0)
+                    improved = True
+                    break
+
+    selected = np.flatnonzero(assignment >= 0)
+    value = float(v[selected].sum())
+    reachable = ok.any(axis=1)
+    bound = lp_bound(w[reachable], v[reachable], float(caps.sum())) if reachable.any() else 0.0
+    optimal = m == 1 and all_optimal
+    return KnapsackResult(
+        selected=[int(i) for i in selected],
+        value=value,
+        capital_used=float(np.maximum(w[selected], 0).sum()),
+        upper_bound=value if optimal else float(max(bound, value)),
+        optimal=optimal,
+        method="per_pool_knapsack+local_search",
+        elapsed_ms=(perf_counter() - start) * 1000,
+        assignments={int(i): int(assignment[i]) for i in selected},
+    )
+
+
+__all__ = [
+    "KnapsackResult",
+    "lp_bound",
+    "solve_knapsack",
+    "solve_multi_pool",
+]
@@ -0,0 +1,263 @@
+"""Vectorized deal × buyer-criteria scoring for ``dynasty.buyer_matches``.
+
+Implements the same rules as the frontend's ``scoreMatch``
+(frontend/lib/buyer-matches/score-match.ts) over whole tables at once:
+deals and criteria rows become columns, every categorical predicate
+(exit strategy, property type, market) becomes a criteria × vocabulary
+membership matrix indexed by the deals' codes, and the numeric predicates
+broadcast to a deals × criteria score matrix. A buyer profile's score for
+a deal is its best criteria row (the first one on ties), and pairs below
+MIN_MATCH_SCORE are dropped, so only the sparse match set leaves NumPy.
+
+Deals are scored in chunks of DEAL_CHUNK rows to bound memory, and only
+against criteria owned by the same user.
+"""
+
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+MIN_MATCH_SCORE = 40
+DEAL_CHUNK = 512
+
+BASE_SCORE = 20
+EXIT_POINTS = (20, -15)          # (match, miss)
+TYPE_POINTS = (15, -10)
+MARKET_POINTS = (20, -15)
+PRICE_POINTS = (15, -15)
+ARV_POINTS = (5, -10)
+CAPITAL_POINTS = (10, -20)
+
+
+def _normalize(value: str) -> str:
+    return re.sub(r"[\s-]", "_", value.strip().lower())
+
+
+def _number(value: Any) -> Optional[float]:
+    # The frontend reads decimals with ``toNumber(x) || null``: 0 means unset.
+    return float(value) if value not in (None, "") and float(value) != 0 else None
+
+
+@dataclass(frozen=True)
+class DealInput:
+    deal_id: str
+    property_id: str
+    user_id: str
+    exit_strategy: str = "wholesale"
+    purchase_price: Optional[float] = None
+    arv: Optional[float] = None
+    capital_required: Optional[float] = None
+    property_type: str = "single-family"
+    city: str = ""
+    state: str = ""
+
+    @classmethod
+    def from_rows(cls, deal: dict[str, Any], prop: dict[str, Any]) -> "DealInput":
+        """From a Prisma ``Deal`` row and its ``Property`` row (camelCase columns)."""
+        return cls(
+            deal_id=str(deal["id"]),
+            property_id=str(deal["propertyId"]),
+            user_id=str(deal["userId"]),
+            exit_strategy=deal.get("exitStrategy") or "wholesale",
+            purchase_price=_number(deal.get("purchasePrice")),
+            arv=_number(deal.get("arv")),
+            capital_required=_number(deal.get("capitalRequired")),
+            property_type=prop.get("propertyType") or "single-family",
+            city=prop.get("city") or "",
+            state=prop.get("state") or "",
+        )
+
+
+@dataclass(frozen=True)
+class CriteriaInput:
+    buyer_profile_id: str
+    user_id: str
+    property_types: tuple[str, ...] = ()
+    exit_strategies: tuple[str, ...] = ()
+    markets: tuple[str, ...] = ()
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_arv: Optional[float] = None
+    max_capital: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "CriteriaInput":
+        """From a ``dynasty.buyer_criteria`` row."""
+        def strings(value: Any) -> tuple[str, ...]:
+            return tuple(str(v) for v in value or [] if v)
+
+        return cls(
+            buyer_profile_id=str(row["buyer_profile_id"]),
+            user_id=str(row["user_id"]),
+            property_types=strings(row.get("property_types")),
+            exit_strategies=strings(row.get("exit_strategies")),
+            markets=strings(row.get("markets")),
+            min_price=_number(row.get("min_price")),
+            max_price=_number(row.get("max_price")),
+            min_arv=_number(row.get("min_arv")),
+            max_capital=_number(row.get("max_capital")),
+        )
+
+
+@dataclass(frozen=True)
+class BuyerMatchResult:
+    deal_id: str
+    property_id: str
+    buyer_profile_id: str
+    user_id: str
+    match_score: int
+    match_reasons: tuple[str, ...]
+
+
+def match_reasons(deal: DealInput, criteria: CriteriaInput) -> list[str]:
+    """The reason strings ``scoreMatch`` reports for one pair, in its order."""
+    reasons = []
+    exits = [_normalize(v) for v in criteria.exit_strategies]
+    if not exits or _normalize(deal.exit_strategy) in exits:
+        reasons.append(f"Buys {deal.exit_strategy.replace('_', ' ')} deals")
+    types = [_normalize(v) for v in criteria.property_types]
+    if not types or _normalize(deal.property_type) in types:
+        reasons.append(f"Targets {deal.property_type.replace('-', ' ')}")
+    markets = [m.lower() for m in criteria.markets]
+    if not markets or deal.city.lower() in markets or deal.state.lower() in markets:
+        reasons.append("In buyer's target market")
+    if deal.purchase_price is not None:
+        within = ((criteria.min_price is None or deal.purchase_price >= criteria.min_price)
+                  and (criteria.max_price is None or deal.purchase_price <= criteria.max_price))
+        reasons.append("Within buyer price range" if within else "Outside buyer price range")
+    if deal.arv is not None and criteria.min_arv is not None and deal.arv >= criteria.min_arv:
+        reasons.append("Meets minimum ARV")
+    if deal.capital_required is not None and criteria.max_capital is not None:
+        reasons.append("Within funding capacity" if deal.capital_required <= criteria.max_capital
+                       else "Exceeds funding capacity")
+    return reasons
+
+
+class _CriteriaColumns:
+    """Criteria rows as arrays plus membership matrices over value vocabularies."""
+
+    def __init__(self, criteria: list[CriteriaInput]) -> None:
+        self.criteria = criteria
+        self.vocab: dict[str, dict[str, int]] = {"exit": {}, "type": {}, "market": {}}
+        self.exit = self._membership("exit", [[_normalize(v) for v in c.exit_strategies] for c in criteria])
+        self.type = self._membership("type", [[_normalize(v) for v in c.property_types] for c in criteria])
+        self.market = self._membership("market", [[m.lower() for m in c.markets] for c in criteria])
+
+        def column(attr: str) -> np.ndarray:
+            return np.array([np.nan if getattr(c, attr) is None else getattr(c, attr) for c in criteria], dtype=float)
+
+        self.min_price, self.max_price = column("min_price"), column("max_price")
+        self.min_arv, self.max_capital = column("min_arv"), column("max_capital")
+
+    def _membership(self, kind: str, values: list[list[str]]) -> tuple[np.ndarray, np.ndarray]:
+        """(any-value flags, criteria × vocab membership with a trailing never-matching column)."""
+        vocab = self.vocab[kind]
+        for row in values:
+            for v in row:
+                vocab.setdefault(v, len(vocab))
+        member = np.zeros((len(values), len(vocab) + 1), dtype=bool)
+        for i, row in enumerate(values):
+            member[i, [vocab[v] for v in row]] = True
+        return np.array([not row for row in values]), member
+
+    def codes(self, kind: str, values: Iterable[str]) -> np.ndarray:
+        vocab = self.vocab[kind]
+        return np.array([vocab.get(v, len(vocab)) for v in values], dtype=np.int64)
+
+
+def _points(ok: np.ndarray, points: tuple[int, int]) -> np.ndarray:
+    return np.where(ok, points[0], points[1])
+
+
+def score_matrix(deals: list[DealInput], criteria: list[CriteriaInput]) -> np.ndarray:
+    """Deals × criteria ``scoreMatch`` scores (clamped to 0-100)."""
+    return _score(deals, _CriteriaColumns(criteria))
+
+
+def _score(deals: list[DealInput], cols: _CriteriaColumns) -> np.ndarray:
+    any_exit, exit_member = cols.exit
+    any_type, type_member = cols.type
+    any_market, market_member = cols.market
+    exit_code = cols.codes("exit", (_normalize(d.exit_strategy) for d in deals))
+    type_code = cols.codes("type", (_normalize(d.property_type) for d in deals))
+    city_code = cols.codes("market", (d.city.lower() for d in deals))
+    state_code = cols.codes("market", (d.state.lower() for d in deals))
+
+    score = np.full((len(deals), len(cols.criteria)), BASE_SCORE, dtype=np.int64)
+    score += _points(any_exit | exit_member[:, exit_code].T, EXIT_POINTS)
+    score += _points(any_type | type_member[:, type_code].T, TYPE_POINTS)
+    score += _points(any_market | market_member[:, city_code].T | market_member[:, state_code].T, MARKET_POINTS)
+
+    def deal_column(attr: str) -> np.ndarray:
+        return np.array([np.nan if getattr(d, attr) is None else getattr(d, attr) for d in deals], dtype=float)[:, None]
+
+    price = deal_column("purchase_price")
+    with np.errstate(invalid="ignore"):
+        within = ((np.isnan(cols.min_price) | (price >= cols.min_price))
+                  & (np.isnan(cols.max_price) | (price <= cols.max_price)))
+        score += np.where(np.isnan(price), 0, _points(within, PRICE_POINTS))
+        arv = deal_column("arv")
+        score += np.where(np.isnan(arv) | np.isnan(cols.min_arv), 0, _points(arv >= cols.min_arv, ARV_POINTS))
+        capital = deal_column("capital_required")
+        score += np.where(np.isnan(capital) | np.isnan(cols.max_capital), 0,
+                          _points(capital <= cols.max_capital, CAPITAL_POINTS))
+    return np.clip(score, 0, 100)
+
+
+def best_matches(deals: Iterable[DealInput], criteria: Iterable[CriteriaInput],
+                 min_score: int = MIN_MATCH_SCORE, chunk: int = DEAL_CHUNK) -> list[BuyerMatchResult]:
+    """Best-criteria score per (deal, buyer profile) of the same user, keeping scores >= ``min_score``."""
+    deals_by_user: dict[str, list[DealInput]] = {}
+    for deal in deals:
+        deals_by_user.setdefault(deal.user_id, []).append(deal)
+    criteria_by_user: dict[str, list[CriteriaInput]] = {}
+    for row in criteria:
+        criteria_by_user.setdefault(row.user_id, []).append(row)
+
+    results: list[BuyerMatchResult] = []
+    for user_id, user_criteria in criteria_by_user.items():
+        user_deals = deals_by_user.get(user_id)
+        if not user_deals:
+            continue
+        # Group each buyer's criteria into contiguous columns, keeping their order.
+        order = sorted(range(len(user_criteria)), key=lambda i: (user_criteria[i].buyer_profile_id, i))
+        user_criteria = [user_criteria[i] for i in order]
+        cols = _CriteriaColumns(user_criteria)
+        owners = [c.buyer_profile_id for c in user_criteria]
+        starts = np.flatnonzero([i == 0 or owners[i] != owners[i - 1] for i in range(len(owners))])
+        position = np.arange(len(owners))
+        for lo in range(0, len(user_deals), chunk):
+            block = user_deals[lo: lo + chunk]
+            scores = _score(block, cols)
+            best = np.maximum.reduceat(scores, starts, axis=1)                  # deals × buyers
+            first = np.minimum.reduceat(
+                np.where(scores == np.repeat(best, np.diff(np.append(starts, len(owners))), axis=1),
+                         position, len(owners)),
+                starts, axis=1,
+            )
+            for d, b in zip(*np.nonzero(best >= min_score)):
+                deal = block[d]
+                chosen = user_criteria[first[d, b]]
+                results.append(BuyerMatchResult(
+                    deal_id=deal.deal_id,
+                    property_id=deal.property_id,
+                    buyer_profile_id=chosen.buyer_profile_id,
+                    user_id=user_id,
+                    match_score=int(best[d, b]),
+                    match_reasons=tuple(match_reasons(deal, chosen)),
+                ))
+    return results
+
+
+__all__ = [
+    "BuyerMatchResult",
+    "CriteriaInput",
+    "DealInput",
+    "MIN_MATCH_SCORE",
+    "best_matches",
+    "match_reasons",
+    "score_matrix",
+]
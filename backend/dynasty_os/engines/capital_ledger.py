@@ -0,0 +1,188 @@
+"""Append-only, double-entry capital ledger with running balances.
+
+Every capital movement — an investor's money arriving, being committed to a
+deal, funded, returned, distributed or withdrawn — is one journal entry
+that posts equal and opposite amounts to two accounts, so each entry nets
+to zero and the ledger as a whole always balances. Entries are never edited
+or removed; corrections are new entries.
+
+Running balances are kept per (investor, account) and per (deal, account)
+as entries are recorded, so a current balance is a dict lookup. Historical
+balances come from a per-investor / per-deal index ordered by effective
+time: bisect to the cut-off, then sum the postings before it.
+
+The same account scheme backs the ``capital_journal`` / ``capital_postings``
+/ ``capital_balances`` tables (migration 016) behind /api/capital/ledger.
+"""
+
+from __future__ import annotations
+from bisect import bisect_right, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+# Investor-side accounts. "external" is the contra account for money
+# entering or leaving the platform, so a ledger's balances always sum to 0.
+ACCOUNTS = ("available", "committed", "deployed", "distributed", "external")
+
+# Entry type -> (account debited, account credited); amounts move from the
+# first account to the second.
+ENTRY_ACCOUNTS: dict[str, tuple[str, str]] = {
+    "deposit": ("external", "available"),       # investor adds capital
+    "commit": ("available", "committed"),       # capital promised to a deal
+    "release": ("committed", "available"),      # commitment cancelled before funding
+    "fund": ("committed", "deployed"),          # capital wired into the deal
+    "return": ("deployed", "available"),        # return of capital from the deal
+    "distribute": ("external", "distributed"),  # preferred return / profit share paid out
+    "withdraw": ("available", "external"),      # investor takes capital off the platform
+}
+ENTRY_TYPES = tuple(ENTRY_ACCOUNTS)
+DEAL_ENTRY_TYPES = frozenset({"commit", "release", "fund", "return", "distribute"})
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    entry_type: str
+    investor_id: str
+    amount: float
+    deal_id: Optional[str] = None
+    effective_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    memo: str = ""
+    entry_id: int = 0
+
+    def postings(self) -> list[tuple[str, float]]:
+        """The entry's two legs as (account, signed amount); they sum to 0."""
+        source, target = ENTRY_ACCOUNTS[self.entry_type]
+        return [(source, -self.amount), (target, self.amount)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entry_id": self.entry_id,
+            "entry_type": self.entry_type,
+            "investor_id": self.investor_id,
+            "deal_id": self.deal_id,
+            "amount": self.amount,
+            "effective_at": self.effective_at,
+            "memo": self.memo,
+            "postings": [{"account": a, "amount": v} for a, v in self.postings()],
+        }
+
+
+def validate_entry(entry_type: str, amount: float, deal_id: Optional[str]) -> None:
+    """Raise ValueError for an entry the ledger would reject."""
+    if entry_type not in ENTRY_ACCOUNTS:
+        raise ValueError(f"entry_type must be one of: {', '.join(ENTRY_TYPES)}")
+    if not amount or amount <= 0:
+        raise ValueError("amount must be positive")
+    if entry_type in DEAL_ENTRY_TYPES and not deal_id:
+        raise ValueError(f"{entry_type} entries need a deal_id")
+
+
+def _zero_balances() -> dict[str, float]:
+    return dict.fromkeys(ACCOUNTS, 0.0)
+
+
+class CapitalLedger:
+    """In-memory journal with O(1) current balances and as-of lookups."""
+
+    def __init__(self) -> None:
+        self._entries: list[JournalEntry] = []
+        self._by_investor: dict[str, dict[str, float]] = defaultdict(_zero_balances)
+        self._by_deal: dict[str, dict[str, float]] = defaultdict(_zero_balances)
+        self._totals = _zero_balances()
+        # (effective_at, entry_id) in time order, per investor / deal
+        self._investor_index: dict[str, list[tuple[str, int]]] = defaultdict(list)
+        self._deal_index: dict[str, list[tuple[str, int]]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, entry_type: str, investor_id: str, amount: float,
+               deal_id: Optional[str] = None, effective_at: Optional[str] = None,
+               memo: str = "") -> JournalEntry:
+        """Append one entry and apply its postings to the running balances."""
+        validate_entry(entry_type, amount, deal_id)
+        entry = JournalEntry(
+            entry_type=entry_type,
+            investor_id=investor_id,
+            amount=float(amount),
+            deal_id=deal_id,
+            effective_at=effective_at or datetime.utcnow().isoformat(),
+            memo=memo,
+            entry_id=len(self._entries) + 1,
+        )
+        self._entries.append(entry)
+        for account, delta in entry.postings():
+            self._by_investor[investor_id][account] += delta
+            self._totals[account] += delta
+            if deal_id:
+                self._by_deal[deal_id][account] += delta
+        key = (entry.effective_at, entry.entry_id)
+        insort(self._investor_index[investor_id], key)
+        if deal_id:
+            insort(self._deal_index[deal_id], key)
+        return entry
+
+    def entries(self, investor_id: Optional[str] = None,
+                deal_id: Optional[str] = None) -> list[JournalEntry]:
+        """Entries in effective-time order, optionally for one investor / deal."""
+        if investor_id is None and deal_id is None:
+            return sorted(self._entries, key=lambda e: (e.effective_at, e.entry_id))
+        index = self._investor_index if investor_id is not None else self._deal_index
+        keyed = index.get(investor_id if investor_id is not None else deal_id, [])
+        rows = (self._entries[entry_id - 1] for _, entry_id in keyed)
+        if investor_id is not None and deal_id is not None:
+            return [e for e in rows if e.deal_id == deal_id]
+        return list(rows)
+
+    def balance(self, investor_id: Optional[str] = None,
+                deal_id: Optional[str] = None) -> dict[str, float]:
+        """Current balance per account for an investor, a deal, or the ledger."""
+        if investor_id is not None and deal_id is not None:
+            return self._sum(self.entries(investor_id, deal_id))
+        if investor_id is not None:
+            return dict(self._by_investor.get(investor_id) or _zero_balances())
+        if deal_id is not None:
+            return dict(self._by_deal.get(deal_id) or _zero_balances())
+        return dict(self._totals)
+
+    def balance_as_of(self, as_of: str, investor_id: Optional[str] = None,
+                      deal_id: Optional[str] = None) -> dict[str, float]:
+        """Balances counting only entries effective at or before ``as_of``."""
+        if investor_id is None and deal_id is None:
+            return self._sum(e for e in self._entries if e.effective_at <= as_of)
+        index = self._investor_index if investor_id is not None else self._deal_index
+        keyed = index.get(investor_id if investor_id is not None else deal_id, [])
+        cut = bisect_right(keyed, (as_of, len(self._entries) + 1))
+        rows = (self._entries[entry_id - 1] for _, entry_id in keyed[:cut])
+        if investor_id is not None and deal_id is not None:
+            rows = (e for e in rows if e.deal_id == deal_id)
+        return self._sum(rows)
+
+    @staticmethod
+    def _sum(entries) -> dict[str, float]:
+        totals = _zero_balances()
+        for entry in entries:
+            for account, delta in entry.postings():
+                totals[account] += delta
+        return totals
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "investors": len(self._by_investor),
+            "deals": len(self._by_deal),
+            "balances": {a: round(v, 2) for a, v in self._totals.items()},
+            "in_balance": abs(sum(self._totals.values())) < 1e-6,
+        }
+
+
+__all__ = [
+    "ACCOUNTS",
+    "ENTRY_ACCOUNTS",
+    "ENTRY_TYPES",
+    "CapitalLedger",
+    "JournalEntry",
+    "validate_entry",
+]
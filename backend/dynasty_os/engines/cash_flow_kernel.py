@@ -0,0 +1,258 @@
+"""Discounted cash-flow kernel for rental hold scenarios.
+
+Builds monthly equity cash-flow matrices (one row per property) with loan
+amortization, rent growth, vacancy and an exit sale, then computes IRR, NPV,
+equity multiple and DSCR for every row at once. IRR is solved with a
+bracketed Newton iteration that runs across all rows together.
+
+Shared by the Land + Build RentalBackstopEngine, the Disposition
+RentalConversionEngine and the Deal StrategyEngine's Rental/BRRRR paths.
+Every input accepts a scalar or a 1-D array; scalars broadcast across rows.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+ArrayLike = Any
+
+IRR_MONTHLY_FLOOR = -0.5
+
+
+@dataclass
+class CashFlowSchedule:
+    """Monthly equity cash flows for N properties over a T-month horizon."""
+    cash_flows: np.ndarray          # (N, T+1); column 0 is the equity check at purchase
+    noi: np.ndarray                 # (N, T) monthly NOI, zero after each row's exit
+    debt_service: np.ndarray        # (N,) level monthly payment
+    loan_balance_at_exit: np.ndarray
+    exit_proceeds: np.ndarray       # net sale proceeds before paying off the loan
+    equity: np.ndarray              # (N,) cash invested at t=0
+    hold_months: np.ndarray         # (N,) month of the exit sale
+
+
+def _vector(value: ArrayLike, n: int) -> np.ndarray:
+    arr = np.asarray(value, dtype=float)
+    return np.broadcast_to(arr, (n,)).astype(float) if arr.ndim == 0 or arr.shape == (1,) else arr.astype(float)
+
+
+def monthly_payment(loan_amount: np.ndarray, annual_rate: np.ndarray, amortization_months: np.ndarray) -> np.ndarray:
+    """Level payment for fully amortizing loans (interest-free loans split evenly)."""
+    r = annual_rate / 12
+    growth = np.power(1 + r, amortization_months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amortizing = loan_amount * r * growth / (growth - 1)
+    return np.where(r == 0, loan_amount / np.maximum(amortization_months, 1), amortizing)
+
+
+def loan_balance(loan_amount: np.ndarray, annual_rate: np.ndarray, payment: np.ndarray, months_paid: np.ndarray) -> np.ndarray:
+    """Remaining principal after ``months_paid`` level payments."""
+    r = annual_rate / 12
+    growth = np.power(1 + r, months_paid)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amortizing = loan_amount * growth - payment * (growth - 1) / r
+    balance = np.where(r == 0, loan_amount - payment * months_paid, amortizing)
+    return np.maximum(balance, 0.0)
+
+
+def build_cash_flows(
+    purchase_price: ArrayLike,
+    monthly_rent: ArrayLike,
+    *,
+    hold_months: ArrayLike = 60,
+    upfront_costs: ArrayLike = 0.0,
+    loan_amount: ArrayLike = 0.0,
+    interest_rate: ArrayLike = 0.07,
+    amortization_years: ArrayLike = 30,
+    rent_growth: ArrayLike = 0.03,
+    vacancy_rate: ArrayLike = 0.05,
+    annual_taxes: ArrayLike = 0.0,
+    annual_insurance: ArrayLike = 0.0,
+    management_pct: ArrayLike = 0.08,
+    maintenance_pct: ArrayLike = 0.10,
+    exit_value: ArrayLike = np.nan,
+    appreciation: ArrayLike = 0.03,
+    selling_costs_pct: ArrayLike = 0.06,
+) -> CashFlowSchedule:
+    """Build the (N, T+1) monthly equity cash-flow matrix.
+
+    Rent steps up by ``rent_growth`` each hold year; management is charged
+    on collected rent and maintenance on gross rent. When ``exit_value`` is
+    NaN the exit price is ``purchase_price`` appreciated over the hold.
+    """
+    n = max(np.size(arg) for arg in (
+        purchase_price, monthly_rent, hold_months, upfront_costs, loan_amount, interest_rate,
+        amortization_years, rent_growth, vacancy_rate, annual_taxes, annual_insurance,
+        management_pct, maintenance_pct, exit_value, appreciation, selling_costs_pct,
+    ))
+    price = _vector(purchase_price, n)
+    rent = _vector(monthly_rent, n)
+    hold = np.maximum(_vector(hold_months, n).round(), 1).astype(int)
+    loan = _vector(loan_amount, n)
+    rate = _vector(interest_rate, n)
+    amort = _vector(amortization_years, n) * 12
+    growth = _vector(rent_growth, n)
+    vacancy = _vector(vacancy_rate, n)
+    fixed_monthly = (_vector(annual_taxes, n) + _vector(annual_insurance, n)) / 12
+    mgmt = _vector(management_pct, n)
+    maint = _vector(maintenance_pct, n)
+    exit_price = _vector(exit_value, n)
+    exit_price = np.where(np.isnan(exit_price), price * np.power(1 + _vector(appreciation, n), hold / 12), exit_price)
+
+    horizon = int(hold.max())
+    months = np.arange(1, horizon + 1)
+    active = months[None, :] <= hold[:, None]
+
+    gross = rent[:, None] * np.power(1 + growth[:, None], (months[None, :] - 1) // 12)
+    collected = gross * (1 - vacancy[:, None])
+    opex = fixed_monthly[:, None] + collected * mgmt[:, None] + gross * maint[:, None]
+    noi = np.where(active, collected - opex, 0.0)
+
+    payment = np.where(loan > 0, monthly_payment(loan, rate, amort), 0.0)
+    balance = loan_balance(loan, rate, payment, hold)
+    proceeds = exit_price * (1 - _vector(selling_costs_pct, n))
+
+    equity = price + _vector(upfront_costs, n) - loan
+    cash_flows = np.zeros((n, horizon + 1))
+    cash_flows[:, 0] = -equity
+    cash_flows[:, 1:] = noi - np.where(active, payment[:, None], 0.0)
+    cash_flows[np.arange(n), hold] += proceeds - balance
+
+    return CashFlowSchedule(
+        cash_flows=cash_flows,
+        noi=noi,
+        debt_service=payment,
+        loan_balance_at_exit=balance,
+        exit_proceeds=proceeds,
+        equity=equity,
+        hold_months=hold,
+    )
+
+
+def npv(cash_flows: np.ndarray, annual_rate: ArrayLike) -> np.ndarray:
+    """Net present value of monthly cash flows at an annual discount rate."""
+    monthly = np.power(1 + np.asarray(annual_rate, dtype=float), 1 / 12) - 1
+    t = np.arange(cash_flows.shape[1])
+    discount = np.power(1 + np.atleast_1d(monthly)[:, None], -t[None, :])
+    return (cash_flows * discount).sum(axis=1)
+
+
+def irr(cash_flows: np.ndarray, max_iter: int = 100, tol: float = 1e-10) -> np.ndarray:
+    """Annualized IRR for every row of a monthly cash-flow matrix.
+
+    Each row is bracketed on a monthly rate in (-50%, 100%) and refined
+    with Newton steps that fall back to bisection when they leave the
+    bracket or fail to halve the previous step (Newton alone crawls in
+    from one side of the convex NPV curve on long, loss-making holds).
+    The -50% floor (about -99.98% a year) keeps ``(1 + r) ** -t`` finite
+    for horizons up to 1000 months. Rows whose NPV never changes sign, or
+    does not stay finite at the bracket ends, get NaN.
+    """
+    cf = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    t = np.arange(cf.shape[1], dtype=float)
+
+    def value_and_slope(rate: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        with np.errstate(over="ignore", invalid="ignore"):
+            discount = np.power(1 + rate[:, None], -t[None, :])
+            value = (cf * discount).sum(axis=1)
+            slope = (-t[None, :] * cf * discount / (1 + rate[:, None])).sum(axis=1)
+        return value, slope
+
+    lo = np.full(cf.shape[0], IRR_MONTHLY_FLOOR)
+    hi = np.full(cf.shape[0], 1.0)
+    f_lo, _ = value_and_slope(lo)
+    f_hi, _ = value_and_slope(hi)
+    solvable = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) != np.sign(f_hi))
+
+    rate = np.full(cf.shape[0], 0.01)
+    last_step = hi - lo
+    for _ in range(max_iter):
+        value, slope = value_and_slope(rate)
+        same_as_lo = np.sign(value) == np.sign(f_lo)
+        lo = np.where(same_as_lo, rate, lo)
+        f_lo = np.where(same_as_lo, value, f_lo)
+        hi = np.where(same_as_lo, hi, rate)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = rate - value / slope
+        in_bracket = np.isfinite(step) & (step > np.minimum(lo, hi)) & (step < np.maximum(lo, hi))
+        fast = np.abs(step - rate) < 0.5 * last_step
+        new_rate = np.where(in_bracket & fast, step, (lo + hi) / 2)
+        last_step = np.abs(new_rate - rate)
+        converged = last_step < tol
+        rate = new_rate
+        if np.all(converged | ~solvable):
+            break
+
+    annual = np.power(1 + rate, 12) - 1
+    return np.where(solvable, annual, np.nan)
+
+
+def analyze_hold(discount_rate: ArrayLike = 0.10, **inputs: Any) -> dict[str, np.ndarray]:
+    """Build cash flows and return IRR, NPV, equity multiple and DSCR per row.
+
+    ``inputs`` are passed to build_cash_flows(). DSCR is year-one NOI over
+    year-one debt service; ``min_dscr`` is the weakest full hold year.
+    Rows without debt report NaN DSCR, rows without positive equity report
+    NaN equity multiple.
+    """
+    schedule = build_cash_flows(**inputs)
+    cf = schedule.cash_flows
+    distributions = cf[:, 1:].sum(axis=1)
+
+    years = max(schedule.noi.shape[1] // 12, 1)
+    annual_noi = schedule.noi[:, : years * 12].reshape(cf.shape[0], years, -1).sum(axis=2)
+    full_year = np.arange(1, years + 1)[None, :] * 12 <= schedule.hold_months[:, None]
+    full_year[:, 0] = True
+    annual_debt = schedule.debt_service * 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr_by_year = np.where(annual_debt[:, None] > 0, annual_noi / annual_debt[:, None], np.nan)
+        equity_multiple = np.where(schedule.equity > 0, distributions / schedule.equity, np.nan)
+
+    return {
+        "irr": irr(cf),
+        "npv": npv(cf, discount_rate),
+        "equity_multiple": equity_multiple,
+        "dscr": dscr_by_year[:, 0],
+        "min_dscr": np.where(annual_debt > 0, np.where(full_year, dscr_by_year, np.inf).min(axis=1), np.nan),
+        "equity": schedule.equity,
+        "total_cash_flow": cf[:, 1:].sum(axis=1) - (schedule.exit_proceeds - schedule.loan_balance_at_exit),
+        "net_exit_proceeds": schedule.exit_proceeds - schedule.loan_balance_at_exit,
+        "debt_service_monthly": schedule.debt_service,
+        "year1_noi": annual_noi[:, 0],
+    }
+
+
+def hold_summary(metrics: dict[str, np.ndarray], index: int = 0) -> dict[str, Any]:
+    """JSON-safe, rounded view of one row of analyze_hold() output."""
+
+    def clean(key: str, digits: int) -> float | None:
+        value = float(metrics[key][index])
+        return round(value, digits) if np.isfinite(value) else None
+
+    return {
+        "irr": clean("irr", 4),
+        "npv": clean("npv", 2),
+        "equity_multiple": clean("equity_multiple", 3),
+        "dscr": clean("dscr", 2),
+        "min_dscr": clean("min_dscr", 2),
+        "equity_invested": clean("equity", 2),
+        "total_cash_flow": clean("total_cash_flow", 2),
+        "net_exit_proceeds": clean("net_exit_proceeds", 2),
+        "debt_service_monthly": clean("debt_service_monthly", 2),
+        "year1_noi": clean("year1_noi", 2),
+    }
+
+
+__all__ = [
+    "CashFlowSchedule",
+    "monthly_payment",
+    "loan_balance",
+    "build_cash_flows",
+    "npv",
+    "irr",
+    "analyze_hold",
+    "hold_summary",
+]
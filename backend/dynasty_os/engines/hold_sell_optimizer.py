@@ -0,0 +1,253 @@
+"""Batch hold-vs-sell optimizer for a rental portfolio.
+
+Every held asset is scored on its own, all rows at once:
+
+* The cash-flow kernel projects the next ``hold_years`` of NOI, debt
+  service, appreciation and the exit sale. The equity check at t=0 is
+  the net proceeds of selling today (value less selling costs and the
+  loan payoff), so each asset's IRR is the return on the equity that
+  holding keeps tied up.
+* Year-one NOI over market value gives the cap rate. Value less the
+  amortizing loan balance at each year end gives the equity projection.
+* The hold NPV at ``reinvestment_rate`` is what holding adds over selling
+  and redeploying the proceeds at that rate. Its negative is the
+  portfolio gain from selling. Divided by the proceeds released, it is
+  the marginal return of a sale, and sell candidates are ranked by it.
+
+Assets whose sale beats holding are marked SELL. If their proceeds fall
+short of ``target_liquidity``, further assets are sold in rank order
+(least return given up per dollar raised first) until the target is met,
+and are marked SELL_FOR_LIQUIDITY. Underwater assets (no net proceeds)
+are always held.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from dynasty_os.engines.cash_flow_kernel import build_cash_flows, irr, loan_balance, npv
+
+SELL = "SELL"
+SELL_FOR_LIQUIDITY = "SELL_FOR_LIQUIDITY"
+HOLD = "HOLD"
+
+DEFAULT_HOLD_YEARS = 5
+DEFAULT_REINVESTMENT_RATE = 0.08
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    return default if value in (None, "") else float(value)
+
+
+@dataclass(frozen=True)
+class HeldAsset:
+    property_id: str
+    market_value: float
+    monthly_rent: float
+    loan_balance: float = 0.0
+    annual_taxes: float = 0.0
+    annual_insurance: float = 0.0
+    market: Optional[str] = None
+    appreciation: Optional[float] = None     # overrides the market / portfolio rate
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "HeldAsset":
+        return cls(
+            property_id=str(row["property_id"]),
+            market_value=_float(row.get("market_value")),
+            monthly_rent=_float(row.get("monthly_rent")),
+            loan_balance=_float(row.get("loan_balance")),
+            annual_taxes=_float(row.get("annual_taxes", row.get("taxes"))),
+            annual_insurance=_float(row.get("annual_insurance", row.get("insurance"))),
+            market=row.get("market"),
+            appreciation=None if row.get("appreciation") is None else float(row["appreciation"]),
+        )
+
+
+@dataclass
+class HoldSellPlan:
+    """Per-asset projections and decisions, plus portfolio totals."""
+    property_ids: list[str]
+    markets: list[Optional[str]]
+    decision: np.ndarray            # (N,) SELL / SELL_FOR_LIQUIDITY / HOLD
+    sell_rank: np.ndarray           # (N,) 1 = best sale per dollar released; 0 = not sellable
+    market_value: np.ndarray
+    cap_rate: np.ndarray
+    appreciation: np.ndarray
+    net_sale_proceeds: np.ndarray   # equity released by selling today
+    equity_by_year: np.ndarray      # (N, hold_years) value less loan balance at each year end
+    projected_value: np.ndarray
+    hold_irr: np.ndarray
+    hold_npv: np.ndarray
+    marginal_return: np.ndarray     # sale gain per dollar released (NaN when not sellable)
+    portfolio: dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.property_ids)
+
+    def rows(self, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """JSON-safe asset rows: sales in rank order, then holds by rank."""
+        def clean(value: float, digits: int) -> Optional[float]:
+            return round(float(value), digits) if np.isfinite(value) else None
+
+        ranked = np.where(self.sell_rank > 0, self.sell_rank, len(self) + 1)
+        order = np.lexsort((ranked, self.decision == HOLD))
+        return [
+            {
+                "property_id": self.property_ids[i],
+                "market": self.markets[i],
+                "decision": str(self.decision[i]),
+                "sell_rank": int(self.sell_rank[i]) or None,
+                "market_value": clean(self.market_value[i], 2),
+                "cap_rate": clean(self.cap_rate[i], 4),
+                "appreciation": clean(self.appreciation[i], 4),
+                "net_sale_proceeds": clean(self.net_sale_proceeds[i], 2),
+                "projected_value": clean(self.projected_value[i], 2),
+                "projected_equity": clean(self.equity_by_year[i, -1], 2),
+                "hold_irr": clean(self.hold_irr[i], 4),
+                "hold_npv": clean(self.hold_npv[i], 2),
+                "sell_gain": clean(-self.hold_npv[i], 2),
+                "marginal_return": clean(self.marginal_return[i], 4),
+            }
+            for i in order[:limit]
+        ]
+
+
+def _portfolio_irr(cash_flows: np.ndarray) -> Optional[float]:
+    if not len(cash_flows):
+        return None
+    value = float(irr(cash_flows.sum(axis=0, keepdims=True))[0])
+    return round(value, 4) if np.isfinite(value) else None
+
+
+def optimize_hold_sell(
+    assets: Iterable[HeldAsset],
+    *,
+    hold_years: int = DEFAULT_HOLD_YEARS,
+    reinvestment_rate: float = DEFAULT_REINVESTMENT_RATE,
+    target_liquidity: float = 0.0,
+    appreciation: float = 0.03,
+    appreciation_by_market: Optional[dict[str, float]] = None,
+    interest_rate: float = 0.07,
+    remaining_amortization_years: float = 25,
+    rent_growth: float = 0.03,
+    vacancy_rate: float = 0.05,
+    management_pct: float = 0.08,
+    maintenance_pct: float = 0.10,
+    selling_costs_pct: float = 0.06,
+) -> HoldSellPlan:
+    """Score every asset, rank sales by marginal return and meet ``target_liquidity``."""
+    assets = list({a.property_id: a for a in assets}.values())
+    n = len(assets)
+    years = max(int(hold_years), 1)
+    value = np.array([a.market_value for a in assets], dtype=float)
+    loan = np.array([a.loan_balance for a in assets], dtype=float)
+    by_market = appreciation_by_market or {}
+    growth = np.array([
+        a.appreciation if a.appreciation is not None else by_market.get(a.market or "", appreciation)
+        for a in assets
+    ], dtype=float)
+
+    schedule = build_cash_flows(
+        purchase_price=value,
+        monthly_rent=np.array([a.monthly_rent for a in assets], dtype=float),
+        hold_months=years * 12,
+        upfront_costs=-value * selling_costs_pct,      # equity at t=0 = net proceeds of selling today
+        loan_amount=loan,
+        interest_rate=interest_rate,
+        amortization_years=remaining_amortization_years,
+        rent_growth=rent_growth,
+        vacancy_rate=vacancy_rate,
+        annual_taxes=np.array([a.annual_taxes for a in assets], dtype=float),
+        annual_insurance=np.array([a.annual_insurance for a in assets], dtype=float),
+        management_pct=management_pct,
+        maintenance_pct=maintenance_pct,
+        appreciation=growth,
+        selling_costs_pct=selling_costs_pct,
+    ) if n else None
+
+    if schedule is None:
+        cf = np.zeros((0, years * 12 + 1))
+        proceeds = cap_rate = hold_irr = hold_npv = np.zeros(0)
+        equity_by_year = np.zeros((0, years))
+    else:
+        cf = schedule.cash_flows
+        proceeds = schedule.equity
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cap_rate = np.where(value > 0, schedule.noi[:, :12].sum(axis=1) / value, np.nan)
+        year_ends = np.arange(1, years + 1)
+        balances = loan_balance(loan[:, None], interest_rate, schedule.debt_service[:, None], year_ends[None, :] * 12)
+        equity_by_year = value[:, None] * np.power(1 + growth[:, None], year_ends[None, :]) - balances
+        hold_irr = irr(cf)
+        hold_npv = npv(cf, reinvestment_rate)
+
+    sellable = proceeds > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        marginal = np.where(sellable, -hold_npv / proceeds, np.nan)
+    ranked = np.flatnonzero(sellable)[np.argsort(-marginal[sellable], kind="stable")]
+    sell_rank = np.zeros(n, dtype=np.int64)
+    sell_rank[ranked] = np.arange(1, len(ranked) + 1)
+
+    decision = np.full(n, HOLD, dtype=object)
+    decision[sellable & (hold_npv < 0)] = SELL
+    shortfall = max(float(target_liquidity) - float(proceeds[decision == SELL].sum()), 0.0)
+    if shortfall > 0:
+        extra = ranked[decision[ranked] == HOLD]
+        cumulative = np.cumsum(proceeds[extra])
+        take = min(int(np.searchsorted(cumulative, shortfall, side="left")) + 1, len(extra))
+        decision[extra[:take]] = SELL_FOR_LIQUIDITY
+
+    sold = decision != HOLD
+    kept = ~sold
+    raised = float(proceeds[sold].sum())
+    total_value = float(value.sum())
+    noi = schedule.noi[:, :12].sum(axis=1) if schedule is not None else np.zeros(0)
+    portfolio = {
+        "assets": n,
+        "hold_years": years,
+        "reinvestment_rate": reinvestment_rate,
+        "total_market_value": round(total_value, 2),
+        "total_equity": round(float((value - loan).sum()), 2),
+        "portfolio_cap_rate": round(float(noi.sum()) / total_value, 4) if total_value > 0 else None,
+        "hold_all_irr": _portfolio_irr(cf),
+        "retained_irr": _portfolio_irr(cf[kept]),
+        "hold_all_npv": round(float(hold_npv.sum()), 2),
+        "value_added_by_sales": round(float(-hold_npv[sold].sum()), 2) + 0.0,
+        "sell": int((decision == SELL).sum()),
+        "sell_for_liquidity": int((decision == SELL_FOR_LIQUIDITY).sum()),
+        "hold": int(kept.sum()),
+        "target_liquidity": round(float(target_liquidity), 2),
+        "liquidity_raised": round(raised, 2),
+        "liquidity_shortfall": round(max(float(target_liquidity) - raised, 0.0), 2),
+        "retained_equity_by_year": [round(float(v), 2) for v in equity_by_year[kept].sum(axis=0)],
+    }
+    return HoldSellPlan(
+        property_ids=[a.property_id for a in assets],
+        markets=[a.market for a in assets],
+        decision=decision,
+        sell_rank=sell_rank,
+        market_value=value,
+        cap_rate=cap_rate,
+        appreciation=growth,
+        net_sale_proceeds=proceeds,
+        equity_by_year=equity_by_year,
+        projected_value=value * np.power(1 + growth, years),
+        hold_irr=hold_irr,
+        hold_npv=hold_npv,
+        marginal_return=marginal,
+        portfolio=portfolio,
+    )
+
+
+__all__ = [
+    "DEFAULT_HOLD_YEARS",
+    "DEFAULT_REINVESTMENT_RATE",
+    "HOLD",
+    "HeldAsset",
+    "HoldSellPlan",
+    "SELL",
+    "SELL_FOR_LIQUIDITY",
+    "optimize_hold_sell",
+]
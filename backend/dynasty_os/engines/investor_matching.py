@@ -0,0 +1,280 @@
+"""Investor–deal matching index on capacity, markets and risk profile.
+
+InvestorEngine used to keep every investor with ``available_capital >= 20%``
+of the asking price and ignore everything else on the record. The index
+here keeps:
+
+* an inverted index from market key (city, county, state, ZIP or
+  "City, ST", normalized by ``market_key``) to investors, plus the set of investors with no market preference;
+* an inverted index from risk_profile to investors, read through
+  RISK_TOLERANCE so a deal's risk level selects every profile that accepts
+  it;
+* a sorted capacity list, so "can cover at least X" is a bisect.
+
+A lookup walks the smallest of those candidate sets and checks the other
+constraints per candidate, so matching one deal never touches investors
+that fail the most selective filter. Matches are ranked by a 0-100 fit
+score built from capital coverage, market, risk and return fit.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+MIN_CAPITAL_SHARE = 0.20          # an investor must be able to cover 20% of the capital need
+
+# Deal risk levels (risk_scores.risk_level) each investor risk profile accepts.
+# CRITICAL deals are never presented.
+RISK_TOLERANCE = {
+    "Conservative": frozenset({"LOW"}),
+    "Moderate": frozenset({"LOW", "MODERATE"}),
+    "Aggressive": frozenset({"LOW", "MODERATE", "HIGH"}),
+}
+# The profile a risk level is "made for" scores full risk fit; others that
+# merely tolerate it score half.
+RISK_HOME_PROFILE = {"LOW": "Conservative", "MODERATE": "Moderate", "HIGH": "Aggressive"}
+DEFAULT_RISK_PROFILE = "Moderate"
+
+FIT_WEIGHTS = {"capacity": 35.0, "market": 25.0, "risk": 20.0, "return": 20.0}
+
+
+# Trailing words dropped from a county name so "St. Francois County" and
+# "St. Francois" land on the same key.
+COUNTY_SUFFIXES = ("COUNTY", "PARISH", "BOROUGH")
+
+
+def _strip_suffix(part: str) -> str:
+    head, _, last = part.rpartition(" ")
+    return head if head and last in COUNTY_SUFFIXES else part
+
+
+def market_key(value: Any) -> str:
+    """Upper case, periods and extra spaces dropped, county suffixes removed.
+
+    Comma-separated forms keep their parts: "Austin,tx" and "Travis County, TX"
+    become "AUSTIN, TX" and "TRAVIS, TX".
+    """
+    text = str(value or "").upper().replace(".", " ")
+    parts = (_strip_suffix(" ".join(part.split())) for part in text.split(","))
+    return ", ".join(part for part in parts if part)
+
+
+def location_keys(city: Any = None, county: Any = None, state: Any = None, zip_code: Any = None) -> frozenset[str]:
+    """Every market key a property sits in, including "City, ST" and "County, ST"."""
+    keys = {market_key(v) for v in (city, county, state, zip_code)}
+    state_key = market_key(state)
+    if state_key:
+        keys |= {f"{market_key(v)}, {state_key}" for v in (city, county) if market_key(v)}
+    keys.discard("")
+    return frozenset(keys)
+
+
+@dataclass(frozen=True)
+class InvestorProfile:
+    investor_id: str
+    investor_name: str = ""
+    available_capital: float = 0.0
+    markets: frozenset[str] = frozenset()     # empty = any market
+    risk_profile: str = DEFAULT_RISK_PROFILE
+    investment_type: str = ""
+    preferred_return: float = 0.08
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "InvestorProfile":
+        profile = row.get("risk_profile") or DEFAULT_RISK_PROFILE
+        return cls(
+            investor_id=str(row.get("investor_id", "")),
+            investor_name=row.get("investor_name") or "",
+            available_capital=float(row.get("available_capital") or 0),
+            markets=frozenset(market_key(m) for m in row.get("markets") or [] if market_key(m)),
+            risk_profile=profile if profile in RISK_TOLERANCE else DEFAULT_RISK_PROFILE,
+            investment_type=row.get("investment_type") or "",
+            preferred_return=float(row.get("preferred_return") or 0.08),
+        )
+
+
+@dataclass(frozen=True)
+class DealProfile:
+    deal_id: str
+    capital_needed: float
+    markets: frozenset[str] = frozenset()     # every market key the deal sits in
+    risk_level: Optional[str] = None          # LOW / MODERATE / HIGH / CRITICAL; None = unscored
+    investment_type: str = ""                 # empty = any
+    projected_return: Optional[float] = None  # expected annual return on the capital
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "DealProfile":
+        return cls(
+            deal_id=str(row.get("deal_id", "")),
+            capital_needed=float(row.get("capital_needed") or row.get("asking_price") or 0),
+            markets=frozenset(market_key(m) for m in row.get("markets") or [] if market_key(m)),
+            risk_level=(row.get("risk_level") or None) and str(row["risk_level"]).upper(),
+            investment_type=row.get("investment_type") or "",
+            projected_return=row.get("projected_return"),
+        )
+
+
+@dataclass
+class InvestorMatch:
+    investor_id: str
+    investor_name: str
+    fit_score: float
+    components: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "investor_id": self.investor_id,
+            "investor_name": self.investor_name,
+            "fit_score": self.fit_score,
+            "components": self.components,
+        }
+
+
+class InvestorMatchIndex:
+    """Inverted market / risk indexes plus a sorted capacity index."""
+
+    def __init__(self, investors: Iterable[InvestorProfile] = ()) -> None:
+        self._investors: dict[str, InvestorProfile] = {}
+        self._by_market: dict[str, set[str]] = {}
+        self._any_market: set[str] = set()
+        self._by_risk: dict[str, set[str]] = {p: set() for p in RISK_TOLERANCE}
+        self._capacity: list[tuple[float, str]] = []
+        self.lookups = 0
+        self.candidates_scanned = 0
+        for investor in investors:
+            self.add(investor)
+
+    def __len__(self) -> int:
+        return len(self._investors)
+
+    def add(self, investor: InvestorProfile) -> None:
+        """Index an investor, replacing any previous version of it."""
+        self.remove(investor.investor_id)
+        iid = investor.investor_id
+        self._investors[iid] = investor
+        for market in investor.markets:
+            self._by_market.setdefault(market, set()).add(iid)
+        if not investor.markets:
+            self._any_market.add(iid)
+        self._by_risk[investor.risk_profile].add(iid)
+        insort(self._capacity, (investor.available_capital, iid))
+
+    def remove(self, investor_id: str) -> None:
+        investor = self._investors.pop(investor_id, None)
+        if investor is None:
+            return
+        for market in investor.markets:
+            self._by_market[market].discard(investor_id)
+        self._any_market.discard(investor_id)
+        self._by_risk[investor.risk_profile].discard(investor_id)
+        slot = bisect_left(self._capacity, (investor.available_capital, investor_id))
+        del self._capacity[slot]
+
+    def _candidates(self, deal: DealProfile, min_capital: float) -> Iterable[str]:
+        """The smallest of the capacity, market and risk candidate sets."""
+        start = bisect_left(self._capacity, (min_capital, ""))
+        best: Optional[set[str]] = None
+        best_size = len(self._capacity) - start
+        if deal.markets:
+            market_ids = set(self._any_market)
+            for market in deal.markets:
+                market_ids |= self._by_market.get(market, set())
+            if len(market_ids) < best_size:
+                best, best_size = market_ids, len(market_ids)
+        if deal.risk_level is not None:
+            risk_ids: set[str] = set()
+            for profile, accepted in RISK_TOLERANCE.items():
+                if deal.risk_level in accepted:
+                    risk_ids |= self._by_risk[profile]
+            if len(risk_ids) < best_size:
+                best, best_size = risk_ids, len(risk_ids)
+        self.candidates_scanned += best_size
+        if best is not None:
+            return best
+        return (iid for _, iid in self._capacity[start:])
+
+    def _fits(self, investor: InvestorProfile, deal: DealProfile, min_capital: float) -> bool:
+        if investor.available_capital < min_capital:
+            return False
+        if deal.markets and investor.markets and not (investor.markets & deal.markets):
+            return False
+        if deal.risk_level is not None and deal.risk_level not in RISK_TOLERANCE[investor.risk_profile]:
+            return False
+        if deal.investment_type and investor.investment_type and investor.investment_type != deal.investment_type:
+            return False
+        return True
+
+    def _score(self, investor: InvestorProfile, deal: DealProfile) -> InvestorMatch:
+        need = deal.capital_needed
+        capacity = min(investor.available_capital / need, 1.0) if need > 0 else 1.0
+        if not deal.markets:
+            market = 0.5
+        else:
+            market = 1.0 if investor.markets & deal.markets else 0.6
+        if deal.risk_level is None:
+            risk = 0.5
+        else:
+            risk = 1.0 if RISK_HOME_PROFILE.get(deal.risk_level) == investor.risk_profile else 0.5
+        if deal.projected_return is None or investor.preferred_return <= 0:
+            ret = 0.5
+        else:
+            ret = min(float(deal.projected_return) / investor.preferred_return, 1.0)
+        components = {"capacity": capacity, "market": market, "risk": risk, "return": max(ret, 0.0)}
+        score = sum(FIT_WEIGHTS[k] * v for k, v in components.items())
+        return InvestorMatch(
+            investor_id=investor.investor_id,
+            investor_name=investor.investor_name,
+            fit_score=round(score, 2),
+            components={k: round(v, 4) for k, v in components.items()},
+        )
+
+    def score(self, investor_id: str, deal: DealProfile,
+              min_share: float = MIN_CAPITAL_SHARE) -> Optional[InvestorMatch]:
+        """Fit of one indexed investor for a deal; None if it isn't eligible."""
+        investor = self._investors.get(investor_id)
+        if investor is None or deal.risk_level == "CRITICAL":
+            return None
+        if not self._fits(investor, deal, deal.capital_needed * min_share):
+            return None
+        return self._score(investor, deal)
+
+    def match(self, deal: DealProfile, limit: int = 25,
+              min_share: float = MIN_CAPITAL_SHARE) -> list[InvestorMatch]:
+        """Eligible investors for one deal, best fit first."""
+        self.lookups += 1
+        if deal.risk_level == "CRITICAL":
+            return []
+        min_capital = deal.capital_needed * min_share
+        matches = [
+            self._score(self._investors[iid], deal)
+            for iid in self._candidates(deal, min_capital)
+            if self._fits(self._investors[iid], deal, min_capital)
+        ]
+        matches.sort(key=lambda m: (-m.fit_score, -self._investors[m.investor_id].available_capital, m.investor_id))
+        return matches[:limit]
+
+    def match_all(self, deals: Iterable[DealProfile], limit: int = 25,
+                  min_share: float = MIN_CAPITAL_SHARE) -> dict[str, list[InvestorMatch]]:
+        """Ranked matches for every deal, keyed by deal_id."""
+        return {deal.deal_id: self.match(deal, limit, min_share) for deal in deals}
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "investors": len(self._investors),
+            "markets_indexed": sum(1 for ids in self._by_market.values() if ids),
+            "lookups": self.lookups,
+            "avg_candidates_scanned": round(self.candidates_scanned / self.lookups, 2) if self.lookups else 0.0,
+        }
+
+
+__all__ = [
+    "DealProfile",
+    "InvestorMatch",
+    "InvestorMatchIndex",
+    "InvestorProfile",
+    "MIN_CAPITAL_SHARE",
+    "RISK_TOLERANCE",
+    "location_keys",
+    "market_key",
+]
@@ -0,0 +1,247 @@
+"""Columnar portfolio exposure, concentration and scenario analytics.
+
+RiskEngine.process compared each position with total capital one at a
+time. This book stores positions as columns — an exposure array plus one
+integer group code per dimension (asset type, market, investor, lender) —
+and keeps a running exposure total per group:
+
+* a full load builds the group totals with one ``bincount`` per dimension;
+* upserting or removing a position adjusts one slot and one group per
+  dimension, so dashboards never re-scan the portfolio on a change;
+* HHI, top concentrations and scenario losses read the group totals, or
+  gather a shock vector through the code columns, in a single NumPy pass.
+
+Scenario shocks are fractional value changes (``-0.25`` = down 25%): a
+``default`` for every position, overridden per group, e.g.
+``{"default": -0.10, "by": {"asset_type": {"Land": -0.35}}}``. The first
+dimension in ``DIMENSIONS`` order that names a position's group wins.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+DIMENSIONS = ("asset_type", "market", "investor", "lender")
+UNASSIGNED = "Unassigned"
+MAX_CONCENTRATION = 0.25          # share of exposure in one group that raises a flag
+MIN_LIQUIDITY_RATIO = 0.10
+HHI_CONCENTRATED = 0.25           # DOJ-style thresholds on the 0-1 scale
+HHI_MODERATE = 0.15
+
+DEFAULT_SCENARIOS: dict[str, dict[str, Any]] = {
+    "market_correction": {"default": -0.10},
+    "severe_downturn": {"default": -0.25,
+                        "by": {"asset_type": {"land": -0.40, "Vacant Land": -0.40, "Development": -0.35}}},
+    "construction_overrun": {"default": 0.0, "by": {"asset_type": {"Development": -0.20}}},
+}
+
+
+@dataclass(frozen=True)
+class Position:
+    position_id: str              # e.g. "allocations:<uuid>"
+    exposure: float
+    asset_type: Optional[str] = None
+    market: Optional[str] = None
+    investor: Optional[str] = None
+    lender: Optional[str] = None
+
+    def group(self, dimension: str) -> str:
+        return getattr(self, dimension) or UNASSIGNED
+
+
+class PortfolioRiskBook:
+    """Positions as columns with per-group exposure totals per dimension."""
+
+    def __init__(self, positions: Iterable[Position] = (), liquid_capital: float = 0.0) -> None:
+        self.liquid_capital = float(liquid_capital)
+        self.updates = 0
+        self.load(positions)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # ─── Columns ────────────────────────────────────────────────────────────
+
+    def _code(self, dimension: str, group: str) -> int:
+        codes = self._codes[dimension]
+        code = codes.get(group)
+        if code is None:
+            code = codes[group] = len(self._labels[dimension])
+            self._labels[dimension].append(group)
+            totals = self._totals[dimension]
+            if code >= len(totals):
+                self._totals[dimension] = np.concatenate((totals, np.zeros(max(len(totals), 8))))
+        return code
+
+    def _grow(self) -> None:
+        size = max(2 * len(self._exposure), 64)
+        self._exposure = np.concatenate((self._exposure, np.zeros(size - len(self._exposure))))
+        for dim in DIMENSIONS:
+            col = self._columns[dim]
+            self._columns[dim] = np.concatenate((col, np.zeros(size - len(col), dtype=np.int64)))
+
+    def load(self, positions: Iterable[Position]) -> int:
+        """Replace every position, building group totals with bincount."""
+        positions = list({p.position_id: p for p in positions}.values())
+        n = len(positions)
+        self._slots: dict[str, int] = {p.position_id: i for i, p in enumerate(positions)}
+        self._free: list[int] = []
+        self._exposure = np.array([p.exposure for p in positions], dtype=float)
+        self._codes: dict[str, dict[str, int]] = {}
+        self._labels: dict[str, list[str]] = {}
+        self._columns: dict[str, np.ndarray] = {}
+        self._totals: dict[str, np.ndarray] = {}
+        for dim in DIMENSIONS:
+            groups = [p.group(dim) for p in positions]
+            labels, codes = np.unique(np.array(groups, dtype=object), return_inverse=True) if n else ([], [])
+            self._labels[dim] = [str(label) for label in labels]
+            self._codes[dim] = {label: i for i, label in enumerate(self._labels[dim])}
+            self._columns[dim] = np.asarray(codes, dtype=np.int64).reshape(n)
+            self._totals[dim] = np.bincount(self._columns[dim], weights=self._exposure,
+                                            minlength=len(self._labels[dim])).astype(float)
+        return n
+
+    def upsert(self, position: Position) -> None:
+        """Add or replace one position, adjusting only its groups."""
+        slot = self._slots.get(position.position_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self._slots)
+                if slot >= len(self._exposure):
+                    self._grow()
+            self._slots[position.position_id] = slot
+        else:
+            self._retire(slot)
+        self._exposure[slot] = position.exposure
+        for dim in DIMENSIONS:
+            code = self._code(dim, position.group(dim))
+            self._columns[dim][slot] = code
+            self._totals[dim][code] += position.exposure
+        self.updates += 1
+
+    def remove(self, position_id: str) -> None:
+        slot = self._slots.pop(position_id, None)
+        if slot is None:
+            return
+        self._retire(slot)
+        self._exposure[slot] = 0.0
+        self._free.append(slot)
+        self.updates += 1
+
+    def _retire(self, slot: int) -> None:
+        old = self._exposure[slot]
+        for dim in DIMENSIONS:
+            self._totals[dim][self._columns[dim][slot]] -= old
+
+    # ─── Analytics ──────────────────────────────────────────────────────────
+
+    @property
+    def total_exposure(self) -> float:
+        return float(self._totals[DIMENSIONS[0]].sum()) if self._slots else 0.0
+
+    def exposures(self, dimension: str) -> dict[str, float]:
+        """Exposure per group of ``dimension``, largest first (empty groups dropped)."""
+        totals = self._totals[dimension][: len(self._labels[dimension])]
+        order = np.argsort(-totals, kind="stable")
+        return {self._labels[dimension][i]: round(float(totals[i]), 2) for i in order if totals[i] > 1e-9}
+
+    def hhi(self, dimension: str) -> float:
+        """Herfindahl–Hirschman index of exposure shares (0-1; 1 = one group)."""
+        totals = np.maximum(self._totals[dimension][: len(self._labels[dimension])], 0.0)
+        total = totals.sum()
+        return float(((totals / total) ** 2).sum()) if total > 0 else 0.0
+
+    def scenario_loss(self, scenario: dict[str, Any]) -> float:
+        """Portfolio value change under ``scenario`` (negative = drawdown)."""
+        if not self._slots:
+            return 0.0
+        live = len(self._exposure)
+        shock = np.full(live, float(scenario.get("default", 0.0)))
+        decided = np.zeros(live, dtype=bool)
+        for dim in DIMENSIONS:
+            overrides = (scenario.get("by") or {}).get(dim) or {}
+            if not overrides:
+                continue
+            table = np.full(len(self._labels[dim]), np.nan)
+            for group, value in overrides.items():
+                code = self._codes[dim].get(group)
+                if code is not None:
+                    table[code] = float(value)
+            hit = self._columns[dim][:live]
+            picked = table[hit] if len(table) else np.full(live, np.nan)
+            apply = ~decided & ~np.isnan(picked)
+            shock[apply] = picked[apply]
+            decided |= apply
+        return float(self._exposure @ shock)
+
+    def report(self, max_concentration: float = MAX_CONCENTRATION,
+               scenarios: Optional[dict[str, dict[str, Any]]] = None,
+               total_capital: Optional[float] = None) -> dict[str, Any]:
+        """Exposures, concentration flags, liquidity ratio and scenario drawdowns.
+
+        Group shares and the liquidity ratio are taken over ``total_capital``
+        when given, otherwise over exposure and exposure plus liquid capital.
+        """
+        total = self.total_exposure
+        capital = total + self.liquid_capital if total_capital is None else float(total_capital)
+        base = total if total_capital is None else capital
+        liquidity_ratio = self.liquid_capital / capital if capital > 0 else 0.0
+        flags: list[str] = []
+        by_dimension: dict[str, Any] = {}
+        for dim in DIMENSIONS:
+            groups = self.exposures(dim)
+            hhi = self.hhi(dim)
+            top = next(iter(groups.items()), None)
+            share = top[1] / base if top and base > 0 else 0.0
+            by_dimension[dim] = {
+                "exposures": groups,
+                "hhi": round(hhi, 4),
+                "top_group": top[0] if top else None,
+                "top_share": round(share, 4),
+                "concentration": "HIGH" if hhi >= HHI_CONCENTRATED else "MODERATE" if hhi >= HHI_MODERATE else "LOW",
+            }
+            for group, exposure in groups.items():
+                if group != UNASSIGNED and base > 0 and exposure / base > max_concentration:
+                    flags.append(f"Concentration risk: {dim} {group} at {exposure / base:.1%}")
+        if capital > 0 and liquidity_ratio < MIN_LIQUIDITY_RATIO:
+            flags.append(f"Liquidity risk: only {liquidity_ratio:.1%} liquid")
+
+        drawdowns = {}
+        for name, scenario in (DEFAULT_SCENARIOS if scenarios is None else scenarios).items():
+            change = self.scenario_loss(scenario)
+            drawdowns[name] = {
+                "value_change": round(change, 2),
+                "drawdown_pct": round(-change / total, 4) + 0.0 if total > 0 else 0.0,
+            }
+        return {
+            "positions": len(self._slots),
+            "total_exposure": round(total, 2),
+            "liquid_capital": round(self.liquid_capital, 2),
+            "liquidity_ratio": round(liquidity_ratio, 4),
+            "by_dimension": by_dimension,
+            "scenarios": drawdowns,
+            "risk_flags": flags,
+            "risk_count": len(flags),
+            "overall_risk": "HIGH" if len(flags) >= 3 else "MODERATE" if flags else "LOW",
+        }
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "positions": len(self._slots),
+            "groups": {dim: len(self.exposures(dim)) for dim in DIMENSIONS},
+            "incremental_updates": self.updates,
+        }
+
+
+__all__ = [
+    "DEFAULT_SCENARIOS",
+    "DIMENSIONS",
+    "MAX_CONCENTRATION",
+    "PortfolioRiskBook",
+    "Position",
+    "UNASSIGNED",
+]
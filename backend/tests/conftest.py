@@ -0,0 +1,29 @@
+"""Shared test setup, run before any test module imports the app.
+
+Importing the land-build API creates a registry that writes snapshots into
+LAND_BUILD_METRICS_DIR, so point it at a throwaway directory and skip the
+final flush at exit.
+
+backend/dynasty_os is a deployment slice without the Lead Engine package;
+register the full package's module under its own name so the routing and
+work-queue APIs' lazy imports (and their tests) find it.
+"""
+import atexit
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+_metrics_dir = tempfile.mkdtemp(prefix="dynasty-metrics-")
+atexit.register(shutil.rmtree, _metrics_dir, True)
+os.environ["LAND_BUILD_METRICS_DIR"] = _metrics_dir
+os.environ["METRICS_FLUSH_AT_EXIT"] = "0"
+
+_lead_engine = importlib.util.spec_from_file_location(
+    "dynasty_os.engines.lead_engine",
+    Path(__file__).resolve().parents[2] / "dynasty_os" / "engines" / "lead_engine" / "__init__.py",
+)
+sys.modules[_lead_engine.name] = importlib.util.module_from_spec(_lead_engine)
+_lead_engine.loader.exec_module(sys.modules[_lead_engine.name])
@@ -0,0 +1,90 @@
+"""
+Tests for the background lead_activities batcher.
+
+Run with: cd backend && pytest tests/test_activity_log.py -v
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from app.activity_log import ActivityLogBatcher
+
+
+class FakeClient:
+    """Records each insert batch; the first ``fail`` inserts raise."""
+
+    def __init__(self, fail=0):
+        self.batches, self.fail, self.lock = [], fail, threading.Lock()
+
+    def table(self, name):
+        return SimpleNamespace(insert=lambda rows: SimpleNamespace(execute=lambda: self._insert(rows)))
+
+    def _insert(self, rows):
+        with self.lock:
+            if self.fail:
+                self.fail -= 1
+                raise RuntimeError("insert failed")
+            self.batches.append([row["n"] for row in rows])
+
+
+def _batcher(client, **kwargs):
+    return ActivityLogBatcher(client_factory=lambda: client, retry_backoff=0, **kwargs)
+
+
+def _wait(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_full_batches_flush_without_waiting_for_the_interval():
+    client = FakeClient()
+    batcher = _batcher(client, batch_size=3, interval=60)
+    for n in range(7):
+        batcher.enqueue({"n": n})
+
+    _wait(lambda: batcher.written == 6)
+    assert client.batches == [[0, 1, 2], [3, 4, 5]]
+
+    batcher.close()
+    assert client.batches[-1] == [6] and batcher.written == 7
+
+
+def test_partial_batch_flushes_after_the_interval():
+    client = FakeClient()
+    batcher = _batcher(client, batch_size=100, interval=0.05)
+    batcher.enqueue({"n": 1})
+    batcher.enqueue({"n": 2})
+
+    _wait(lambda: batcher.written == 2)
+    assert client.batches == [[1, 2]]
+    batcher.close()
+
+
+def test_close_writes_the_batch_the_worker_is_holding():
+    client = FakeClient()
+    batcher = _batcher(client, batch_size=100, interval=60)
+    for n in range(3):
+        batcher.enqueue({"n": n})
+    _wait(batcher._queue.empty)        # the worker has taken them into its batch
+
+    started = time.monotonic()
+    batcher.close()
+
+    assert time.monotonic() - started < 5
+    assert client.batches == [[0, 1, 2]]
+    batcher.enqueue({"n": 3})
+    assert client.batches[-1] == [3]
+
+
+def test_failed_inserts_are_retried_then_counted():
+    client = FakeClient(fail=2)
+    batcher = _batcher(client, retries=2)
+    batcher.enqueue({"n": 1})
+    batcher.close()
+    assert (batcher.written, batcher.failed, batcher.retried) == (1, 0, 2)
+
+    client.fail = 3
+    batcher.enqueue({"n": 2})
+    assert (batcher.written, batcher.failed, batcher.retried) == (1, 1, 4)
@@ -0,0 +1,65 @@
+"""Address normalization, hashing and the trigram search index.
+
+Run with: cd backend && pytest tests/test_address_index.py -v
+"""
+from __future__ import annotations
+
+from app.address_index import AddressIndex, address_hash, normalize_address, parse_address, similarity
+from app.lead_import import import_key
+
+
+def test_variants_share_one_key():
+    variants = [
+        "123 North Main Street Apt 2",
+        "123 n. main st #2",
+        "123 N Main Street #2",
+    ]
+    assert {normalize_address(v) for v in variants} == {"123 N MAIN ST UNIT 2"}
+    assert len({address_hash(v) for v in variants}) == 1
+
+    located = ["123 N Main St Unit 2, Park Hills, MO 63601", "123 north main street apt 2 Park Hills MO 63601-1234"]
+    assert {normalize_address(v) for v in located} == {"123 N MAIN ST UNIT 2 63601"}
+    parsed = parse_address(located[0])
+    assert (parsed.street, parsed.unit, parsed.city, parsed.state, parsed.zip) == (
+        "123 N MAIN ST", "2", "PARK HILLS", "MO", "63601")
+
+
+def test_same_street_in_other_cities_does_not_collide():
+    dallas, springfield = "123 Main St, Dallas, TX 75201", "123 Main Street, Springfield, MO 65801"
+    assert normalize_address(dallas) != normalize_address(springfield)
+    assert address_hash(dallas) != address_hash(springfield)
+    assert import_key("Seller", {"address": dallas}) != import_key("Seller", {"address": springfield})
+    assert normalize_address("500 Ocean Dr, Miami, FL") != normalize_address("500 Ocean Dr, Tampa, FL")
+
+
+def test_locality_is_stripped_with_or_without_commas():
+    assert normalize_address("123 Main St Orlando FL 32801") == "123 MAIN ST 32801"
+    assert normalize_address("123 Main St, Orlando, FL 32801") == "123 MAIN ST 32801"
+    assert normalize_address("500 Ocean Dr Miami FL") == "500 OCEAN DR MIAMI FL"
+    assert normalize_address("500 Ocean Drive, Miami, FL") == "500 OCEAN DR MIAMI FL"
+    assert normalize_address("100 Main St E Ste 4, Tulsa, OK") == "100 MAIN ST E UNIT 4 TULSA OK"
+
+
+def test_keys_normalize_to_themselves():
+    # Stored keys are re-hashed as addresses (property lookups, the backfill).
+    for address in ("123 N Main St Unit 2, Park Hills, MO 63601", "500 Ocean Dr Miami FL",
+                    "123 Broadway, New York, NY", "12 First Avenue Northwest"):
+        key = normalize_address(address)
+        assert normalize_address(key) == key
+        assert address_hash(key) == address_hash(address)
+
+
+def test_street_names_that_look_like_suffixes_survive():
+    assert normalize_address("45 North St") == "45 NORTH ST"
+    assert normalize_address("9 Court Street") == "9 COURT ST"
+    assert normalize_address("12 First Avenue Northwest") == "12 1ST AVE NW"
+    assert normalize_address("   ") is None
+
+
+def test_search_ranks_same_house_number_first():
+    index = AddressIndex([(1, "125 N Main St"), (2, "123 N Maine Street"), (3, "9 Oak Dr")])
+
+    assert index.get("125 north main street") == [1]
+    ranked = index.search("123 N Main St")
+    assert [m["id"] for m in ranked] == [2, 1]
+    assert ranked[0]["score"] == round(similarity("123 N MAIN ST", "123 N MAINE ST"), 4)
@@ -0,0 +1,355 @@
+"""
+Tests for vectorized buyer-match scoring and the BuyerMatchJob diff / upsert.
+
+Run with: cd backend && pytest tests/test_buyer_match_scoring.py -v
+"""
+import re
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import app.buyer_match_job as buyer_match_job
+from app.buyer_match_job import BuyerMatchJob
+from dynasty_os.engines.buyer_match_scoring import (
+    CriteriaInput,
+    DealInput,
+    best_matches,
+    match_reasons,
+    score_matrix,
+)
+
+
+# ─── Reference: frontend/lib/buyer-matches/score-match.ts, line for line ────
+
+def _normalize(value):
+    return re.sub(r"[\s-]", "_", value.strip().lower())
+
+
+def score_match(deal, criteria):
+    score = 20
+    reasons = []
+
+    exits = [_normalize(v) for v in criteria["exitStrategies"]]
+    if not exits or _normalize(deal["exitStrategy"]) in exits:
+        score += 20
+        reasons.append(f"Buys {deal['exitStrategy'].replace('_', ' ')} deals")
+    else:
+        score -= 15
+
+    types = [_normalize(v) for v in criteria["propertyTypes"]]
+    if not types or _normalize(deal["propertyType"]) in types:
+        score += 15
+        reasons.append(f"Targets {deal['propertyType'].replace('-', ' ')}")
+    else:
+        score -= 10
+
+    markets = [m.lower() for m in criteria["markets"]]
+    if not markets or deal["propertyCity"].lower() in markets or deal["propertyState"].lower() in markets:
+        score += 20
+        reasons.append("In buyer's target market")
+    else:
+        score -= 15
+
+    if deal["purchasePrice"] is not None:
+        within_min = criteria["minPrice"] is None or deal["purchasePrice"] >= criteria["minPrice"]
+        within_max = criteria["maxPrice"] is None or deal["purchasePrice"] <= criteria["maxPrice"]
+        if within_min and within_max:
+            score += 15
+            reasons.append("Within buyer price range")
+        else:
+            score -= 15
+            reasons.append("Outside buyer price range")
+
+    if deal["arv"] is not None and criteria["minArv"] is not None:
+        if deal["arv"] >= criteria["minArv"]:
+            score += 5
+            reasons.append("Meets minimum ARV")
+        else:
+            score -= 10
+
+    if deal["capitalRequired"] is not None and criteria["maxCapital"] is not None:
+        if deal["capitalRequired"] <= criteria["maxCapital"]:
+            score += 10
+            reasons.append("Within funding capacity")
+        else:
+            score -= 20
+            reasons.append("Exceeds funding capacity")
+
+    return {"matchScore": min(100, max(0, round(score))), "reasons": reasons}
+
+
+def _ts_deal(deal: DealInput):
+    return {
+        "exitStrategy": deal.exit_strategy, "purchasePrice": deal.purchase_price, "arv": deal.arv,
+        "capitalRequired": deal.capital_required, "propertyType": deal.property_type,
+        "propertyCity": deal.city, "propertyState": deal.state,
+    }
+
+
+def _ts_criteria(c: CriteriaInput):
+    return {
+        "propertyTypes": list(c.property_types), "exitStrategies": list(c.exit_strategies),
+        "markets": list(c.markets), "minPrice": c.min_price, "maxPrice": c.max_price,
+        "minArv": c.min_arv, "maxCapital": c.max_capital,
+    }
+
+
+EXITS = ["wholesale", "fix_and_flip", "fix and flip", "buy-and-hold", "brrrr"]
+TYPES = ["single-family", "single family", "multi-family", "land", "Condo"]
+CITIES = [("Austin", "TX"), ("Dallas", "TX"), ("Memphis", "TN"), ("Tulsa", "OK")]
+
+
+def _random_deal(rng, i, user_id="u1"):
+    city, state = CITIES[rng.integers(len(CITIES))]
+
+    def maybe(lo, hi):
+        return None if rng.random() < 0.2 else float(rng.integers(lo, hi)) * 1_000
+
+    return DealInput(
+        f"d{i}", f"p{i}", user_id, str(rng.choice(EXITS)), maybe(50, 400), maybe(80, 600), maybe(10, 300),
+        str(rng.choice(TYPES)), city if rng.random() < 0.8 else city.upper(), state,
+    )
+
+
+def _random_criteria(rng, i, user_id="u1"):
+    def some(values):
+        return tuple(str(v) for v in rng.choice(values, size=rng.integers(0, 3), replace=False))
+
+    def maybe(lo, hi):
+        return None if rng.random() < 0.4 else float(rng.integers(lo, hi)) * 1_000
+
+    markets = some([c for c, _ in CITIES] + [s for _, s in CITIES] + ["austin"])
+    return CriteriaInput(
+        f"b{i % 15}", user_id, some(TYPES), some(EXITS), markets,
+        maybe(40, 200), maybe(150, 500), maybe(100, 400), maybe(50, 250),
+    )
+
+
+# ─── Scoring parity ─────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("deal, criteria, score, reasons", [
+    (
+        DealInput("d", "p", "u", "fix_and_flip", 200_000, 320_000, 90_000, "single-family", "Austin", "TX"),
+        CriteriaInput("b", "u", ("Single Family",), ("fix and flip",), ("tx",), 150_000, 250_000, 300_000, 100_000),
+        100,
+        ["Buys fix and flip deals", "Targets single family", "In buyer's target market",
+         "Within buyer price range", "Meets minimum ARV", "Within funding capacity"],
+    ),
+    (
+        DealInput("d", "p", "u", "wholesale", 400_000, 200_000, 300_000, "land", "Memphis", "TN"),
+        CriteriaInput("b", "u", ("single-family",), ("brrrr",), ("Austin",), None, 250_000, 250_000, 100_000),
+        0,
+        ["Outside buyer price range", "Exceeds funding capacity"],
+    ),
+    (
+        DealInput("d", "p", "u", "wholesale", None, None, None, "single-family", "Tulsa", "OK"),
+        CriteriaInput("b", "u"),
+        75,
+        ["Buys wholesale deals", "Targets single family", "In buyer's target market"],
+    ),
+])
+def test_scoring_matches_frontend_fixtures(deal, criteria, score, reasons):
+    assert score_match(_ts_deal(deal), _ts_criteria(criteria)) == {"matchScore": score, "reasons": reasons}
+    assert int(score_matrix([deal], [criteria])[0, 0]) == score
+    assert match_reasons(deal, criteria) == reasons
+
+
+def test_score_matrix_matches_score_match_on_random_pairs():
+    rng = np.random.default_rng(48)
+    deals = [_random_deal(rng, i) for i in range(120)]
+    criteria = [_random_criteria(rng, i) for i in range(60)]
+    scores = score_matrix(deals, criteria)
+    for d, deal in enumerate(deals):
+        for c, row in enumerate(criteria):
+            expected = score_match(_ts_deal(deal), _ts_criteria(row))
+            assert scores[d, c] == expected["matchScore"]
+            assert match_reasons(deal, row) == expected["reasons"]
+
+
+def test_best_matches_keep_each_buyers_first_best_criteria():
+    rng = np.random.default_rng(480)
+    deals = [_random_deal(rng, i, user_id=f"u{i % 2}") for i in range(80)]
+    criteria = [_random_criteria(rng, i, user_id=f"u{i % 2}") for i in range(60)]
+    expected = {}
+    for deal in deals:
+        for row in criteria:
+            if row.user_id != deal.user_id:
+                continue
+            result = score_match(_ts_deal(deal), _ts_criteria(row))
+            key = (deal.deal_id, row.buyer_profile_id)
+            if key not in expected or result["matchScore"] > expected[key][0]:
+                expected[key] = (result["matchScore"], tuple(result["reasons"]))
+    expected = {k: v for k, v in expected.items() if v[0] >= 40}
+    got = {(m.deal_id, m.buyer_profile_id): (m.match_score, m.match_reasons)
+           for m in best_matches(deals, criteria, chunk=16)}
+    assert got == expected
+
+
+# ─── BuyerMatchJob against an in-memory PostgREST client ────────────────────
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client, self.table = client, table
+        self.filters, self.negate = [], False
+        self.order_by = self.bounds = self.payload = None
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def _where(self, predicate):
+        negate, self.negate = self.negate, False
+        self.filters.append((lambda r: not predicate(r)) if negate else predicate)
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self._where(lambda r: r.get(column) == value)
+
+    def neq(self, column, value):
+        return self._where(lambda r: r.get(column) != value)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._where(lambda r: r.get(column) in values)
+
+    def is_(self, column, value):
+        assert value == "null"
+        return self._where(lambda r: r.get(column) is None)
+
+    def order(self, column):
+        self.order_by = column
+        return self
+
+    def range(self, lo, hi):
+        self.bounds = (lo, hi)
+        return self
+
+    def upsert(self, rows, on_conflict, returning=None):
+        self.payload, self.conflict = rows, on_conflict.split(",")
+        return self
+
+    def execute(self):
+        rows = self.client.tables.setdefault(self.table, [])
+        if self.payload is not None:
+            self.client.upserts.append((self.table, [dict(r) for r in self.payload]))
+            for new in self.payload:
+                key = tuple(new[c] for c in self.conflict)
+                old = next((r for r in rows if tuple(r.get(c) for c in self.conflict) == key), None)
+                if old is None:
+                    rows.append(dict(new))
+                else:
+                    old.update({k: v for k, v in new.items() if k != "id"})
+            return SimpleNamespace(data=[])
+        data = [dict(r) for r in rows if all(f(r) for f in self.filters)]
+        assert self.order_by, "paged reads must be ordered"
+        data.sort(key=lambda r: r[self.order_by])
+        if self.bounds:
+            data = data[self.bounds[0]: self.bounds[1] + 1]
+        return SimpleNamespace(data=data)
+
+
+class FakeClient:
+    def __init__(self, tables):
+        self.tables = tables
+        self.upserts = []
+
+    def schema(self, name):
+        return self
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def _tables():
+    properties = [
+        {"id": "p1", "propertyType": "single-family", "city": "Austin", "state": "TX"},
+        {"id": "p2", "propertyType": "land", "city": "Memphis", "state": "TN"},
+        {"id": "p3", "propertyType": "single-family", "city": "Dallas", "state": "TX"},
+    ]
+    deal = {"exitStrategy": "fix_and_flip", "purchasePrice": 200_000, "arv": 300_000, "capitalRequired": 80_000,
+            "decision": "GO", "status": "active"}
+    deals = [
+        {**deal, "id": "d1", "userId": "u1", "propertyId": "p1"},
+        {**deal, "id": "d2", "userId": "u1", "propertyId": "p2", "purchasePrice": 90_000},
+        {**deal, "id": "d3", "userId": "u1", "propertyId": "p3", "status": "closed"},
+        {**deal, "id": "d4", "userId": "u2", "propertyId": "p3"},
+    ]
+    profiles = [
+        {"id": "b1", "user_id": "u1", "status": "ACTIVE"},
+        {"id": "b2", "user_id": "u1", "status": "ACTIVE"},
+        {"id": "b3", "user_id": "u1", "status": "PAUSED"},
+        {"id": "b4", "user_id": "u2", "status": "ACTIVE"},
+    ]
+    criteria = [
+        {"id": "c1", "buyer_profile_id": "b1", "user_id": "u1", "markets": ["TX"], "max_price": 250_000},
+        {"id": "c2", "buyer_profile_id": "b2", "user_id": "u1", "property_types": ["land"]},
+        {"id": "c3", "buyer_profile_id": "b3", "user_id": "u1"},
+        {"id": "c4", "buyer_profile_id": "b4", "user_id": "u2", "exit_strategies": ["wholesale"]},
+    ]
+    return {"Deal": deals, "Property": properties, "buyer_profiles": profiles,
+            "buyer_criteria": criteria, "buyer_matches": []}
+
+
+def _expected(tables):
+    props = {p["id"]: p for p in tables["Property"]}
+    deals = [DealInput.from_rows(d, props[d["propertyId"]]) for d in tables["Deal"] if d["status"] != "closed"]
+    active = {p["id"] for p in tables["buyer_profiles"] if p["status"] == "ACTIVE"}
+    criteria = [CriteriaInput.from_row(r) for r in tables["buyer_criteria"] if r["buyer_profile_id"] in active]
+    return {(m.deal_id, m.buyer_profile_id): (m.match_score, list(m.match_reasons))
+            for m in best_matches(deals, criteria)}
+
+
+def _stored(client):
+    return {(r["deal_id"], r["buyer_profile_id"]): (r["match_score"], r["match_reasons"])
+            for r in client.tables["buyer_matches"]}
+
+
+def test_job_inserts_updates_and_skips_unchanged(monkeypatch):
+    monkeypatch.setattr(buyer_match_job, "LOAD_PAGE_SIZE", 2)
+    tables = _tables()
+    expected = _expected(tables)
+    (kept_key, kept), (stale_key, stale) = list(expected.items())[:2]
+    tables["buyer_matches"] = [
+        {"id": "m-kept", "deal_id": kept_key[0], "buyer_profile_id": kept_key[1],
+         "match_score": kept[0], "match_reasons": kept[1]},
+        {"id": "m-stale", "deal_id": stale_key[0], "buyer_profile_id": stale_key[1],
+         "match_score": stale[0] - 5, "match_reasons": []},
+    ]
+    client = FakeClient(tables)
+
+    result = BuyerMatchJob(client, batch_size=2).run()
+    assert (result["matches"], result["inserted"], result["updated"], result["unchanged"]) == (
+        len(expected), len(expected) - 2, 1, 1)
+    assert result["written"] == len(expected) - 1
+    assert _stored(client) == expected
+    written = [row for _, batch in client.upserts for row in batch]
+    assert all(len(batch) <= 2 for _, batch in client.upserts)
+    assert "m-kept" not in {row["id"] for row in written}
+    assert {row["id"] for row in written if row["buyer_profile_id"] == stale_key[1]
+            and row["deal_id"] == stale_key[0]} == {"m-stale"}
+    assert not any(key[1] == "b3" or key[0] == "d3" for key in _stored(client))
+
+    again = BuyerMatchJob(client).run()
+    assert (again["written"], again["unchanged"]) == (0, len(expected))
+
+
+def test_job_incremental_and_dry_runs():
+    tables = _tables()
+    expected = _expected(tables)
+    client = FakeClient(tables)
+
+    dry = BuyerMatchJob(client, dry_run=True).run()
+    assert dry["inserted"] == len(expected) and dry["written"] == 0 and not client.upserts
+
+    result = BuyerMatchJob(client).run(deal_ids=["d2"])
+    assert result["deals"] == 1
+    assert _stored(client) == {k: v for k, v in expected.items() if k[0] == "d2"}
+
+    result = BuyerMatchJob(client).run(buyer_profile_ids=["b4"])
+    assert result["buyer_profiles"] == 1
+    assert _stored(client) == {k: v for k, v in expected.items() if k[0] == "d2" or k[1] == "b4"}
@@ -0,0 +1,47 @@
+"""Buyer price-band interval index against a brute-force scan.
+
+Run with: cd backend && pytest tests/test_buyer_matching.py -v
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from dynasty_os.engines.buyer_matching import BuyerBands, BuyerIntervalIndex
+
+
+def _random_buyer(rng, buyer_id: str) -> BuyerBands:
+    bands = []
+    for _ in range(rng.integers(1, 4)):
+        lo = float(rng.integers(0, 40)) * 10_000
+        hi = float("inf") if rng.random() < 0.1 else lo + float(rng.integers(0, 30)) * 10_000
+        bands.append((lo, hi))
+    return BuyerBands(buyer_id, tuple(bands), float(rng.integers(5, 60)) * 10_000, float(rng.integers(0, 100)))
+
+
+def _brute(buyers: dict[str, BuyerBands], price: float) -> list[str]:
+    hits = [b for b in buyers.values() if any(lo <= price <= hi for lo, hi in b.intervals())]
+    return [b.buyer_id for b in sorted(hits, key=lambda b: (-b.buyer_score, b.buyer_id))]
+
+
+def test_index_matches_brute_force_through_adds_and_removes():
+    rng = np.random.default_rng(47)
+    buyers = {f"b{i}": _random_buyer(rng, f"b{i}") for i in range(300)}
+    index = BuyerIntervalIndex(buyers.values())
+    prices = [float(p) for p in rng.integers(0, 70, 60) * 10_000] + [250_000.0, 0.0]
+
+    for step in range(200):
+        buyer_id = f"b{rng.integers(0, 400)}"
+        if rng.random() < 0.3:
+            buyers.pop(buyer_id, None)
+            index.remove(buyer_id)
+        else:
+            buyers[buyer_id] = _random_buyer(rng, buyer_id)
+            index.add(buyers[buyer_id])
+        if step % 20 == 0:
+            for price in prices:
+                assert index.match(price) == _brute(buyers, price)
+
+    properties = [(f"p{i}", price) for i, price in enumerate(prices)]
+    expected = {pid: ids for pid, price in properties if (ids := _brute(buyers, price))}
+    assert index.match_all(properties) == expected
+    assert len(index) == len(buyers)
@@ -0,0 +1,69 @@
+"""
+Tests for the double-entry capital ledger.
+
+Run with: cd backend && pytest tests/test_capital_ledger.py -v
+"""
+import random
+
+import pytest
+
+from dynasty_os.engines.capital_ledger import ACCOUNTS, CapitalLedger
+
+
+def _replay(ledger, entries):
+    totals = dict.fromkeys(ACCOUNTS, 0.0)
+    for entry in entries:
+        for account, delta in entry.postings():
+            totals[account] += delta
+    return totals
+
+
+def test_lifecycle_balances_per_investor_and_deal():
+    ledger = CapitalLedger()
+    ledger.record("deposit", "inv-1", 500_000, effective_at="2026-01-01T00:00:00")
+    ledger.record("commit", "inv-1", 200_000, deal_id="deal-a", effective_at="2026-02-01T00:00:00")
+    ledger.record("fund", "inv-1", 200_000, deal_id="deal-a", effective_at="2026-03-01T00:00:00")
+    ledger.record("distribute", "inv-1", 16_000, deal_id="deal-a", effective_at="2026-06-01T00:00:00")
+    ledger.record("return", "inv-1", 200_000, deal_id="deal-a", effective_at="2026-09-01T00:00:00")
+
+    investor = ledger.balance(investor_id="inv-1")
+    assert investor["available"] == 500_000
+    assert investor["committed"] == 0
+    assert investor["deployed"] == 0
+    assert investor["distributed"] == 16_000
+    assert ledger.balance(deal_id="deal-a")["deployed"] == 0
+    assert ledger.balance_as_of("2026-04-01", investor_id="inv-1")["deployed"] == 200_000
+    assert ledger.balance_as_of("2026-04-01", deal_id="deal-a")["available"] == -200_000
+    assert ledger.get_metrics()["in_balance"]
+
+
+def test_rejects_invalid_entries():
+    ledger = CapitalLedger()
+    with pytest.raises(ValueError):
+        ledger.record("transfer", "inv-1", 10)
+    with pytest.raises(ValueError):
+        ledger.record("deposit", "inv-1", 0)
+    with pytest.raises(ValueError):
+        ledger.record("fund", "inv-1", 10)
+    assert len(ledger) == 0
+
+
+def test_running_and_as_of_balances_match_full_replay():
+    rng = random.Random(42)
+    ledger = CapitalLedger()
+    types = ["deposit", "commit", "release", "fund", "return", "distribute", "withdraw"]
+    for _ in range(400):
+        entry_type = rng.choice(types)
+        deal = rng.choice(["d1", "d2", "d3"]) if entry_type not in ("deposit", "withdraw") else None
+        day = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00"
+        ledger.record(entry_type, rng.choice(["i1", "i2"]), rng.randint(1, 1000), deal, effective_at=day)
+
+    for investor in ("i1", "i2"):
+        entries = ledger.entries(investor_id=investor)
+        assert ledger.balance(investor_id=investor) == pytest.approx(_replay(ledger, entries))
+        cutoff = "2026-07-01T00:00:00"
+        expected = _replay(ledger, [e for e in entries if e.effective_at <= cutoff])
+        assert ledger.balance_as_of(cutoff, investor_id=investor) == pytest.approx(expected)
+        both = [e for e in entries if e.deal_id == "d2"]
+        assert ledger.balance(investor_id=investor, deal_id="d2") == pytest.approx(_replay(ledger, both))
+    assert sum(ledger.balance().values()) == pytest.approx(0)
@@ -0,0 +1,94 @@
+"""Cash-flow kernel: amortization, vectorized IRR/NPV and engine hooks.
+
+Run with: cd backend && pytest tests/test_cash_flow_kernel.py -v
+"""
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+import pytest
+
+from dynasty_os.engines.cash_flow_kernel import analyze_hold, build_cash_flows, irr, loan_balance, monthly_payment, npv
+from dynasty_os.engines.land_build_uw_dd_engine import RentalBackstopEngine
+
+
+def test_irr_solves_every_row_and_flags_unsolvable_rows():
+    flows = np.zeros((3, 13))
+    flows[0, 0], flows[0, 12] = -1000, 1100     # 10% over exactly one year
+    flows[1, 0], flows[1, 12] = -1000, 1000     # break-even
+    flows[2, 0], flows[2, 12] = 500, 500        # never negative: no IRR
+
+    rates = irr(flows)
+
+    assert rates[0] == pytest.approx(0.10, abs=1e-9)
+    assert rates[1] == pytest.approx(0.0, abs=1e-9)
+    assert np.isnan(rates[2])
+    assert npv(flows[:2], 0.10)[0] == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("months", [180, 360, 600])
+def test_irr_solves_loss_making_long_horizons(months):
+    monthly = {rate: (1 + rate) ** (1 / 12) - 1 for rate in (-0.116, -0.40, 0.07)}
+    flows = np.zeros((len(monthly), months + 1))
+    flows[:, 1:] = 100.0
+    t = np.arange(1, months + 1)
+    for row, m in enumerate(monthly.values()):
+        flows[row, 0] = -(100.0 * (1 + m) ** -t).sum()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        rates = irr(flows)
+
+    assert rates == pytest.approx(list(monthly), abs=1e-7)
+
+
+def test_amortization_pays_off_the_loan():
+    loan, rate, months = np.array([200_000.0]), np.array([0.06]), np.array([360.0])
+    payment = monthly_payment(loan, rate, months)
+
+    assert payment[0] == pytest.approx(1199.10, abs=0.01)
+    assert loan_balance(loan, rate, payment, months)[0] == pytest.approx(0.0, abs=1e-6)
+    assert loan_balance(loan, rate, payment, np.array([60.0]))[0] == pytest.approx(186_108.71, abs=0.05)
+
+
+def test_unlevered_flat_hold_matches_closed_form():
+    metrics = analyze_hold(
+        purchase_price=[120_000, 120_000],
+        monthly_rent=[1_000, 1_500],
+        hold_months=60,
+        rent_growth=0.0,
+        vacancy_rate=0.0,
+        management_pct=0.0,
+        maintenance_pct=0.0,
+        appreciation=0.0,
+        selling_costs_pct=0.0,
+    )
+
+    expected = (1 + np.array([1_000, 1_500]) / 120_000) ** 12 - 1
+    np.testing.assert_allclose(metrics["irr"], expected, rtol=1e-9)
+    np.testing.assert_allclose(metrics["equity_multiple"], [1.5, 1.75])
+    assert np.isnan(metrics["dscr"]).all()
+
+
+def test_any_array_argument_sets_the_row_count():
+    schedule = build_cash_flows(150_000, 1_400, hold_months=24, loan_amount=[0, 60_000, 120_000])
+    assert schedule.cash_flows.shape == (3, 25)
+    np.testing.assert_allclose(schedule.equity, [150_000, 90_000, 30_000])
+    assert schedule.debt_service[0] == 0 and schedule.debt_service[2] == pytest.approx(2 * schedule.debt_service[1])
+
+    rows = build_cash_flows(150_000, 1_400, hold_months=24, vacancy_rate=[0.0, 0.1])
+    assert rows.noi[0].sum() > rows.noi[1].sum()
+
+
+def test_rental_backstop_dcf_reports_levered_returns():
+    engine = RentalBackstopEngine()
+    dcf = engine.process_dcf(
+        "PROP-1", monthly_rent=2_000, annual_taxes=3_000, annual_insurance=1_200,
+        purchase_price=250_000, loan_amount=187_500, holding_years=7,
+    )
+
+    assert dcf["equity_invested"] == 62_500
+    assert dcf["dscr"] is not None and dcf["dscr"] > 0
+    assert dcf["irr"] is not None
+    assert engine.get_metrics()["dcf_runs"] == 1
@@ -0,0 +1,94 @@
+"""
+Tests for the disposition_performance catch-up behind /api/disposition/performance.
+
+Run with: cd backend && pytest tests/test_disposition_performance.py -v
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import app.api.disposition as disposition
+
+T0 = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+
+
+class FakePerformance:
+    """disposition_performance with only the committed rows visible."""
+
+    def __init__(self):
+        self.rows = []
+
+    def commit(self, row_id, seconds, days_on_market):
+        self.rows.append({
+            "id": row_id, "list_price": 100.0, "sale_price": 95.0, "days_on_market": days_on_market,
+            "exit_strategy": "Flip", "market": "Tulsa, OK",
+            "recorded_at": (T0 + timedelta(seconds=seconds)).isoformat(),
+        })
+
+    def table(self, name):
+        return FakeQuery(self.rows)
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows, self.filters, self.n = rows, [], None
+
+    def select(self, columns):
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda r: datetime.fromisoformat(r[column]) >= datetime.fromisoformat(value))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda r: r[column] > value)
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, n):
+        self.n = n
+        return self
+
+    def execute(self):
+        rows = sorted((r for r in self.rows if all(f(r) for f in self.filters)), key=lambda r: r["id"])
+        return SimpleNamespace(data=rows[: self.n])
+
+
+@pytest.fixture(autouse=True)
+def fresh_sketches(monkeypatch):
+    monkeypatch.setattr(disposition, "_performance", None)
+    monkeypatch.setattr(disposition, "LOAD_PAGE_SIZE", 2)
+
+
+def _count(db):
+    return disposition._performance_sketches(db, force=True).summary("days_on_market|*|*")["count"]
+
+
+def test_rows_committed_out_of_id_order_are_counted_once():
+    db = FakePerformance()
+    for i in range(1, 4):
+        db.commit(i, i, 10 * i)
+    db.commit(5, 5, 50)                 # id 4 is still in flight
+    assert _count(db) == 4
+
+    db.commit(4, 4, 40)                 # commits after id 5 was read
+    db.commit(6, 6, 60)
+    assert _count(db) == 6
+    assert _count(db) == 6
+
+    sketches = disposition._performance_sketches(db)
+    assert sketches.summary("days_on_market|Flip|Tulsa, OK")["mean"] == 35
+
+
+def test_overlap_ids_are_pruned_past_the_window():
+    db = FakePerformance()
+    db.commit(1, 0, 10)
+    db.commit(2, 10, 20)
+    _count(db)
+    db.commit(3, 10 + disposition.PERFORMANCE_OVERLAP_SECONDS + 1, 30)
+
+    assert _count(db) == 3
+    assert sorted(disposition._performance_recent) == [3]
@@ -0,0 +1,97 @@
+"""
+Tests for POST /api/capital/distributions/waterfall against a fake PostgREST client.
+
+Run with: cd backend && pytest tests/test_distribution_waterfall.py -v
+"""
+from datetime import date
+from types import SimpleNamespace
+
+import app.api.capital as capital
+
+
+class FakeQuery:
+    def __init__(self, db, rows):
+        self.db, self.rows = db, rows
+
+    def select(self, columns):
+        return self
+
+    def _where(self, keep):
+        return FakeQuery(self.db, [r for r in self.rows if keep(r)])
+
+    def gte(self, column, value):
+        return self._where(lambda r: r[column] >= value)
+
+    def lte(self, column, value):
+        return self._where(lambda r: r[column] <= value)
+
+    def eq(self, column, value):
+        return self._where(lambda r: r[column] == value)
+
+    def in_(self, column, values):
+        return self._where(lambda r: r[column] in values)
+
+    def insert(self, rows):
+        self.db.inserted.extend(rows)
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=rows))
+
+    def execute(self):
+        return SimpleNamespace(data=list(self.rows))
+
+
+class FakeDB:
+    def __init__(self, tables):
+        self.tables, self.inserted = tables, []
+
+    def table(self, name):
+        return FakeQuery(self, self.tables.get(name, []))
+
+
+def _db(prior_distributions=()):
+    return FakeDB({
+        "closings": [
+            {"property_id": "p1", "sale_price": 200, "net_profit": 50, "capital_recovered": 100,
+             "close_date": "2026-06-30"},
+            {"property_id": "p2", "sale_price": 200, "net_profit": 50, "capital_recovered": 100,
+             "close_date": "2026-06-30"},
+        ],
+        "deals": [{"deal_id": "d1", "property_id": "p1", "created_at": "2025-06-30"},
+                  {"deal_id": "d2", "property_id": "p2", "created_at": "2025-06-30"}],
+        "commitments": [
+            {"investor_id": "zero-pref", "deal_id": "d1", "amount": 50, "status": "Funded",
+             "created_at": "2025-06-30", "investors": {"preferred_return": 0}},
+            {"investor_id": "default-pref", "deal_id": "d1", "amount": 50, "status": "Funded",
+             "created_at": "2025-06-30", "investors": {"preferred_return": None}},
+            {"investor_id": "zero-pref", "deal_id": "d2", "amount": 100, "status": "Funded",
+             "created_at": "2025-06-30", "investors": {"preferred_return": 0}},
+        ],
+        "distributions": list(prior_distributions),
+    })
+
+
+def _run(monkeypatch, db):
+    monkeypatch.setattr(capital, "get_supabase", lambda: db)
+    return capital.run_distribution_waterfall(capital.WaterfallRun(
+        close_from=date(2026, 1, 1), close_to=date(2026, 12, 31), distribution_date=date(2026, 7, 15),
+    ))
+
+
+def test_an_explicit_zero_pref_is_not_replaced_by_the_default(monkeypatch):
+    result = _run(monkeypatch, _db())
+
+    pref = {(r["investor_id"], r["deal_id"]): r["amount"] for r in result["distributions"]
+            if r["type"] == "Preferred Return"}
+    assert ("zero-pref", "d1") not in pref and ("zero-pref", "d2") not in pref
+    assert 3.9 < pref[("default-pref", "d1")] < 4.1          # 8% on 50 for one year
+    assert result["skipped_deals"] == [] and result["skipped_for"] == {}
+
+
+def test_deals_with_earlier_distributions_are_skipped_and_reported(monkeypatch):
+    prior = [{"deal_id": "d2", "type": "Preferred Return"}, {"deal_id": "d2", "type": "Preferred Return"}]
+    db = _db(prior)
+    result = _run(monkeypatch, db)
+
+    assert result["deals"] == 1
+    assert result["skipped_deals"] == ["d2"]
+    assert result["skipped_for"] == {"d2": ["Preferred Return"]}
+    assert {r["deal_id"] for r in db.inserted} == {"d1"}
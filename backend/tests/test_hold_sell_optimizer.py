@@ -0,0 +1,57 @@
+"""
+Tests for the batch hold-vs-sell optimizer.
+
+Run with: cd backend && pytest tests/test_hold_sell_optimizer.py -v
+"""
+import numpy as np
+
+from dynasty_os.engines.cash_flow_kernel import analyze_hold
+from dynasty_os.engines.hold_sell_optimizer import HOLD, SELL, SELL_FOR_LIQUIDITY, HeldAsset, optimize_hold_sell
+
+
+def _portfolio(n=300, seed=4):
+    rng = np.random.default_rng(seed)
+    value = rng.uniform(80_000, 400_000, n)
+    return [
+        HeldAsset(str(i), v, v * rng.uniform(0.006, 0.012), v * rng.uniform(0, 1.05), v * 0.012, 1200)
+        for i, v in enumerate(value)
+    ]
+
+
+def test_hold_irr_matches_single_asset_dcf():
+    asset = HeldAsset("a", 200_000, 1_800, loan_balance=120_000, annual_taxes=2_400, annual_insurance=1_200)
+    plan = optimize_hold_sell([asset], hold_years=7, reinvestment_rate=0.09)
+    reference = analyze_hold(
+        discount_rate=0.09, purchase_price=200_000, upfront_costs=-12_000, monthly_rent=1_800,
+        hold_months=84, loan_amount=120_000, amortization_years=25, annual_taxes=2_400,
+        annual_insurance=1_200, management_pct=0.08,
+    )
+    assert np.isclose(plan.hold_irr[0], reference["irr"][0])
+    assert np.isclose(plan.hold_npv[0], reference["npv"][0])
+    assert plan.net_sale_proceeds[0] == 200_000 * 0.94 - 120_000
+
+
+def test_sales_beat_holding_and_liquidity_follows_rank():
+    assets = _portfolio()
+    free = optimize_hold_sell(assets)
+    assert np.all((free.decision == SELL) == ((free.hold_npv < 0) & (free.net_sale_proceeds > 0)))
+
+    target = free.net_sale_proceeds[free.decision == SELL].sum() + 3_000_000
+    plan = optimize_hold_sell(assets, target_liquidity=target)
+    extra = plan.decision == SELL_FOR_LIQUIDITY
+    still_sellable = (plan.decision == HOLD) & (plan.net_sale_proceeds > 0)
+
+    assert extra.any() and plan.portfolio["liquidity_shortfall"] == 0
+    assert plan.portfolio["liquidity_raised"] >= target
+    assert plan.sell_rank[extra].max() < plan.sell_rank[still_sellable].min()
+    assert np.all(plan.decision[plan.net_sale_proceeds <= 0] == HOLD)
+
+
+def test_long_holds_report_finite_irr(recwarn):
+    asset = HeldAsset("a", 200_000, 1_200, loan_balance=150_000)
+    for years in (15, 20, 30):
+        plan = optimize_hold_sell([asset], hold_years=years)
+        rate = plan.hold_irr[0]
+        assert np.isfinite(rate) and -0.5 < rate < 0.5
+        assert np.isclose(plan.hold_npv[0], 0.0, atol=1.0) or (plan.hold_npv[0] > 0) == (rate > 0.08)
+    assert not [w for w in recwarn if issubclass(w.category, RuntimeWarning)]
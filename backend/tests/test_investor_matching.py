@@ -0,0 +1,71 @@
+"""
+Tests for the investor–deal matching index.
+
+Run with: cd backend && pytest tests/test_investor_matching.py -v
+"""
+import numpy as np
+
+from dynasty_os.engines.investor_matching import (
+    RISK_TOLERANCE,
+    DealProfile,
+    InvestorMatchIndex,
+    InvestorProfile,
+    location_keys,
+    market_key,
+)
+
+MARKETS = ["Austin, TX", "Travis County", "TX", "St. Francois", "MO", "78701", "Tulsa,ok"]
+RISK_LEVELS = [None, "LOW", "MODERATE", "HIGH", "CRITICAL"]
+
+
+def test_market_key_normalizes_county_and_city_state_forms():
+    assert market_key("St. Francois County") == market_key("st francois") == "ST FRANCOIS"
+    assert market_key("Orleans Parish") == "ORLEANS"
+    assert market_key("Austin,tx") == market_key(" austin ,  TX ") == "AUSTIN, TX"
+    assert market_key("Travis County, TX") == "TRAVIS, TX"
+    assert market_key("County") == "COUNTY"
+    assert location_keys("Austin", "Travis County", "TX", "78701") == {
+        "AUSTIN", "TRAVIS", "TX", "78701", "AUSTIN, TX", "TRAVIS, TX",
+    }
+
+
+def test_county_and_city_state_markets_match():
+    index = InvestorMatchIndex([
+        InvestorProfile.from_row({"investor_id": "a", "available_capital": 500_000, "markets": ["St. Francois"]}),
+        InvestorProfile.from_row({"investor_id": "b", "available_capital": 500_000, "markets": ["Farmington, MO"]}),
+        InvestorProfile.from_row({"investor_id": "c", "available_capital": 500_000, "markets": ["Austin, TX"]}),
+    ])
+    deal = DealProfile("d", 100_000, location_keys("Farmington", "St. Francois County", "MO", "63640"))
+    assert sorted(m.investor_id for m in index.match(deal)) == ["a", "b"]
+
+
+def _brute(investors, deal, min_share=0.2):
+    index = InvestorMatchIndex(investors)
+    fits = [m for inv in investors if (m := index.score(inv.investor_id, deal, min_share)) is not None]
+    by_id = {inv.investor_id: inv for inv in investors}
+    fits.sort(key=lambda m: (-m.fit_score, -by_id[m.investor_id].available_capital, m.investor_id))
+    return [m.investor_id for m in fits]
+
+
+def test_index_matches_brute_force_scan():
+    rng = np.random.default_rng(44)
+    investors = [
+        InvestorProfile.from_row({
+            "investor_id": f"i{i}",
+            "available_capital": float(rng.integers(0, 60)) * 10_000,
+            "markets": list(rng.choice(MARKETS, size=rng.integers(0, 3), replace=False)),
+            "risk_profile": rng.choice(list(RISK_TOLERANCE)),
+            "preferred_return": float(rng.uniform(0.05, 0.15)),
+        })
+        for i in range(300)
+    ]
+    index = InvestorMatchIndex(investors)
+    for _ in range(100):
+        deal = DealProfile.from_row({
+            "deal_id": "d",
+            "capital_needed": float(rng.integers(1, 200)) * 10_000,
+            "markets": list(rng.choice(MARKETS, size=rng.integers(0, 3), replace=False)),
+            "risk_level": RISK_LEVELS[rng.integers(len(RISK_LEVELS))],
+            "projected_return": float(rng.uniform(0, 0.2)),
+        })
+        assert [m.investor_id for m in index.match(deal, limit=len(investors))] == _brute(investors, deal)
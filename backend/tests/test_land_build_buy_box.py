@@ -0,0 +1,44 @@
+"""Bulk buy-box matching agrees with the one-at-a-time evaluator.
+
+Run with: cd backend && pytest tests/test_land_build_buy_box.py -v
+"""
+from __future__ import annotations
+
+import itertools
+
+from dynasty_os.engines.land_build_uw_dd_engine import BuyBoxCriteria, BuyBoxEngine
+
+PROPERTIES = [
+    {"property_id": "P1", "lot_size_acres": 2.0, "arv_land": 90_000, "purchase_price": 40_000, "zoning": "R1", "county": "Polk"},
+    {"property_id": "P2", "lot_size_acres": 12.0, "arv_land": 30_000, "purchase_price": 80_000, "zoning": "AG", "county": "Lake"},
+    {"property_id": "P3", "lot_size_acres": 0.5, "arv_land": 60_000, "purchase_price": 20_000, "county": "Orange"},
+]
+
+BUYBOXES = [
+    BuyBoxCriteria("BB-infill", min_lot_size=0.25, max_lot_size=5, min_arv=50_000, max_purchase_price=50_000,
+                   preferred_zoning=["R1", "R2"], excluded_counties=["Lake"]),
+    BuyBoxCriteria("BB-acreage", min_lot_size=5, max_lot_size=40, min_arv=25_000, max_purchase_price=100_000,
+                   excluded_counties=["Polk", "Orange"]),
+]
+
+
+def test_bulk_scores_match_single_evaluations():
+    result = BuyBoxEngine().evaluate_bulk(PROPERTIES, BUYBOXES, min_score=0)
+    bulk = {(m["property_id"], m["buybox_id"]): m for m in result["matches"]}
+
+    assert result["pairs_evaluated"] == 6
+    for prop, box in itertools.product(PROPERTIES, BUYBOXES):
+        single = BuyBoxEngine().evaluate(prop, box)
+        pair = bulk[(prop["property_id"], box.buybox_id)]
+        assert pair["match_score"] == single["match_score"]
+        assert pair["failed_checks"] == [name for name, ok in single["checks"].items() if not ok]
+
+
+def test_bulk_output_is_sparse_above_threshold():
+    engine = BuyBoxEngine()
+    result = engine.evaluate_bulk(PROPERTIES, BUYBOXES)
+
+    assert sorted((m["property_id"], m["buybox_id"]) for m in result["matches"]) == [
+        ("P1", "BB-infill"), ("P2", "BB-acreage"), ("P3", "BB-infill"),
+    ]
+    assert engine.get_metrics()["bulk_matches"] == 3
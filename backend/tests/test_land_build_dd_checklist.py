@@ -0,0 +1,67 @@
+"""DD checklist store: indexed updates, precomputed counters, durability.
+
+Run with: cd backend && pytest tests/test_land_build_dd_checklist.py -v
+"""
+from __future__ import annotations
+
+from dynasty_os.engines.land_build_uw_dd_engine import DDChecklistEngine, DDChecklistStore
+
+
+def test_summary_is_scoped_to_exact_property_id():
+    engine = DDChecklistEngine()
+    engine.create_checklist("PROP-1", include_categories=["Title Review", "Utilities"])
+    engine.create_checklist("PROP-11", include_categories=["Title Review"])
+
+    assert engine.get_checklist_summary("PROP-1")["total_items"] == 2
+    assert engine.get_checklist_summary("PROP-11")["total_items"] == 1
+    assert engine.get_checklist_summary("PROP-2") == {"property_id": "PROP-2", "total_items": 0}
+
+
+def test_status_update_moves_counters():
+    engine = DDChecklistEngine()
+    checklist = engine.create_checklist("PROP-7", include_categories=["Title Review", "Utilities", "Flood Zone"])
+    first, second = checklist["items"][0]["item_id"], checklist["items"][1]["item_id"]
+
+    updated = engine.update_item_status(first, "Passed", result="Clean title")
+    engine.update_item_status(second, "Failed", notes="No sewer")
+    engine.update_item_status(second, "Passed with Issues", notes="Septic approved")
+
+    assert updated["status"] == "Passed"
+    assert updated["result"] == "Clean title"
+    summary = engine.get_checklist_summary("PROP-7")
+    assert summary["status_summary"] == {"Not Started": 1, "Passed": 1, "Passed with Issues": 1}
+    assert summary["completion_pct"] == 66.7
+    assert engine.get_metrics() == {
+        "total_checklists": 1,
+        "total_items": 3,
+        "passed": 1,
+        "issues": 1,
+        "failed": 0,
+    }
+    assert engine.update_item_status("DD-missing-001", "Passed") == {}
+
+
+def test_recreating_a_checklist_keeps_existing_statuses():
+    engine = DDChecklistEngine()
+    checklist = engine.create_checklist("PROP-3", include_categories=["Title Review"])
+    engine.update_item_status(checklist["items"][0]["item_id"], "Passed")
+
+    again = engine.create_checklist("PROP-3", include_categories=["Title Review"])
+
+    assert again["items"][0]["status"] == "Passed"
+    assert engine.get_metrics()["total_checklists"] == 1
+    assert engine.get_metrics()["total_items"] == 1
+
+
+def test_file_store_survives_reopen(tmp_path):
+    path = str(tmp_path / "dd.sqlite3")
+    store = DDChecklistStore(path)
+    engine = DDChecklistEngine(store)
+    checklist = engine.create_checklist("PROP-9", include_categories=["Title Review", "Utilities"])
+    engine.update_item_status(checklist["items"][1]["item_id"], "Failed")
+    store.close()
+
+    reopened = DDChecklistEngine(DDChecklistStore(path))
+    summary = reopened.get_checklist_summary("PROP-9")
+    assert summary["status_summary"] == {"Not Started": 1, "Failed": 1}
+    assert reopened.get_metrics()["failed"] == 1
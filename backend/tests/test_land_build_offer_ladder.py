@@ -0,0 +1,80 @@
+"""Land + Build offer ladder: parity with calculate_offer(), memoization, column naming.
+
+Run with: cd backend && pytest tests/test_land_build_offer_ladder.py -v
+"""
+from __future__ import annotations
+
+import pytest
+
+from dynasty_os.engines.land_build_uw_dd_engine import ExitType, OfferCalculationEngine
+
+PROPERTIES = [
+    {"property_id": "p1", "arv": 200_000, "repair_cost": 30_000},
+    {"property_id": "p2", "arv": 347_250.55, "repair_cost": 61_333.33, "holding_cost_monthly": 1_275.5,
+     "holding_months": 9},
+    {"property_id": "p3", "arv": 89_999.99, "holding_months": 0},
+    {"property_id": "p4", "arv": 200_000, "repair_cost": 30_000},   # same inputs as p1
+]
+ROIS = [0.0, 0.1, 0.125, 0.2, 0.333]
+# Every exit type, plus one calculate_offer() only knows through its fallback branch.
+STRATEGIES = [e.value for e in ExitType] + ["Seller Finance"]
+
+
+def _column(strategy, roi):
+    slug = "".join(ch if ch.isalnum() else "_" for ch in strategy.lower()).strip("_")
+    return f"mao_{slug}_{f'{roi * 100:g}'.replace('.', '_')}"
+
+
+def test_ladder_matches_calculate_offer_for_every_strategy_and_roi():
+    engine = OfferCalculationEngine()
+    ladder = engine.offer_ladder(PROPERTIES, ROIS, STRATEGIES)
+
+    assert ladder["offer_count"] == len(PROPERTIES) * len(STRATEGIES) * len(ROIS)
+    for strategy in STRATEGIES:
+        for roi in ROIS:
+            column = ladder["columns"][_column(strategy, roi)]
+            for row, prop in enumerate(PROPERTIES):
+                single = engine.calculate_offer(
+                    prop["property_id"], prop["arv"], prop.get("repair_cost", 0.0), strategy, roi,
+                    prop.get("holding_cost_monthly", 0.0), prop.get("holding_months", 12),
+                )
+                assert column[row] == single["recommended_purchase_price"], (strategy, roi)
+                assert ladder["columns"]["holding_cost"][row] == single["holding_cost"]
+
+
+def test_repeated_ladders_reuse_the_memoized_mao_tables():
+    engine = OfferCalculationEngine()
+    first = engine.offer_ladder(PROPERTIES, ROIS, STRATEGIES)
+    assert (first["unique_inputs"], first["cache_hits"]) == (3, 0)
+
+    # Overwrite one memoized table: a repeat call must read it rather than recompute.
+    table = engine._mao_cache[(tuple(STRATEGIES), tuple(ROIS))][(200_000.0, 30_000.0, 0.0)]
+    table[:] = -1.0
+    again = engine.offer_ladder(list(reversed(PROPERTIES)), ROIS, STRATEGIES)
+
+    assert (again["unique_inputs"], again["cache_hits"]) == (3, 3)
+    assert engine._mao_cache_entries == 3
+    assert engine.get_metrics()["ladder_cache_hits"] == 3
+    for name, values in again["columns"].items():
+        if name.startswith("mao_"):
+            assert values[0] == values[3] == -1.0
+            assert values[1:3] == list(reversed(first["columns"][name][1:3]))
+
+    # A different ROI ladder is a different table set.
+    assert engine.offer_ladder(PROPERTIES, ROIS[:2], STRATEGIES)["cache_hits"] == 0
+
+
+def test_fractional_rois_get_their_own_columns():
+    ladder = OfferCalculationEngine().offer_ladder(
+        [{"property_id": "p1", "arv": 200_000, "repair_cost": 30_000}], [0.12, 0.125], ["Wholesale"]
+    )
+
+    mao = {k: v for k, v in ladder["columns"].items() if k.startswith("mao_")}
+    assert list(mao) == ["mao_wholesale_12", "mao_wholesale_12_5"]
+    assert ladder["offer_count"] == len(mao)
+    assert mao["mao_wholesale_12"][0] - mao["mao_wholesale_12_5"][0] == pytest.approx(1_000)
+
+
+def test_duplicate_rois_are_rejected():
+    with pytest.raises(ValueError):
+        OfferCalculationEngine().offer_ladder([{"property_id": "p1", "arv": 1}], [0.1, 0.10], ["Wholesale"])
@@ -0,0 +1,77 @@
+"""Land + Build scenario grids: cell-by-cell parity with process() and the size cap.
+
+Run with: cd backend && pytest tests/test_land_build_scenario_grid.py -v
+"""
+from __future__ import annotations
+
+from itertools import product
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.land_build_uw_dd import (
+    MAX_GRID_CELLS,
+    RentalBackstopRequest,
+    SaleScenarioRequest,
+    calculate_rental_backstop,
+    calculate_sale_scenario,
+)
+from dynasty_os.engines.land_build_uw_dd_engine import RentalBackstopEngine, SaleScenarioEngine
+
+
+@pytest.mark.parametrize("purchase_price", [180_000.0, 0.0])
+def test_sale_grid_cells_match_process(purchase_price):
+    arvs, months, carrying = [150_000.0, 240_000.5, 310_000.0], [0, 6, 18], [0.0, 1_250.75]
+    engine = SaleScenarioEngine()
+    grid = engine.process_grid("p1", purchase_price, arvs, months, carrying)
+
+    for (a, arv), (m, hold), (c, carry) in product(enumerate(arvs), enumerate(months), enumerate(carrying)):
+        single = engine.process("p1", arv, purchase_price, hold, carry)
+        assert grid["projected_profit"][a][m][c] == single["projected_profit"]
+        assert grid["projected_roi"][a][m][c] == single["projected_roi"]
+        assert grid["carrying_cost_total"][m][c] == single["carrying_cost_total"]
+    assert grid["scenario_count"] == 18
+    assert grid["best_case"] == {"arv_sale": 310_000.0, "holding_months": 0, "carrying_cost_monthly": 0.0,
+                                 "projected_profit": round(310_000 * 0.88 - purchase_price, 2),
+                                 "projected_roi": grid["projected_roi"][2][0][0]}
+
+
+def test_rental_grid_cells_match_process_at_zero_vacancy():
+    rents, years = [1_400.0, 2_150.25, 3_000.0], [1, 5, 10]
+    engine = RentalBackstopEngine()
+    grid = engine.process_grid("p1", rents, [0.0, 0.08], years, 3_600.0, 1_450.0,
+                               exit_arv=320_000.0, purchase_price=250_000.0)
+
+    for (r, rent), (y, hold) in product(enumerate(rents), enumerate(years)):
+        single = engine.process("p1", rent, 3_600.0, 1_450.0, hold, 320_000.0, 250_000.0)
+        assert grid["monthly_cash_flow"][r][0] == single["monthly_cash_flow"]
+        assert grid["annual_cash_flow"][r][0] == single["annual_cash_flow"]
+        assert grid["total_cash_flow"][r][0][y] == single["total_cash_flow"]
+        assert grid["total_profit"][r][0][y] == single["total_profit"]
+        # 8% vacancy loses collected rent but also the PM fee on it.
+        lost = rent * 0.08 * (1 - 0.08)
+        assert grid["monthly_cash_flow"][r][1] == pytest.approx(single["monthly_cash_flow"] - lost, abs=0.01)
+    assert grid["equity_at_exit"] == 70_000.0
+
+
+def test_grids_over_the_cell_cap_are_rejected():
+    rows = int(MAX_GRID_CELLS ** 0.5) + 1
+    with pytest.raises(HTTPException) as exc:
+        calculate_sale_scenario(SaleScenarioRequest(
+            property_id="p1", arv_sale=200_000, purchase_price=150_000,
+            arv_values=[float(v) for v in range(rows)], holding_months_values=list(range(rows)),
+        ))
+    assert exc.value.status_code == 400
+    assert str(MAX_GRID_CELLS) in exc.value.detail
+
+    with pytest.raises(HTTPException):
+        calculate_rental_backstop(RentalBackstopRequest(
+            property_id="p1", est_monthly_rent=2_000,
+            rent_values=[1_000.0] * rows, vacancy_rates=[0.0] * rows,
+        ))
+
+    at_cap = calculate_sale_scenario(SaleScenarioRequest(
+        property_id="p1", arv_sale=200_000, purchase_price=150_000,
+        arv_values=[float(v) for v in range(MAX_GRID_CELLS // 1000)], holding_months_values=list(range(1000)),
+    ))
+    assert at_cap["grid"]["scenario_count"] == MAX_GRID_CELLS
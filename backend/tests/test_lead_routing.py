@@ -0,0 +1,154 @@
+"""
+Tests for the workload-aware RoutingEngine and POST /api/leads/auto-route.
+
+Run with: cd backend && pytest tests/test_lead_routing.py -v
+"""
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError
+
+import app.api.leads as leads
+import app.summary as summary
+from dynasty_os.engines.lead_engine import Lead, RoutingEngine
+
+
+def _lead(i, lead_type="Seller"):
+    return Lead(lead_id=f"lead-{i}", lead_type=lead_type, source="Referral")
+
+
+def test_least_loaded_assignee_wins_until_everyone_is_full():
+    engine = RoutingEngine()
+    engine.register_assignee("ana", capacity=2)
+    engine.register_assignee("bo", capacity=4, open_leads=1)
+
+    routed = [engine.process(_lead(i), "A")["routed_to"] for i in range(6)]
+
+    # ana 0/2 < bo 1/4, then bo 1/4 < ana 1/2, ... until both are full.
+    assert routed[:5] == ["ana", "bo", "ana", "bo", "bo"]
+    assert routed[5] == "senior_acquisitions"
+    assert {a["assignee"]: a["open_leads"] for a in engine.load_snapshot()} == {"ana": 2, "bo": 4}
+    assert engine.get_metrics() == {
+        "total_routed": 6,
+        "by_assignee": {"ana": 2, "bo": 3, "senior_acquisitions": 1},
+        "overflowed": 1,
+    }
+
+
+def test_eligibility_and_load_changes():
+    engine = RoutingEngine()
+    engine.register_assignee("hot", capacity=10, grades=["A"])
+    engine.register_assignee("buyers", capacity=10, lead_types=["Buyer"])
+    engine.register_assignee("any", capacity=10, open_leads=5)
+
+    assert engine.process(_lead(1), "A")["routed_to"] == "hot"
+    assert engine.process(_lead(2, "Buyer"), "C")["routed_to"] == "buyers"
+    assert engine.process(_lead(3), "C")["routed_to"] == "any"
+
+    engine.adjust_load("hot", 9)
+    engine.adjust_load("any", -6)
+    assert engine.process(_lead(4), "A")["routed_to"] == "any"
+    assert engine.process(_lead(5), "A", override_assignee="hot")["reason"] == "override"
+    assert {a["assignee"]: a["open_leads"] for a in engine.load_snapshot()} == {"any": 1, "buyers": 1, "hot": 11}
+
+
+class FakeDB:
+    """In-memory leads table plus the PostgREST calls auto-route makes."""
+
+    def __init__(self, rows, rpc_deployed=True):
+        self.rows = {r["lead_id"]: dict(r) for r in rows}
+        self.rpc_deployed = rpc_deployed
+        self.rpc_calls, self.routing_rows = [], []
+
+    def rpc(self, function, params):
+        self.rpc_calls.append(function)
+        if not self.rpc_deployed:
+            raise APIError({"code": summary.RPC_NOT_FOUND, "message": "not found"})
+        routed = []
+        for item in params["p_assignments"]:
+            row = self.rows.get(item["lead_id"])
+            if row is None:
+                continue
+            routed.append({"lead_id": item["lead_id"], "previous_owner": row["owner"]})
+            row["owner"] = item["routed_to"]
+            self.routing_rows.append(item)
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=routed))
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class FakeQuery:
+    def __init__(self, db, name):
+        self.db, self.name, self.ids, self.payload = db, name, None, None
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.ids = list(values)
+        return self
+
+    def insert(self, rows):
+        self.db.routing_rows.extend(rows)
+        return self
+
+    def update(self, values):
+        self.payload = values
+        return self
+
+    def execute(self):
+        if self.name == "leads" and self.payload is not None:
+            for lead_id in self.ids:
+                self.db.rows[lead_id].update(self.payload)
+        if self.name == "leads":
+            return SimpleNamespace(data=[self.db.rows[i] for i in self.ids if i in self.db.rows])
+        return SimpleNamespace(data=[])
+
+
+@pytest.fixture
+def router(monkeypatch):
+    engine = RoutingEngine()
+    engine.register_assignee("ana", capacity=10, open_leads=3)
+    engine.register_assignee("bo", capacity=10, open_leads=3)
+    monkeypatch.setattr(leads, "_lead_router", lambda db: engine)
+    monkeypatch.setattr(leads, "lead_activity_log", SimpleNamespace(enqueue=lambda row: None))
+    monkeypatch.setattr(summary, "_missing_rpcs", set())
+    return engine
+
+
+def _rows():
+    return [
+        {"lead_id": "00000000-0000-0000-0000-000000000001", "lead_type": "Seller", "grade": "A", "owner": "ana"},
+        {"lead_id": "00000000-0000-0000-0000-000000000002", "lead_type": "Seller", "grade": "B", "owner": None},
+    ]
+
+
+@pytest.mark.parametrize("rpc_deployed", [True, False])
+def test_auto_route_moves_load_off_previous_owner(router, monkeypatch, rpc_deployed):
+    db = FakeDB(_rows(), rpc_deployed=rpc_deployed)
+    monkeypatch.setattr(leads, "get_supabase", lambda: db)
+
+    result = leads.auto_route_leads(leads.LeadAutoRouteRequest(lead_ids=list(db.rows)))
+
+    assert result["routed"] == 2
+    assert db.rpc_calls == ["auto_route_leads_tx"]
+    assert len(db.routing_rows) == 2
+    assert {r["owner"] for r in db.rows.values()} == {a["routed_to"] for a in result["assignments"]}
+    # Two leads gained an owner, one of them was already ana's: net +1 in total, never counted twice.
+    load = {a["assignee"]: a["open_leads"] for a in router.load_snapshot()}
+    assert sum(load.values()) == 7
+    assert load == {"ana": 3 - 1 + result["by_assignee"].get("ana", 0), "bo": 3 + result["by_assignee"].get("bo", 0)}
+
+
+def test_auto_route_skips_leads_deleted_before_the_write(router, monkeypatch):
+    db = FakeDB(_rows())
+    monkeypatch.setattr(leads, "get_supabase", lambda: db)
+    requested = list(db.rows)
+    monkeypatch.setattr(FakeQuery, "execute", lambda self: SimpleNamespace(data=_rows()))
+
+    db.rows.pop(requested[1])
+    result = leads.auto_route_leads(leads.LeadAutoRouteRequest(lead_ids=requested))
+
+    assert [a["lead_id"] for a in result["assignments"]] == [requested[0]]
+    assert sum(a["open_leads"] for a in router.load_snapshot()) == 6
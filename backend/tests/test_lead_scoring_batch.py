@@ -0,0 +1,57 @@
+"""
+Parity of the batch lead scorer (/lead-score/batch) with the single-lead scorer.
+
+Run with: cd backend && pytest tests/test_lead_scoring_batch.py -v
+"""
+from itertools import product
+
+import numpy as np
+
+from app.api.deals import LeadScoringBatchInput, LeadScoringInput, score_lead, score_leads_batch
+
+MOTIVATIONS = [None, "", "Divorce pending", "tired landlord", "behind on payments", "FORECLOSURE notice", "probate-sale"]
+
+
+def _assert_parity(leads):
+    batch = score_leads_batch(LeadScoringBatchInput(leads=leads, lead_ids=[str(i) for i in range(len(leads))]))
+    single = [score_lead(lead) for lead in leads]
+    assert batch.count == len(leads)
+    assert batch.score == [r.score for r in single]
+    assert batch.grade == [r.grade for r in single]
+    assert batch.priority == [r.priority for r in single]
+
+
+def test_batch_matches_single_scorer_on_threshold_edges():
+    leads = [
+        LeadScoringInput(motivation=m, equity_pct=e, timeline_days=t, asking_vs_arv=a, vacant=v)
+        for m, e, t, a, v in product(
+            MOTIVATIONS[:3],
+            [None, -0.1, 0.0, 0.1999, 0.20, 0.3999, 0.40, 0.9],
+            [None, 0, 30, 31, 90, 91],
+            [None, 0.5, 0.65, 0.6501, 0.75, 0.7501, 1.2],
+            [False, True],
+        )
+    ]
+    _assert_parity(leads)
+
+
+def test_batch_matches_single_scorer_on_random_leads():
+    rng = np.random.default_rng(37)
+
+    def maybe(value):
+        return None if rng.random() < 0.2 else value
+
+    leads = [
+        LeadScoringInput(
+            motivation=MOTIVATIONS[rng.integers(len(MOTIVATIONS))],
+            equity_pct=maybe(float(rng.uniform(-0.2, 1.0))),
+            timeline_days=maybe(int(rng.integers(0, 200))),
+            asking_vs_arv=maybe(float(rng.uniform(0.3, 1.3))),
+            vacant=bool(rng.random() < 0.5),
+            tax_delinquent=bool(rng.random() < 0.5),
+            absentee_owner=bool(rng.random() < 0.5),
+        )
+        for _ in range(2_000)
+    ]
+    _assert_parity(leads)
+    _assert_parity([])
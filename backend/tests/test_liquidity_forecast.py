@@ -0,0 +1,68 @@
+"""
+Tests for the daily liquidity forecaster.
+
+Run with: cd backend && pytest tests/test_liquidity_forecast.py -v
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+from dynasty_os.engines.liquidity_forecast import CashEvent, LiquidityForecaster
+
+START = date(2026, 1, 1)
+
+
+def _events(key, rng):
+    on = START + timedelta(days=int(rng.integers(-10, 200)))
+    amount = float(rng.uniform(-50_000, 50_000))
+    if rng.random() < 0.3:
+        return [CashEvent(key, amount, on, on + timedelta(days=int(rng.integers(0, 90))))]
+    return [CashEvent(key, amount, on)]
+
+
+def test_incremental_updates_match_full_load():
+    rng = np.random.default_rng(45)
+    sources = {f"s:{i}": _events(f"s:{i}", rng) for i in range(200)}
+    live = LiquidityForecaster(START, 100_000, 20_000)
+    live.load(e for events in sources.values() for e in events)
+
+    for _ in range(300):
+        key = f"s:{rng.integers(0, 250)}"
+        if rng.random() < 0.3:
+            sources.pop(key, None)
+            live.remove(key)
+        else:
+            sources[key] = _events(key, rng)
+            live.upsert(key, sources[key])
+
+    fresh = LiquidityForecaster(START, 100_000, 20_000)
+    fresh.load(e for events in sources.values() for e in events)
+    assert len(live) == len(fresh)
+    assert np.allclose(live.positions(), fresh.positions())
+    assert live.breaches() == fresh.breaches()
+
+
+def test_breach_runs_cover_days_below_reserve():
+    forecaster = LiquidityForecaster(START, 10_000, 5_000, horizon_days=30)
+    forecaster.load([
+        CashEvent("a", -8_000, START + timedelta(days=5)),
+        CashEvent("b", 6_000, START + timedelta(days=10)),
+        CashEvent("c", -6_000, START + timedelta(days=20), START + timedelta(days=22)),
+        CashEvent("d", 4_000, START + timedelta(days=25)),
+    ])
+    assert forecaster.breaches() == [
+        {"start": "2026-01-06", "end": "2026-01-10", "days": 5, "lowest_position": 2_000.0,
+         "lowest_on": "2026-01-06", "max_shortfall": 3_000.0},
+        {"start": "2026-01-22", "end": "2026-01-25", "days": 4, "lowest_position": 2_000.0,
+         "lowest_on": "2026-01-23", "max_shortfall": 3_000.0},
+    ]
+    assert forecaster.forecast(include_daily=False)["first_breach"] == "2026-01-06"
+    assert forecaster.breaches(reserve=1_000) == []
+
+    short = forecaster.forecast(horizon_days=21)
+    assert short["horizon_days"] == 21 and len(short["daily"]) == 22
+    assert short["breaches"][-1] == {"start": "2026-01-22", "end": "2026-01-22", "days": 1,
+                                     "lowest_position": 4_000.0, "lowest_on": "2026-01-22",
+                                     "max_shortfall": 1_000.0}
+    assert short["ending_cash"] == 4_000.0
+    assert forecaster.forecast(horizon_days=4)["liquidity_status"] == "ADEQUATE"
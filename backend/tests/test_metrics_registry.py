@@ -0,0 +1,106 @@
+"""Metrics registry: counters, latency histograms and multi-worker merge.
+
+Run with: cd backend && pytest tests/test_metrics_registry.py -v
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+from app.metrics import MetricsRegistry, nest_counters, summarize_histogram
+
+
+def test_engine_counters_skip_floats_and_nest():
+    registry = MetricsRegistry("test")
+    registry.record_engine("sale_scenario", {"total_scenarios": 1, "avg_roi": 0.25})
+    registry.record_engine("exit_strategy", {"total_analyses": 1, "recommended_exits": {"Flip": 1}})
+    registry.record_engine("exit_strategy", {"total_analyses": 1, "recommended_exits": {"Flip": 1}})
+
+    assert nest_counters(registry.snapshot()["counters"]) == {
+        "sale_scenario": {"total_scenarios": 1},
+        "exit_strategy": {"total_analyses": 2, "recommended_exits": {"Flip": 2}},
+    }
+
+
+def test_workers_merge_through_snapshot_dir(tmp_path):
+    first = MetricsRegistry("land_build", snapshot_dir=tmp_path, flush_interval=3600, flush_at_exit=False)
+    second = MetricsRegistry("land_build", snapshot_dir=tmp_path, flush_interval=3600, flush_at_exit=False)
+    for ms in (0.5, 3, 40):
+        first.observe("latency:POST /x", ms)
+    first.incr("requests:POST /x", 3)
+    second.observe("latency:POST /x", 700)
+    second.incr("requests:POST /x")
+    first.flush()
+    second.flush()
+
+    merged = first.aggregate()
+
+    assert merged["workers"] == 2
+    assert merged["counters"]["requests:POST /x"] == 4
+    summary = summarize_histogram(merged["histograms"]["latency:POST /x"])
+    assert summary["count"] == 4
+    assert summary["p50_ms"] == 5.0
+    assert summary["p99_ms"] == 1000.0
+
+
+def test_value_sketches_merge_across_workers(tmp_path):
+    first = MetricsRegistry("disposition", snapshot_dir=tmp_path, flush_interval=3600, flush_at_exit=False)
+    second = MetricsRegistry("disposition", snapshot_dir=tmp_path, flush_interval=3600, flush_at_exit=False)
+    for dom in range(1, 101):
+        (first if dom % 2 else second).record_value("days_on_market|*|*", dom)
+    first.flush()
+    second.flush()
+
+    summary = first.aggregate()["sketches"]["days_on_market|*|*"].summary()
+
+    assert summary["count"] == 100
+    assert summary["mean"] == 50.5
+    assert summary["p50"] == 50 and summary["p90"] == 90
+
+
+def _registry(tmp_path, **kwargs):
+    return MetricsRegistry("land_build", snapshot_dir=tmp_path, flush_interval=3600, flush_at_exit=False, **kwargs)
+
+
+def test_dead_workers_are_folded_into_one_retired_file(tmp_path):
+    live, exited, remote = _registry(tmp_path), _registry(tmp_path), _registry(tmp_path)
+    for registry, n in ((live, 1), (exited, 2), (remote, 4)):
+        registry.incr("requests:POST /x", n)
+        registry.record_value("dom", n)
+        registry.flush()
+    # ``exited`` ran on this host under a pid that is gone; ``remote`` has
+    # not written for longer than stale_after.
+    finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              capture_output=True, text=True, check=True)
+    path = exited._snapshot_path()
+    path.write_text(json.dumps({**json.loads(path.read_text()), "pid": int(finished.stdout)}))
+    os.utime(remote._snapshot_path(), (0, 0))
+
+    first = live.aggregate()
+    second = live.aggregate()
+
+    assert first["counters"] == second["counters"] == {"requests:POST /x": 7}
+    assert second["sketches"]["dom"].summary()["count"] == 3
+    assert first["workers"] == second["workers"] == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [live._snapshot_path().name, "land_build-retired.json"])
+
+
+def test_worker_folded_while_idle_is_not_counted_twice(tmp_path):
+    idle, reader = _registry(tmp_path), _registry(tmp_path, stale_after=0)
+    idle.incr("requests:POST /x", 3)
+    idle.observe("latency:POST /x", 40)
+    idle.flush()
+    reader.aggregate()
+    assert not idle._snapshot_path().exists()
+
+    idle.incr("requests:POST /x")
+    idle.observe("latency:POST /x", 700)
+    idle.flush()
+    reader.stale_after = 3600
+
+    merged = reader.aggregate()
+    assert merged["counters"] == {"requests:POST /x": 4}
+    assert merged["histograms"]["latency:POST /x"]["count"] == 2
@@ -0,0 +1,70 @@
+"""
+Tests for the columnar portfolio risk book.
+
+Run with: cd backend && pytest tests/test_portfolio_risk.py -v
+"""
+import numpy as np
+
+from dynasty_os.engines.portfolio_risk import DIMENSIONS, PortfolioRiskBook, Position
+
+GROUPS = {
+    "asset_type": ["SFR", "Land", "Duplex", None],
+    "market": ["Austin, TX", "Tulsa, OK", "Memphis, TN"],
+    "investor": ["Ava", "Ben", None],
+    "lender": ["DSCR", "Hard Money", None],
+}
+
+
+def _position(position_id, rng):
+    return Position(
+        position_id,
+        float(rng.uniform(10_000, 200_000)),
+        **{dim: GROUPS[dim][rng.integers(len(GROUPS[dim]))] for dim in DIMENSIONS},
+    )
+
+
+def test_incremental_updates_match_full_load():
+    rng = np.random.default_rng(46)
+    positions = {f"p{i}": _position(f"p{i}", rng) for i in range(150)}
+    live = PortfolioRiskBook(positions.values(), liquid_capital=250_000)
+
+    for _ in range(400):
+        position_id = f"p{rng.integers(0, 200)}"
+        if rng.random() < 0.35:
+            positions.pop(position_id, None)
+            live.remove(position_id)
+        else:
+            positions[position_id] = _position(position_id, rng)
+            live.upsert(positions[position_id])
+
+    fresh = PortfolioRiskBook(positions.values(), liquid_capital=250_000)
+    assert len(live) == len(fresh)
+    assert np.isclose(live.total_exposure, fresh.total_exposure)
+    for dim in DIMENSIONS:
+        assert live.exposures(dim) == fresh.exposures(dim)
+        assert np.isclose(live.hhi(dim), fresh.hhi(dim))
+    live_report, fresh_report = live.report(), fresh.report()
+    assert live_report["risk_flags"] == fresh_report["risk_flags"]
+    for name, drawdown in fresh_report["scenarios"].items():
+        assert np.isclose(live_report["scenarios"][name]["value_change"], drawdown["value_change"])
+
+
+def test_scenario_loss_uses_first_matching_dimension():
+    book = PortfolioRiskBook([
+        Position("a", 100_000, asset_type="Land", market="Austin, TX"),
+        Position("b", 200_000, asset_type="SFR", market="Austin, TX"),
+        Position("c", 50_000, asset_type="SFR", market="Tulsa, OK"),
+    ])
+    scenario = {"default": -0.1, "by": {"asset_type": {"Land": -0.4}, "market": {"Austin, TX": -0.2}}}
+    assert np.isclose(book.scenario_loss(scenario), -40_000 - 40_000 - 5_000)
+    book.remove("a")
+    assert np.isclose(book.scenario_loss(scenario), -40_000 - 5_000)
+
+
+def test_report_honors_total_capital():
+    book = PortfolioRiskBook([Position("a", 30_000, asset_type="Land")], liquid_capital=5_000)
+    assert book.report()["liquidity_ratio"] == round(5_000 / 35_000, 4)
+    report = book.report(total_capital=200_000)
+    assert report["liquidity_ratio"] == 0.025
+    assert report["by_dimension"]["asset_type"]["top_share"] == 0.15
+    assert not any(flag.startswith("Concentration") for flag in report["risk_flags"])
@@ -0,0 +1,54 @@
+"""KLL quantile sketches: accuracy, merging and JSON round-trips.
+
+Run with: cd backend && pytest tests/test_quantile_sketch.py -v
+"""
+import json
+
+import numpy as np
+
+from dynasty_os.engines.quantile_sketch import KLLSketch, KeyedSketches, rollup_keys
+
+QS = (0.1, 0.5, 0.9, 0.99)
+
+
+def _rank_error(values, sketch, q):
+    return abs(float((values <= sketch.quantile(q)).mean()) - q)
+
+
+def test_bounded_size_and_rank_error():
+    values = np.random.default_rng(7).lognormal(3.5, 0.8, 100_000)
+    sketch = KLLSketch(seed=7)
+    sketch.extend(values)
+
+    assert sketch.count == len(values)
+    assert sum(len(level) for level in sketch._levels) < 3 * sketch.k + 100
+    assert max(_rank_error(values, sketch, q) for q in QS) < 0.01
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+    assert abs(sketch.mean - values.mean()) < 1e-9 * values.mean()
+
+
+def test_merged_workers_match_one_stream():
+    values = np.random.default_rng(11).integers(1, 240, 60_000).astype(float)
+    workers = [KLLSketch(seed=i) for i in range(6)]
+    for i, worker in enumerate(workers):
+        worker.extend(values[i::6])
+    merged = KLLSketch(seed=0)
+    for worker in workers:
+        merged.merge(KLLSketch.from_dict(json.loads(json.dumps(worker.to_dict()))))
+
+    assert merged.count == len(values)
+    assert merged.summary()["max"] == values.max()
+    assert max(_rank_error(values, merged, q) for q in QS) < 0.015
+
+
+def test_keyed_rollups():
+    keyed = KeyedSketches()
+    for dom, exit_strategy, market in [(10, "Flip", "Austin, TX"), (30, "Flip", None), (50, "Wholesale", "Austin, TX")]:
+        for key in rollup_keys("days_on_market", exit_strategy, market):
+            keyed.add(key, dom)
+
+    assert keyed.summary("days_on_market|*|*")["count"] == 3
+    assert keyed.summary("days_on_market|Flip|*")["p50"] == 10
+    assert keyed.summary("days_on_market|*|Austin, TX")["max"] == 50
+    assert keyed.summary("days_on_market|Flip|Austin, TX")["count"] == 1
+    assert "days_on_market|Flip|None" not in keyed
@@ -0,0 +1,172 @@
+"""
+Tests for the Python fallbacks of the summary endpoints (migration not applied).
+
+Run with: cd backend && pytest tests/test_summary_fallbacks.py -v
+"""
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError
+
+import app.api.capital as capital
+import app.api.disposition as disposition
+import app.summary as summary
+from app.summary import bucket_totals, closing_buckets, period_start
+
+ALLOCATIONS = [
+    {"amount": 100, "roi": 0.12, "allocated_at": "2025-12-31T23:30:00-05:00"},   # 2026-01-01 in UTC
+    {"amount": 50.5, "roi": None, "allocated_at": "2026-03-31T10:00:00+00:00"},
+    {"amount": None, "roi": 0.2, "allocated_at": "2026-04-01T00:00:00Z"},
+    {"amount": 25, "roi": 0.1, "allocated_at": None},
+]
+COMMITMENTS = [
+    {"amount": 200, "status": "Funded", "created_at": "2026-06-30T23:59:59+00:00"},
+    {"amount": 10, "status": "Funded", "created_at": "2026-07-01T00:00:00+00:00"},
+    {"amount": 999, "status": "Pending", "created_at": "2026-07-01T00:00:00+00:00"},
+]
+CLOSINGS = [
+    {"net_profit": 10, "capital_recovered": 100, "sale_price": 150, "close_date": "2025-12-31"},
+    {"net_profit": 20, "capital_recovered": 200, "sale_price": 250, "close_date": "2026-01-01"},
+    {"net_profit": 30.25, "capital_recovered": None, "sale_price": 300, "close_date": "2026-03-31"},
+    {"net_profit": -5, "capital_recovered": 50, "sale_price": 60, "close_date": "2026-04-01"},
+    {"net_profit": 1, "capital_recovered": 1, "sale_price": 1, "close_date": None},
+]
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows, self.counting = rows, False
+
+    def select(self, columns, count=None):
+        self.counting = count == "exact"
+        return self
+
+    def eq(self, column, value):
+        return FakeQuery([r for r in self.rows if r[column] == value])._counting(self.counting)
+
+    def gte(self, column, value):
+        return FakeQuery([r for r in self.rows if r[column] and r[column] >= value])._counting(self.counting)
+
+    def lte(self, column, value):
+        return FakeQuery([r for r in self.rows if r[column] and r[column] <= value])._counting(self.counting)
+
+    def limit(self, n):
+        return self
+
+    def _counting(self, counting):
+        self.counting = counting
+        return self
+
+    def execute(self):
+        if self.counting:
+            return SimpleNamespace(data=[], count=len(self.rows))
+        return SimpleNamespace(data=list(self.rows))
+
+
+class FakeDB:
+    """The summary tables, with none of migration 015's functions deployed."""
+
+    tables = {
+        "allocations": ALLOCATIONS,
+        "commitments": COMMITMENTS,
+        "closings": CLOSINGS,
+        "offers": [{"status": "Accepted"}, {"status": "Rejected"}, {"status": "Pending"}],
+    }
+
+    def rpc(self, function, params):
+        raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{function}"})
+
+    def table(self, name):
+        return FakeQuery(self.tables[name])
+
+
+@pytest.fixture(autouse=True)
+def fallback_db(monkeypatch):
+    monkeypatch.setattr(summary, "_missing_rpcs", set())
+    monkeypatch.setattr(capital, "get_supabase", FakeDB)
+    monkeypatch.setattr(disposition, "get_supabase", FakeDB)
+    for endpoint in (capital.deployed_capital, capital.capital_returns, disposition.profit_analysis):
+        endpoint.cache_clear()
+    yield
+    for endpoint in (capital.deployed_capital, capital.capital_returns, disposition.profit_analysis):
+        endpoint.cache_clear()
+
+
+@pytest.mark.parametrize("value, period, expected", [
+    ("2026-03-31", "quarter", "2026-01-01"),
+    ("2026-04-01", "quarter", "2026-04-01"),
+    ("2026-09-30", "quarter", "2026-07-01"),
+    ("2026-10-01", "quarter", "2026-10-01"),
+    ("2026-12-31", "quarter", "2026-10-01"),
+    ("2026-12-31", "year", "2026-01-01"),
+    ("2027-01-01", "year", "2027-01-01"),
+    ("2026-02-28", "month", "2026-02-01"),
+    ("2026-03-31T23:59:59.999999+00:00", "quarter", "2026-01-01"),
+    ("2026-03-31T20:00:00-05:00", "quarter", "2026-04-01"),
+    ("2026-12-31T19:30:00-05:00", "year", "2027-01-01"),
+    ("2027-01-01T01:00:00+02:00", "year", "2026-01-01"),
+    ("2026-06-30T23:00:00", "quarter", "2026-04-01"),
+    (None, "year", None),
+    ("", "month", None),
+])
+def test_period_start_matches_date_trunc(value, period, expected):
+    assert period_start(value, period) == expected
+
+
+def test_bucket_totals_skips_undated_rows_and_counts():
+    buckets = bucket_totals(CLOSINGS, "close_date", "year", {"net_profit": "profit"}, count_as="n")
+    assert buckets == {"2025-01-01": {"n": 1, "profit": 10.0}, "2026-01-01": {"n": 3, "profit": 45.25}}
+
+
+def test_closing_buckets_by_quarter():
+    assert closing_buckets(CLOSINGS, None) == []
+    assert closing_buckets(CLOSINGS, "quarter") == [
+        {"period": "2025-10-01", "closed_deals": 1, "total_net_profit": 10.0,
+         "total_capital_recovered": 100.0, "total_revenue": 150.0},
+        {"period": "2026-01-01", "closed_deals": 2, "total_net_profit": 50.25,
+         "total_capital_recovered": 200.0, "total_revenue": 550.0},
+        {"period": "2026-04-01", "closed_deals": 1, "total_net_profit": -5.0,
+         "total_capital_recovered": 50.0, "total_revenue": 60.0},
+    ]
+
+
+def test_deployed_capital_merges_allocation_and_commitment_buckets():
+    result = capital.deployed_capital(period="quarter")
+    assert "capital_deployed_summary" in summary._missing_rpcs
+    assert {k: v for k, v in result.items() if k != "by_period"} == {
+        "total_deployed_allocations": 175.5, "allocation_count": 4,
+        "total_committed_funded": 210.0, "funded_commitment_count": 2,
+    }
+    # Buckets present on only one side carry a 0.0 for the other, as the SQL UNION ALL does.
+    assert result["by_period"] == [
+        {"period": "2026-01-01", "deployed_allocations": 150.5, "committed_funded": 0.0},
+        {"period": "2026-04-01", "deployed_allocations": 0.0, "committed_funded": 200.0},
+        {"period": "2026-07-01", "deployed_allocations": 0.0, "committed_funded": 10.0},
+    ]
+    assert capital.deployed_capital(period="year")["by_period"] == [
+        {"period": "2026-01-01", "deployed_allocations": 150.5, "committed_funded": 210.0},
+    ]
+    assert capital.deployed_capital()["by_period"] == []
+
+
+def test_capital_returns_fallback():
+    result = capital.capital_returns(period="year")
+    assert result == {
+        "total_net_profit": 56.25, "total_capital_recovered": 351.0, "total_revenue": 761.0,
+        "total_deployed": 175.5, "avg_roi": 0.105, "closed_deals": 5,
+        "by_period": [
+            {"period": "2025-01-01", "closed_deals": 1, "total_net_profit": 10.0,
+             "total_capital_recovered": 100.0, "total_revenue": 150.0},
+            {"period": "2026-01-01", "closed_deals": 3, "total_net_profit": 45.25,
+             "total_capital_recovered": 250.0, "total_revenue": 610.0},
+        ],
+    }
+
+
+def test_profit_analysis_fallback_filters_the_year():
+    result = disposition.profit_analysis(year=2026, period="quarter")
+    assert result["closed_deals"] == 3
+    assert result["total_net_profit"] == 45.25 and result["avg_profit_per_deal"] == 15.08
+    assert result["offer_conversion_rate"] == round(1 / 3, 4)
+    assert [b["period"] for b in result["by_period"]] == ["2026-01-01", "2026-04-01"]
+    assert result["year_filter"] == 2026
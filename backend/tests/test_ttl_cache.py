@@ -0,0 +1,109 @@
+"""
+Tests for the ttl_cache decorator and the /api/leads/stats RPC and fallback.
+
+Run with: cd backend && pytest tests/test_ttl_cache.py -v
+"""
+import threading
+from types import SimpleNamespace
+
+from postgrest.exceptions import APIError
+
+import app.api.leads as leads
+import app.cache as cache
+from app.cache import ttl_cache
+
+
+def test_entries_expire_and_cache_clear_drops_them(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: clock[0])
+    calls = []
+
+    @ttl_cache(seconds=15)
+    def stats(period, *, year=None):
+        calls.append((period, year))
+        return len(calls)
+
+    assert stats("month") == stats("month") == 1
+    assert stats("month", year=2026) == 2
+    clock[0] += 14.9
+    assert stats("month") == 1
+    clock[0] += 0.2
+    assert stats("month") == 3
+    stats.cache_clear()
+    assert stats("month") == 4
+    assert calls == [("month", None), ("month", 2026), ("month", None), ("month", None)]
+
+
+def test_misses_for_different_keys_run_concurrently_same_key_once():
+    started = {"a": threading.Event(), "b": threading.Event()}
+    calls = []
+
+    @ttl_cache(seconds=60)
+    def slow(key):
+        calls.append(key)
+        started[key].set()
+        # Each key waits for the other: a single cache-wide lock would deadlock here.
+        assert started["b" if key == "a" else "a"].wait(timeout=5)
+        return key.upper()
+
+    results = []
+    threads = [threading.Thread(target=lambda k=k: results.append(slow(k))) for k in ("a", "b", "a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert sorted(results) == ["A", "A", "B", "B"]
+    assert sorted(calls) == ["a", "b"]
+
+
+class FakeStatsDB:
+    """leads / lead_scoring rows, plus lead_stats() built the way migration 009 builds it."""
+
+    def __init__(self, leads_rows, scoring_rows, rpc_deployed):
+        self.tables = {"leads": leads_rows, "lead_scoring": scoring_rows}
+        self.rpc_deployed = rpc_deployed
+
+    def rpc(self, name):
+        if not self.rpc_deployed:
+            raise APIError({"code": "PGRST202", "message": "not found"})
+        counters = {}
+        for row in self.tables["leads"]:
+            key = ("status", row["status"] or "Unknown")
+            counters[key] = counters.get(key, 0) + 1
+        for row in self.tables["lead_scoring"]:
+            key = ("grade", row["grade"] or "D")
+            counters[key] = counters.get(key, 0) + 1
+        data = {
+            "total": len(self.tables["leads"]),
+            "by_status": {b: n for (d, b), n in counters.items() if d == "status" and n > 0},
+            "by_grade": {b: n for (d, b), n in counters.items() if d == "grade" and n > 0},
+        }
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=data))
+
+    def table(self, name):
+        rows = self.tables[name]
+        query = SimpleNamespace()
+        query.select = lambda columns: query
+        query.range = lambda lo, hi: SimpleNamespace(execute=lambda: SimpleNamespace(data=rows[lo: hi + 1]))
+        return query
+
+
+def test_stats_fallback_matches_rpc_shape(monkeypatch):
+    statuses = ["New", "Hot", None, "New", "Dead"] * 450
+    leads_rows = [{"status": s, "score": 50} for s in statuses]
+    scoring_rows = [{"grade": g} for g in ["A", "B", None, "A"] * 300]
+    results = {}
+    for deployed in (True, False):
+        db = FakeStatsDB(leads_rows, scoring_rows, deployed)
+        monkeypatch.setattr(leads, "get_supabase", lambda: db)
+        leads.lead_stats.cache_clear()
+        results[deployed] = leads.lead_stats()
+    leads.lead_stats.cache_clear()
+
+    assert results[True] == results[False]
+    assert results[False] == {
+        "total": 2250,
+        "by_status": {"New": 900, "Hot": 450, "Unknown": 450, "Dead": 450},
+        "by_grade": {"A": 600, "B": 300, "D": 300},
+    }
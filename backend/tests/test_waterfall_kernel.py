@@ -0,0 +1,96 @@
+"""
+Tests for the vectorized distribution waterfall.
+
+Run with: cd backend && pytest tests/test_waterfall_kernel.py -v
+"""
+import numpy as np
+import pytest
+
+from dynasty_os.engines.waterfall_kernel import WaterfallTerms, WaterfallTier, run_waterfall
+
+TERMS = WaterfallTerms(
+    preferred_return=0.08,
+    catch_up=1.0,
+    tiers=(WaterfallTier(lp_split=0.80, hurdle=0.12), WaterfallTier(lp_split=0.70)),
+)
+
+
+def _reference(cash, capital, pref_rate, years, terms):
+    """One deal, one tier at a time, written the long way."""
+    lp = [0.0] * len(capital)
+    gp = 0.0
+    total_capital = sum(capital)
+    roc = min(cash, total_capital)
+    for i, c in enumerate(capital):
+        lp[i] += roc * c / total_capital
+    cash -= roc
+    owed = [c * r * y for c, r, y in zip(capital, pref_rate, years)]
+    pref = min(cash, sum(owed))
+    for i, o in enumerate(owed):
+        lp[i] += pref * o / sum(owed) if sum(owed) else 0.0
+    cash -= pref
+    lp_profit = pref
+    gp_share = 1 - terms.tiers[0].lp_split
+    if terms.catch_up:
+        step = min(cash, gp_share * pref / (terms.catch_up - gp_share))
+        gp += terms.catch_up * step
+        lp_profit += (1 - terms.catch_up) * step
+        for i, c in enumerate(capital):
+            lp[i] += (1 - terms.catch_up) * step * c / total_capital
+        cash -= step
+    base = sum(c * y for c, y in zip(capital, years))
+    for tier in terms.tiers:
+        step = cash if tier.hurdle is None else min(cash, max(tier.hurdle * base - lp_profit, 0) / tier.lp_split)
+        lp_profit += tier.lp_split * step
+        gp += (1 - tier.lp_split) * step
+        for i, c in enumerate(capital):
+            lp[i] += tier.lp_split * step * c / total_capital
+        cash -= step
+    return lp, gp
+
+
+def test_single_deal_tiers_by_hand():
+    result = run_waterfall([1_300_000], [0, 0], [600_000, 400_000], TERMS)
+
+    assert result.return_of_capital.tolist() == [600_000, 400_000]
+    assert result.preferred_return.tolist() == pytest.approx([48_000, 32_000])
+    # Catch-up brings the GP to 20% of the 100k profit paid so far.
+    assert result.gp_catch_up[0] == pytest.approx(20_000)
+    # 50k to reach the 12% hurdle at 80/20, the last 150k at 70/30.
+    assert result.gp_carry[0] == pytest.approx(10_000 + 45_000)
+    assert result.profit_share.sum() == pytest.approx(40_000 + 105_000)
+
+
+def test_loss_only_returns_capital_pro_rata():
+    result = run_waterfall([500_000], [0, 0], [600_000, 400_000], TERMS)
+    assert result.return_of_capital.tolist() == pytest.approx([300_000, 200_000])
+    assert result.preferred_return.sum() == 0
+    assert result.gp_total.sum() == 0
+
+
+def test_rejects_bad_terms():
+    with pytest.raises(ValueError):
+        run_waterfall([1.0], [0], [1.0], WaterfallTerms(tiers=(WaterfallTier(lp_split=0.8, hurdle=0.1),)))
+    with pytest.raises(ValueError):
+        run_waterfall([1.0], [0], [1.0], WaterfallTerms(catch_up=0.1, tiers=(WaterfallTier(lp_split=0.7),)))
+
+
+def test_fund_run_matches_per_deal_reference():
+    rng = np.random.default_rng(7)
+    n_deals, n_positions = 40, 300
+    deal_index = np.concatenate([np.arange(n_deals), rng.integers(0, n_deals, n_positions - n_deals)])
+    capital = rng.uniform(10_000, 250_000, n_positions)
+    pref = rng.choice([0.06, 0.08, 0.10], n_positions)
+    years = rng.uniform(0.25, 3.0, n_positions)
+    deal_capital = np.bincount(deal_index, weights=capital)
+    cash = deal_capital * rng.uniform(0.7, 1.8, n_deals)
+
+    result = run_waterfall(cash, deal_index, capital, TERMS, preferred_return=pref, years=years)
+
+    assert result.lp_total.sum() + result.gp_total.sum() == pytest.approx(cash.sum())
+    for d in range(n_deals):
+        members = np.flatnonzero(deal_index == d)
+        lp, gp = _reference(cash[d], capital[members].tolist(), pref[members].tolist(),
+                            years[members].tolist(), TERMS)
+        assert result.lp_total[members] == pytest.approx(lp)
+        assert result.gp_total[d] == pytest.approx(gp)
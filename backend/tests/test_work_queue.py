@@ -0,0 +1,84 @@
+"""
+Tests for the WorkQueueScheduler heaps and POST /api/work-queue/events.
+
+Run with: cd backend && pytest tests/test_work_queue.py -v
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import app.api.work_queue as work_queue
+from dynasty_os.engines.lead_engine import WorkItem, WorkQueueScheduler
+
+DAY = datetime(2026, 3, 1, 9)
+
+
+def _item(item_id, priority=50, due=None, assignee="ana", status="OPEN"):
+    return WorkItem("lead_action_queue", str(item_id), assignee, priority, due, "CALL", status=status)
+
+
+def _ids(items):
+    return [item.item_id for item in items]
+
+
+def test_priority_then_due_date_with_undated_last():
+    scheduler = WorkQueueScheduler()
+    scheduler.load([
+        _item(1, 50, DAY + timedelta(days=2)),
+        _item(2, 90),
+        _item(3, 50),
+        _item(4, 50, DAY),
+        _item(5, 90, DAY + timedelta(days=9)),
+        _item(6, 10, DAY, assignee="bo"),
+        _item(7, 99, DAY, status="DONE"),
+    ])
+
+    assert _ids(scheduler.next_for("ana", 10)) == ["5", "2", "4", "1", "3"]
+    # Peeking leaves the queue as it was.
+    assert _ids(scheduler.next_for("ana", 2)) == ["5", "2"]
+    assert scheduler.depth("ana") == 5 and scheduler.depth("bo") == 1
+
+
+def test_reschedule_complete_and_remove_delete_lazily():
+    scheduler = WorkQueueScheduler()
+    scheduler.load([_item(i, 50, DAY + timedelta(days=i)) for i in range(1, 7)])
+
+    scheduler.upsert(_item(6, 80, DAY + timedelta(days=6)))    # reprioritized
+    scheduler.upsert(_item(1, 50, DAY + timedelta(days=30)))   # rescheduled
+    scheduler.upsert(_item(2, 50, DAY, status="DONE"))         # completed
+    scheduler.remove("lead_action_queue", 3)
+    scheduler.upsert(_item(4, 50, DAY, assignee="bo"))         # reassigned
+
+    assert _ids(scheduler.next_for("ana", 10)) == ["6", "5", "1"]
+    assert _ids(scheduler.next_for("bo", 10)) == ["4"]
+    assert scheduler.depth("ana") == 3
+    assert scheduler.get_metrics()["open_items"] == 4
+    assert scheduler.get_metrics()["deltas_applied"] == 5
+
+
+def test_due_dates_with_an_offset_are_converted_to_utc():
+    item = WorkItem.from_row("lead_action_queue", {
+        "id": 1, "assigned_to": "ana", "priority": 50, "action_type": "CALL",
+        "next_action_date": "2026-03-01T09:00:00-05:00",
+    })
+    assert item.due_at == datetime(2026, 3, 1, 14)
+
+
+def test_events_batch_is_validated_before_any_is_applied(monkeypatch):
+    scheduler = WorkQueueScheduler()
+    scheduler.load([_item(1)])
+    monkeypatch.setattr(work_queue, "_ensure_loaded", lambda: scheduler)
+
+    def event(kind, record):
+        return work_queue.WorkQueueEvent(type=kind, table="lead_action_queue", record=record)
+
+    good = event("INSERT", {"id": 2, "assigned_to": "ana", "priority": 70, "action_type": "CALL"})
+    with pytest.raises(HTTPException) as exc:
+        work_queue.apply_work_queue_events([good, event("UPDATE", {"id": 3, "assigned_to": "ana"})])
+    assert exc.value.status_code == 400
+    assert _ids(scheduler.next_for("ana")) == ["1"]
+
+    delete = work_queue.WorkQueueEvent(type="DELETE", table="lead_action_queue", old_record={"id": 1})
+    assert work_queue.apply_work_queue_events([good, delete]) == {"applied": 2}
+    assert _ids(scheduler.next_for("ana")) == ["2"]
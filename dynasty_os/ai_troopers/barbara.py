@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any
 
 from dynasty_os.engines.capital_engine import CapitalEngine, InvestorRecord
+from dynasty_os.engines.investor_matching import DealProfile, InvestorMatchIndex, InvestorProfile
 
 
 class BarbaraTrooper:
@@ -16,6 +17,7 @@ class BarbaraTrooper:
         "capital raising",
         "investor onboarding",
         "deal opportunity presentation",
+        "investor-deal matching",
     ]
     investor_lifecycle_stages = [
         "Prospect",
@@ -30,6 +32,7 @@ class BarbaraTrooper:
     def __init__(self) -> None:
         self._engine = CapitalEngine()
         self._investors: dict[str, InvestorRecord] = {}
+        self._match_index = InvestorMatchIndex()
         self._communications: list[dict[str, Any]] = []
 
     def add_investor(self, investor_data: dict[str, Any]) -> InvestorRecord:
@@ -45,6 +48,7 @@ class BarbaraTrooper:
             markets=investor_data.get("markets", []),
         )
         self._investors[investor.investor_id] = investor
+        self._match_index.add(InvestorProfile.from_row(investor_data))
         self._engine.investor_relations.process(investor, "Added to CRM")
         return investor
 
@@ -75,12 +79,23 @@ class BarbaraTrooper:
         self._communications.append(comm)
         return {"report": report, "communication": comm}
 
+    def match_investors(self, deal_summary: dict[str, Any], limit: int = 10) -> dict[str, Any]:
+        """Rank CRM investors for a deal (capital_needed, markets, risk_level, projected_return)."""
+        deal = DealProfile.from_row(deal_summary)
+        ranked = self._match_index.match(deal, limit=limit)
+        return {
+            "deal_id": deal.deal_id,
+            "matched_investors": len(ranked),
+            "matches": [m.to_dict() for m in ranked],
+        }
+
     def present_opportunity(self, investor_id: str, deal_summary: dict[str, Any]) -> dict[str, Any]:
         investor = self._investors.get(investor_id)
         if not investor:
             return {"error": f"Investor {investor_id} not found"}
 
         fits_budget = investor.available_capital >= deal_summary.get("capital_needed", 0)
+        fit = self._match_index.score(investor_id, DealProfile.from_row(deal_summary))
         presentation = {
             "investor_id": investor_id,
             "investor_name": investor.investor_name,
@@ -88,6 +103,8 @@ class BarbaraTrooper:
             "capital_needed": deal_summary.get("capital_needed", 0),
             "projected_return": deal_summary.get("projected_return", 0),
             "fits_investor_budget": fits_budget,
+            "eligible": fit is not None,
+            "fit_score": fit.fit_score if fit else 0.0,
             "presented_at": datetime.utcnow().isoformat(),
         }
         self._communications.append(presentation)
@@ -137,6 +137,8 @@ class DynastyOrchestrator:
                 return trooper.present_opportunity(
                     payload.get("investor_id", ""), payload
                 )
+            if action == "match_investors":
+                return trooper.match_investors(payload, payload.get("limit", 10))
             return trooper.get_status()
         elif trooper_name == "ADAM":
             return trooper.analyze_property(
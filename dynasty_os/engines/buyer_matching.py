@@ -0,0 +1,217 @@
+"""Interval index for matching buyers to properties by price.
+
+A buyer matches a price when ``min_price <= price <= max_price`` for one of
+its criteria bands and ``funding_capacity >= price``. Folding capacity into
+each band's upper bound turns every buyer into one or more closed price
+intervals, so matching is interval stabbing:
+
+* ``match`` walks a centered interval tree. Each node keeps the intervals
+  that straddle its center sorted by lower and by upper bound, so a lookup
+  costs O(log n + k) with a ``searchsorted`` slice per node.
+* ``match_all`` sorts every property price once and, per interval, finds
+  the run of prices inside it with two ``searchsorted`` calls; the runs
+  expand into a sparse (property, buyer) pair list in a single NumPy pass.
+
+Buyers added or removed after a build are kept in a small pending set and
+a tombstone set, and the tree is rebuilt once those grow past
+``REBUILD_FRACTION`` of the index.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+REBUILD_FRACTION = 0.125
+MIN_PENDING = 32
+
+
+def _price(value: Any, default: float) -> float:
+    return default if value is None else float(value)
+
+
+@dataclass(frozen=True)
+class BuyerBands:
+    buyer_id: str
+    bands: tuple[tuple[float, float], ...] = ((0.0, float("inf")),)   # (min_price, max_price)
+    funding_capacity: float = 0.0
+    buyer_score: float = 0.0
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "BuyerBands":
+        """From a ``buyers`` row, optionally embedding ``buyer_criteria`` rows.
+
+        Without criteria the row's own ``min_price`` / ``max_price`` (the
+        BuyerEngine.register_buyer shape) form the single band.
+        """
+        criteria = row.get("buyer_criteria") or [row]
+        return cls(
+            buyer_id=str(row.get("buyer_id", "")),
+            bands=tuple(
+                (_price(c.get("min_price"), 0.0), _price(c.get("max_price"), float("inf")))
+                for c in criteria
+            ),
+            funding_capacity=_price(row.get("funding_capacity"), 0.0),
+            buyer_score=float(row.get("buyer_score") or 0),
+        )
+
+    def intervals(self) -> list[tuple[float, float]]:
+        """Price intervals this buyer matches (band capped at funding capacity)."""
+        out = []
+        for lo, hi in self.bands:
+            hi = min(hi, self.funding_capacity)
+            if lo <= hi:
+                out.append((lo, hi))
+        return out
+
+
+@dataclass
+class _Node:
+    center: float
+    lo_sorted: np.ndarray       # straddling intervals' lower bounds, ascending
+    lo_owner: np.ndarray        # buyer slot per lo_sorted entry
+    hi_sorted: np.ndarray       # straddling intervals' upper bounds, ascending
+    hi_owner: np.ndarray
+    left: Optional["_Node"] = None
+    right: Optional["_Node"] = None
+
+
+def _build(lo: np.ndarray, hi: np.ndarray, owner: np.ndarray) -> Optional[_Node]:
+    if len(lo) == 0:
+        return None
+    endpoints = np.concatenate((lo, np.where(np.isinf(hi), lo, hi)))
+    center = float(np.median(endpoints))
+    left = hi < center
+    right = lo > center
+    here = ~(left | right)
+    by_lo = np.argsort(lo[here], kind="stable")
+    by_hi = np.argsort(hi[here], kind="stable")
+    return _Node(
+        center=center,
+        lo_sorted=lo[here][by_lo], lo_owner=owner[here][by_lo],
+        hi_sorted=hi[here][by_hi], hi_owner=owner[here][by_hi],
+        left=_build(lo[left], hi[left], owner[left]),
+        right=_build(lo[right], hi[right], owner[right]),
+    )
+
+
+class BuyerIntervalIndex:
+    """Centered interval tree over buyer price bands capped by funding capacity."""
+
+    def __init__(self, buyers: Iterable[BuyerBands] = ()) -> None:
+        self._buyers: dict[str, BuyerBands] = {b.buyer_id: b for b in buyers}
+        self._pending: dict[str, BuyerBands] = {}
+        self._tombstones: set[str] = set()
+        self.lookups = 0
+        self.rebuilds = 0
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._buyers)
+
+    def _rebuild(self) -> None:
+        self._slots = sorted(self._buyers)
+        self._built = set(self._slots)
+        lo, hi, owner = [], [], []
+        for slot, buyer_id in enumerate(self._slots):
+            for a, b in self._buyers[buyer_id].intervals():
+                lo.append(a)
+                hi.append(b)
+                owner.append(slot)
+        self._lo = np.array(lo, dtype=float)
+        self._hi = np.array(hi, dtype=float)
+        self._owner = np.array(owner, dtype=np.int64)
+        self._scores = np.array([self._buyers[b].buyer_score for b in self._slots], dtype=float)
+        self._root = _build(self._lo, self._hi, self._owner)
+        self._pending.clear()
+        self._tombstones.clear()
+        self.rebuilds += 1
+
+    def _maybe_rebuild(self) -> None:
+        stale = len(self._pending) + len(self._tombstones)
+        if stale > max(MIN_PENDING, REBUILD_FRACTION * len(self._buyers)):
+            self._rebuild()
+
+    def add(self, buyer: BuyerBands) -> None:
+        """Index a buyer, replacing any previous version of it."""
+        if buyer.buyer_id in self._built:
+            self._tombstones.add(buyer.buyer_id)
+        self._buyers[buyer.buyer_id] = buyer
+        self._pending[buyer.buyer_id] = buyer
+        self._maybe_rebuild()
+
+    def remove(self, buyer_id: str) -> None:
+        if self._buyers.pop(buyer_id, None) is None:
+            return
+        self._pending.pop(buyer_id, None)
+        if buyer_id in self._built:
+            self._tombstones.add(buyer_id)
+        self._maybe_rebuild()
+
+    def _ranked(self, buyer_ids: Iterable[str]) -> list[str]:
+        return sorted(buyer_ids, key=lambda b: (-self._buyers[b].buyer_score, b))
+
+    def match(self, price: float) -> list[str]:
+        """Buyer ids that can buy at ``price``, highest buyer_score first."""
+        self.lookups += 1
+        slots: list[np.ndarray] = []
+        node = self._root
+        while node is not None:
+            if price < node.center:
+                slots.append(node.lo_owner[: np.searchsorted(node.lo_sorted, price, side="right")])
+                node = node.left
+            else:
+                slots.append(node.hi_owner[np.searchsorted(node.hi_sorted, price, side="left"):])
+                node = node.right if price > node.center else None
+        found = {self._slots[s] for s in np.unique(np.concatenate(slots))} if slots else set()
+        found -= self._tombstones
+        for buyer_id, buyer in self._pending.items():
+            if any(lo <= price <= hi for lo, hi in buyer.intervals()):
+                found.add(buyer_id)
+        return self._ranked(found)
+
+    def match_all(self, properties: Iterable[tuple[str, float]]) -> dict[str, list[str]]:
+        """Ranked buyer ids for every (property_id, price); unmatched properties are omitted."""
+        if self._pending or self._tombstones:
+            self._rebuild()
+        properties = list(properties)
+        if not properties or not len(self._lo):
+            return {}
+        prices = np.array([p for _, p in properties], dtype=float)
+        order = np.argsort(prices, kind="stable")
+        sorted_prices = prices[order]
+        first = np.searchsorted(sorted_prices, self._lo, side="left")
+        last = np.searchsorted(sorted_prices, self._hi, side="right")
+        counts = np.maximum(last - first, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return {}
+        # Expand each interval's [first, last) price run into explicit pairs.
+        run_start = np.repeat(first - np.cumsum(counts) + counts, counts)
+        prop = order[run_start + np.arange(total)]
+        owner = np.repeat(self._owner, counts)
+        pairs = np.unique(prop * len(self._slots) + owner)   # one pair per buyer even with overlapping bands
+        prop, owner = np.divmod(pairs, len(self._slots))
+        ranked = np.lexsort((owner, -self._scores[owner], prop))
+        prop, owner = prop[ranked], owner[ranked]
+        bounds = np.flatnonzero(np.diff(prop)) + 1
+        return {
+            properties[int(group[0])][0]: [self._slots[s] for s in owners]
+            for group, owners in zip(np.split(prop, bounds), np.split(owner, bounds))
+        }
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "buyers": len(self._buyers),
+            "intervals": int(len(self._lo)),
+            "pending": len(self._pending),
+            "lookups": self.lookups,
+            "rebuilds": self.rebuilds,
+        }
+
+
+__all__ = [
+    "BuyerBands",
+    "BuyerIntervalIndex",
+]
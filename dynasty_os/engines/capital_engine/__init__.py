@@ -1,9 +1,13 @@
 """Capital Engine — 10 sub-systems for capital acquisition, allocation, and reporting."""
 from __future__ import annotations
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
+from dynasty_os.engines.allocation_solver import DEFAULT_TIME_BUDGET, solve_knapsack, solve_multi_pool
+from dynasty_os.engines.liquidity_forecast import DEFAULT_HORIZON_DAYS, CashEvent, LiquidityForecaster
+from dynasty_os.engines.portfolio_risk import DIMENSIONS, PortfolioRiskBook, Position
+
 
 INVESTOR_STAGES = [
     "Prospect", "Warm", "Meeting", "Committed", "Funded", "Repeat", "Strategic Partner",
@@ -133,35 +137,92 @@ class FundingStructureEngine:
 
 
 class AllocationEngine:
-    """Allocates capital to deals, prioritized by ROI."""
+    """Allocates capital to deals, maximizing expected profit (ROI x capital).
+
+    The funded set is the exact 0/1 knapsack optimum (or the best found
+    within ``time_budget`` seconds, with its gap to the upper bound) rather
+    than a greedy fill in ROI order.
+    """
 
     def __init__(self) -> None:
         self._allocations: list[dict[str, Any]] = []
+        self._solves = 0
+        self._proven_optimal = 0
+
+    def _record(self, deal: dict[str, Any], pool_id: str | None = None) -> dict[str, Any]:
+        alloc = {
+            "deal_id": deal.get("deal_id", ""),
+            "allocated": deal.get("capital_needed", 0),
+            "roi": deal.get("roi", 0),
+            "priority_score": deal.get("roi", 0) * 100,
+            "allocated_at": datetime.utcnow().isoformat(),
+        }
+        if pool_id is not None:
+            alloc["pool_id"] = pool_id
+        self._allocations.append(alloc)
+        return alloc
+
+    def optimize(self, available_capital: float, deal_queue: list[dict[str, Any]],
+                 time_budget: float = DEFAULT_TIME_BUDGET) -> dict[str, Any]:
+        """Funded allocations plus solver stats (value, upper bound, gap, optimal)."""
+        weights = [d.get("capital_needed", 0) for d in deal_queue]
+        values = [d.get("roi", 0) * d.get("capital_needed", 0) for d in deal_queue]
+        result = solve_knapsack(weights, values, available_capital, time_budget=time_budget)
+        self._solves += 1
+        self._proven_optimal += int(result.optimal)
+        funded = sorted(result.selected, key=lambda i: deal_queue[i].get("roi", 0), reverse=True)
+        return {
+            "allocations": [self._record(deal_queue[i]) for i in funded],
+            "remaining_capital": available_capital - result.capital_used,
+            "solver": {k: v for k, v in result.to_dict().items() if k != "selected"},
+        }
 
     def process(self, available_capital: float, deal_queue: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        sorted_deals = sorted(deal_queue, key=lambda d: d.get("roi", 0), reverse=True)
-        remaining = available_capital
-        allocations: list[dict[str, Any]] = []
-
-        for deal in sorted_deals:
-            needed = deal.get("capital_needed", 0)
-            if remaining >= needed:
-                alloc = {
-                    "deal_id": deal.get("deal_id", ""),
-                    "allocated": needed,
-                    "roi": deal.get("roi", 0),
-                    "priority_score": deal.get("roi", 0) * 100,
-                    "allocated_at": datetime.utcnow().isoformat(),
-                }
-                allocations.append(alloc)
-                self._allocations.append(alloc)
-                remaining -= needed
-
-        return allocations
+        return self.optimize(available_capital, deal_queue)["allocations"]
+
+    def process_pools(self, pools: list[dict[str, Any]], deal_queue: list[dict[str, Any]],
+                      time_budget: float = DEFAULT_TIME_BUDGET) -> dict[str, Any]:
+        """Fund deals from several investor pools, each deal from at most one.
+
+        Pools are ``{"pool_id", "capital", "deal_ids": [...]}``; an empty or
+        missing ``deal_ids`` means the pool may fund any deal.
+        """
+        weights = [d.get("capital_needed", 0) for d in deal_queue]
+        values = [d.get("roi", 0) * d.get("capital_needed", 0) for d in deal_queue]
+        eligible = [
+            [not p.get("deal_ids") or d.get("deal_id") in p["deal_ids"] for p in pools]
+            for d in deal_queue
+        ]
+        result = solve_multi_pool(weights, values, [p.get("capital", 0) for p in pools],
+                                  eligible if deal_queue and pools else None, time_budget=time_budget)
+        self._solves += 1
+        self._proven_optimal += int(result.optimal)
+        funded = sorted(result.selected, key=lambda i: deal_queue[i].get("roi", 0), reverse=True)
+        # Keyed by pool position: pool ids may be missing or repeated.
+        deployed = [0.0] * len(pools)
+        allocations = []
+        for i in funded:
+            pool = result.assignments[i]
+            allocations.append(self._record(deal_queue[i], pools[pool].get("pool_id", "")))
+            deployed[pool] += allocations[-1]["allocated"]
+        return {
+            "allocations": allocations,
+            "pools": [
+                {"pool_id": p.get("pool_id", ""), "capital": p.get("capital", 0),
+                 "deployed": deployed[k], "remaining": p.get("capital", 0) - deployed[k]}
+                for k, p in enumerate(pools)
+            ],
+            "solver": {k: v for k, v in result.to_dict().items() if k != "selected"},
+        }
 
     def get_metrics(self) -> dict[str, Any]:
         total_deployed = sum(a["allocated"] for a in self._allocations)
-        return {"total_allocations": len(self._allocations), "total_capital_deployed": total_deployed}
+        return {
+            "total_allocations": len(self._allocations),
+            "total_capital_deployed": total_deployed,
+            "solves": self._solves,
+            "proven_optimal": self._proven_optimal,
+        }
 
 
 class PortfolioEngine:
@@ -204,25 +265,26 @@ class RiskEngine:
         self._risk_snapshots: list[dict[str, Any]] = []
 
     def process(self, portfolio_data: dict[str, Any], max_concentration: float = 0.25) -> dict[str, Any]:
-        total = portfolio_data.get("total_capital", 1)
-        positions = portfolio_data.get("positions", [])
-        risks: list[str] = []
-
-        for pos in positions:
-            concentration = pos.get("exposure", 0) / total
-            if concentration > max_concentration:
-                risks.append(f"Concentration risk: {pos.get('asset_type', '')} at {concentration:.1%}")
-
-        liquidity_ratio = portfolio_data.get("liquid_capital", 0) / total
-        if liquidity_ratio < 0.10:
-            risks.append(f"Liquidity risk: only {liquidity_ratio:.1%} liquid")
-
-        snapshot = {
-            "risk_flags": risks,
-            "risk_count": len(risks),
-            "overall_risk": "HIGH" if len(risks) >= 3 else "MODERATE" if len(risks) >= 1 else "LOW",
-            "evaluated_at": datetime.utcnow().isoformat(),
-        }
+        """Group exposures by asset type, market, investor and lender and flag concentrations.
+
+        ``positions`` are dicts with ``exposure`` and any of the DIMENSIONS
+        keys; ``liquid_capital`` is cash not yet deployed. ``total_capital``,
+        when given, is the base for concentration shares and the liquidity
+        ratio (otherwise exposure plus liquid capital). Optional
+        ``scenarios`` replace DEFAULT_SCENARIOS for the drawdown table.
+        """
+        positions = [
+            Position(
+                position_id=str(pos.get("position_id", i)),
+                exposure=float(pos.get("exposure", 0) or 0),
+                **{dim: pos.get(dim) for dim in DIMENSIONS},
+            )
+            for i, pos in enumerate(portfolio_data.get("positions", []))
+        ]
+        book = PortfolioRiskBook(positions, portfolio_data.get("liquid_capital", 0))
+        snapshot = book.report(max_concentration, portfolio_data.get("scenarios"),
+                               portfolio_data.get("total_capital"))
+        snapshot["evaluated_at"] = datetime.utcnow().isoformat()
         self._risk_snapshots.append(snapshot)
         return snapshot
 
@@ -263,6 +325,8 @@ class LiquidityEngine:
 
     def __init__(self) -> None:
         self._liquidity_log: list[dict[str, Any]] = []
+        self._forecasts = 0
+        self._breaches_flagged = 0
 
     def process(self, total_capital: float, deployed_capital: float, reserve_ratio: float = 0.15) -> dict[str, Any]:
         liquid = total_capital - deployed_capital
@@ -283,14 +347,26 @@ class LiquidityEngine:
         self._liquidity_log.append(record)
         return record
 
+    def forecast(self, starting_cash: float, events: list[CashEvent], reserve: float,
+                 start: date | None = None, horizon_days: int = DEFAULT_HORIZON_DAYS) -> dict[str, Any]:
+        """Daily cash projection from scheduled events, flagging reserve breaches."""
+        forecaster = LiquidityForecaster(start or date.today(), starting_cash, reserve, horizon_days)
+        forecaster.load(events)
+        result = forecaster.forecast()
+        self._forecasts += 1
+        self._breaches_flagged += len(result["breaches"])
+        return result
+
     def get_metrics(self) -> dict[str, Any]:
         if not self._liquidity_log:
-            return {"total_snapshots": 0}
+            return {"total_snapshots": 0, "forecasts": self._forecasts}
         latest = self._liquidity_log[-1]
         return {
             "total_snapshots": len(self._liquidity_log),
             "latest_dry_powder": latest["dry_powder"],
             "latest_velocity": latest["capital_velocity"],
+            "forecasts": self._forecasts,
+            "breaches_flagged": self._breaches_flagged,
         }
 
 
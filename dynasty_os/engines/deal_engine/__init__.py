@@ -4,6 +4,11 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
+from dynasty_os.engines.cash_flow_kernel import analyze_hold, hold_summary
+from dynasty_os.engines.investor_matching import DealProfile, InvestorMatchIndex, InvestorProfile
+
 DEAL_OUTCOMES = ["GO", "GO_WITH_CONDITIONS", "RENEGOTIATE", "HOLD", "KILL"]
 
 EXIT_STRATEGIES = ["Wholesale", "Flip", "BRRRR", "Rental", "Development"]
@@ -99,7 +104,7 @@ class StrategyEngine:
     def __init__(self) -> None:
         self._strategies_run: list[dict[str, Any]] = []
 
-    def process(self, deal: DealData) -> dict[str, Any]:
+    def process(self, deal: DealData, include_dcf: bool = False) -> dict[str, Any]:
         strategies: list[dict[str, Any]] = []
 
         wholesale_profit = deal.arv * 0.70 - deal.repairs - deal.asking_price - 5000
@@ -147,6 +152,12 @@ class StrategyEngine:
             "risk": "HIGH",
         })
 
+        if include_dcf:
+            hold_returns = self.hold_returns(deal)
+            for s in strategies:
+                if s["strategy"] in hold_returns:
+                    s["dcf"] = hold_returns[s["strategy"]]
+
         ranked = sorted(strategies, key=lambda s: s["profit"], reverse=True)
         result = {
             "deal_id": deal.deal_id,
@@ -156,6 +167,30 @@ class StrategyEngine:
         self._strategies_run.append(result)
         return result
 
+    def hold_returns(self, deal: DealData, hold_years: int = 5, interest_rate: float = 0.07,
+                     discount_rate: float = 0.10) -> dict[str, dict[str, Any]]:
+        """Discounted returns for the Rental and BRRRR paths, solved together.
+
+        Both start from asking + repairs and sell at appreciated ARV. Rental
+        finances 75% of the asking price; BRRRR refinances at 75% of ARV, so
+        its equity (and IRR) can vanish when the refi returns all the cash.
+        """
+        basis = deal.asking_price + deal.repairs
+        metrics = analyze_hold(
+            purchase_price=np.array([basis, basis]),
+            monthly_rent=deal.rent,
+            hold_months=hold_years * 12,
+            loan_amount=np.array([deal.asking_price * 0.75, deal.arv * 0.75]),
+            interest_rate=interest_rate,
+            annual_taxes=deal.taxes,
+            annual_insurance=deal.insurance,
+            management_pct=0.10,
+            maintenance_pct=0.0,
+            exit_value=deal.arv * (1.03 ** hold_years),
+            discount_rate=discount_rate,
+        )
+        return {"Rental": hold_summary(metrics, 0), "BRRRR": hold_summary(metrics, 1)}
+
     def get_metrics(self) -> dict[str, Any]:
         rec_counts: dict[str, int] = {}
         for r in self._strategies_run:
@@ -348,14 +383,26 @@ class InvestorEngine:
         self._matches: list[dict[str, Any]] = []
 
     def process(self, deal: DealData, profit: float, investors: list[dict[str, Any]]) -> dict[str, Any]:
-        matched = [
-            inv for inv in investors
-            if inv.get("available_capital", 0) >= deal.asking_price * 0.20
-        ]
+        """Rank investors for one deal on capacity, market, risk and return fit.
+
+        Market keys and the risk level come from ``deal.metadata``
+        (``markets``, ``risk_level``); without them only capacity — 20% of
+        the asking price — and return fit apply.
+        """
+        index = InvestorMatchIndex(InvestorProfile.from_row(inv) for inv in investors)
+        profile = DealProfile.from_row({
+            "deal_id": deal.deal_id,
+            "capital_needed": deal.asking_price,
+            "markets": deal.metadata.get("markets", []),
+            "risk_level": deal.metadata.get("risk_level"),
+            "projected_return": profit / deal.asking_price if deal.asking_price else None,
+        })
+        ranked = index.match(profile, limit=len(investors) or 1)
         result = {
             "deal_id": deal.deal_id,
-            "matched_investors": len(matched),
-            "investors": [inv.get("investor_id", "") for inv in matched],
+            "matched_investors": len(ranked),
+            "investors": [m.investor_id for m in ranked],
+            "matches": [m.to_dict() for m in ranked],
             "projected_profit": round(profit, 2),
         }
         self._matches.append(result)
@@ -4,6 +4,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
+from dynasty_os.engines.buyer_matching import BuyerBands, BuyerIntervalIndex
+from dynasty_os.engines.cash_flow_kernel import analyze_hold, hold_summary
+from dynasty_os.engines.hold_sell_optimizer import HOLD, HeldAsset, optimize_hold_sell
+from dynasty_os.engines.quantile_sketch import ALL, KLLSketch, KeyedSketches, rollup_keys, sketch_key, split_key
 
 BUYER_TYPES = [
     "Cash Buyer", "Flipper", "Landlord", "Developer",
@@ -99,20 +105,17 @@ class BuyerEngine:
 
     def __init__(self) -> None:
         self._buyers: dict[str, dict[str, Any]] = {}
+        self._index = BuyerIntervalIndex()
         self._matches: list[dict[str, Any]] = []
 
     def register_buyer(self, buyer: dict[str, Any]) -> dict[str, Any]:
         self._buyers[buyer.get("buyer_id", "")] = buyer
+        self._index.add(BuyerBands.from_row(buyer))
         return buyer
 
     def process(self, property_data: dict[str, Any]) -> list[dict[str, Any]]:
         price = property_data.get("asking_price", 0)
-        matches = [
-            b for b in self._buyers.values()
-            if b.get("min_price", 0) <= price <= b.get("max_price", float("inf"))
-            and b.get("funding_capacity", 0) >= price
-        ]
-        matches_sorted = sorted(matches, key=lambda b: b.get("buyer_score", 0), reverse=True)
+        matches_sorted = [self._buyers[b] for b in self._index.match(price)]
         self._matches.append({
             "property_id": property_data.get("property_id", ""),
             "matched_buyers": len(matches_sorted),
@@ -120,6 +123,20 @@ class BuyerEngine:
         })
         return matches_sorted
 
+    def process_all(self, properties: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        """Ranked buyers for every property in one sweep, keyed by property_id (unmatched omitted)."""
+        matched = self._index.match_all(
+            (p.get("property_id", ""), p.get("asking_price", 0)) for p in properties
+        )
+        now = datetime.utcnow().isoformat()
+        for p in properties:
+            self._matches.append({
+                "property_id": p.get("property_id", ""),
+                "matched_buyers": len(matched.get(p.get("property_id", ""), [])),
+                "matched_at": now,
+            })
+        return {pid: [self._buyers[b] for b in buyer_ids] for pid, buyer_ids in matched.items()}
+
     def get_metrics(self) -> dict[str, Any]:
         by_type: dict[str, int] = {}
         for b in self._buyers.values():
@@ -254,6 +271,7 @@ class RentalConversionEngine:
 
     def __init__(self) -> None:
         self._conversions: list[dict[str, Any]] = []
+        self._dcf_runs = 0
 
     def process(self, property_id: str, arv: float, rent: float, taxes: float,
                 insurance: float, management_rate: float = 0.10) -> dict[str, Any]:
@@ -273,19 +291,79 @@ class RentalConversionEngine:
         self._conversions.append(conversion)
         return conversion
 
+    def process_dcf(self, property_id: str, arv: float, rent: float, taxes: float,
+                    insurance: float, **assumptions: Any) -> dict[str, Any]:
+        """Multi-year hold returns for one candidate; see process_dcf_bulk()."""
+        candidate = {"property_id": property_id, "arv": arv, "rent": rent, "taxes": taxes, "insurance": insurance}
+        return self.process_dcf_bulk([candidate], **assumptions)[0]
+
+    def process_dcf_bulk(self, candidates: list[dict[str, Any]], hold_years: int = 5,
+                         loan_to_value: float = 0.75, interest_rate: float = 0.07,
+                         rent_growth: float = 0.03, vacancy_rate: float = 0.05,
+                         management_rate: float = 0.10, discount_rate: float = 0.10) -> list[dict[str, Any]]:
+        """Discounted hold returns for many conversion candidates in one pass.
+
+        Each candidate needs property_id, arv, rent, taxes and insurance; an
+        optional total_invested overrides the ARV as the cost basis. The
+        candidate is treated as refinanced at ``loan_to_value`` of ARV and
+        sold at appreciated ARV after ``hold_years``. A hold is recommended
+        when the IRR clears the discount rate.
+        """
+        if not candidates:
+            return []
+        arv = np.array([float(c["arv"]) for c in candidates])
+        basis = np.array([float(c.get("total_invested") or c["arv"]) for c in candidates])
+        metrics = analyze_hold(
+            purchase_price=basis,
+            monthly_rent=np.array([float(c["rent"]) for c in candidates]),
+            hold_months=hold_years * 12,
+            loan_amount=arv * loan_to_value,
+            interest_rate=interest_rate,
+            rent_growth=rent_growth,
+            vacancy_rate=vacancy_rate,
+            annual_taxes=np.array([float(c.get("taxes", 0)) for c in candidates]),
+            annual_insurance=np.array([float(c.get("insurance", 0)) for c in candidates]),
+            management_pct=management_rate,
+            maintenance_pct=0.0,
+            exit_value=arv * (1.03 ** hold_years),
+            discount_rate=discount_rate,
+        )
+
+        evaluated_at = datetime.utcnow().isoformat()
+        results = []
+        for i, candidate in enumerate(candidates):
+            summary = hold_summary(metrics, i)
+            results.append({
+                "property_id": candidate["property_id"],
+                "hold_years": hold_years,
+                **summary,
+                "hold_recommendation": summary["irr"] is not None and summary["irr"] >= discount_rate,
+                "evaluated_at": evaluated_at,
+            })
+        self._dcf_runs += len(results)
+        return results
+
     def get_metrics(self) -> dict[str, Any]:
         holds = sum(1 for c in self._conversions if c["hold_recommendation"])
-        return {"total_evaluated": len(self._conversions), "hold_recommendations": holds}
+        return {"total_evaluated": len(self._conversions), "hold_recommendations": holds, "dcf_evaluated": self._dcf_runs}
 
 
 class PerformanceAnalyticsEngine:
-    """Tracks disposition KPIs: days on market, price reductions, close rates."""
+    """Tracks disposition KPIs: days on market, price reductions, close rates.
+
+    Records are not kept: each one feeds a quantile sketch per metric for
+    its exit strategy and market plus the ``*`` rollups, so medians and
+    p90s come from bounded, mergeable state.
+    """
+
+    METRICS = ("days_on_market", "price_reduction_pct")
 
     def __init__(self) -> None:
-        self._records: list[dict[str, Any]] = []
+        self._sketches = KeyedSketches()
+        self._recorded = 0
 
     def process(self, property_id: str, list_price: float, sale_price: float,
-                days_on_market: int, exit_strategy: str) -> dict[str, Any]:
+                days_on_market: int, exit_strategy: str, market: str | None = None) -> dict[str, Any]:
         price_reduction = list_price - sale_price
         price_reduction_pct = price_reduction / list_price if list_price else 0
 
@@ -297,20 +375,48 @@ class PerformanceAnalyticsEngine:
             "price_reduction_pct": round(price_reduction_pct, 4),
             "days_on_market": days_on_market,
             "exit_strategy": exit_strategy,
+            "market": market,
             "recorded_at": datetime.utcnow().isoformat(),
         }
-        self._records.append(record)
+        for metric in self.METRICS:
+            for key in rollup_keys(metric, exit_strategy, market):
+                self._sketches.add(key, record[metric])
+        self._recorded += 1
         return record
 
+    def distribution(self, metric: str, exit_strategy: str | None = None,
+                     market: str | None = None) -> dict[str, Any] | None:
+        """Count, mean, min, max, p50 and p90 of ``metric`` for one exit strategy / market (None = all)."""
+        return self._sketches.summary(sketch_key(metric, exit_strategy, market))
+
     def get_metrics(self) -> dict[str, Any]:
-        if not self._records:
+        if not self._recorded:
             return {"total_recorded": 0}
-        avg_dom = sum(r["days_on_market"] for r in self._records) / len(self._records)
-        avg_reduction = sum(r["price_reduction_pct"] for r in self._records) / len(self._records)
+        dom = self.distribution("days_on_market")
+        reduction = self.distribution("price_reduction_pct")
+        by_exit: dict[str, Any] = {}
+        for key in self._sketches.keys():
+            metric, exit_strategy, market = split_key(key)
+            if metric != "days_on_market" or exit_strategy == ALL or market != ALL:
+                continue
+            exit_dom = self.distribution("days_on_market", exit_strategy)
+            exit_reduction = self.distribution("price_reduction_pct", exit_strategy)
+            by_exit[exit_strategy] = {
+                "recorded": exit_dom["count"],
+                "median_days_on_market": exit_dom["p50"],
+                "p90_days_on_market": exit_dom["p90"],
+                "median_price_reduction_pct": round(exit_reduction["p50"] * 100, 2),
+                "p90_price_reduction_pct": round(exit_reduction["p90"] * 100, 2),
+            }
         return {
-            "total_recorded": len(self._records),
-            "avg_days_on_market": round(avg_dom, 1),
-            "avg_price_reduction_pct": round(avg_reduction * 100, 2),
+            "total_recorded": self._recorded,
+            "avg_days_on_market": round(dom["mean"], 1),
+            "avg_price_reduction_pct": round(reduction["mean"] * 100, 2),
+            "median_days_on_market": dom["p50"],
+            "p90_days_on_market": dom["p90"],
+            "median_price_reduction_pct": round(reduction["p50"] * 100, 2),
+            "p90_price_reduction_pct": round(reduction["p90"] * 100, 2),
+            "by_exit_strategy": by_exit,
         }
 
 
@@ -318,7 +424,9 @@ class CapitalRecoveryEngine:
     """Tracks net capital recovery across all disposition events."""
 
     def __init__(self) -> None:
-        self._recoveries: list[dict[str, Any]] = []
+        self._dispositions = 0
+        self._net_profit = 0.0
+        self._roi = KLLSketch()
 
     def process(self, property_id: str, sale_price: float, total_invested: float,
                 closing_costs: float, agent_fees: float = 0) -> dict[str, Any]:
@@ -337,16 +445,19 @@ class CapitalRecoveryEngine:
             "roi": round(roi, 4),
             "recovered_at": datetime.utcnow().isoformat(),
         }
-        self._recoveries.append(recovery)
+        self._dispositions += 1
+        self._net_profit += recovery["net_profit"]
+        self._roi.add(recovery["roi"])
         return recovery
 
     def get_metrics(self) -> dict[str, Any]:
-        total_profit = sum(r["net_profit"] for r in self._recoveries)
-        avg_roi = sum(r["roi"] for r in self._recoveries) / len(self._recoveries) if self._recoveries else 0
+        median_roi, p90_roi = self._roi.quantiles((0.5, 0.9))
         return {
-            "total_dispositions": len(self._recoveries),
-            "total_net_profit": round(total_profit, 2),
-            "avg_roi": round(avg_roi * 100, 2),
+            "total_dispositions": self._dispositions,
+            "total_net_profit": round(self._net_profit, 2),
+            "avg_roi": round((self._roi.mean or 0) * 100, 2),
+            "median_roi": round(median_roi * 100, 2) if median_roi is not None else 0,
+            "p90_roi": round(p90_roi * 100, 2) if p90_roi is not None else 0,
         }
 
 
@@ -355,6 +466,7 @@ class PortfolioOptimizationEngine:
 
     def __init__(self) -> None:
         self._recommendations: list[dict[str, Any]] = []
+        self._optimized = {"runs": 0, "assets": 0, "sell": 0, "sell_for_liquidity": 0}
 
     def process(self, portfolio_summary: dict[str, Any], market_conditions: dict[str, Any]) -> dict[str, Any]:
         appreciation = market_conditions.get("annual_appreciation", 0.03)
@@ -385,10 +497,35 @@ class PortfolioOptimizationEngine:
         self._recommendations.append(result)
         return result
 
+    def optimize(self, assets: list[dict[str, Any]], target_liquidity: float = 0.0,
+                 limit: int | None = None, **assumptions: Any) -> dict[str, Any]:
+        """Hold / sell verdict for every held asset in one pass; see optimize_hold_sell().
+
+        Each asset needs property_id, market_value and monthly_rent, and may
+        carry loan_balance, annual_taxes, annual_insurance, market and an
+        appreciation override.
+        """
+        plan = optimize_hold_sell((HeldAsset.from_row(a) for a in assets),
+                                  target_liquidity=target_liquidity, **assumptions)
+        self._optimized["runs"] += 1
+        self._optimized["assets"] += len(plan)
+        self._optimized["sell"] += plan.portfolio["sell"]
+        self._optimized["sell_for_liquidity"] += plan.portfolio["sell_for_liquidity"]
+        return {
+            "portfolio": plan.portfolio,
+            "assets": plan.rows(limit),
+            "analyzed_at": datetime.utcnow().isoformat(),
+        }
+
     def get_metrics(self) -> dict[str, Any]:
-        holds = sum(1 for r in self._recommendations if r["recommendation"] == "HOLD")
+        holds = sum(1 for r in self._recommendations if r["recommendation"] == HOLD)
         sells = len(self._recommendations) - holds
-        return {"total_recommendations": len(self._recommendations), "hold": holds, "sell": sells}
+        return {
+            "total_recommendations": len(self._recommendations),
+            "hold": holds,
+            "sell": sells,
+            "optimized": dict(self._optimized),
+        }
 
 
 class DispositionEngine:
@@ -16,11 +16,18 @@ Sheets mapped:
 """
 
 from __future__ import annotations
+import sqlite3
+import threading
 from dataclasses import MISSING, dataclass, field
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Optional
 from enum import Enum
 
+import numpy as np
+
+from dynasty_os.engines.cash_flow_kernel import analyze_hold, hold_summary
+
 DD_STATUSES = ["Not Started", "In Progress", "Passed", "Passed with Issues", "Failed", "N/A"]
 CAMPAIGN_STATUSES = ["Planning", "Active", "Paused", "Completed", "Archived"]
 OFFER_STATUSES = ["Draft", "Submitted", "Accepted", "Rejected", "Countered", "Withdrawn"]
@@ -225,6 +232,7 @@ class SaleScenarioEngine:
 
     def __init__(self) -> None:
         self._scenarios: list[dict[str, Any]] = []
+        self._grid_cells = 0
 
     def process(self, property_id: str, arv_sale: float, purchase_price: float, 
                 holding_months: int = 12, carrying_cost_monthly: float = 0.0) -> dict[str, Any]:
@@ -249,13 +257,62 @@ class SaleScenarioEngine:
         self._scenarios.append(scenario)
         return scenario
 
+    def process_grid(self, property_id: str, purchase_price: float, arv_values: list[float],
+                     holding_months: list[int], carrying_costs_monthly: list[float]) -> dict[str, Any]:
+        """Evaluate every ARV x holding months x carrying cost combination in one broadcast.
+
+        Surfaces are indexed [arv][holding_months][carrying_cost] and use the
+        same math as process().
+        """
+        arv = np.asarray(arv_values, dtype=float)[:, None, None]
+        months = np.asarray(holding_months, dtype=float)[None, :, None]
+        carry = np.asarray(carrying_costs_monthly, dtype=float)[None, None, :]
+
+        carrying_total = carry * months
+        total_cost = purchase_price + carrying_total
+        profit = (arv - arv * 0.12) - total_cost
+        roi = profit / purchase_price if purchase_price else np.zeros_like(profit)
+
+        best = np.unravel_index(np.argmax(profit), profit.shape)
+        worst = np.unravel_index(np.argmin(profit), profit.shape)
+
+        def cell(idx: tuple[int, ...]) -> dict[str, Any]:
+            a, m, c = (int(i) for i in idx)
+            return {
+                "arv_sale": round(float(arv_values[a]), 2),
+                "holding_months": int(holding_months[m]),
+                "carrying_cost_monthly": round(float(carrying_costs_monthly[c]), 2),
+                "projected_profit": round(float(profit[idx]), 2),
+                "projected_roi": round(float(roi[idx]), 4),
+            }
+
+        self._grid_cells += profit.size
+        return {
+            "property_id": property_id,
+            "purchase_price": round(purchase_price, 2),
+            "axes": {
+                "arv_sale": [round(float(v), 2) for v in arv_values],
+                "holding_months": [int(v) for v in holding_months],
+                "carrying_cost_monthly": [round(float(v), 2) for v in carrying_costs_monthly],
+            },
+            "carrying_cost_total": np.round(carrying_total[0], 2).tolist(),
+            "projected_profit": np.round(profit, 2).tolist(),
+            "projected_roi": np.round(roi, 4).tolist(),
+            "scenario_count": int(profit.size),
+            "profitable_share": round(float(np.mean(profit > 0)), 4),
+            "best_case": cell(best),
+            "worst_case": cell(worst),
+            "calculated_at": datetime.utcnow().isoformat(),
+        }
+
     def get_metrics(self) -> dict[str, Any]:
         if not self._scenarios:
-            return {"total_scenarios": 0}
+            return {"total_scenarios": 0, "grid_scenarios": self._grid_cells}
         avg_profit = sum(s["projected_profit"] for s in self._scenarios) / len(self._scenarios)
         avg_roi = sum(s["projected_roi"] for s in self._scenarios) / len(self._scenarios)
         return {
             "total_scenarios": len(self._scenarios),
+            "grid_scenarios": self._grid_cells,
             "avg_profit": round(avg_profit, 2),
             "avg_roi": round(avg_roi, 4),
         }
@@ -266,6 +323,8 @@ class RentalBackstopEngine:
 
     def __init__(self) -> None:
         self._backstops: list[dict[str, Any]] = []
+        self._grid_cells = 0
+        self._dcf_runs = 0
 
     def process(self, property_id: str, monthly_rent: float, annual_taxes: float,
                 annual_insurance: float, holding_years: int = 5, 
@@ -298,10 +357,86 @@ class RentalBackstopEngine:
         self._backstops.append(backstop)
         return backstop
 
+    def process_grid(self, property_id: str, monthly_rents: list[float], vacancy_rates: list[float],
+                     holding_years: list[int], annual_taxes: float, annual_insurance: float,
+                     exit_arv: float = 0.0, purchase_price: float = 0.0) -> dict[str, Any]:
+        """Evaluate every rent x vacancy x holding years combination in one broadcast.
+
+        Cash-flow matrices are indexed [rent][vacancy]; totals and profit add a
+        trailing [holding_years] axis. With a 0% vacancy the cells match process().
+        """
+        rent = np.asarray(monthly_rents, dtype=float)[:, None]
+        vacancy = np.asarray(vacancy_rates, dtype=float)[None, :]
+        years = np.asarray(holding_years, dtype=float)
+
+        collected = rent * (1 - vacancy)
+        maintenance_reserve = rent * 12 * 0.10
+        pm_cost = collected * 0.08
+        monthly_expenses = (annual_taxes / 12) + (annual_insurance / 12) + maintenance_reserve + pm_cost
+        monthly_cf = collected - monthly_expenses
+        annual_cf = monthly_cf * 12
+        total_cf = annual_cf[:, :, None] * years[None, None, :]
+
+        equity_build = exit_arv - purchase_price if exit_arv else 0.0
+        total_profit = total_cf + equity_build
+
+        self._grid_cells += total_profit.size
+        return {
+            "property_id": property_id,
+            "axes": {
+                "est_monthly_rent": [round(float(v), 2) for v in monthly_rents],
+                "vacancy_rate": [round(float(v), 4) for v in vacancy_rates],
+                "holding_years": [int(v) for v in holding_years],
+            },
+            "monthly_cash_flow": np.round(monthly_cf, 2).tolist(),
+            "annual_cash_flow": np.round(annual_cf, 2).tolist(),
+            "total_cash_flow": np.round(total_cf, 2).tolist(),
+            "equity_at_exit": round(equity_build, 2),
+            "total_profit": np.round(total_profit, 2).tolist(),
+            "scenario_count": int(total_profit.size),
+            "positive_cash_flow_share": round(float(np.mean(monthly_cf > 0)), 4),
+            "calculated_at": datetime.utcnow().isoformat(),
+        }
+
+    def process_dcf(self, property_id: str, monthly_rent: float, annual_taxes: float,
+                    annual_insurance: float, purchase_price: float, holding_years: int = 5,
+                    exit_arv: float = 0.0, loan_amount: float = 0.0, interest_rate: float = 0.07,
+                    rent_growth: float = 0.03, vacancy_rate: float = 0.05,
+                    discount_rate: float = 0.10) -> dict[str, Any]:
+        """Monthly discounted cash flow for the backstop hold.
+
+        Unlike process(), rent grows annually, the loan amortizes and the exit
+        sale is discounted back. Without an exit ARV the purchase price is
+        appreciated 3% a year.
+        """
+        metrics = analyze_hold(
+            purchase_price=purchase_price,
+            monthly_rent=monthly_rent,
+            hold_months=holding_years * 12,
+            loan_amount=loan_amount,
+            interest_rate=interest_rate,
+            rent_growth=rent_growth,
+            vacancy_rate=vacancy_rate,
+            annual_taxes=annual_taxes,
+            annual_insurance=annual_insurance,
+            exit_value=exit_arv or np.nan,
+            discount_rate=discount_rate,
+        )
+        self._dcf_runs += 1
+        return {
+            "property_id": property_id,
+            "holding_years": holding_years,
+            "discount_rate": discount_rate,
+            **hold_summary(metrics),
+            "calculated_at": datetime.utcnow().isoformat(),
+        }
+
     def get_metrics(self) -> dict[str, Any]:
-        if not self._backstops:
-            return {"total_backstops": 0}
-        return {"total_backstops": len(self._backstops)}
+        return {
+            "total_backstops": len(self._backstops),
+            "grid_scenarios": self._grid_cells,
+            "dcf_runs": self._dcf_runs,
+        }
 
 
 class ExitStrategyEngine:
@@ -372,6 +507,175 @@ class ExitStrategyEngine:
         }
 
 
+_DD_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dd_checklist_items (
+    item_id           TEXT PRIMARY KEY,
+    property_id       TEXT NOT NULL,
+    position          INTEGER NOT NULL,
+    category          TEXT NOT NULL,
+    description       TEXT NOT NULL,
+    status            TEXT NOT NULL DEFAULT 'Not Started',
+    responsible_party TEXT NOT NULL DEFAULT '',
+    due_date          TEXT NOT NULL DEFAULT '',
+    notes             TEXT NOT NULL DEFAULT '',
+    result            TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_dd_checklist_items_property
+    ON dd_checklist_items (property_id, position);
+
+CREATE TABLE IF NOT EXISTS dd_checklists (
+    property_id TEXT PRIMARY KEY,
+    item_count  INTEGER NOT NULL DEFAULT 0,
+    created_at  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dd_checklist_status_counts (
+    property_id TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    item_count  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (property_id, status)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS dd_checklist_totals (
+    metric TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+_DD_ITEM_COLUMNS = (
+    "item_id", "category", "description", "status",
+    "responsible_party", "due_date", "notes", "result",
+)
+_DD_COMPLETE_STATUSES = ("Passed", "Passed with Issues")
+
+
+class DDChecklistStore:
+    """Embedded SQLite store for DD checklist items.
+
+    Items are keyed by item_id and indexed by property_id. Per-property and
+    global status counters are maintained in the same transaction as every
+    write, so summaries and metrics read a few counter rows instead of
+    scanning items. Defaults to an in-memory database; pass a file path to
+    keep checklists across restarts.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_DD_STORE_SCHEMA)
+
+    def _bump(self, property_id: str, status: str, delta: int) -> None:
+        self._conn.execute(
+            "INSERT INTO dd_checklist_status_counts (property_id, status, item_count) VALUES (?, ?, ?) "
+            "ON CONFLICT (property_id, status) DO UPDATE SET item_count = item_count + excluded.item_count",
+            (property_id, status, delta),
+        )
+        self._bump_total(f"status:{status}", delta)
+
+    def _bump_total(self, metric: str, delta: int) -> None:
+        self._conn.execute(
+            "INSERT INTO dd_checklist_totals (metric, value) VALUES (?, ?) "
+            "ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value",
+            (metric, delta),
+        )
+
+    def create_items(self, property_id: str, items: list[DDChecklistItem]) -> int:
+        """Insert items not already stored; returns how many were new."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                created = 0
+                for position, item in enumerate(items):
+                    cur = self._conn.execute(
+                        "INSERT OR IGNORE INTO dd_checklist_items "
+                        "(item_id, property_id, position, category, description, status, "
+                        "responsible_party, due_date, notes, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (item.item_id, property_id, position, item.category, item.description, item.status,
+                         item.responsible_party, item.due_date, item.notes, item.result),
+                    )
+                    if cur.rowcount:
+                        created += 1
+                        self._bump(property_id, item.status, 1)
+
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO dd_checklists (property_id, item_count, created_at) VALUES (?, 0, ?)",
+                    (property_id, datetime.utcnow().isoformat()),
+                )
+                if cur.rowcount:
+                    self._bump_total("checklists", 1)
+                if created:
+                    self._conn.execute(
+                        "UPDATE dd_checklists SET item_count = item_count + ? WHERE property_id = ?",
+                        (created, property_id),
+                    )
+                    self._bump_total("items", created)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return created
+
+    def update_status(self, item_id: str, status: str, result: str = "", notes: str = "") -> dict[str, Any]:
+        """Update one item by primary key and move its counters; {} if missing."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT property_id, status FROM dd_checklist_items WHERE item_id = ?", (item_id,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("ROLLBACK")
+                    return {}
+                self._conn.execute(
+                    "UPDATE dd_checklist_items SET status = ?, result = ?, notes = ? WHERE item_id = ?",
+                    (status, result, notes, item_id),
+                )
+                if row["status"] != status:
+                    self._bump(row["property_id"], row["status"], -1)
+                    self._bump(row["property_id"], status, 1)
+                updated = self._conn.execute(
+                    f"SELECT {', '.join(_DD_ITEM_COLUMNS)} FROM dd_checklist_items WHERE item_id = ?", (item_id,)
+                ).fetchone()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return dict(updated)
+
+    def items_for_property(self, property_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_DD_ITEM_COLUMNS)} FROM dd_checklist_items "
+                "WHERE property_id = ? ORDER BY position",
+                (property_id,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def status_counts(self, property_id: str) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, item_count FROM dd_checklist_status_counts "
+                "WHERE property_id = ? AND item_count > 0",
+                (property_id,),
+            ).fetchall()
+        return {r["status"]: r["item_count"] for r in rows}
+
+    def totals(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT metric, value FROM dd_checklist_totals").fetchall()
+        return {r["metric"]: r["value"] for r in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 class DDChecklistEngine:
     """Manages due diligence checklists."""
 
@@ -384,83 +688,128 @@ class DDChecklistEngine:
         "Contractor Bids", "Permit Research", "Engineering Reports",
     ]
 
-    def __init__(self) -> None:
-        self._checklists: list[dict[str, Any]] = []
-        self._items: list[DDChecklistItem] = []
+    def __init__(self, store: DDChecklistStore | None = None) -> None:
+        self._store = store or DDChecklistStore()
 
     def create_checklist(self, property_id: str, include_categories: list[str] | None = None) -> dict[str, Any]:
-        """Create a new DD checklist for a property."""
+        """Create a DD checklist for a property. Re-creating keeps existing item statuses."""
         categories = include_categories or self.STANDARD_CATEGORIES
-        items = []
-        for i, cat in enumerate(categories):
-            item = DDChecklistItem(
+        items = [
+            DDChecklistItem(
                 item_id=f"DD-{property_id}-{i+1:03d}",
                 category=cat,
                 description=f"{cat} verification",
             )
-            items.append(item)
-            self._items.append(item)
+            for i, cat in enumerate(categories)
+        ]
+        self._store.create_items(property_id, items)
+        stored = self._store.items_for_property(property_id)
 
-        checklist = {
+        return {
             "property_id": property_id,
-            "item_count": len(items),
-            "items": [item.__dict__ for item in items],
+            "item_count": len(stored),
+            "items": stored,
             "created_at": datetime.utcnow().isoformat(),
         }
-        self._checklists.append(checklist)
-        return checklist
 
     def update_item_status(self, item_id: str, status: str, result: str = "", notes: str = "") -> dict[str, Any]:
         """Update a checklist item's status."""
-        for item in self._items:
-            if item.item_id == item_id:
-                item.status = status
-                item.result = result
-                item.notes = notes
-                return item.__dict__
-
-        return {}
+        return self._store.update_status(item_id, status, result=result, notes=notes)
 
     def get_checklist_summary(self, property_id: str) -> dict[str, Any]:
         """Get summary of checklist status for a property."""
-        relevant_items = [i for i in self._items if i.item_id.endswith(property_id.split('-')[-1]) or 
-                         any(property_id in i.item_id for _ in [1])]
-        
-        if not relevant_items:
+        status_counts = self._store.status_counts(property_id)
+        total = sum(status_counts.values())
+        if not total:
             return {"property_id": property_id, "total_items": 0}
 
-        status_counts = {}
-        for item in relevant_items:
-            status_counts[item.status] = status_counts.get(item.status, 0) + 1
-
-        complete = sum(1 for i in relevant_items if i.status in ("Passed", "Passed with Issues"))
-        completion_pct = (complete / len(relevant_items) * 100) if relevant_items else 0
-
+        complete = sum(status_counts.get(s, 0) for s in _DD_COMPLETE_STATUSES)
         return {
             "property_id": property_id,
-            "total_items": len(relevant_items),
+            "total_items": total,
             "status_summary": status_counts,
-            "completion_pct": round(completion_pct, 1),
+            "completion_pct": round(complete / total * 100, 1),
         }
 
     def get_metrics(self) -> dict[str, Any]:
-        passed = sum(1 for i in self._items if i.status == "Passed")
-        issues = sum(1 for i in self._items if i.status == "Passed with Issues")
-        failed = sum(1 for i in self._items if i.status == "Failed")
+        totals = self._store.totals()
         return {
-            "total_checklists": len(self._checklists),
-            "total_items": len(self._items),
-            "passed": passed,
-            "issues": issues,
-            "failed": failed,
+            "total_checklists": totals.get("checklists", 0),
+            "total_items": totals.get("items", 0),
+            "passed": totals.get("status:Passed", 0),
+            "issues": totals.get("status:Passed with Issues", 0),
+            "failed": totals.get("status:Failed", 0),
         }
 
 
+BUYBOX_CHECKS = ("lot_size", "arv", "purchase_price", "zoning", "county_excluded")
+
+
+class BuyBoxIndex:
+    """Buy boxes compiled into interval bounds and set-membership tables.
+
+    Lot size, ARV and price become per-box bound arrays; zoning and excluded
+    counties become boolean (box x vocabulary) tables with a trailing column
+    for values no box mentions. match() scores a property batch against every
+    box with the same five checks as BuyBoxEngine.evaluate().
+    """
+
+    def __init__(self, buyboxes: list[BuyBoxCriteria]) -> None:
+        self.buybox_ids = [b.buybox_id for b in buyboxes]
+        self.min_lot = np.array([b.min_lot_size for b in buyboxes], dtype=float)
+        self.max_lot = np.array([b.max_lot_size for b in buyboxes], dtype=float)
+        self.min_arv = np.array([b.min_arv for b in buyboxes], dtype=float)
+        self.max_price = np.array([b.max_purchase_price for b in buyboxes], dtype=float)
+
+        self._zoning_codes = {z: i for i, z in enumerate(sorted({z for b in buyboxes for z in b.preferred_zoning}))}
+        self._county_codes = {c: i for i, c in enumerate(sorted({c for b in buyboxes for c in b.excluded_counties}))}
+        # zoning_ok[b, code]: box b accepts that zoning (any zoning when it has no preference)
+        self.zoning_ok = np.zeros((len(buyboxes), len(self._zoning_codes) + 1), dtype=bool)
+        # county_ok[b, code]: the county is not on box b's exclusion list
+        self.county_ok = np.ones((len(buyboxes), len(self._county_codes) + 1), dtype=bool)
+        for row, b in enumerate(buyboxes):
+            if b.preferred_zoning:
+                self.zoning_ok[row, [self._zoning_codes[z] for z in b.preferred_zoning]] = True
+            else:
+                self.zoning_ok[row, :] = True
+            if b.excluded_counties:
+                self.county_ok[row, [self._county_codes[c] for c in b.excluded_counties]] = False
+
+    def __len__(self) -> int:
+        return len(self.buybox_ids)
+
+    def compile_properties(self, properties: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+        """Columnar view of a property batch; unknown zoning/counties map to the spare column."""
+        unknown_zoning, unknown_county = len(self._zoning_codes), len(self._county_codes)
+        return {
+            "lot": np.array([p.get("lot_size_acres") or 0 for p in properties], dtype=float),
+            "arv": np.array([p.get("arv_land") or 0 for p in properties], dtype=float),
+            "price": np.array([p.get("purchase_price") or 0 for p in properties], dtype=float),
+            "zoning": np.array([self._zoning_codes.get(p.get("zoning") or "", unknown_zoning) for p in properties], dtype=np.intp),
+            "county": np.array([self._county_codes.get(p.get("county") or "", unknown_county) for p in properties], dtype=np.intp),
+        }
+
+    def match(self, columns: dict[str, np.ndarray]) -> np.ndarray:
+        """Boolean check tensor shaped (checks, properties, buyboxes)."""
+        lot = columns["lot"][:, None]
+        return np.stack([
+            (lot >= self.min_lot) & (lot <= self.max_lot),
+            columns["arv"][:, None] >= self.min_arv,
+            columns["price"][:, None] <= self.max_price,
+            self.zoning_ok[:, columns["zoning"]].T,
+            self.county_ok[:, columns["county"]].T,
+        ])
+
+
 class BuyBoxEngine:
     """Evaluates properties against buy box criteria."""
 
+    BULK_CHUNK_CELLS = 2_000_000
+
     def __init__(self) -> None:
         self._evaluations: list[dict[str, Any]] = []
+        self._bulk_pairs = 0
+        self._bulk_matches = 0
 
     def evaluate(self, property_input: dict[str, Any], buybox: BuyBoxCriteria) -> dict[str, Any]:
         """Evaluate property against buy box criteria."""
@@ -490,12 +839,58 @@ class BuyBoxEngine:
         self._evaluations.append(evaluation)
         return evaluation
 
+    def evaluate_bulk(self, properties: list[dict[str, Any]], buyboxes: list[BuyBoxCriteria],
+                      min_score: float = 80.0) -> dict[str, Any]:
+        """Score every property against every buy box, keeping pairs at or above ``min_score``.
+
+        Properties are scored in chunks so the check tensor stays bounded;
+        only qualifying pairs are materialized, each with the checks it failed.
+        """
+        index = BuyBoxIndex(buyboxes)
+        total = len(BUYBOX_CHECKS)
+        needed = int(np.ceil(min_score / 100 * total - 1e-9))
+        chunk = max(1, self.BULK_CHUNK_CELLS // max(len(index), 1))
+
+        matches: list[dict[str, Any]] = []
+        for start in range(0, len(properties), chunk):
+            batch = properties[start:start + chunk]
+            checks = index.match(index.compile_properties(batch))
+            passed = checks.sum(axis=0, dtype=np.int8)
+            rows, cols = np.nonzero(passed >= needed)
+            hits = passed[rows, cols].tolist()
+            failed = (~checks[:, rows, cols]).T.tolist()
+            for r, c, hit, misses in zip(rows.tolist(), cols.tolist(), hits, failed):
+                score = hit / total * 100
+                matches.append({
+                    "property_id": batch[r].get("property_id", ""),
+                    "buybox_id": index.buybox_ids[c],
+                    "passed": hit,
+                    "match_score": round(score, 1),
+                    "meets_criteria": score >= 80,
+                    "failed_checks": [name for name, miss in zip(BUYBOX_CHECKS, misses) if miss],
+                })
+
+        pairs = len(properties) * len(index)
+        self._bulk_pairs += pairs
+        self._bulk_matches += len(matches)
+        return {
+            "property_count": len(properties),
+            "buybox_count": len(index),
+            "pairs_evaluated": pairs,
+            "min_score": min_score,
+            "match_count": len(matches),
+            "matches": matches,
+            "evaluated_at": datetime.utcnow().isoformat(),
+        }
+
     def get_metrics(self) -> dict[str, Any]:
         meets = sum(1 for e in self._evaluations if e["meets_criteria"])
         return {
             "total_evaluations": len(self._evaluations),
             "meets_criteria": meets,
             "rejected": len(self._evaluations) - meets,
+            "bulk_pairs_evaluated": self._bulk_pairs,
+            "bulk_matches": self._bulk_matches,
         }
 
 
@@ -543,28 +938,47 @@ class CampaignEngine:
         }
 
 
+def offer_mao(arv, repair_cost, total_carrying, exit_strategy: str, target_roi):
+    """Unrounded MAO for one exit strategy.
+
+    Works elementwise on numpy arrays, so offer_ladder() gets the same
+    floating-point operations (and the same rounding) as calculate_offer().
+    """
+    profit_target = arv * target_roi
+    if exit_strategy == ExitType.FLIP.value:
+        return arv - repair_cost - profit_target - arv * 0.12 - total_carrying
+    if exit_strategy == ExitType.WHOLESALE.value:
+        return arv * 0.70 - profit_target - total_carrying
+    if exit_strategy == ExitType.DEVELOPMENT.value:
+        return (arv * 1.3) - (repair_cost * 1.2) - profit_target - total_carrying
+    return arv - profit_target - total_carrying
+
+
+def roi_label(roi: float) -> str:
+    """Exact ROI percent for ladder column names: 0.125 -> ``12_5``."""
+    return f"{roi * 100:g}".replace(".", "_").replace("-", "neg")
+
+
 class OfferCalculationEngine:
     """Calculates optimal offers based on deal parameters."""
 
+    MAO_CACHE_SIZE = 100_000
+
     def __init__(self) -> None:
         self._offers: list[OfferCalculation] = []
+        # ladder signature -> {(arv, repair_cost, carrying): (strategies x rois) MAO table}
+        self._mao_cache: dict[tuple, dict[tuple[float, float, float], np.ndarray]] = {}
+        self._mao_cache_entries = 0
+        self._ladder_offers = 0
+        self._ladder_cache_hits = 0
 
     def calculate_offer(self, property_id: str, arv: float, repair_cost: float = 0.0,
                        exit_strategy: str = "Flip", target_roi: float = 0.20,
                        holding_cost_monthly: float = 0.0, holding_months: int = 12) -> dict[str, Any]:
         """Calculate recommended offer price."""
-        selling_costs = arv * 0.12
         profit_target = arv * target_roi
         total_carrying = holding_cost_monthly * holding_months
-
-        if exit_strategy == ExitType.FLIP.value:
-            mao = arv - repair_cost - profit_target - selling_costs - total_carrying
-        elif exit_strategy == ExitType.WHOLESALE.value:
-            mao = arv * 0.70 - profit_target - total_carrying
-        elif exit_strategy == ExitType.DEVELOPMENT.value:
-            mao = (arv * 1.3) - (repair_cost * 1.2) - profit_target - total_carrying
-        else:
-            mao = arv - profit_target - total_carrying
+        mao = offer_mao(arv, repair_cost, total_carrying, exit_strategy, target_roi)
 
         offer = OfferCalculation(
             offer_id=f"OFF-{property_id}-{len(self._offers)+1:04d}",
@@ -588,8 +1002,90 @@ class OfferCalculationEngine:
         self._offers.append(offer)
         return result
 
+    def offer_ladder(self, properties: list[dict[str, Any]], target_rois: list[float],
+                     exit_strategies: list[str] | None = None) -> dict[str, Any]:
+        """MAO for every property x exit strategy x target ROI, returned column-wise.
+
+        Each property needs property_id and arv; repair_cost,
+        holding_cost_monthly and holding_months default as in
+        calculate_offer(). Properties sharing (arv, repair, carrying) are
+        computed once, and their tables are memoized across calls for the
+        same strategy/ROI ladder. Output columns are named
+        ``mao_<strategy>_<roi%>`` (``mao_flip_12_5`` for 12.5%) so each row
+        maps to one mail-merge record; ROIs that would share a column name
+        raise ValueError.
+        """
+        strategies = tuple(exit_strategies or [e.value for e in ExitType])
+        rois = tuple(float(r) for r in target_rois)
+        labels = [roi_label(r) for r in rois]
+        if len(set(labels)) != len(labels):
+            raise ValueError(f"target_rois must be distinct, got {sorted(labels)}")
+        keys = np.array([
+            (
+                float(p["arv"]),
+                float(p.get("repair_cost") or 0.0),
+                float(p.get("holding_cost_monthly") or 0.0) * int(p.get("holding_months", 12)),
+            )
+            for p in properties
+        ], dtype=float).reshape(-1, 3)
+
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        cache = self._mao_cache.setdefault((strategies, rois), {})
+        tables = np.empty((len(unique_keys), len(strategies), len(rois)))
+        missing = []
+        for i, key in enumerate(map(tuple, unique_keys.tolist())):
+            cached = cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                tables[i] = cached
+        self._ladder_cache_hits += len(unique_keys) - len(missing)
+
+        if missing:
+            arv, repair, carrying = (unique_keys[missing, j][:, None] for j in range(3))
+            roi = np.array(rois)[None, :]
+            computed = np.stack([offer_mao(arv, repair, carrying, s, roi) for s in strategies], axis=1)
+            tables[missing] = computed
+            if self._mao_cache_entries + len(missing) > self.MAO_CACHE_SIZE:
+                self._mao_cache = {(strategies, rois): {}}
+                cache = self._mao_cache[(strategies, rois)]
+                self._mao_cache_entries = 0
+            for i, table in zip(missing, computed):
+                cache[tuple(unique_keys[i].tolist())] = table
+            self._mao_cache_entries += len(missing)
+
+        # Python's round(), not np.round(): they disagree on half-cent ties.
+        mao = tables[inverse]
+        columns: dict[str, list[Any]] = {
+            "property_id": [p.get("property_id", "") for p in properties],
+            "arv": np.round(keys[:, 0], 2).tolist(),
+            "repair_cost": np.round(keys[:, 1], 2).tolist(),
+            "holding_cost": np.round(keys[:, 2], 2).tolist(),
+        }
+        for si, strategy in enumerate(strategies):
+            slug = "".join(ch if ch.isalnum() else "_" for ch in strategy.lower()).strip("_")
+            for ri, label in enumerate(labels):
+                columns[f"mao_{slug}_{label}"] = [round(v, 2) for v in mao[:, si, ri].tolist()]
+
+        self._ladder_offers += mao.size
+        return {
+            "row_count": len(properties),
+            "offer_count": int(mao.size),
+            "exit_strategies": list(strategies),
+            "target_rois": list(rois),
+            "unique_inputs": len(unique_keys),
+            "cache_hits": len(unique_keys) - len(missing),
+            "columns": columns,
+            "calculated_at": datetime.utcnow().isoformat(),
+        }
+
     def get_metrics(self) -> dict[str, Any]:
-        return {"total_offers_calculated": len(self._offers)}
+        return {
+            "total_offers_calculated": len(self._offers),
+            "ladder_offers_calculated": self._ladder_offers,
+            "ladder_cache_hits": self._ladder_cache_hits,
+        }
 
 
 class LandBuild_UW_DDEngine:
@@ -599,12 +1095,12 @@ class LandBuild_UW_DDEngine:
     It handles comprehensive Land + Build deal analysis with scenario modeling and DD.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, dd_store: DDChecklistStore | None = None) -> None:
         self.property_input = PropertyInputEngine()
         self.sale_scenario = SaleScenarioEngine()
         self.rental_backstop = RentalBackstopEngine()
         self.exit_strategy = ExitStrategyEngine()
-        self.dd_checklist = DDChecklistEngine()
+        self.dd_checklist = DDChecklistEngine(dd_store)
         self.buy_box = BuyBoxEngine()
         self.campaign = CampaignEngine()
         self.offer_calc = OfferCalculationEngine()
@@ -705,9 +1201,13 @@ __all__ = [
     "SaleScenarioEngine",
     "RentalBackstopEngine",
     "ExitStrategyEngine",
+    "DDChecklistStore",
     "DDChecklistEngine",
     "BuyBoxEngine",
+    "BuyBoxIndex",
     "CampaignEngine",
     "OfferCalculationEngine",
     "LandBuild_UW_DDEngine",
+    "offer_mao",
+    "roi_label",
 ]
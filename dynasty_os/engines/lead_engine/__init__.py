@@ -1,8 +1,11 @@
 """Lead Engine — 10 sub-systems for full-cycle lead management."""
 from __future__ import annotations
+import heapq
+import threading
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timezone
+from itertools import count
+from typing import Any, Iterable
 
 
 LEAD_TYPES = [
@@ -151,8 +154,34 @@ class QualificationEngine:
         }
 
 
+@dataclass
+class Assignee:
+    """A routable team member: how many open leads they can carry and which
+    grades / lead types they take (empty means any)."""
+    name: str
+    capacity: int
+    grades: frozenset[str] = frozenset()
+    lead_types: frozenset[str] = frozenset()
+    open_leads: int = 0
+
+    def accepts(self, grade: str, lead_type: str) -> bool:
+        return (not self.grades or grade in self.grades) and (not self.lead_types or lead_type in self.lead_types)
+
+    @property
+    def load(self) -> float:
+        return self.open_leads / self.capacity if self.capacity > 0 else float("inf")
+
+
 class RoutingEngine:
-    """Routes leads to the right team member based on type, score, and workload."""
+    """Routes leads to the right team member based on type, score, and workload.
+
+    With no assignees registered, grades map to static team queues. Once
+    assignees are registered, each lead goes to the least-loaded (open
+    leads / capacity) eligible assignee with room left; when everyone
+    eligible is full it overflows to the grade's team queue. Candidates are
+    kept in one heap per (grade, lead_type) pool with versioned entries, so
+    an assignment or load change costs O(log n) per pool touched.
+    """
 
     def __init__(self) -> None:
         self._routing_rules: dict[str, str] = {
@@ -161,26 +190,143 @@ class RoutingEngine:
             "C": "follow_up_team",
             "D": "nurture_sequence",
         }
-        self._routed: list[dict[str, Any]] = []
+        # Running counters only: the engine is a process-wide singleton, so
+        # keeping every routing result would grow without bound.
+        self._routed_total = 0
+        self._routed_by: dict[str, int] = {}
+        self._assignees: dict[str, Assignee] = {}
+        self._versions: dict[str, int] = {}
+        self._pools: dict[tuple[str, str], list[tuple[float, int, int, str, int]]] = {}
+        self._pool_members: dict[str, set[tuple[str, str]]] = {}
+        self._lock = threading.RLock()
+        self._overflowed = 0
+
+    # ── Assignee registry ──────────────────────────────────────────────────
+
+    def register_assignee(self, name: str, capacity: int, grades: Iterable[str] = (),
+                          lead_types: Iterable[str] = (), open_leads: int = 0) -> Assignee:
+        with self._lock:
+            assignee = Assignee(name, capacity, frozenset(grades), frozenset(lead_types), open_leads)
+            self._assignees[name] = assignee
+            # Eligibility may have changed: drop pool membership and rebuild lazily.
+            self._pools.clear()
+            self._pool_members.clear()
+            self._bump(name)
+            return assignee
+
+    def reset_assignees(self) -> None:
+        """Forget every registered assignee (before re-registering a fresh roster)."""
+        with self._lock:
+            self._assignees.clear()
+            self._versions.clear()
+            self._pools.clear()
+            self._pool_members.clear()
+
+    def set_load(self, open_counts: dict[str, int]) -> None:
+        """Reset open-lead counts (e.g. from a fresh database count)."""
+        with self._lock:
+            for name, assignee in self._assignees.items():
+                assignee.open_leads = int(open_counts.get(name, 0))
+            self._pools.clear()
+            self._pool_members.clear()
+
+    def adjust_load(self, name: str, delta: int) -> None:
+        """Apply a load delta, e.g. -1 when one of their leads closes."""
+        with self._lock:
+            assignee = self._assignees.get(name)
+            if assignee is None:
+                return
+            assignee.open_leads = max(assignee.open_leads + delta, 0)
+            self._bump(name)
+
+    def _bump(self, name: str) -> None:
+        """New version for ``name`` and a fresh entry in each pool it belongs to."""
+        version = self._versions.get(name, 0) + 1
+        self._versions[name] = version
+        assignee = self._assignees[name]
+        entry = (assignee.load, assignee.open_leads, -assignee.capacity, name, version)
+        for pool_key in self._pool_members.get(name, ()):
+            pool = self._pools[pool_key]
+            heapq.heappush(pool, entry)
+            if len(pool) > 2 * len(self._assignees) + 16:
+                # Compact superseded entries so pools stay O(assignees).
+                pool[:] = [e for e in pool if e[4] == self._versions.get(e[3])]
+                heapq.heapify(pool)
+
+    def _pool(self, grade: str, lead_type: str) -> list[tuple[float, int, int, str, int]]:
+        key = (grade, lead_type)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = []
+            for name, assignee in self._assignees.items():
+                if assignee.accepts(grade, lead_type):
+                    pool.append((assignee.load, assignee.open_leads, -assignee.capacity, name, self._versions[name]))
+                    self._pool_members.setdefault(name, set()).add(key)
+            heapq.heapify(pool)
+            self._pools[key] = pool
+        return pool
+
+    def _least_loaded(self, grade: str, lead_type: str) -> str | None:
+        pool = self._pool(grade, lead_type)
+        while pool:
+            load, _, _, name, version = pool[0]
+            if version != self._versions.get(name) or name not in self._assignees:
+                heapq.heappop(pool)
+                continue
+            return name if load < 1 else None
+        return None
+
+    # ── Routing ────────────────────────────────────────────────────────────
 
     def process(self, lead: Lead, grade: str, override_assignee: str = "") -> dict[str, Any]:
-        assignee = override_assignee or self._routing_rules.get(grade, "general_inbox")
+        with self._lock:
+            reason = "override" if override_assignee else "grade_rule"
+            assignee = override_assignee
+            if not assignee and self._assignees:
+                assignee = self._least_loaded(grade, lead.lead_type) or ""
+                if assignee:
+                    reason = "least_loaded"
+                else:
+                    self._overflowed += 1
+                    reason = "overflow"
+            assignee = assignee or self._routing_rules.get(grade, "general_inbox")
+            if assignee in self._assignees:
+                self._assignees[assignee].open_leads += 1
+                self._bump(assignee)
+            self._routed_total += 1
+            self._routed_by[assignee] = self._routed_by.get(assignee, 0) + 1
         lead.owner = assignee
         result = {
             "lead_id": lead.lead_id,
             "grade": grade,
             "routed_to": assignee,
+            "reason": reason,
             "routed_at": datetime.utcnow().isoformat(),
         }
-        self._routed.append(result)
         return result
 
+    def process_bulk(self, leads: Iterable[tuple[Lead, str]]) -> list[dict[str, Any]]:
+        """Route a batch of (lead, grade) pairs, updating loads as it goes."""
+        return [self.process(lead, grade) for lead, grade in leads]
+
+    def load_snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "assignee": a.name,
+                    "open_leads": a.open_leads,
+                    "capacity": a.capacity,
+                    "load": round(a.load, 4) if a.capacity > 0 else None,
+                    "grades": sorted(a.grades),
+                    "lead_types": sorted(a.lead_types),
+                }
+                for a in sorted(self._assignees.values(), key=lambda a: (a.load, a.name))
+            ]
+
     def get_metrics(self) -> dict[str, Any]:
-        by_assignee: dict[str, int] = {}
-        for r in self._routed:
-            a = r["routed_to"]
-            by_assignee[a] = by_assignee.get(a, 0) + 1
-        return {"total_routed": len(self._routed), "by_assignee": by_assignee}
+        with self._lock:
+            return {"total_routed": self._routed_total, "by_assignee": dict(self._routed_by),
+                    "overflowed": self._overflowed}
 
 
 class FollowUpEngine:
@@ -292,6 +438,170 @@ class AnalyticsEngine:
     def get_metrics(self) -> dict[str, Any]:
         return {"snapshots_taken": len(self._snapshots)}
 
+# Seller follow-ups carry no priority column; they are scheduled callbacks
+# with a seller already in conversation, so they rank just under CALL_NOW
+# (100) from the lead action queue generator.
+SELLER_FOLLOWUP_PRIORITY = 90
+
+WORK_SOURCES = ("lead_action_queue", "seller_followups")
+OPEN_STATUS = "OPEN"
+
+
+@dataclass
+class WorkItem:
+    source: str
+    item_id: str
+    assignee: str
+    priority: int
+    due_at: datetime | None
+    action_type: str
+    property_id: str = ""
+    status: str = OPEN_STATUS
+    reason: str = ""
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.source, self.item_id)
+
+    @classmethod
+    def from_row(cls, source: str, row: dict[str, Any]) -> "WorkItem":
+        """Build from a lead_action_queue or seller_followups row (snake_case)."""
+        due = row.get("next_action_date") if source == "lead_action_queue" else row.get("followup_date")
+        if isinstance(due, str):
+            due = datetime.fromisoformat(due.replace("Z", "+00:00"))
+        if due is not None and due.tzinfo is not None:
+            # Naive UTC, like the timestamp-without-time-zone columns.
+            due = due.astimezone(timezone.utc).replace(tzinfo=None)
+        if source == "lead_action_queue":
+            priority, action_type, reason = int(row["priority"]), row["action_type"], row.get("reason") or ""
+        else:
+            priority, action_type, reason = SELLER_FOLLOWUP_PRIORITY, f"FOLLOWUP_{row.get('followup_type') or 'CALL'}", row.get("notes") or ""
+        return cls(
+            source=source,
+            item_id=str(row["id"]),
+            assignee=row.get("assigned_to") or str(row.get("user_id") or ""),
+            priority=priority,
+            due_at=due,
+            action_type=action_type,
+            property_id=str(row.get("property_id") or ""),
+            status=row.get("status") or OPEN_STATUS,
+            reason=reason,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "id": self.item_id,
+            "assignee": self.assignee,
+            "priority": self.priority,
+            "due_at": self.due_at.isoformat() if self.due_at else None,
+            "action_type": self.action_type,
+            "property_id": self.property_id,
+            "reason": self.reason,
+        }
+
+
+class WorkQueueScheduler:
+    """Per-assignee priority heaps over open lead actions and seller follow-ups.
+
+    Ordering matches the lead action queue screens: priority descending,
+    then next action date ascending with undated items last. Writes are
+    applied as deltas (``upsert`` / ``remove``) with lazy deletion, so each
+    change and each popped entry costs O(log n); ``next_for`` pops the top N
+    live entries and pushes them back instead of sorting the queue.
+    """
+
+    def __init__(self) -> None:
+        self._heaps: dict[str, list[list[Any]]] = {}
+        self._live: dict[tuple[str, str], list[Any]] = {}
+        self._stale: dict[str, int] = {}
+        self._seq = count()
+        self._lock = threading.Lock()
+        self._deltas_applied = 0
+        self._loaded_at: str | None = None
+
+    def _entry(self, item: WorkItem) -> list[Any]:
+        due = item.due_at.timestamp() if item.due_at else float("inf")
+        return [-item.priority, due, next(self._seq), item]
+
+    def load(self, items: Iterable[WorkItem]) -> int:
+        """Replace all heaps with ``items`` (only OPEN ones are kept)."""
+        heaps: dict[str, list[list[Any]]] = {}
+        live: dict[tuple[str, str], list[Any]] = {}
+        for item in items:
+            if item.status != OPEN_STATUS:
+                continue
+            entry = self._entry(item)
+            heaps.setdefault(item.assignee, []).append(entry)
+            live[item.key] = entry
+        for heap in heaps.values():
+            heapq.heapify(heap)
+        with self._lock:
+            self._heaps, self._live, self._stale = heaps, live, {}
+            self._loaded_at = datetime.utcnow().isoformat()
+        return len(live)
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        entry = self._live.pop(key, None)
+        if entry is None:
+            return
+        assignee = entry[3].assignee
+        self._stale[assignee] = self._stale.get(assignee, 0) + 1
+        heap = self._heaps.get(assignee, [])
+        # Rebuild once dead entries outnumber live ones to bound heap growth.
+        if self._stale[assignee] > len(heap) // 2:
+            self._heaps[assignee] = [e for e in heap if self._live.get(e[3].key) is e]
+            heapq.heapify(self._heaps[assignee])
+            self._stale[assignee] = 0
+
+    def upsert(self, item: WorkItem) -> None:
+        """Apply an insert/update; items no longer OPEN leave the queue."""
+        with self._lock:
+            self._deltas_applied += 1
+            self._discard(item.key)
+            if item.status != OPEN_STATUS:
+                return
+            entry = self._entry(item)
+            self._live[item.key] = entry
+            heapq.heappush(self._heaps.setdefault(item.assignee, []), entry)
+
+    def remove(self, source: str, item_id: str) -> None:
+        with self._lock:
+            self._deltas_applied += 1
+            self._discard((source, str(item_id)))
+
+    def next_for(self, assignee: str, n: int = 10) -> list[WorkItem]:
+        """Top ``n`` open items for one assignee without disturbing the queue."""
+        with self._lock:
+            heap = self._heaps.get(assignee, [])
+            taken: list[list[Any]] = []
+            while heap and len(taken) < n:
+                entry = heapq.heappop(heap)
+                if self._live.get(entry[3].key) is entry:
+                    taken.append(entry)
+                else:
+                    self._stale[assignee] = max(self._stale.get(assignee, 0) - 1, 0)
+            for entry in taken:
+                heapq.heappush(heap, entry)
+            return [entry[3] for entry in taken]
+
+    def depth(self, assignee: str) -> int:
+        with self._lock:
+            return len(self._heaps.get(assignee, [])) - self._stale.get(assignee, 0)
+
+    def get_metrics(self) -> dict[str, Any]:
+        with self._lock:
+            by_assignee = {
+                a: len(h) - self._stale.get(a, 0) for a, h in self._heaps.items()
+                if len(h) - self._stale.get(a, 0) > 0
+            }
+            return {
+                "open_items": len(self._live),
+                "by_assignee": by_assignee,
+                "deltas_applied": self._deltas_applied,
+                "loaded_at": self._loaded_at,
+            }
+
 
 class LeadEngine:
     """Master orchestrator for all 10 Lead Engine sub-systems."""
@@ -351,11 +661,14 @@ __all__ = [
     "CaptureEngine",
     "EnrichmentEngine",
     "QualificationEngine",
+    "Assignee",
     "RoutingEngine",
     "FollowUpEngine",
     "NurtureEngine",
     "ConversionEngine",
     "IntelligenceEngine",
     "AnalyticsEngine",
+    "WorkItem",
+    "WorkQueueScheduler",
     "LeadEngine",
 ]
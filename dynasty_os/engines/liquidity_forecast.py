@@ -0,0 +1,181 @@
+"""Daily cash-position forecaster with reserve-breach detection.
+
+LiquidityEngine.process gives one point-in-time reserve ratio; this module
+projects the cash position for every day of a horizon (180 days by default)
+from scheduled cash events:
+
+* point events — an amount landing on one day (a confirmed commitment
+  being funded, a scheduled allocation, an expected closing);
+* spread events — an amount paid evenly over a date range (a project's
+  remaining budget burned down to its target completion).
+
+All events become a daily net-flow vector through ``bincount`` (points) and
+a difference array (spreads), so a full load is a few NumPy passes. Events
+are grouped by a source key such as ``commitments:<id>``; replacing or
+removing one key subtracts its old contribution and adds the new one, so a
+single commitment change costs O(horizon), not a rebuild.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+DEFAULT_HORIZON_DAYS = 180
+
+
+@dataclass(frozen=True)
+class CashEvent:
+    key: str                      # source row, e.g. "commitments:<uuid>"
+    amount: float                 # + inflow / - outflow
+    on: date
+    until: Optional[date] = None  # set for spread events (inclusive end)
+
+
+class LiquidityForecaster:
+    """Projected end-of-day cash for ``start`` .. ``start + horizon_days``."""
+
+    def __init__(self, start: date, starting_cash: float = 0.0, reserve: float = 0.0,
+                 horizon_days: int = DEFAULT_HORIZON_DAYS) -> None:
+        self.start = start
+        self.horizon_days = horizon_days
+        self.starting_cash = float(starting_cash)
+        self.reserve = float(reserve)
+        self._net = np.zeros(horizon_days + 1)
+        self._events: dict[str, list[CashEvent]] = {}
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    # ─── Event streams → daily flows ────────────────────────────────────────
+
+    def _offsets(self, days: Iterable[date]) -> np.ndarray:
+        stamps = np.array([d.isoformat() for d in days], dtype="datetime64[D]")
+        return (stamps - np.datetime64(self.start.isoformat(), "D")).astype(np.int64)
+
+    def _flows(self, events: list[CashEvent]) -> np.ndarray:
+        """Daily net flow contributed by ``events``. Past dates clip to day 0."""
+        size = self.horizon_days + 1
+        flows = np.zeros(size)
+        if not events:
+            return flows
+        amounts = np.array([e.amount for e in events], dtype=float)
+        first = np.maximum(self._offsets(e.on for e in events), 0)
+        spread = np.array([e.until is not None for e in events])
+
+        points = ~spread & (first <= self.horizon_days)
+        flows += np.bincount(first[points], weights=amounts[points], minlength=size)
+
+        if spread.any():
+            last = self._offsets(e.until or e.on for e in events)[spread]
+            lo = first[spread]
+            hi = np.maximum(last, lo)
+            rate = amounts[spread] / (hi - lo + 1)
+            live = lo <= self.horizon_days
+            diff = np.zeros(size + 1)
+            np.add.at(diff, lo[live], rate[live])
+            np.add.at(diff, np.minimum(hi[live] + 1, size), -rate[live])
+            flows += np.cumsum(diff[:-1])
+        return flows
+
+    def load(self, events: Iterable[CashEvent]) -> int:
+        """Replace every stream with ``events`` in one vectorized pass."""
+        events = list(events)
+        self._events = {}
+        for event in events:
+            self._events.setdefault(event.key, []).append(event)
+        self._net = self._flows(events)
+        return len(self._events)
+
+    def upsert(self, key: str, events: Iterable[CashEvent]) -> None:
+        """Replace one source's events (an empty list removes it)."""
+        events = [e for e in events if e.key == key]
+        old = self._events.pop(key, [])
+        if old:
+            self._net -= self._flows(old)
+        if events:
+            self._events[key] = events
+            self._net += self._flows(events)
+        self.updates += 1
+
+    def remove(self, key: str) -> None:
+        self.upsert(key, [])
+
+    # ─── Projections ────────────────────────────────────────────────────────
+
+    def positions(self) -> np.ndarray:
+        """End-of-day cash position per day (index 0 = ``start``)."""
+        return self.starting_cash + np.cumsum(self._net)
+
+    def _horizon(self, horizon_days: Optional[int]) -> int:
+        return self.horizon_days if horizon_days is None else max(0, min(horizon_days, self.horizon_days))
+
+    def breaches(self, reserve: Optional[float] = None,
+                 horizon_days: Optional[int] = None) -> list[dict[str, Any]]:
+        """Contiguous runs of days below the reserve, within the first ``horizon_days`` days."""
+        reserve = self.reserve if reserve is None else reserve
+        cash = self.positions()[: self._horizon(horizon_days) + 1]
+        below = np.concatenate(([0], (cash < reserve).astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(below))
+        runs = []
+        for lo, hi in zip(edges[::2], edges[1::2]):
+            window = cash[lo:hi]
+            worst = int(lo + np.argmin(window))
+            runs.append({
+                "start": (self.start + timedelta(days=int(lo))).isoformat(),
+                "end": (self.start + timedelta(days=int(hi - 1))).isoformat(),
+                "days": int(hi - lo),
+                "lowest_position": round(float(cash[worst]), 2),
+                "lowest_on": (self.start + timedelta(days=worst)).isoformat(),
+                "max_shortfall": round(float(reserve - cash[worst]), 2),
+            })
+        return runs
+
+    def forecast(self, include_daily: bool = True, reserve: Optional[float] = None,
+                 horizon_days: Optional[int] = None) -> dict[str, Any]:
+        """Summary (and optionally the daily series) over the first ``horizon_days`` days.
+
+        Every field, breach ends included, is computed on the shortened
+        series, so nothing past the requested horizon leaks in.
+        """
+        reserve = self.reserve if reserve is None else reserve
+        horizon = self._horizon(horizon_days)
+        cash = self.positions()[: horizon + 1]
+        breaches = self.breaches(reserve, horizon)
+        result: dict[str, Any] = {
+            "start": self.start.isoformat(),
+            "horizon_days": horizon,
+            "starting_cash": round(self.starting_cash, 2),
+            "reserve": round(reserve, 2),
+            "ending_cash": round(float(cash[-1]), 2),
+            "lowest_position": round(float(cash.min()), 2),
+            "lowest_on": (self.start + timedelta(days=int(cash.argmin()))).isoformat(),
+            "first_breach": breaches[0]["start"] if breaches else None,
+            "breaches": breaches,
+            "liquidity_status": "WARNING" if breaches else "ADEQUATE",
+        }
+        if include_daily:
+            result["daily"] = [
+                {"date": (self.start + timedelta(days=i)).isoformat(),
+                 "net_flow": round(float(flow), 2), "cash": round(float(c), 2)}
+                for i, (flow, c) in enumerate(zip(self._net, cash))
+            ]
+        return result
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "sources": len(self._events),
+            "events": sum(len(v) for v in self._events.values()),
+            "incremental_updates": self.updates,
+            "horizon_days": self.horizon_days,
+        }
+
+
+__all__ = [
+    "CashEvent",
+    "DEFAULT_HORIZON_DAYS",
+    "LiquidityForecaster",
+]
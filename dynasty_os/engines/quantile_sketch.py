@@ -0,0 +1,273 @@
+"""Mergeable streaming quantile sketches for disposition KPIs.
+
+``KLLSketch`` is the Karnin–Lang–Liberty compactor sketch: values land in
+level 0, and a level that reaches its capacity is sorted and every other
+item (random offset) is promoted to the next level with twice the weight.
+Capacities shrink geometrically below the top level, so a sketch holds
+about ``3k`` values however many it has seen, and quantile queries have
+rank error around ``1.7 / k`` (about 1% at the default ``k=200``).
+
+Two sketches merge by concatenating levels and compacting, so per-worker
+sketches (or per-key ones) combine into exactly what one sketch fed every
+value would estimate. Each sketch also keeps the exact count, sum, min and
+max, which covers the running averages the engines used to rescan for.
+
+``KeyedSketches`` keeps one sketch per string key; ``rollup_keys`` names
+the keys an observation lands in so every grouping of its dimensions —
+including the ``*`` totals — can be read without a scan.
+"""
+
+from __future__ import annotations
+import math
+import random
+from itertools import product
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+DEFAULT_K = 200
+CAPACITY_DECAY = 2.0 / 3.0
+MIN_CAPACITY = 2
+KEY_SEPARATOR = "|"
+ALL = "*"
+SUMMARY_QUANTILES = (0.5, 0.9)
+
+
+class KLLSketch:
+    """Streaming quantiles over floats with exact count / sum / min / max."""
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None) -> None:
+        self.k = int(k)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels: list[list[float]] = [[]]
+        self._rng = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(MIN_CAPACITY, int(math.ceil(CAPACITY_DECAY ** depth * self.k)))
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _compress(self) -> None:
+        """Compact the lowest full level; repeat until the sketch fits."""
+        while self._size >= self._max_size:
+            for h, level in enumerate(self._levels):
+                if len(level) >= self._capacity(h):
+                    if h + 1 == len(self._levels):
+                        self._grow()
+                    level.sort()
+                    offset = self._rng.random() < 0.5
+                    # An odd item out stays behind at this level.
+                    keep = level.pop() if len(level) % 2 else None
+                    self._levels[h + 1].extend(level[offset::2])
+                    level.clear()
+                    if keep is not None:
+                        level.append(keep)
+                    break
+            else:
+                return
+            self._size = sum(len(level) for level in self._levels)
+
+    # ─── Updates ────────────────────────────────────────────────────────────
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._levels[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold ``other`` into this sketch (``other`` is left unchanged)."""
+        if not other.count:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for h, level in enumerate(other._levels):
+            self._levels[h].extend(level)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._size = sum(len(level) for level in self._levels)
+        self._compress()
+        return self
+
+    # ─── Queries ────────────────────────────────────────────────────────────
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate([np.asarray(level, dtype=float) for level in self._levels])
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=float) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs: Iterable[float]) -> list[Optional[float]]:
+        """Estimated values at each quantile in ``qs`` (0 and 1 are the exact min and max)."""
+        qs = list(qs)
+        if not self.count:
+            return [None] * len(qs)
+        items, cumulative = self._weighted()
+        out: list[Optional[float]] = []
+        for q in qs:
+            if q <= 0:
+                out.append(self.min)
+            elif q >= 1:
+                out.append(self.max)
+            else:
+                i = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+                out.append(float(items[min(i, len(items) - 1)]))
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def rank(self, value: float) -> float:
+        """Estimated fraction of values <= ``value``."""
+        if not self.count:
+            return 0.0
+        items, cumulative = self._weighted()
+        i = int(np.searchsorted(items, value, side="right"))
+        return float(cumulative[i - 1] / cumulative[-1]) if i else 0.0
+
+    def summary(self, qs: Iterable[float] = SUMMARY_QUANTILES, digits: int = 4) -> dict[str, Any]:
+        """Count, mean, min, max and ``p<q>`` entries (e.g. ``p50``, ``p90``)."""
+        qs = list(qs)
+
+        def fmt(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, digits)
+
+        out: dict[str, Any] = {
+            "count": self.count,
+            "mean": fmt(self.mean),
+            "min": fmt(self.min) if self.count else None,
+            "max": fmt(self.max) if self.count else None,
+        }
+        for q, value in zip(qs, self.quantiles(qs)):
+            out[f"p{round(q * 100):g}"] = fmt(value)
+        return out
+
+    # ─── Serialization ──────────────────────────────────────────────────────
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "levels": [list(level) for level in self._levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], seed: Optional[int] = None) -> "KLLSketch":
+        sketch = cls(k=data.get("k", DEFAULT_K), seed=seed)
+        sketch.count = int(data.get("count", 0))
+        sketch.total = float(data.get("sum", 0.0))
+        if sketch.count:
+            sketch.min = float(data["min"])
+            sketch.max = float(data["max"])
+        sketch._levels = [[float(v) for v in level] for level in data.get("levels") or [[]]]
+        sketch._size = sum(len(level) for level in sketch._levels)
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch._levels)))
+        sketch._compress()
+        return sketch
+
+
+class KeyedSketches:
+    """One KLLSketch per key, created on first use."""
+
+    def __init__(self, k: int = DEFAULT_K) -> None:
+        self.k = k
+        self._sketches: dict[str, KLLSketch] = {}
+
+    def __len__(self) -> int:
+        return len(self._sketches)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sketches
+
+    def keys(self) -> list[str]:
+        return sorted(self._sketches)
+
+    def get(self, key: str) -> Optional[KLLSketch]:
+        return self._sketches.get(key)
+
+    def add(self, key: str, value: float) -> None:
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = KLLSketch(self.k)
+        sketch.add(value)
+
+    def merge(self, other: "KeyedSketches") -> "KeyedSketches":
+        for key, sketch in other._sketches.items():
+            mine = self._sketches.get(key)
+            if mine is None:
+                mine = self._sketches[key] = KLLSketch(sketch.k)
+            mine.merge(sketch)
+        return self
+
+    def summary(self, key: str, qs: Iterable[float] = SUMMARY_QUANTILES) -> Optional[dict[str, Any]]:
+        sketch = self._sketches.get(key)
+        return sketch.summary(qs) if sketch is not None else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: sketch.to_dict() for key, sketch in self._sketches.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], k: int = DEFAULT_K) -> "KeyedSketches":
+        keyed = cls(k)
+        keyed._sketches = {key: KLLSketch.from_dict(value) for key, value in data.items()}
+        return keyed
+
+
+def sketch_key(metric: str, *groups: Optional[str]) -> str:
+    return KEY_SEPARATOR.join((metric, *((g or ALL).replace(KEY_SEPARATOR, "/") for g in groups)))
+
+
+def split_key(key: str) -> tuple[str, ...]:
+    return tuple(key.split(KEY_SEPARATOR))
+
+
+def rollup_keys(metric: str, *groups: Optional[str]) -> list[str]:
+    """Every key one observation updates: each group either kept or rolled up to ``*``.
+
+    ``rollup_keys("dom", "Flip", "Austin, TX")`` gives ``dom|Flip|Austin, TX``,
+    ``dom|Flip|*``, ``dom|*|Austin, TX`` and ``dom|*|*``.
+    """
+    options = [(g, None) if g else (None,) for g in groups]
+    return list(dict.fromkeys(sketch_key(metric, *combo) for combo in product(*options)))
+
+
+__all__ = [
+    "ALL",
+    "DEFAULT_K",
+    "KLLSketch",
+    "KeyedSketches",
+    "rollup_keys",
+    "sketch_key",
+    "split_key",
+]
@@ -0,0 +1,157 @@
+"""Distribution waterfall for whole-fund distribution runs.
+
+Evaluates every investor × deal position of a distribution run at once.
+Each deal's distributable cash flows through the tiers in order:
+
+1. Return of capital — pro rata to contributed capital.
+2. Preferred return — ``capital × pref rate × years held`` per position,
+   paid pro rata to the amount each position is owed.
+3. GP catch-up (optional) — ``catch_up`` of every dollar goes to the GP
+   until the GP holds the first profit tier's GP share of all profit paid
+   so far.
+4. Profit tiers — each tier splits cash ``lp_split`` / ``1 - lp_split``
+   until LP profit reaches ``hurdle × capital × years``; the last tier has
+   no hurdle and takes the residual.
+
+Deal-level tier amounts are computed as arrays over deals; LP amounts are
+then spread over positions with ``bincount`` gathers, so a run costs a few
+NumPy passes regardless of how many investors and deals it spans.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+
+ArrayLike = Any
+
+
+@dataclass(frozen=True)
+class WaterfallTier:
+    lp_split: float                  # LP share of cash in this tier
+    hurdle: Optional[float] = None   # annual LP profit rate on capital that ends the tier; None = residual
+
+
+@dataclass(frozen=True)
+class WaterfallTerms:
+    preferred_return: float = 0.08   # default annual pref where a position has none of its own
+    catch_up: float = 0.0            # GP share of cash in the catch-up tier (0 disables it)
+    tiers: tuple[WaterfallTier, ...] = field(default_factory=lambda: (WaterfallTier(lp_split=0.70),))
+
+    def validate(self) -> None:
+        if not self.tiers or self.tiers[-1].hurdle is not None:
+            raise ValueError("the last waterfall tier must have no hurdle")
+        for tier in self.tiers:
+            if not 0 < tier.lp_split <= 1:
+                raise ValueError("tier lp_split must be in (0, 1]")
+        hurdles = [t.hurdle for t in self.tiers[:-1]]
+        if any(h is None for h in hurdles) or hurdles != sorted(hurdles):
+            raise ValueError("tier hurdles must be set and ascending")
+        if self.catch_up and self.catch_up <= 1 - self.tiers[0].lp_split:
+            raise ValueError("catch_up must exceed the first tier's GP share")
+
+
+@dataclass
+class WaterfallResult:
+    """Per-position LP amounts and per-deal totals, aligned with the inputs."""
+    return_of_capital: np.ndarray    # (P,)
+    preferred_return: np.ndarray     # (P,)
+    profit_share: np.ndarray         # (P,) LP catch-up remainder + tier splits
+    gp_catch_up: np.ndarray          # (D,)
+    gp_carry: np.ndarray             # (D,) GP share of the profit tiers
+
+    @property
+    def lp_total(self) -> np.ndarray:
+        return self.return_of_capital + self.preferred_return + self.profit_share
+
+    @property
+    def gp_total(self) -> np.ndarray:
+        return self.gp_catch_up + self.gp_carry
+
+
+def _vector(value: ArrayLike, n: int) -> np.ndarray:
+    arr = np.asarray(value, dtype=float)
+    return np.broadcast_to(arr, (n,)).astype(float) if arr.ndim == 0 else arr.astype(float)
+
+
+def _share(total: np.ndarray, weights: np.ndarray, deal_index: np.ndarray, n_deals: int) -> np.ndarray:
+    """Split each deal's ``total`` over its positions in proportion to ``weights``."""
+    per_deal = np.bincount(deal_index, weights=weights, minlength=n_deals)
+    safe = np.where(per_deal > 0, per_deal, 1.0)
+    return total[deal_index] * weights / safe[deal_index]
+
+
+def run_waterfall(
+    distributable: ArrayLike,
+    deal_index: ArrayLike,
+    capital: ArrayLike,
+    terms: WaterfallTerms = WaterfallTerms(),
+    preferred_return: ArrayLike = None,
+    years: ArrayLike = 1.0,
+) -> WaterfallResult:
+    """Run the waterfall for D deals and P LP positions.
+
+    ``distributable`` is cash per deal (D,); ``deal_index`` maps each
+    position to its deal (P,); ``capital``, ``preferred_return`` and
+    ``years`` are per position and broadcast from scalars.
+    """
+    terms.validate()
+    cash = np.maximum(np.asarray(distributable, dtype=float), 0.0)
+    n_deals = len(cash)
+    deal_index = np.asarray(deal_index, dtype=np.int64)
+    n = len(deal_index)
+    capital = _vector(capital, n)
+    pref_rate = _vector(terms.preferred_return if preferred_return is None else preferred_return, n)
+    years = np.maximum(_vector(years, n), 0.0)
+
+    deal_capital = np.bincount(deal_index, weights=capital, minlength=n_deals)
+    owed = capital * pref_rate * years
+    deal_owed = np.bincount(deal_index, weights=owed, minlength=n_deals)
+    hurdle_base = np.bincount(deal_index, weights=capital * years, minlength=n_deals)
+
+    roc = np.minimum(cash, deal_capital)
+    cash = cash - roc
+    pref = np.minimum(cash, deal_owed)
+    cash = cash - pref
+    lp_profit = pref.copy()
+    lp_split_cash = np.zeros(n_deals)
+
+    gp_catch_up = np.zeros(n_deals)
+    if terms.catch_up:
+        gp_share = 1 - terms.tiers[0].lp_split
+        needed = gp_share * pref / (terms.catch_up - gp_share)
+        tier_cash = np.minimum(cash, needed)
+        gp_catch_up = terms.catch_up * tier_cash
+        lp_split_cash += tier_cash - gp_catch_up
+        lp_profit += tier_cash - gp_catch_up
+        cash = cash - tier_cash
+
+    gp_carry = np.zeros(n_deals)
+    for tier in terms.tiers:
+        if tier.hurdle is None:
+            tier_cash = cash
+        else:
+            needed = np.maximum(tier.hurdle * hurdle_base - lp_profit, 0.0) / tier.lp_split
+            tier_cash = np.minimum(cash, needed)
+        lp_part = tier.lp_split * tier_cash
+        lp_split_cash += lp_part
+        lp_profit += lp_part
+        gp_carry += tier_cash - lp_part
+        cash = cash - tier_cash
+
+    return WaterfallResult(
+        return_of_capital=_share(roc, capital, deal_index, n_deals),
+        preferred_return=_share(pref, owed, deal_index, n_deals),
+        profit_share=_share(lp_split_cash, capital, deal_index, n_deals),
+        gp_catch_up=gp_catch_up,
+        gp_carry=gp_carry,
+    )
+
+
+__all__ = [
+    "WaterfallResult",
+    "WaterfallTerms",
+    "WaterfallTier",
+    "run_waterfall",
+]
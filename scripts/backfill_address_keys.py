@@ -0,0 +1,106 @@
+"""Fill address_normalized / address_hash on rows written before migration 013.
+
+The API sets both columns on insert; this walks properties and the
+property-intelligence tables for rows where they are still NULL. Safe to
+re-run. ``--all`` recomputes every row instead, and ``--leads`` recomputes
+``leads.import_key``; run both once whenever the normalized key format
+changes (keys written before it included the ZIP or city/state would
+otherwise never match new ones). Reads SUPABASE_URL / SUPABASE_SERVICE_KEY
+from the environment (or backend/.env).
+
+Usage:
+    python scripts/backfill_address_keys.py
+    python scripts/backfill_address_keys.py --source property_tax --page-size 500
+    python scripts/backfill_address_keys.py --all --leads
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from dotenv import load_dotenv  # noqa: E402
+
+from app.address_index import address_hash, normalize_address  # noqa: E402
+from app.api.property import ADDRESS_SOURCES  # noqa: E402
+from app.db import get_supabase  # noqa: E402
+from app.lead_import import import_key  # noqa: E402
+
+
+def backfill(db, source: str, page_size: int, recompute: bool = False) -> dict:
+    id_col = ADDRESS_SOURCES[source]
+    updated = skipped = 0
+    last_id = None
+    while True:
+        q = db.table(source).select(f"{id_col}, address")
+        if not recompute:
+            q = q.is_("address_normalized", "null")
+        if last_id is not None:
+            q = q.gt(id_col, last_id)
+        rows = q.order(id_col).limit(page_size).execute().data or []
+        if not rows:
+            break
+        for row in rows:
+            key = normalize_address(row.get("address"))
+            if not key:
+                skipped += 1
+                continue
+            db.table(source).update({"address_normalized": key, "address_hash": address_hash(key)}) \
+                .eq(id_col, row[id_col]).execute()
+            updated += 1
+        last_id = rows[-1][id_col]
+    return {"updated": updated, "skipped_blank": skipped}
+
+
+def backfill_import_keys(db, page_size: int) -> dict:
+    """Recompute leads.import_key for imported leads; clashes are reported, not merged."""
+    updated = conflicts = 0
+    last_id = None
+    while True:
+        q = db.table("leads").select("lead_id, lead_type, metadata, import_key") \
+            .not_.is_("import_key", "null")
+        if last_id is not None:
+            q = q.gt("lead_id", last_id)
+        rows = q.order("lead_id").limit(page_size).execute().data or []
+        if not rows:
+            break
+        for row in rows:
+            key = import_key(row["lead_type"], row.get("metadata") or {})
+            if key == row["import_key"]:
+                continue
+            try:
+                db.table("leads").update({"import_key": key}).eq("lead_id", row["lead_id"]).execute()
+            except Exception as exc:  # noqa: BLE001 - unique clash with an existing lead
+                conflicts += 1
+                print(f"lead {row['lead_id']}: import_key not updated: {exc}", file=sys.stderr)
+                continue
+            updated += 1
+        last_id = rows[-1]["lead_id"]
+    return {"updated": updated, "conflicts": conflicts}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backfill normalized address keys.")
+    parser.add_argument("--source", choices=list(ADDRESS_SOURCES), action="append",
+                        help="Table to backfill (repeatable); defaults to all")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--all", action="store_true",
+                        help="Recompute keys on every row, not only rows where they are NULL")
+    parser.add_argument("--leads", action="store_true", help="Also recompute leads.import_key")
+    args = parser.parse_args()
+
+    load_dotenv(BACKEND_DIR / ".env")
+    db = get_supabase()
+    report = {source: backfill(db, source, args.page_size, recompute=args.all)
+              for source in args.source or ADDRESS_SOURCES}
+    if args.leads:
+        report["leads"] = backfill_import_keys(db, args.page_size)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
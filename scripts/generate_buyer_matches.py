@@ -0,0 +1,44 @@
+"""Generate dynasty.buyer_matches for open deals against active buyer profiles.
+
+Runs the same job as POST /api/disposition/buyer-matches/generate and prints
+its report as JSON. Reads SUPABASE_URL / SUPABASE_SERVICE_KEY from the
+environment (or backend/.env).
+
+Usage:
+    python scripts/generate_buyer_matches.py
+    python scripts/generate_buyer_matches.py --deal <deal_id> --deal <deal_id>
+    python scripts/generate_buyer_matches.py --buyer-profile <buyer_profile_id> --dry-run
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from dotenv import load_dotenv  # noqa: E402
+
+from app.buyer_match_job import BuyerMatchJob  # noqa: E402
+from app.db import get_supabase  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate buyer matches for open deals.")
+    parser.add_argument("--deal", action="append", dest="deal_ids", help="Only re-score this deal (repeatable)")
+    parser.add_argument("--buyer-profile", action="append", dest="buyer_profile_ids",
+                        help="Only re-score this buyer profile (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Score and diff without writing")
+    args = parser.parse_args()
+
+    load_dotenv(BACKEND_DIR / ".env")
+    job = BuyerMatchJob(get_supabase(), batch_size=args.batch_size, dry_run=args.dry_run)
+    report = job.run(deal_ids=args.deal_ids, buyer_profile_ids=args.buyer_profile_ids)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
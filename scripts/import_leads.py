@@ -0,0 +1,52 @@
+"""Bulk-import leads from a CSV or NDJSON export straight into Supabase.
+
+Uses the same validation, batching and dedupe as POST /api/leads/import and
+prints the import report as JSON. Reads SUPABASE_URL / SUPABASE_SERVICE_KEY
+from the environment (or backend/.env).
+
+Usage:
+    python scripts/import_leads.py leads.csv --lead-type Seller --source "Direct Mail"
+    python scripts/import_leads.py leads.ndjson --format ndjson
+    cat leads.csv | python scripts/import_leads.py -
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from dotenv import load_dotenv  # noqa: E402
+
+from app.db import get_supabase  # noqa: E402
+from app.lead_import import IMPORT_FORMATS, LeadImporter  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import leads from CSV or NDJSON.")
+    parser.add_argument("path", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults from the file extension (csv)")
+    parser.add_argument("--lead-type", help="Lead type for rows that omit one")
+    parser.add_argument("--source", help="Source for rows that omit one")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    load_dotenv(BACKEND_DIR / ".env")
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    importer = LeadImporter(get_supabase(), batch_size=args.batch_size,
+                            default_lead_type=args.lead_type, default_source=args.source)
+
+    if args.path == "-":
+        report = importer.run(sys.stdin, fmt)
+    else:
+        with open(args.path, newline="", encoding="utf-8-sig") as handle:
+            report = importer.run(handle, fmt)
+
+    print(json.dumps(report, indent=2))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
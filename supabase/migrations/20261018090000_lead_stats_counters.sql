@@ -0,0 +1,125 @@
+-- Migration: 009_lead_stats_counters.sql
+-- /api/leads/stats used to page every row of leads and lead_scoring through
+-- PostgREST and count in Python. Counts now live in lead_stats_counters,
+-- kept current by row triggers, and lead_stats() returns them as one JSON
+-- document. lead_stats_grouped is the from-scratch equivalent used to
+-- (re)build the counters.
+
+CREATE TABLE IF NOT EXISTS lead_stats_counters (
+    dimension   TEXT NOT NULL CHECK (dimension IN ('total','status','grade')),
+    bucket      TEXT NOT NULL,
+    lead_count  BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, bucket)
+);
+
+-- Grouped counts straight from the base tables (null status -> 'Unknown',
+-- null grade -> 'D', matching the API's defaults).
+CREATE OR REPLACE VIEW lead_stats_grouped AS
+    SELECT 'total'::TEXT AS dimension, ''::TEXT AS bucket, count(*)::BIGINT AS lead_count
+      FROM leads
+    UNION ALL
+    SELECT 'status', COALESCE(status, 'Unknown'), count(*)
+      FROM leads
+     GROUP BY COALESCE(status, 'Unknown')
+    UNION ALL
+    SELECT 'grade', COALESCE(grade, 'D'), count(*)
+      FROM lead_scoring
+     GROUP BY COALESCE(grade, 'D');
+
+CREATE OR REPLACE FUNCTION bump_lead_stat(p_dimension TEXT, p_bucket TEXT, p_delta BIGINT)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO lead_stats_counters (dimension, bucket, lead_count)
+    VALUES (p_dimension, p_bucket, p_delta)
+    ON CONFLICT (dimension, bucket)
+    DO UPDATE SET lead_count = lead_stats_counters.lead_count + EXCLUDED.lead_count;
+$$;
+
+CREATE OR REPLACE FUNCTION leads_stats_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_lead_stat('status', COALESCE(OLD.status, 'Unknown'), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_lead_stat('status', COALESCE(NEW.status, 'Unknown'), 1);
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_lead_stat('total', '', 1);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_lead_stat('total', '', -1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION lead_scoring_stats_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_lead_stat('grade', COALESCE(OLD.grade, 'D'), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_lead_stat('grade', COALESCE(NEW.grade, 'D'), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_leads_stats_insert_delete ON leads;
+CREATE TRIGGER trg_leads_stats_insert_delete
+    AFTER INSERT OR DELETE ON leads
+    FOR EACH ROW EXECUTE FUNCTION leads_stats_trigger();
+
+DROP TRIGGER IF EXISTS trg_leads_stats_status ON leads;
+CREATE TRIGGER trg_leads_stats_status
+    AFTER UPDATE OF status ON leads
+    FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION leads_stats_trigger();
+
+DROP TRIGGER IF EXISTS trg_lead_scoring_stats_insert_delete ON lead_scoring;
+CREATE TRIGGER trg_lead_scoring_stats_insert_delete
+    AFTER INSERT OR DELETE ON lead_scoring
+    FOR EACH ROW EXECUTE FUNCTION lead_scoring_stats_trigger();
+
+DROP TRIGGER IF EXISTS trg_lead_scoring_stats_grade ON lead_scoring;
+CREATE TRIGGER trg_lead_scoring_stats_grade
+    AFTER UPDATE OF grade ON lead_scoring
+    FOR EACH ROW WHEN (OLD.grade IS DISTINCT FROM NEW.grade)
+    EXECUTE FUNCTION lead_scoring_stats_trigger();
+
+-- Recompute every counter from the base tables (run once below, and again
+-- if the counters are ever suspected of drifting).
+CREATE OR REPLACE FUNCTION rebuild_lead_stats()
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    LOCK TABLE lead_stats_counters IN EXCLUSIVE MODE;
+    DELETE FROM lead_stats_counters;
+    INSERT INTO lead_stats_counters (dimension, bucket, lead_count)
+    SELECT dimension, bucket, lead_count FROM lead_stats_grouped;
+END;
+$$;
+
+-- Same shape as the /api/leads/stats response.
+CREATE OR REPLACE FUNCTION lead_stats()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'total', COALESCE((SELECT lead_count FROM lead_stats_counters WHERE dimension = 'total'), 0),
+        'by_status', COALESCE((SELECT jsonb_object_agg(bucket, lead_count) FROM lead_stats_counters
+                               WHERE dimension = 'status' AND lead_count > 0), '{}'::jsonb),
+        'by_grade', COALESCE((SELECT jsonb_object_agg(bucket, lead_count) FROM lead_stats_counters
+                              WHERE dimension = 'grade' AND lead_count > 0), '{}'::jsonb)
+    );
+$$;
+
+SELECT rebuild_lead_stats();
@@ -0,0 +1,21 @@
+-- Migration: 010_leads_grade_keyset.sql
+-- GET /api/leads filtered grade after PostgREST had already paginated, so
+-- a page of 50 could come back with a handful of rows. The current grade is
+-- now denormalized onto leads (written by POST /api/leads/{id}/score) and
+-- listing pages by keyset on (date_created, lead_id) instead of OFFSET.
+
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS grade TEXT CHECK (grade IN ('A','B','C','D'));
+
+-- Backfill from the most recent score per lead.
+UPDATE leads l
+   SET grade = s.grade
+  FROM (
+        SELECT DISTINCT ON (lead_id) lead_id, grade
+          FROM lead_scoring
+         ORDER BY lead_id, scored_at DESC
+       ) s
+ WHERE s.lead_id = l.lead_id
+   AND l.grade IS DISTINCT FROM s.grade;
+
+CREATE INDEX IF NOT EXISTS idx_leads_created_keyset ON leads (date_created DESC, lead_id DESC);
+CREATE INDEX IF NOT EXISTS idx_leads_grade_keyset   ON leads (grade, date_created DESC, lead_id DESC);
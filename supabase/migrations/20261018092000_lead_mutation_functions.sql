@@ -0,0 +1,127 @@
+-- Migration: 011_lead_mutation_functions.sql
+-- score/route/update in /api/leads each took 3-4 sequential PostgREST round
+-- trips, and a failure partway through left partial writes (e.g. a score
+-- with no activity entry). Each mutation is now one transactional function
+-- called via RPC. The lead row is locked first so concurrent calls for the
+-- same lead serialize; a missing lead raises P0002 (mapped to 404).
+
+CREATE OR REPLACE FUNCTION score_lead_tx(
+    p_lead_id                  UUID,
+    p_motivation_score         INT,
+    p_equity_score             INT,
+    p_condition_score          INT,
+    p_timeline_score           INT,
+    p_price_expectation_score  INT,
+    p_total_score              INT,
+    p_grade                    TEXT,
+    p_activity_description     TEXT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_scoring_id UUID;
+BEGIN
+    PERFORM 1 FROM leads WHERE lead_id = p_lead_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Lead % not found', p_lead_id USING ERRCODE = 'P0002';
+    END IF;
+
+    SELECT scoring_id INTO v_scoring_id
+      FROM lead_scoring
+     WHERE lead_id = p_lead_id
+     ORDER BY scored_at DESC
+     LIMIT 1;
+
+    IF v_scoring_id IS NULL THEN
+        INSERT INTO lead_scoring (
+            lead_id, motivation_score, equity_score, condition_score,
+            timeline_score, price_expectation_score, total_score, grade
+        ) VALUES (
+            p_lead_id, p_motivation_score, p_equity_score, p_condition_score,
+            p_timeline_score, p_price_expectation_score, p_total_score, p_grade
+        );
+    ELSE
+        UPDATE lead_scoring
+           SET motivation_score        = p_motivation_score,
+               equity_score            = p_equity_score,
+               condition_score         = p_condition_score,
+               timeline_score          = p_timeline_score,
+               price_expectation_score = p_price_expectation_score,
+               total_score             = p_total_score,
+               grade                   = p_grade
+         WHERE scoring_id = v_scoring_id;
+    END IF;
+
+    UPDATE leads SET score = p_total_score, grade = p_grade WHERE lead_id = p_lead_id;
+
+    INSERT INTO lead_activities (lead_id, activity_type, description)
+    VALUES (p_lead_id, 'Scored', p_activity_description);
+
+    RETURN jsonb_build_object('lead_id', p_lead_id, 'total_score', p_total_score, 'grade', p_grade);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION route_lead_tx(
+    p_lead_id               UUID,
+    p_routed_to             TEXT,
+    p_reason                TEXT,
+    p_activity_description  TEXT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_routing lead_routing;
+BEGIN
+    UPDATE leads SET owner = p_routed_to WHERE lead_id = p_lead_id;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Lead % not found', p_lead_id USING ERRCODE = 'P0002';
+    END IF;
+
+    INSERT INTO lead_routing (lead_id, routed_to, reason)
+    VALUES (p_lead_id, p_routed_to, p_reason)
+    RETURNING * INTO v_routing;
+
+    INSERT INTO lead_activities (lead_id, activity_type, description)
+    VALUES (p_lead_id, 'Routed', p_activity_description);
+
+    RETURN to_jsonb(v_routing);
+END;
+$$;
+
+-- p_updates carries only the fields being changed (the API drops nulls).
+CREATE OR REPLACE FUNCTION update_lead_tx(
+    p_lead_id               UUID,
+    p_updates               JSONB,
+    p_activity_description  TEXT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_lead leads;
+BEGIN
+    UPDATE leads SET
+        lead_type        = CASE WHEN p_updates ? 'lead_type'        THEN p_updates->>'lead_type'                ELSE lead_type END,
+        source           = CASE WHEN p_updates ? 'source'           THEN p_updates->>'source'                   ELSE source END,
+        status           = CASE WHEN p_updates ? 'status'           THEN p_updates->>'status'                   ELSE status END,
+        score            = CASE WHEN p_updates ? 'score'            THEN (p_updates->>'score')::INT             ELSE score END,
+        owner            = CASE WHEN p_updates ? 'owner'            THEN p_updates->>'owner'                    ELSE owner END,
+        pipeline_stage   = CASE WHEN p_updates ? 'pipeline_stage'   THEN p_updates->>'pipeline_stage'           ELSE pipeline_stage END,
+        notes            = CASE WHEN p_updates ? 'notes'            THEN p_updates->>'notes'                    ELSE notes END,
+        next_action_date = CASE WHEN p_updates ? 'next_action_date' THEN (p_updates->>'next_action_date')::DATE ELSE next_action_date END,
+        metadata         = CASE WHEN p_updates ? 'metadata'         THEN p_updates->'metadata'                  ELSE metadata END
+    WHERE lead_id = p_lead_id
+    RETURNING * INTO v_lead;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Lead % not found', p_lead_id USING ERRCODE = 'P0002';
+    END IF;
+
+    INSERT INTO lead_activities (lead_id, activity_type, description)
+    VALUES (p_lead_id, 'Updated', p_activity_description);
+
+    RETURN to_jsonb(v_lead);
+END;
+$$;
@@ -0,0 +1,10 @@
+-- Migration: 012_leads_import_key.sql
+-- Bulk lead import (POST /api/leads/import, scripts/import_leads.py) tags
+-- each row that has an address/phone/email with a hash of those fields and
+-- upserts with ON CONFLICT (import_key) DO NOTHING, so re-running an export
+-- does not duplicate leads. Rows without identifying fields keep NULL and
+-- are never treated as duplicates.
+
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS import_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS leads_import_key_key ON leads (import_key);
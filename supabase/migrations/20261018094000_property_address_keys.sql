@@ -0,0 +1,72 @@
+-- Migration: 013_property_address_keys.sql
+-- properties and the property-intelligence tables are keyed by free-text
+-- address, and /api/property?address= ran an unindexable ILIKE '%x%' scan.
+-- The API now writes a canonical address_normalized (USPS-style suffixes,
+-- directionals and units, see backend/app/address_index.py) and its
+-- address_hash on every insert:
+--   * address_hash gets a hash index for O(1) exact dedupe lookups;
+--   * address_normalized gets a pg_trgm GIN index, which serves both the
+--     ILIKE filter and ranked fuzzy matching via match_address().
+-- Existing rows are filled by scripts/backfill_address_keys.py.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE properties         ADD COLUMN IF NOT EXISTS address_normalized TEXT;
+ALTER TABLE properties         ADD COLUMN IF NOT EXISTS address_hash TEXT;
+ALTER TABLE property_vacancy   ADD COLUMN IF NOT EXISTS address_normalized TEXT;
+ALTER TABLE property_vacancy   ADD COLUMN IF NOT EXISTS address_hash TEXT;
+ALTER TABLE property_tax       ADD COLUMN IF NOT EXISTS address_normalized TEXT;
+ALTER TABLE property_tax       ADD COLUMN IF NOT EXISTS address_hash TEXT;
+ALTER TABLE property_ownership ADD COLUMN IF NOT EXISTS address_normalized TEXT;
+ALTER TABLE property_ownership ADD COLUMN IF NOT EXISTS address_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_properties_address_hash ON properties USING hash (address_hash);
+CREATE INDEX IF NOT EXISTS idx_property_vacancy_address_hash ON property_vacancy USING hash (address_hash);
+CREATE INDEX IF NOT EXISTS idx_property_tax_address_hash ON property_tax USING hash (address_hash);
+CREATE INDEX IF NOT EXISTS idx_property_ownership_address_hash ON property_ownership USING hash (address_hash);
+
+CREATE INDEX IF NOT EXISTS idx_properties_address_trgm
+    ON properties USING gin (address_normalized gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_property_vacancy_address_trgm
+    ON property_vacancy USING gin (address_normalized gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_property_tax_address_trgm
+    ON property_tax USING gin (address_normalized gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_property_ownership_address_trgm
+    ON property_ownership USING gin (address_normalized gin_trgm_ops);
+
+-- Ranked fuzzy candidates for an already-normalized query. p_source is
+-- whitelisted (the table name is interpolated) and mapped to its key column.
+CREATE OR REPLACE FUNCTION match_address(
+    p_source    TEXT,
+    p_query     TEXT,
+    p_limit     INT DEFAULT 10,
+    p_min_score REAL DEFAULT 0.3
+)
+RETURNS TABLE (record_id UUID, address TEXT, address_normalized TEXT, score REAL)
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_key TEXT;
+BEGIN
+    v_key := CASE p_source
+        WHEN 'properties'         THEN 'id'
+        WHEN 'property_vacancy'   THEN 'vacancy_id'
+        WHEN 'property_tax'       THEN 'tax_id'
+        WHEN 'property_ownership' THEN 'ownership_id'
+    END;
+    IF v_key IS NULL THEN
+        RAISE EXCEPTION 'Unknown address source %', p_source USING ERRCODE = '22023';
+    END IF;
+
+    PERFORM set_config('pg_trgm.similarity_threshold', p_min_score::TEXT, true);
+    RETURN QUERY EXECUTE format(
+        'SELECT %I, address, address_normalized, similarity(address_normalized, $1)
+           FROM %I
+          WHERE address_normalized %% $1
+          ORDER BY similarity(address_normalized, $1) DESC
+          LIMIT $2',
+        v_key, p_source
+    ) USING p_query, p_limit;
+END;
+$$;
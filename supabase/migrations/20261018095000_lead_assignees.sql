@@ -0,0 +1,28 @@
+-- Migration: 014_lead_assignees.sql
+-- Workload-aware routing (POST /api/leads/auto-route). lead_assignees lists
+-- the reps the router may pick, how many open leads each can carry, and the
+-- grades / lead types they take (NULL or empty = any). lead_assignee_load
+-- gives each owner's current open-lead count in one grouped read, which
+-- seeds the router's in-process load heaps.
+
+CREATE TABLE IF NOT EXISTS lead_assignees (
+    assignee    TEXT PRIMARY KEY,
+    capacity    INT NOT NULL CHECK (capacity >= 0),
+    grades      TEXT[] DEFAULT '{}',
+    lead_types  TEXT[] DEFAULT '{}',
+    active      BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at  TIMESTAMPTZ DEFAULT now(),
+    updated_at  TIMESTAMPTZ DEFAULT now()
+);
+
+-- Closed, Dead and Archived leads no longer count against a rep.
+CREATE INDEX IF NOT EXISTS idx_leads_owner_open
+    ON leads (owner)
+    WHERE status IS NULL OR status NOT IN ('Closed', 'Dead', 'Archived');
+
+CREATE OR REPLACE VIEW lead_assignee_load AS
+SELECT owner AS assignee, count(*)::INT AS open_leads
+  FROM leads
+ WHERE owner IS NOT NULL
+   AND (status IS NULL OR status NOT IN ('Closed', 'Dead', 'Archived'))
+ GROUP BY owner;
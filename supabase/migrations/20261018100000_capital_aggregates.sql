@@ -0,0 +1,167 @@
+-- Migration: 015_capital_aggregates.sql
+-- /api/capital/deployed, /api/capital/returns and /api/disposition/profit
+-- used to download every allocations, commitments, closings and offers row
+-- to add up amounts in Python. These functions return only the totals (and,
+-- when p_period is 'month', 'quarter' or 'year', one row per bucket), so the
+-- response stays the same size however long the ledger grows.
+
+-- Rejects anything date_trunc() shouldn't be handed from an API parameter.
+CREATE OR REPLACE FUNCTION check_summary_period(p_period TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+BEGIN
+    IF p_period IS NOT NULL AND p_period NOT IN ('month', 'quarter', 'year') THEN
+        RAISE EXCEPTION 'Unknown summary period %', p_period USING ERRCODE = '22023';
+    END IF;
+END;
+$$;
+
+-- Per-bucket closing totals, oldest first; '[]' when p_period is NULL.
+CREATE OR REPLACE FUNCTION closings_by_period(
+    p_period TEXT,
+    p_from   DATE DEFAULT NULL,
+    p_to     DATE DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'period', bucket,
+               'closed_deals', closed_deals,
+               'total_net_profit', round(net_profit, 2),
+               'total_capital_recovered', round(capital_recovered, 2),
+               'total_revenue', round(revenue, 2)
+           ) ORDER BY bucket), '[]'::jsonb)
+      FROM (
+        SELECT date_trunc(p_period, close_date)::DATE AS bucket,
+               count(*) AS closed_deals,
+               COALESCE(sum(net_profit), 0) AS net_profit,
+               COALESCE(sum(capital_recovered), 0) AS capital_recovered,
+               COALESCE(sum(sale_price), 0) AS revenue
+          FROM closings
+         WHERE p_period IS NOT NULL
+           AND close_date IS NOT NULL
+           AND (p_from IS NULL OR close_date >= p_from)
+           AND (p_to IS NULL OR close_date <= p_to)
+         GROUP BY 1
+      ) buckets;
+$$;
+
+-- Same totals as /api/capital/deployed; buckets by allocated_at / created_at.
+CREATE OR REPLACE FUNCTION capital_deployed_summary(p_period TEXT DEFAULT NULL)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_result JSONB;
+BEGIN
+    PERFORM check_summary_period(p_period);
+
+    SELECT jsonb_build_object(
+        'total_deployed_allocations', round(COALESCE(sum(amount), 0), 2),
+        'allocation_count', count(*)
+    ) INTO v_result
+      FROM allocations;
+
+    SELECT v_result || jsonb_build_object(
+        'total_committed_funded', round(COALESCE(sum(amount), 0), 2),
+        'funded_commitment_count', count(*)
+    ) INTO v_result
+      FROM commitments
+     WHERE status = 'Funded';
+
+    SELECT v_result || jsonb_build_object('by_period', COALESCE(jsonb_agg(jsonb_build_object(
+               'period', bucket,
+               'deployed_allocations', round(allocated, 2),
+               'committed_funded', round(funded, 2)
+           ) ORDER BY bucket), '[]'::jsonb))
+      INTO v_result
+      FROM (
+        SELECT bucket, sum(allocated) AS allocated, sum(funded) AS funded
+          FROM (
+            SELECT date_trunc(p_period, allocated_at)::DATE AS bucket,
+                   COALESCE(amount, 0) AS allocated, 0::NUMERIC AS funded
+              FROM allocations
+             WHERE p_period IS NOT NULL AND allocated_at IS NOT NULL
+            UNION ALL
+            SELECT date_trunc(p_period, created_at)::DATE, 0, COALESCE(amount, 0)
+              FROM commitments
+             WHERE p_period IS NOT NULL AND status = 'Funded' AND created_at IS NOT NULL
+          ) rows
+         GROUP BY bucket
+      ) buckets;
+
+    RETURN v_result;
+END;
+$$;
+
+-- Same totals as /api/capital/returns (a NULL roi counts as 0 in the average).
+CREATE OR REPLACE FUNCTION capital_returns_summary(p_period TEXT DEFAULT NULL)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_result JSONB;
+BEGIN
+    PERFORM check_summary_period(p_period);
+
+    SELECT jsonb_build_object(
+        'total_net_profit', round(COALESCE(sum(net_profit), 0), 2),
+        'total_capital_recovered', round(COALESCE(sum(capital_recovered), 0), 2),
+        'total_revenue', round(COALESCE(sum(sale_price), 0), 2),
+        'closed_deals', count(*)
+    ) INTO v_result
+      FROM closings;
+
+    SELECT v_result || jsonb_build_object(
+        'total_deployed', round(COALESCE(sum(amount), 0), 2),
+        'avg_roi', round(COALESCE(avg(COALESCE(roi, 0)), 0), 4)
+    ) INTO v_result
+      FROM allocations;
+
+    RETURN v_result || jsonb_build_object('by_period', closings_by_period(p_period));
+END;
+$$;
+
+-- Same totals as /api/disposition/profit. The offer conversion rate spans
+-- all offers regardless of p_year, as the endpoint always reported it.
+CREATE OR REPLACE FUNCTION disposition_profit_summary(
+    p_year   INT DEFAULT NULL,
+    p_period TEXT DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_from   DATE := CASE WHEN p_year IS NOT NULL THEN make_date(p_year, 1, 1) END;
+    v_to     DATE := CASE WHEN p_year IS NOT NULL THEN make_date(p_year, 12, 31) END;
+    v_result JSONB;
+BEGIN
+    PERFORM check_summary_period(p_period);
+
+    SELECT jsonb_build_object(
+        'closed_deals', count(*),
+        'total_net_profit', round(COALESCE(sum(net_profit), 0), 2),
+        'total_capital_recovered', round(COALESCE(sum(capital_recovered), 0), 2),
+        'total_revenue', round(COALESCE(sum(sale_price), 0), 2),
+        'avg_profit_per_deal', round(COALESCE(sum(net_profit) / NULLIF(count(*), 0), 0), 2)
+    ) INTO v_result
+      FROM closings
+     WHERE (v_from IS NULL OR close_date >= v_from)
+       AND (v_to IS NULL OR close_date <= v_to);
+
+    SELECT v_result || jsonb_build_object(
+        'offer_conversion_rate',
+        round(COALESCE(count(*) FILTER (WHERE status = 'Accepted')::NUMERIC / NULLIF(count(*), 0), 0), 4)
+    ) INTO v_result
+      FROM offers;
+
+    RETURN v_result || jsonb_build_object('by_period', closings_by_period(p_period, v_from, v_to));
+END;
+$$;
@@ -0,0 +1,302 @@
+-- Migration: 016_capital_ledger.sql
+-- Append-only, double-entry capital ledger. Available, committed, deployed
+-- and distributed capital were spread across investors.available_capital,
+-- commitments, allocations and distributions and recomputed by scanning.
+-- Now every movement is one capital_journal row with two capital_postings
+-- legs that net to zero (account scheme: dynasty_os/engines/capital_ledger.py):
+--
+--   deposit     external  -> available     commit   available -> committed
+--   release     committed -> available     fund     committed -> deployed
+--   return      deployed  -> available     withdraw available -> external
+--   distribute  external  -> distributed
+--
+-- Triggers keep capital_balances (one row per investor/account and per
+-- deal/account) current, so balance reads are single-row lookups; as-of
+-- balances scan capital_postings through its (investor|deal, effective_at)
+-- indexes. Commitment and distribution writes post their entries
+-- automatically, and existing rows are replayed once at the bottom.
+
+CREATE TABLE IF NOT EXISTS capital_journal (
+    entry_id      BIGSERIAL PRIMARY KEY,
+    entry_type    TEXT NOT NULL CHECK (entry_type IN
+                      ('deposit','commit','release','fund','return','distribute','withdraw')),
+    investor_id   UUID NOT NULL REFERENCES investors (investor_id),
+    deal_id       UUID REFERENCES deals (deal_id),
+    amount        NUMERIC NOT NULL CHECK (amount > 0),
+    effective_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    source_table  TEXT,
+    source_id     UUID,
+    memo          TEXT,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    CHECK (deal_id IS NOT NULL OR entry_type IN ('deposit', 'withdraw'))
+);
+
+CREATE TABLE IF NOT EXISTS capital_postings (
+    posting_id    BIGSERIAL PRIMARY KEY,
+    entry_id      BIGINT NOT NULL REFERENCES capital_journal (entry_id),
+    account       TEXT NOT NULL CHECK (account IN
+                      ('available','committed','deployed','distributed','external')),
+    investor_id   UUID NOT NULL,
+    deal_id       UUID,
+    amount        NUMERIC NOT NULL,
+    effective_at  TIMESTAMPTZ NOT NULL
+);
+
+-- scope is 'investor' or 'deal'; scope_id is the investor_id / deal_id.
+CREATE TABLE IF NOT EXISTS capital_balances (
+    scope       TEXT NOT NULL CHECK (scope IN ('investor', 'deal')),
+    scope_id    UUID NOT NULL,
+    account     TEXT NOT NULL,
+    balance     NUMERIC NOT NULL DEFAULT 0,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (scope, scope_id, account)
+);
+
+CREATE INDEX IF NOT EXISTS idx_capital_journal_investor ON capital_journal (investor_id, effective_at);
+CREATE INDEX IF NOT EXISTS idx_capital_journal_deal     ON capital_journal (deal_id, effective_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_capital_journal_source
+    ON capital_journal (source_table, source_id, entry_type) WHERE source_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_capital_postings_investor
+    ON capital_postings (investor_id, effective_at) INCLUDE (account, amount);
+CREATE INDEX IF NOT EXISTS idx_capital_postings_deal
+    ON capital_postings (deal_id, effective_at) INCLUDE (account, amount) WHERE deal_id IS NOT NULL;
+
+-- ─── Append-only guard ──────────────────────────────────────────────────────
+
+CREATE OR REPLACE FUNCTION capital_ledger_immutable()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RAISE EXCEPTION '% is append-only; post a correcting entry instead', TG_TABLE_NAME
+        USING ERRCODE = '55000';
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_capital_journal_immutable ON capital_journal;
+CREATE TRIGGER trg_capital_journal_immutable
+    BEFORE UPDATE OR DELETE ON capital_journal
+    FOR EACH ROW EXECUTE FUNCTION capital_ledger_immutable();
+DROP TRIGGER IF EXISTS trg_capital_postings_immutable ON capital_postings;
+CREATE TRIGGER trg_capital_postings_immutable
+    BEFORE UPDATE OR DELETE ON capital_postings
+    FOR EACH ROW EXECUTE FUNCTION capital_ledger_immutable();
+
+-- ─── Postings and running balances ──────────────────────────────────────────
+
+CREATE OR REPLACE FUNCTION bump_capital_balance(p_scope TEXT, p_scope_id UUID, p_account TEXT, p_delta NUMERIC)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO capital_balances (scope, scope_id, account, balance)
+    VALUES (p_scope, p_scope_id, p_account, p_delta)
+    ON CONFLICT (scope, scope_id, account)
+    DO UPDATE SET balance = capital_balances.balance + EXCLUDED.balance, updated_at = now();
+$$;
+
+-- Each journal row writes its two legs; each leg moves the running balances.
+CREATE OR REPLACE FUNCTION capital_journal_post()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_from TEXT;
+    v_to   TEXT;
+BEGIN
+    SELECT a[1], a[2] INTO v_from, v_to FROM (SELECT CASE NEW.entry_type
+        WHEN 'deposit'    THEN ARRAY['external', 'available']
+        WHEN 'commit'     THEN ARRAY['available', 'committed']
+        WHEN 'release'    THEN ARRAY['committed', 'available']
+        WHEN 'fund'       THEN ARRAY['committed', 'deployed']
+        WHEN 'return'     THEN ARRAY['deployed', 'available']
+        WHEN 'distribute' THEN ARRAY['external', 'distributed']
+        WHEN 'withdraw'   THEN ARRAY['available', 'external']
+    END AS a) legs;
+
+    INSERT INTO capital_postings (entry_id, account, investor_id, deal_id, amount, effective_at)
+    VALUES (NEW.entry_id, v_from, NEW.investor_id, NEW.deal_id, -NEW.amount, NEW.effective_at),
+           (NEW.entry_id, v_to,   NEW.investor_id, NEW.deal_id,  NEW.amount, NEW.effective_at);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION capital_postings_balance()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM bump_capital_balance('investor', NEW.investor_id, NEW.account, NEW.amount);
+    IF NEW.deal_id IS NOT NULL THEN
+        PERFORM bump_capital_balance('deal', NEW.deal_id, NEW.account, NEW.amount);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_capital_journal_post ON capital_journal;
+CREATE TRIGGER trg_capital_journal_post
+    AFTER INSERT ON capital_journal
+    FOR EACH ROW EXECUTE FUNCTION capital_journal_post();
+DROP TRIGGER IF EXISTS trg_capital_postings_balance ON capital_postings;
+CREATE TRIGGER trg_capital_postings_balance
+    AFTER INSERT ON capital_postings
+    FOR EACH ROW EXECUTE FUNCTION capital_postings_balance();
+
+-- ─── Reads ──────────────────────────────────────────────────────────────────
+
+-- {account: balance} for one investor or deal (both NULL = whole ledger).
+CREATE OR REPLACE FUNCTION capital_balance(p_investor_id UUID DEFAULT NULL, p_deal_id UUID DEFAULT NULL)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_object_agg(account, balance), '{}'::jsonb)
+      FROM (
+        SELECT account, sum(balance) AS balance
+          FROM capital_balances
+         WHERE (p_investor_id IS NOT NULL AND scope = 'investor' AND scope_id = p_investor_id
+                AND p_deal_id IS NULL)
+            OR (p_deal_id IS NOT NULL AND scope = 'deal' AND scope_id = p_deal_id
+                AND p_investor_id IS NULL)
+            OR (p_investor_id IS NULL AND p_deal_id IS NULL AND scope = 'investor')
+         GROUP BY account
+        UNION ALL
+        -- One investor's position in one deal: summed from that deal's postings.
+        SELECT account, sum(amount)
+          FROM capital_postings
+         WHERE p_investor_id IS NOT NULL AND p_deal_id IS NOT NULL
+           AND deal_id = p_deal_id AND investor_id = p_investor_id
+         GROUP BY account
+      ) balances;
+$$;
+
+-- Same shape as capital_balance(), counting entries effective at or before p_as_of.
+CREATE OR REPLACE FUNCTION capital_balance_as_of(
+    p_as_of       TIMESTAMPTZ,
+    p_investor_id UUID DEFAULT NULL,
+    p_deal_id     UUID DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_object_agg(account, balance), '{}'::jsonb)
+      FROM (
+        SELECT account, sum(amount) AS balance
+          FROM capital_postings
+         WHERE effective_at <= p_as_of
+           AND (p_investor_id IS NULL OR investor_id = p_investor_id)
+           AND (p_deal_id IS NULL OR deal_id = p_deal_id)
+         GROUP BY account
+      ) balances;
+$$;
+
+-- ─── Automatic entries from commitments and distributions ───────────────────
+
+-- Commitment status walks Pending/Confirmed -> Funded -> Returned; a
+-- commitment returned before it was funded is a release, not a return.
+CREATE OR REPLACE FUNCTION commitments_capital_journal()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_old TEXT := CASE WHEN TG_OP = 'UPDATE' THEN OLD.status END;
+    v_amount NUMERIC := COALESCE(NEW.amount, 0);
+BEGIN
+    IF v_amount <= 0 THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO capital_journal (entry_type, investor_id, deal_id, amount, source_table, source_id)
+        VALUES ('commit', NEW.investor_id, NEW.deal_id, v_amount, 'commitments', NEW.commitment_id)
+        ON CONFLICT DO NOTHING;
+    END IF;
+    IF NEW.status = 'Funded' AND (v_old IS NULL OR v_old NOT IN ('Funded', 'Returned')) THEN
+        INSERT INTO capital_journal (entry_type, investor_id, deal_id, amount, source_table, source_id)
+        VALUES ('fund', NEW.investor_id, NEW.deal_id, v_amount, 'commitments', NEW.commitment_id)
+        ON CONFLICT DO NOTHING;
+    END IF;
+    IF NEW.status = 'Returned' AND v_old IS DISTINCT FROM 'Returned' THEN
+        INSERT INTO capital_journal (entry_type, investor_id, deal_id, amount, source_table, source_id)
+        VALUES (CASE WHEN v_old = 'Funded' THEN 'return' ELSE 'release' END,
+                NEW.investor_id, NEW.deal_id, v_amount, 'commitments', NEW.commitment_id)
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- A distribution is posted once, when it is first marked Sent or Confirmed.
+CREATE OR REPLACE FUNCTION distributions_capital_journal()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF COALESCE(NEW.amount, 0) > 0
+       AND NEW.status IN ('Sent', 'Confirmed')
+       AND (TG_OP = 'INSERT' OR OLD.status NOT IN ('Sent', 'Confirmed')) THEN
+        INSERT INTO capital_journal (entry_type, investor_id, deal_id, amount, effective_at,
+                                     source_table, source_id, memo)
+        VALUES ('distribute', NEW.investor_id, NEW.deal_id, NEW.amount,
+                COALESCE(NEW.distribution_date::TIMESTAMPTZ, now()),
+                'distributions', NEW.distribution_id, NEW.type)
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_commitments_capital_journal ON commitments;
+CREATE TRIGGER trg_commitments_capital_journal
+    AFTER INSERT OR UPDATE OF status ON commitments
+    FOR EACH ROW EXECUTE FUNCTION commitments_capital_journal();
+DROP TRIGGER IF EXISTS trg_distributions_capital_journal ON distributions;
+CREATE TRIGGER trg_distributions_capital_journal
+    AFTER INSERT OR UPDATE OF status ON distributions
+    FOR EACH ROW EXECUTE FUNCTION distributions_capital_journal();
+
+-- ─── Opening balances ───────────────────────────────────────────────────────
+
+-- Each investor opens with a deposit of today's available capital plus
+-- whatever is still tied up in unreturned commitments, then every
+-- commitment and paid distribution is replayed, so available ends where
+-- investors.available_capital is today.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM capital_journal) THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO capital_journal (entry_type, investor_id, amount, effective_at, source_table, source_id, memo)
+    SELECT 'deposit', i.investor_id, opening, COALESCE(i.created_at, now()),
+           'investors', i.investor_id, 'Opening balance'
+      FROM (
+        SELECT inv.investor_id, inv.created_at,
+               COALESCE(inv.available_capital, 0)
+               + COALESCE((SELECT sum(c.amount) FROM commitments c
+                            WHERE c.investor_id = inv.investor_id
+                              AND c.status IN ('Pending', 'Confirmed', 'Funded')), 0) AS opening
+          FROM investors inv
+      ) i
+     WHERE opening > 0;
+
+    INSERT INTO capital_journal (entry_type, investor_id, deal_id, amount, effective_at, source_table, source_id)
+    SELECT step.entry_type, c.investor_id, c.deal_id, c.amount,
+           COALESCE(c.created_at, now()), 'commitments', c.commitment_id
+      FROM commitments c
+      CROSS JOIN LATERAL (VALUES (1, 'commit'), (2, 'fund'), (3, 'return')) AS step (n, entry_type)
+     WHERE COALESCE(c.amount, 0) > 0
+       AND (step.n = 1
+            OR (step.n = 2 AND c.status IN ('Funded', 'Returned'))
+            OR (step.n = 3 AND c.status = 'Returned'))
+     ORDER BY c.created_at, c.commitment_id, step.n;
+
+    INSERT INTO capital_journal (entry_type, investor_id, deal_id, amount, effective_at,
+                                 source_table, source_id, memo)
+    SELECT 'distribute', d.investor_id, d.deal_id, d.amount,
+           COALESCE(d.distribution_date::TIMESTAMPTZ, now()),
+           'distributions', d.distribution_id, d.type
+      FROM distributions d
+     WHERE COALESCE(d.amount, 0) > 0 AND d.status IN ('Sent', 'Confirmed');
+END;
+$$;
@@ -0,0 +1,10 @@
+-- Migration: 017_properties_address_trgm.sql
+-- /api/property?address= matches address_normalized (street key only, see
+-- 013) OR the raw address, so city / ZIP searches and rows not yet filled
+-- by scripts/backfill_address_keys.py still match. Index the raw column
+-- too so neither side of the OR falls back to a sequential scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_properties_address_raw_trgm
+    ON properties USING gin (address gin_trgm_ops);
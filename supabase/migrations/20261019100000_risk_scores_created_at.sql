@@ -0,0 +1,7 @@
+-- Migration: 018_risk_scores_created_at.sql
+-- Investor matching (/api/deal/{id}/investors) reads a deal's risk level
+-- from the newest risk_scores row. The table had no timestamp to order by,
+-- so add one; existing rows get the migration time.
+
+ALTER TABLE risk_scores
+    ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now();
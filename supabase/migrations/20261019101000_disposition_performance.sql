@@ -0,0 +1,17 @@
+-- Migration: 019_disposition_performance.sql
+-- Sold-listing events behind /api/disposition/performance. The API used to
+-- keep only per-worker quantile sketches in snapshot files, so a restart or
+-- a lost storage directory dropped every KPI. Events are now stored here;
+-- each worker rebuilds its sketches from this table on first use and then
+-- reads only rows past the last id it has seen.
+
+CREATE TABLE IF NOT EXISTS disposition_performance (
+    id              BIGSERIAL PRIMARY KEY,
+    property_id     TEXT NOT NULL,
+    list_price      NUMERIC NOT NULL,
+    sale_price      NUMERIC NOT NULL,
+    days_on_market  INT NOT NULL,
+    exit_strategy   TEXT NOT NULL,
+    market          TEXT,
+    recorded_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,73 @@
+-- Migration: 020_lead_routing_previous_owner.sql
+-- The in-process router moves one open lead of load from the previous owner
+-- to the new one on every routing. route_lead_tx now reports the owner it
+-- replaced, so /route no longer needs a SELECT first, and
+-- auto_route_leads_tx writes a whole auto-route batch (owner, lead_routing
+-- row and Routed activity per lead) in one transaction, reporting each
+-- lead's previous owner. Leads deleted since they were read are skipped and
+-- left out of the result.
+
+CREATE OR REPLACE FUNCTION route_lead_tx(
+    p_lead_id               UUID,
+    p_routed_to             TEXT,
+    p_reason                TEXT,
+    p_activity_description  TEXT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_previous_owner TEXT;
+    v_routing        lead_routing;
+BEGIN
+    SELECT owner INTO v_previous_owner FROM leads WHERE lead_id = p_lead_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Lead % not found', p_lead_id USING ERRCODE = 'P0002';
+    END IF;
+
+    UPDATE leads SET owner = p_routed_to WHERE lead_id = p_lead_id;
+
+    INSERT INTO lead_routing (lead_id, routed_to, reason)
+    VALUES (p_lead_id, p_routed_to, p_reason)
+    RETURNING * INTO v_routing;
+
+    INSERT INTO lead_activities (lead_id, activity_type, description)
+    VALUES (p_lead_id, 'Routed', p_activity_description);
+
+    RETURN to_jsonb(v_routing) || jsonb_build_object('previous_owner', v_previous_owner);
+END;
+$$;
+
+-- p_assignments: [{"lead_id", "routed_to", "reason", "description"}, ...]
+CREATE OR REPLACE FUNCTION auto_route_leads_tx(p_assignments JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_item            JSONB;
+    v_lead_id         UUID;
+    v_previous_owner  TEXT;
+    v_routed          JSONB := '[]'::JSONB;
+BEGIN
+    FOR v_item IN
+        SELECT value FROM jsonb_array_elements(p_assignments) ORDER BY value->>'lead_id'
+    LOOP
+        v_lead_id := (v_item->>'lead_id')::UUID;
+        SELECT owner INTO v_previous_owner FROM leads WHERE lead_id = v_lead_id FOR UPDATE;
+        CONTINUE WHEN NOT FOUND;
+
+        UPDATE leads SET owner = v_item->>'routed_to' WHERE lead_id = v_lead_id;
+
+        INSERT INTO lead_routing (lead_id, routed_to, reason)
+        VALUES (v_lead_id, v_item->>'routed_to', v_item->>'reason');
+
+        INSERT INTO lead_activities (lead_id, activity_type, description)
+        VALUES (v_lead_id, 'Routed', v_item->>'description');
+
+        v_routed := v_routed || jsonb_build_array(
+            jsonb_build_object('lead_id', v_lead_id, 'previous_owner', v_previous_owner)
+        );
+    END LOOP;
+    RETURN v_routed;
+END;
+$$;
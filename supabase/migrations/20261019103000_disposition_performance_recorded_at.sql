@@ -0,0 +1,9 @@
+-- Migration: 021_disposition_performance_recorded_at.sql
+-- BIGSERIAL ids are handed out before commit, so a worker that caught up
+-- with "id > last seen" skipped rows whose transaction committed after a
+-- higher id was already read. Workers now re-read a trailing recorded_at
+-- window on each catch-up and skip ids already counted; this index keeps
+-- that window read cheap.
+
+CREATE INDEX IF NOT EXISTS idx_disposition_performance_recorded_at
+    ON disposition_performance (recorded_at);